@@ -0,0 +1,144 @@
+"""管理用の重い処理（バッジチェック・タイムスタンプ更新）を非同期ジョブとして実行する
+
+ジョブの状態はストアに保存する。複数ワーカーでは BadgeStore（SQLite）を渡すと、
+どのワーカーに届いた状態の問い合わせにも答えられ、重複した実行要求もワーカーをまたいで
+1つのジョブにまとまる。ストアを渡さない場合はプロセス内の MemoryJobStore を使う。
+"""
+import logging
+import os
+import secrets
+import socket
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ('succeeded', 'failed')
+
+# ジョブを実行するワーカー（同じマシンならプロセスの生存を確認できる）
+WORKER_HOST = socket.gethostname()
+
+
+def new_job(kind):
+    """1回分のジョブの状態"""
+    return {
+        'id': secrets.token_hex(8),
+        'kind': kind,
+        'status': 'queued',
+        'created_at': datetime.now().isoformat(),
+        'started_at': None,
+        'finished_at': None,
+        'result': None,
+        'error': None,
+        'worker': {'host': WORKER_HOST, 'pid': os.getpid()}
+    }
+
+
+def _process_exists(pid):
+    if os.name == 'nt':
+        # Windows の os.kill はプロセスを終了させるため確認しない
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def is_abandoned(job):
+    """同じマシンで実行していたワーカーが終了し、完了しないまま残ったジョブか"""
+    worker = job.get('worker') or {}
+    return worker.get('host') == WORKER_HOST and not _process_exists(worker.get('pid', 0))
+
+
+class MemoryJobStore:
+    """プロセス内だけのジョブの保存先（単一プロセス・サーバーレス環境向け）"""
+
+    def __init__(self):
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def claim_job(self, job, history=50, is_abandoned=None):
+        with self._lock:
+            for active in self._jobs.values():
+                if active['kind'] == job['kind'] and active['status'] not in TERMINAL_STATUSES:
+                    return dict(active), True
+            self._jobs[job['id']] = dict(job)
+            while len(self._jobs) > history:
+                oldest_id, oldest = next(iter(self._jobs.items()))
+                if oldest['status'] not in TERMINAL_STATUSES:
+                    break
+                del self._jobs[oldest_id]
+            return job, False
+
+    def update_job(self, job):
+        with self._lock:
+            if job['id'] in self._jobs:
+                self._jobs[job['id']] = dict(job)
+
+    def get_job(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+
+class JobManager:
+    """ジョブを1本のワーカーで順番に実行する
+
+    - 同じ種類のジョブが待機中・実行中なら新しく作らずそのジョブを返す（多重実行の防止）
+    - ワーカーが1本なので、ファイルやDBへの書き込みが並行して走らない
+    - inline=True の場合はリクエスト内で実行する（バックグラウンドスレッドが
+      レスポンス後に止められるサーバーレス環境向け）
+    """
+
+    def __init__(self, history=50, inline=False, store=None):
+        self.history = history
+        self.inline = inline
+        self.store = store if store is not None else MemoryJobStore()
+        self._executor = None if inline else ThreadPoolExecutor(max_workers=1, thread_name_prefix='admin-job')
+
+    def submit(self, kind, func):
+        """ジョブを登録して (ジョブ, 既存ジョブに合流したか) を返す"""
+        job, coalesced = self.store.claim_job(new_job(kind), self.history, is_abandoned)
+        if coalesced:
+            return job, True
+
+        if self.inline:
+            self._run(job, func)
+            return job, False
+        # 実行中に書き換えられないよう、登録時点の状態を返す
+        submitted = dict(job)
+        self._executor.submit(self._run, job, func)
+        return submitted, False
+
+    def get(self, job_id):
+        return self.store.get_job(job_id)
+
+    def _run(self, job, func):
+        job.update(status='running', started_at=datetime.now().isoformat())
+        self.store.update_job(job)
+        try:
+            result = func()
+            job.update(status='succeeded', result=result)
+        except Exception as e:
+            logger.exception(f"Error in admin job {job['kind']} ({job['id']}): {e}")
+            job.update(status='failed', error=str(e))
+        finally:
+            job['finished_at'] = datetime.now().isoformat()
+            self.store.update_job(job)
+
+
+def job_response(job, coalesced):
+    """ジョブ登録時のレスポンス本体（ステータスは202で返す）"""
+    return {
+        'success': True,
+        'job_id': job['id'],
+        'status': job['status'],
+        'coalesced': coalesced,
+        'status_url': f"/api/admin/jobs/{job['id']}",
+        'job': dict(job)
+    }
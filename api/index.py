@@ -1,136 +1,314 @@
 from flask import Flask, jsonify, request
 from flask_cors import CORS
-import requests
 import os
+import sys
 import time
-from dotenv import load_dotenv
+import hmac
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
 
-# .envファイルを読み込む
-load_dotenv()
+# プロジェクトルートの共通モジュールを読み込めるようにする
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from structured_logging import configure_logging
+from metrics import instrument_flask
+from profiling import Profiler, install_profiler, phase
+from response_cache import TTLCache
+from token_manager import TokenManager
+from payload_cache import PayloadCache
+from badge_index import BadgeIndexCache
+from search_index import (DEFAULT_LIMIT, MAX_LIMIT, MAX_OFFSET, SearchIndexSync, badge_documents,
+                          emote_documents, search_response)
+from catalog_query import (BADGE_SPEC, EMOTE_SPEC, CatalogViewCache, QueryError, is_catalog_query,
+                           parse_catalog_query)
+from availability import load_availability_periods
+from badge_metadata import (load_badge_metadata, normalize_language, find_obtain_method,
+                            estimate_created_date, build_meta_bundle, build_availability_map)
+from dashboard import build_dashboard, filter_dashboard
+from compact_format import COMPACT_FORMAT, encode_dashboard
+from badge_matcher import TimestampMatcher
+from snapshot import SnapshotReader, source_hash
+from admin_jobs import JobManager, job_response
+
+# .envファイルがあれば読み込む（Vercelでは環境変数が設定済みのため dotenv 自体を読み込まない）
+ENV_FILE = os.path.join(ROOT_DIR, '.env')
+if os.path.exists(ENV_FILE):
+    from dotenv import load_dotenv
+    load_dotenv(ENV_FILE)
+
+# 構造化ログ（LOG_LEVEL・LOG_FORMAT で設定）
+configure_logging()
+logger = logging.getLogger('index')
 
 app = Flask(__name__)
 CORS(app)
 
+# ルートごとの処理時間・件数の記録と /metrics（値は関数のインスタンスごと）
+instrument_flask(app)
+
+# 区間ごとの計測（最も遅いリクエストの記録）と管理者によるオンデマンドのプロファイル
+profiler = Profiler()
+install_profiler(app, profiler)
+
 # Twitch API認証情報（環境変数から取得）
 CLIENT_ID = os.getenv('TWITCH_CLIENT_ID')
 CLIENT_SECRET = os.getenv('TWITCH_CLIENT_SECRET')
 
 # 環境変数が設定されていない場合のエラーチェック
 if not CLIENT_ID or not CLIENT_SECRET:
-    print("ERROR: Twitch API credentials not found!")
-    print("Please set TWITCH_CLIENT_ID and TWITCH_CLIENT_SECRET in your .env file")
+    logger.error("Twitch API credentials not found! "
+                 "Please set TWITCH_CLIENT_ID and TWITCH_CLIENT_SECRET in your .env file")
 
-# アクセストークンのキャッシュ
-access_token_cache = {
-    'token': None,
-    'expires_at': 0
-}
+# Twitch APIの接続先（負荷試験などでスタブサーバーに差し替え可能）
+HELIX_API_URL = os.getenv('HELIX_API_URL', 'https://api.twitch.tv/helix')
+TWITCH_TOKEN_URL = os.getenv('TWITCH_TOKEN_URL', 'https://id.twitch.tv/oauth2/token')
+
+# Helixレスポンスのキャッシュ（ウォームなインスタンスでは上流呼び出しを省略）
+HELIX_CACHE_TTL = int(os.getenv('HELIX_CACHE_TTL', '600'))
+HELIX_CACHE_MAX_STALE = int(os.getenv('HELIX_CACHE_MAX_STALE', '86400'))
+helix_cache = TTLCache(ttl=HELIX_CACHE_TTL, max_stale=HELIX_CACHE_MAX_STALE, name='helix')
+
+# 拡張済みレスポンスのシリアライズ・圧縮結果のキャッシュ
+payload_cache = PayloadCache()
+
+# バッジ単体（/api/badges/<set_id>）の索引
+badge_index_cache = BadgeIndexCache()
+
+# 一覧のフィールド選択・絞り込み・並び替え用（並び順はデータバージョンごとに計算済み）
+catalog_views = CatalogViewCache()
+
+# /api/search の転置インデックス（データが変わったときは変わった文書だけ索引し直す）
+search_sync = SearchIndexSync()
+
+# ビルド時に書き出された badge_database.json のバッジ詳細（無ければ空）
+BADGE_DATABASE_FILE = os.path.join(ROOT_DIR, 'badge_database.json')
+_badge_details = None
+
+def get_badge_details():
+    """badge_database.json のバッジ詳細を初回アクセス時に1回だけ読み込む"""
+    global _badge_details
+    if _badge_details is None:
+        try:
+            with open(BADGE_DATABASE_FILE, 'r') as f:
+                _badge_details = json.load(f).get('badge_details', {})
+        except (OSError, ValueError) as e:
+            logger.error(f"Error loading badge details: {e}")
+            _badge_details = {}
+    return _badge_details
+
+# 入手方法・推定作成日のメタデータ（ストアが無いため badge_metadata.json を初回アクセス時に読み込む）
+_badge_metadata = None
+
+def get_badge_metadata():
+    """badge_metadata.json を初回アクセス時に1回だけ読み込む"""
+    global _badge_metadata
+    if _badge_metadata is None:
+        try:
+            _badge_metadata = load_badge_metadata()[0]
+        except (OSError, ValueError) as e:
+            logger.error(f"Error loading badge metadata: {e}")
+            _badge_metadata = {'obtain_methods': {}, 'creation_dates': {}}
+    return _badge_metadata
+
+def get_http_client():
+    """上流HTTPクライアント（requests の読み込みは最初の上流呼び出しまで遅らせる）"""
+    from upstream import get_http_client as get_upstream_client
+    return get_upstream_client()
+
+# アクセストークンの管理（サーバーレスのためタイマー更新は行わず、アクセス時に更新）
+token_manager = TokenManager(CLIENT_ID, CLIENT_SECRET, get_http_client, background=False,
+                             token_url=TWITCH_TOKEN_URL)
 
 def get_app_access_token():
     """Twitchアプリケーションアクセストークンを取得"""
-    # キャッシュされたトークンが有効な場合はそれを返す
-    if access_token_cache['token'] and time.time() < access_token_cache['expires_at']:
-        return access_token_cache['token']
-    
-    # 新しいトークンを取得
-    url = 'https://id.twitch.tv/oauth2/token'
-    params = {
-        'client_id': CLIENT_ID,
-        'client_secret': CLIENT_SECRET,
-        'grant_type': 'client_credentials'
-    }
-    
-    try:
-        response = requests.post(url, params=params)
-        response.raise_for_status()
-        
-        data = response.json()
-        access_token = data['access_token']
-        expires_in = data.get('expires_in', 3600)
-        
-        # トークンをキャッシュ
-        access_token_cache['token'] = access_token
-        access_token_cache['expires_at'] = time.time() + expires_in - 60  # 1分前に期限切れとする
-        
-        return access_token
-    except Exception as e:
-        print(f"Error getting access token: {e}")
-        return None
+    with phase('token'):
+        return token_manager.get_token()
 
-@app.route('/api/badges', methods=['GET'])
-def get_global_badges():
-    """Twitchグローバルバッジを取得するAPIエンドポイント"""
-    if not CLIENT_ID or not CLIENT_SECRET:
-        return jsonify({'error': 'API credentials not configured'}), 500
-        
-    # アクセストークンを取得
+class AccessTokenError(Exception):
+    """アクセストークンを取得できなかった場合の例外"""
+
+
+def fetch_helix(path):
+    """Twitch Helix APIからデータを取得（キャッシュのローダーとして使用）"""
     access_token = get_app_access_token()
     
     if not access_token:
-        return jsonify({'error': 'Failed to get access token'}), 500
+        raise AccessTokenError('Failed to get access token')
     
-    # Twitch APIからグローバルバッジを取得
-    url = 'https://api.twitch.tv/helix/chat/badges/global'
+    url = f'{HELIX_API_URL}/{path}'
     headers = {
         'Authorization': f'Bearer {access_token}',
         'Client-Id': CLIENT_ID
     }
     
+    response = get_http_client().get(url, headers=headers)
+    
+    # トークンが失効していた場合は無効化して1回だけ再試行
+    if response.status_code == 401:
+        token_manager.invalidate(access_token)
+        access_token = get_app_access_token()
+        if not access_token:
+            raise AccessTokenError('Failed to get access token')
+        headers['Authorization'] = f'Bearer {access_token}'
+        response = get_http_client().get(url, headers=headers)
+    
+    response.raise_for_status()
+    
+    return response.json()
+
+# ビルド時のスナップショット（snapshot.py）。生成から SNAPSHOT_MAX_AGE 秒以内はHelixを呼ばずに使う。
+# /api/cron/refresh-snapshot は次の実行までに古くなるスナップショットについてHelixの内容を確認し、
+# 変わっていればデプロイフックで再ビルドする（SNAPSHOT_CHECK_INTERVAL は vercel.json の crons の間隔と合わせる）
+SNAPSHOT_MAX_AGE = int(os.getenv('SNAPSHOT_MAX_AGE', '3600'))
+SNAPSHOT_CHECK_INTERVAL = 3600
+SNAPSHOT_DEPLOY_HOOK_URL = os.getenv('SNAPSHOT_DEPLOY_HOOK_URL')
+CRON_SECRET = os.getenv('CRON_SECRET')
+snapshot_reader = SnapshotReader()
+
+HELIX_PATHS = {
+    'badges': 'chat/badges/global',
+    'emotes': 'chat/emotes/global'
+}
+
+def load_helix(kind):
+    """スナップショットが新しければそれを返し、古い（または無い）場合のみHelixから取得する"""
+    data = snapshot_reader.get(kind, SNAPSHOT_MAX_AGE)
+    if data is not None:
+        return data
+    return fetch_helix(HELIX_PATHS[kind])
+
+@app.route('/api/badges', methods=['GET'])
+def get_global_badges():
+    """Twitchグローバルバッジを取得するAPIエンドポイント"""
+    if not CLIENT_ID or not CLIENT_SECRET:
+        return jsonify({'error': 'API credentials not configured'}), 500
+    
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
+        # Twitch APIからグローバルバッジを取得（キャッシュ経由）
+        twitch_data, helix_version = helix_cache.get_versioned(
+            'badges', lambda: load_helix('badges'))
         
-        twitch_data = response.json()
+        # Stream Database APIから追加日情報を取得して統合（データ更新時のみ）
+        payload = get_badges_payload(twitch_data, helix_version)
         
-        # Stream Database APIから追加日情報を取得して統合
-        enhanced_data = enhance_badges_with_timestamps(twitch_data)
+        # 一覧のクエリパラメータがある場合は絞り込み・ページング済みの一覧を返す
+        if is_catalog_query(request.args):
+            return catalog_response(BADGE_SPEC, payload)
         
-        return jsonify(enhanced_data)
+        return payload.to_response()
+    except AccessTokenError:
+        return jsonify({'error': 'Failed to get access token'}), 500
     except Exception as e:
-        print(f"Error fetching badges: {e}")
+        logger.exception(f"Error fetching badges: {e}")
         return jsonify({'error': 'Failed to fetch badges'}), 500
 
+def catalog_response(spec, payload):
+    """fields・sort・limit・cursor と絞り込み条件を適用した一覧を返す"""
+    view = catalog_views.get(spec, payload.version, lambda: payload.data.get('data', []))
+    try:
+        query = parse_catalog_query(request.args, spec)
+        return view.query(query, availability_periods).to_response()
+    except QueryError as e:
+        return jsonify({'error': str(e)}), 400
+
+def copy_items(twitch_data):
+    """拡張用のコピー（enhance_* は各要素のキーを追加するだけなので要素の辞書まで複製すれば十分。
+    コールドスタートの最初のリクエストで deepcopy が支配的だったため）"""
+    copied = dict(twitch_data)
+    if 'data' in copied:
+        copied['data'] = [dict(item) for item in copied['data']]
+    return copied
+
+def get_badges_payload(twitch_data, helix_version):
+    """拡張済みバッジ一覧のペイロード（Helixのバージョンごとに1回だけ構築）"""
+    return payload_cache.get(
+        'badges', helix_version, lambda: enhance_badges_with_timestamps(copy_items(twitch_data)))
+
+@app.route('/api/badges/<set_id>', methods=['GET'])
+def get_badge(set_id):
+    """バッジ単体（versions・タイムスタンプ・badge_details）を返す"""
+    if not CLIENT_ID or not CLIENT_SECRET:
+        return jsonify({'error': 'API credentials not configured'}), 500
+    
+    try:
+        twitch_data, helix_version = helix_cache.get_versioned(
+            'badges', lambda: load_helix('badges'))
+        badges_payload = get_badges_payload(twitch_data, helix_version)
+        index = badge_index_cache.get(badges_payload.version, lambda: (
+            badges_payload.data.get('data', []), get_badge_details()))
+        
+        payload = index.get(set_id)
+        if payload is None:
+            return jsonify({'error': 'Badge not found'}), 404
+        return payload.to_response()
+    except AccessTokenError:
+        return jsonify({'error': 'Failed to get access token'}), 500
+    except Exception as e:
+        logger.exception(f"Error fetching badge {set_id}: {e}")
+        return jsonify({'error': 'Failed to fetch badge'}), 500
+
+@app.route('/api/badges/availability', methods=['GET'])
+def get_badges_availability():
+    """入手可能期間の情報があるバッジ全件の入手可能状態（一覧ページのカード表示用）"""
+    lang = normalize_language(request.args.get('lang'))
+    
+    # 入手可能判定は時刻に依存するため1分単位で再計算
+    version = int(time.time() // 60)
+    payload = payload_cache.get(f'availability:{lang}', version, lambda: {
+        'lang': lang,
+        'availability': build_availability_map(availability_periods, lang)
+    })
+    return payload.to_response()
+
+@app.route('/api/badges/<set_id>/meta', methods=['GET'])
+def get_badge_meta(set_id):
+    """バッジ単体・1言語分のメタデータ（入手方法と入手可能状態）を返す"""
+    lang = normalize_language(request.args.get('lang'))
+    obtain_method, has_own = find_obtain_method(get_badge_metadata(), set_id, lang)
+    
+    # 固有の情報が無いバッジ（汎用説明のみ）はキャッシュせず、任意のIDでキャッシュが増えないようにする
+    if not has_own and set_id not in availability_periods:
+        return jsonify(build_meta_bundle(set_id, lang, obtain_method, availability_periods))
+    
+    version = int(time.time() // 60)
+    payload = payload_cache.get(f'meta:{set_id}:{lang}', version, lambda: build_meta_bundle(
+        set_id, lang, obtain_method, availability_periods))
+    return payload.to_response()
+
+# Stream Database公式サイトから取得した正確な追加日（バッジ・エモート、2025年7月更新版）
+TIMESTAMPS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'timestamps.json')
+_timestamp_tables = None
+
+def get_timestamp_tables():
+    """timestamps.json と、バッジの部分一致インデックスを初回アクセス時に1回だけ構築する"""
+    global _timestamp_tables
+    if _timestamp_tables is None:
+        try:
+            with open(TIMESTAMPS_FILE, 'r') as f:
+                tables = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Error loading timestamps: {e}")
+            tables = {}
+        badges = tables.get('badges', {})
+        _timestamp_tables = {
+            'badges': badges,
+            'emotes': tables.get('emotes', {}),
+            'matcher': TimestampMatcher(badges)
+        }
+    return _timestamp_tables
+
 def enhance_badges_with_timestamps(twitch_data):
     """Stream Databaseのデータでバッジにタイムスタンプを追加（正確な追加日のみ）"""
-    # Stream Database公式サイトから取得した正確な追加日データベース（2025年7月更新版）
-    badge_timestamps = {
-        # 2025年の最新バッジ（Stream Databaseから取得した正確な追加日）
-        'zevent25': '2025-09-04T00:00:00.000Z',  # ZEVENT 2025
-        'hornet': '2025-09-03T00:00:00.000Z',  # Hollow Knight: Silksong
-        'subtember-2025': '2025-09-03T00:00:00.000Z',  # SUBtember 2025
-        'gears-of-war-superfan-badge': '2025-08-29T00:00:00.000Z',  # Gears of War Superfan
-        'path-of-exile-2-badge': '2025-08-27T00:00:00.000Z',  # Chaos Orb (Path of Exile 2)
-        
-        # 2025年の既存バッジ（Stream Databaseから取得した正確な追加日）
-        'evo-2025': '2025-07-31T00:00:00.000Z',
-        'la-velada-v-badge': '2025-07-23T00:00:00.000Z',
-        'legendus': '2025-06-28T06:15:55.000Z',
-        'league-of-legends-mid-season-invitational-2025---grey': '2025-06-24T01:11:19.640Z',
-        'league-of-legends-mid-season-invitational-2025---purple': '2025-06-24T01:11:19.640Z',
-        'league-of-legends-mid-season-invitational-2025---blue': '2025-06-24T01:11:19.640Z',
-        'borderlands-4-badge---ripper': '2025-06-20T22:01:18.225Z',
-        'borderlands-4-badge---vault-symbol': '2025-06-20T22:01:18.225Z',
-        'bot-badge': '2025-06-09T23:43:23.947Z',
-        'elden-ring-recluse': '2025-05-30T22:26:02.951Z',
-        'elden-ring-wylder': '2025-05-30T22:26:02.951Z',
-        'clips-leader': '2025-04-11T20:37:56.758Z',
-        'marathon-reveal-runner': '2025-04-10T21:04:04.000Z',
-        'gone-bananas': '2025-04-01T17:07:13.529Z',
-        
-        # 2024年のバッジ（Stream Databaseから取得した正確な追加日）
-        'clip-the-halls': '2024-12-03T18:59:14.164Z',
-        'gold-pixel-heart---together-for-good-24': '2024-12-02T21:05:01.561Z',
-        'arcane-season-2-premiere': '2024-11-07T21:36:20.704Z',
-        'dreamcon-2024': '2024-08-28T21:00:06.004Z',
-        'la-velada-del-ano-iv': '2024-07-13T16:19:09.441Z',
-        'destiny-2-final-shape-raid-race': '2024-06-06T22:09:47.189Z',
-        'destiny-2-the-final-shape-streamer': '2024-06-06T22:09:48.208Z',
-        'minecraft-15th-anniversary-celebration': '2024-05-28T17:21:51.000Z',
-    }
+    tables = get_timestamp_tables()
+    badge_timestamps = tables['badges']
     
     # バッジデータにタイムスタンプを追加（正確な追加日のみ）
+    matcher = tables['matcher']
+    creation_dates = get_badge_metadata().get('creation_dates', {})
     if 'data' in twitch_data:
-        for badge in twitch_data['data']:
+        for index, badge in enumerate(twitch_data['data']):
             set_id = badge.get('set_id', '')
             
             # 完全一致チェック（正確な追加日のみ）
@@ -139,18 +317,16 @@ def enhance_badges_with_timestamps(twitch_data):
                 badge['has_real_timestamp'] = True
             else:
                 # 部分一致チェック（正確な追加日のみ）
-                found_timestamp = None
-                for key, timestamp in badge_timestamps.items():
-                    if key in set_id or set_id in key:
-                        found_timestamp = timestamp
-                        break
+                found_timestamp = matcher.partial_match(set_id)
                 
                 if found_timestamp:
                     badge['created_at'] = found_timestamp
                     badge['has_real_timestamp'] = True
                 else:
-                    # 追加日が不明な場合は何も設定しない
+                    # 追加日が不明な場合は並び替え用の推定作成日のみ設定
                     badge['has_real_timestamp'] = False
+                    badge['estimated_created_at'] = estimate_created_date(
+                        set_id, index, creation_dates)
     
     return twitch_data
 
@@ -159,93 +335,34 @@ def get_global_emotes():
     """Twitchグローバルエモートを取得するAPIエンドポイント"""
     if not CLIENT_ID or not CLIENT_SECRET:
         return jsonify({'error': 'API credentials not configured'}), 500
-        
-    # アクセストークンを取得
-    access_token = get_app_access_token()
-    
-    if not access_token:
-        return jsonify({'error': 'Failed to get access token'}), 500
-    
-    # Twitch APIからグローバルエモートを取得
-    url = 'https://api.twitch.tv/helix/chat/emotes/global'
-    headers = {
-        'Authorization': f'Bearer {access_token}',
-        'Client-Id': CLIENT_ID
-    }
     
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
+        # Twitch APIからグローバルエモートを取得（キャッシュ経由）
+        twitch_data, helix_version = helix_cache.get_versioned(
+            'emotes', lambda: load_helix('emotes'))
         
-        twitch_data = response.json()
+        # Stream Database APIから追加日情報を取得して統合（データ更新時のみ）
+        payload = get_emotes_payload(twitch_data, helix_version)
         
-        # Stream Database APIから追加日情報を取得して統合
-        enhanced_data = enhance_emotes_with_timestamps(twitch_data)
+        # 一覧のクエリパラメータがある場合は絞り込み・ページング済みの一覧を返す
+        if is_catalog_query(request.args):
+            return catalog_response(EMOTE_SPEC, payload)
         
-        return jsonify(enhanced_data)
+        return payload.to_response()
+    except AccessTokenError:
+        return jsonify({'error': 'Failed to get access token'}), 500
     except Exception as e:
-        print(f"Error fetching emotes: {e}")
+        logger.exception(f"Error fetching emotes: {e}")
         return jsonify({'error': 'Failed to fetch emotes'}), 500
 
+def get_emotes_payload(twitch_data, helix_version):
+    """拡張済みエモート一覧のペイロード（Helixのバージョンごとに1回だけ構築）"""
+    return payload_cache.get(
+        'emotes', helix_version, lambda: enhance_emotes_with_timestamps(copy_items(twitch_data)))
+
 def enhance_emotes_with_timestamps(twitch_data):
     """Stream Databaseのデータでエモートにタイムスタンプを追加"""
-    # Stream Database（2025年7月更新）からの正確な追加日データベース
-    emote_timestamps = {
-        # 2025年に追加されたエモート（Stream Databaseから取得）
-        'bosscleared': '2025-08-01T00:00:00.000Z',
-        'veladapeereira': '2025-07-24T00:00:00.000Z',
-        'veladaperxitaa': '2025-07-24T00:00:00.000Z',
-        'veladaroro': '2025-07-24T00:00:00.000Z',
-        'veladatomas': '2025-07-24T00:00:00.000Z',
-        'veladaviruzz': '2025-07-24T00:00:00.000Z',
-        'veladawestcol': '2025-07-24T00:00:00.000Z',
-        'veladarivaldios': '2025-07-24T00:00:00.000Z',
-        'veladagrefg': '2025-07-24T00:00:00.000Z',
-        'veladagaspi': '2025-07-24T00:00:00.000Z',
-        'veladacarlos': '2025-07-24T00:00:00.000Z',
-        'veladaandoni': '2025-07-24T00:00:00.000Z',
-        'veladaarigeli': '2025-07-24T00:00:00.000Z',
-        'veladaabby': '2025-07-24T00:00:00.000Z',
-        'veladaalana': '2025-07-24T00:00:00.000Z',
-        'velocityrun': '2025-07-07T00:00:00.000Z',
-        'mechacharge': '2025-07-02T00:00:00.000Z',
-        'ewccrush': '2025-06-16T00:00:00.000Z',
-        'elegiggle': '2025-06-09T00:00:00.000Z',
-        'nrwylder': '2025-05-30T00:00:00.000Z',
-        'pbmmixtape': '2025-05-29T00:00:00.000Z',
-        'darthjarjar': '2025-05-28T00:00:00.000Z',
-        'streameru': '2025-05-23T00:00:00.000Z',
-        'faze': '2025-05-23T00:00:00.000Z',
-        'oops25': '2025-05-16T00:00:00.000Z',
-        'zlansup': '2025-04-18T00:00:00.000Z',
-        'feverfighter': '2025-04-17T00:00:00.000Z',
-        'baftagames': '2025-04-08T00:00:00.000Z',
-        'mcdzombiehamburglar': '2025-04-01T00:00:00.000Z',
-        'inzoipsycat': '2025-03-27T00:00:00.000Z',
-        'acshadows': '2025-03-20T00:00:00.000Z',
-        'clixhuh': '2025-03-17T00:00:00.000Z',
-        'wedidthat': '2025-03-07T00:00:00.000Z',
-        'splitfictionjosef': '2025-03-05T00:00:00.000Z',
-        'mizfight': '2025-02-28T00:00:00.000Z',
-        'andtime': '2025-02-27T00:00:00.000Z',
-        'lovesmash': '2025-02-14T00:00:00.000Z',
-        'sharetheve': '2025-02-14T00:00:00.000Z',
-        'sharethehug': '2025-02-14T00:00:00.000Z',
-        'sharethelo': '2025-02-14T00:00:00.000Z',
-        'simsplumbob': '2025-02-04T00:00:00.000Z',
-        
-        # 2024年に追加されたエモート（Stream Databaseから取得）
-        'pewpewpew': '2024-12-20T00:00:00.000Z',
-        'cinheimer': '2024-11-08T00:00:00.000Z',
-        'caitthinking': '2024-11-08T00:00:00.000Z',
-        'ekkochest': '2024-11-08T00:00:00.000Z',
-        'ambessalove': '2024-11-08T00:00:00.000Z',
-        'feelsvi': '2024-11-08T00:00:00.000Z',
-        'jinxlul': '2024-11-08T00:00:00.000Z',
-        'bratchat': '2024-10-10T00:00:00.000Z',
-        'bigsad': '2024-09-30T00:00:00.000Z',
-        'andalusiancrush': '2024-09-23T00:00:00.000Z',
-    }
+    emote_timestamps = get_timestamp_tables()['emotes']
     
     # エモートデータにタイムスタンプを追加
     if 'data' in twitch_data:
@@ -258,92 +375,219 @@ def enhance_emotes_with_timestamps(twitch_data):
     
     return twitch_data
 
-@app.route('/api/update-badges', methods=['POST'])
-def update_badges():
-    """Stream Databaseから最新バッジ情報をチェック"""
-    import re
-    import json
-    from datetime import datetime
+def get_search_index(kind=None):
+    """検索対象のデータが変わっていれば索引に反映してから返す"""
+    if kind in (None, 'badge'):
+        twitch_data, helix_version = helix_cache.get_versioned(
+            'badges', lambda: load_helix('badges'))
+        badges_payload = get_badges_payload(twitch_data, helix_version)
+        search_sync.sync('badge', badges_payload.version, lambda: badge_documents(
+            badges_payload.data.get('data', []), get_badge_details(),
+            get_badge_metadata().get('obtain_methods', {})))
+    if kind in (None, 'emote'):
+        twitch_data, helix_version = helix_cache.get_versioned(
+            'emotes', lambda: load_helix('emotes'))
+        emotes_payload = get_emotes_payload(twitch_data, helix_version)
+        search_sync.sync('emote', emotes_payload.version, lambda: emote_documents(
+            emotes_payload.data.get('data', [])))
+    return search_sync.index
+
+@app.route('/api/search', methods=['GET'])
+def search():
+    """バッジ（ID・タイトル・説明）とエモート名をスコア順に検索する"""
+    if not CLIENT_ID or not CLIENT_SECRET:
+        return jsonify({'error': 'API credentials not configured'}), 500
     
+    query = request.args.get('q', '')[:100]
+    kind = request.args.get('type') or None
+    if kind not in (None, 'badge', 'emote'):
+        return jsonify({'error': 'type must be badge or emote'}), 400
     try:
-        # 既知のバッジリスト（現在コードに含まれているもの）
-        known_badges = {
-            'zevent25', 'hornet', 'subtember-2025', 
-            'gears-of-war-superfan-badge', 'path-of-exile-2-badge',
-            'zevent-2024', 'la-velada-v-badge', 'evo-2025',
-            'share-the-love', 'speedons-5-badge', 'clips-leader',
-            'legendus', 'marathon-reveal-runner', 'gone-bananas',
-            'elden-ring-wylder', 'elden-ring-recluse',
-            'league-of-legends-mid-season-invitational-2025---grey',
-            'league-of-legends-mid-season-invitational-2025---purple',
-            'league-of-legends-mid-season-invitational-2025---blue',
-            'borderlands-4-badge---ripper', 'borderlands-4-badge---vault-symbol',
-            'bot-badge', 'minecraft-15th-anniversary-celebration',
-            'clip-the-halls', 'gold-pixel-heart---together-for-good-24',
-            'gold-pixel-heart', 'arcane-season-2-premiere', 'dreamcon-2024',
-            'destiny-2-the-final-shape-streamer', 'destiny-2-final-shape-raid-race',
-            'raging-wolf-helm', 'ruby-pixel-heart---together-for-good-24',
-            'purple-pixel-heart---together-for-good-24', 'la-velada-iv'
-        }
-        
-        # Stream Databaseからデータを取得
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(
-            'https://www.streamdatabase.com/twitch/global-badges',
-            headers=headers,
-            timeout=15
-        )
-        
-        if response.status_code != 200:
-            return jsonify({
-                'success': False,
-                'error': f'Stream Database API error: {response.status_code}'
-            }), 500
-        
-        html_content = response.text
-        current_badges = set()
-        
-        # HTMLからバッジIDを抽出
-        badge_id_pattern = r'\/twitch\/global-badges\/([^\/\s"]+)\/1'
-        badge_ids = re.findall(badge_id_pattern, html_content)
-        
-        for badge_id in badge_ids:
-            if badge_id and not badge_id.endswith('.json') and not badge_id.startswith('_'):
-                current_badges.add(badge_id)
-        
-        # 新しいバッジを検出
-        new_badges = current_badges - known_badges
+        limit = min(max(int(request.args.get('limit', DEFAULT_LIMIT)), 1), MAX_LIMIT)
+        offset = min(max(int(request.args.get('offset', 0)), 0), MAX_OFFSET)
+    except ValueError:
+        return jsonify({'error': 'limit and offset must be integers'}), 400
+    
+    try:
+        results, total = get_search_index(kind).search_page(query, kind, limit, offset)
+        return jsonify(search_response(query, results, total, offset))
+    except AccessTokenError:
+        return jsonify({'error': 'Failed to get access token'}), 500
+    except Exception as e:
+        logger.exception(f"Error searching for {query!r}: {e}")
+        return jsonify({'error': 'Failed to search'}), 500
+
+# ダッシュボード用の並列取得スレッドプールと入手可能期間データ
+dashboard_executor = ThreadPoolExecutor(max_workers=4)
+availability_periods = load_availability_periods()
+
+@app.route('/api/dashboard', methods=['GET'])
+def get_dashboard():
+    """バッジとエモートを並列に取得し、ストリームダッシュボード用にまとめて返す"""
+    if not CLIENT_ID or not CLIENT_SECRET:
+        return jsonify({'error': 'API credentials not configured'}), 500
+    
+    try:
+        # 2つの上流呼び出しを並列に実行（コールドキャッシュ時も遅い方の待ち時間で済む）
+        badges_future = dashboard_executor.submit(
+            helix_cache.get_versioned, 'badges', lambda: load_helix('badges'))
+        emotes_future = dashboard_executor.submit(
+            helix_cache.get_versioned, 'emotes', lambda: load_helix('emotes'))
+        badges_data, badges_version = badges_future.result()
+        emotes_data, emotes_version = emotes_future.result()
         
-        result = {
-            'success': True,
-            'timestamp': datetime.now().isoformat(),
-            'total_badges_found': len(current_badges),
-            'known_badges_count': len(known_badges),
-            'new_badges_count': len(new_badges),
-            'new_badges': list(new_badges)[:10]  # 最大10個まで返す
-        }
+        # 入手可能判定は時刻に依存するため1分単位で再計算
+        version = (badges_version, emotes_version, int(time.time() // 60))
+        payload = payload_cache.get('dashboard', version, lambda: build_dashboard(
+            enhance_badges_with_timestamps(copy_items(badges_data)),
+            enhance_emotes_with_timestamps(copy_items(emotes_data)),
+            availability_periods
+        ))
         
-        if new_badges:
-            result['message'] = f'{len(new_badges)}個の新しいバッジが見つかりました'
-        else:
-            result['message'] = '新しいバッジは見つかりませんでした'
+        compact = request.args.get('format') == COMPACT_FORMAT
         
-        return jsonify(result)
+        # set_ids 指定時は指定したバッジのみ返す（app.py の /api/dashboard と同じ部分更新用）
+        set_ids = request.args.get('set_ids')
+        if set_ids is not None:
+            filtered = filter_dashboard(payload.data, set_ids.split(','))
+            return jsonify(encode_dashboard(filtered) if compact else filtered)
         
-    except requests.exceptions.RequestException as e:
-        return jsonify({
-            'success': False,
-            'error': f'Network error: {str(e)}'
-        }), 500
+        if compact:
+            dashboard = payload.data
+            return payload_cache.get(
+                'dashboard:compact', version, lambda: encode_dashboard(dashboard)).to_response()
         
+        return payload.to_response()
+    except AccessTokenError:
+        return jsonify({'error': 'Failed to get access token'}), 500
     except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': f'Server error: {str(e)}'
-        }), 500
+        logger.exception(f"Error building dashboard: {e}")
+        return jsonify({'error': 'Failed to fetch dashboard data'}), 500
+
+# 管理用ジョブ（サーバーレス環境ではレスポンス後にスレッドが止まるためリクエスト内で実行）
+admin_jobs = JobManager(inline=True)
+
+def run_badge_check():
+    """Stream Databaseから最新バッジ情報をチェック"""
+    import re
+    from datetime import datetime
+    
+    # 既知のバッジリスト（現在コードに含まれているもの）
+    known_badges = {
+        'zevent25', 'hornet', 'subtember-2025', 
+        'gears-of-war-superfan-badge', 'path-of-exile-2-badge',
+        'zevent-2024', 'la-velada-v-badge', 'evo-2025',
+        'share-the-love', 'speedons-5-badge', 'clips-leader',
+        'legendus', 'marathon-reveal-runner', 'gone-bananas',
+        'elden-ring-wylder', 'elden-ring-recluse',
+        'league-of-legends-mid-season-invitational-2025---grey',
+        'league-of-legends-mid-season-invitational-2025---purple',
+        'league-of-legends-mid-season-invitational-2025---blue',
+        'borderlands-4-badge---ripper', 'borderlands-4-badge---vault-symbol',
+        'bot-badge', 'minecraft-15th-anniversary-celebration',
+        'clip-the-halls', 'gold-pixel-heart---together-for-good-24',
+        'gold-pixel-heart', 'arcane-season-2-premiere', 'dreamcon-2024',
+        'destiny-2-the-final-shape-streamer', 'destiny-2-final-shape-raid-race',
+        'raging-wolf-helm', 'ruby-pixel-heart---together-for-good-24',
+        'purple-pixel-heart---together-for-good-24', 'la-velada-iv'
+    }
+    
+    # Stream Databaseからデータを取得
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    }
+    
+    response = get_http_client().get(
+        'https://www.streamdatabase.com/twitch/global-badges',
+        headers=headers,
+        timeout=(3.05, 15)
+    )
+    
+    if response.status_code != 200:
+        raise RuntimeError(f'Stream Database API error: {response.status_code}')
+    
+    html_content = response.text
+    current_badges = set()
+    
+    # HTMLからバッジIDを抽出
+    badge_id_pattern = r'\/twitch\/global-badges\/([^\/\s"]+)\/1'
+    badge_ids = re.findall(badge_id_pattern, html_content)
+    
+    for badge_id in badge_ids:
+        if badge_id and not badge_id.endswith('.json') and not badge_id.startswith('_'):
+            current_badges.add(badge_id)
+    
+    # 新しいバッジを検出
+    new_badges = current_badges - known_badges
+    
+    result = {
+        'timestamp': datetime.now().isoformat(),
+        'total_badges_found': len(current_badges),
+        'known_badges_count': len(known_badges),
+        'new_badges_count': len(new_badges),
+        'new_badges': list(new_badges)[:10]  # 最大10個まで返す
+    }
+    
+    if new_badges:
+        result['message'] = f'{len(new_badges)}個の新しいバッジが見つかりました'
+    else:
+        result['message'] = '新しいバッジは見つかりませんでした'
+    
+    return result
+
+@app.route('/api/update-badges', methods=['POST'])
+def update_badges():
+    """バッジチェックをジョブとして実行し、ジョブIDと結果を返す"""
+    job, coalesced = admin_jobs.submit('badge-check', run_badge_check)
+    return jsonify(job_response(job, coalesced)), 202
+
+@app.route('/api/admin/jobs/<job_id>')
+def get_job(job_id):
+    """ジョブの状態を取得（同じインスタンスで実行されたジョブのみ）"""
+    job = admin_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+@app.route('/api/cron/refresh-snapshot', methods=['GET'])
+def refresh_snapshot():
+    """Helixの内容がスナップショットと変わっていればデプロイフックで再ビルドする（Vercel Cronから呼ぶ）"""
+    if not CRON_SECRET or not hmac.compare_digest(
+            request.headers.get('Authorization', ''), f'Bearer {CRON_SECRET}'):
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    age = snapshot_reader.age()
+    status = {'refreshed': False, 'changed': None,
+              'age': round(age) if age is not None else None, 'max_age': SNAPSHOT_MAX_AGE}
+    # 次の実行までに SNAPSHOT_MAX_AGE を超えないスナップショットは確認しない
+    if age is not None and age + SNAPSHOT_CHECK_INTERVAL <= SNAPSHOT_MAX_AGE:
+        return jsonify(status)
+
+    snapshot_hash = snapshot_reader.source_hash()
+    if snapshot_hash is not None:
+        try:
+            # スナップショットを使う load_helix ではなく、Helixから直接取得して比較する
+            current_hash = source_hash({kind: fetch_helix(path) for kind, path in HELIX_PATHS.items()})
+        except Exception as e:
+            logger.error(f"Error fetching Helix data to check the snapshot: {e}")
+            return jsonify({'error': 'Failed to fetch Helix data'}), 502
+        status['changed'] = current_hash != snapshot_hash
+        if not status['changed']:
+            return jsonify(status)
+
+    if not SNAPSHOT_DEPLOY_HOOK_URL:
+        return jsonify({'error': 'SNAPSHOT_DEPLOY_HOOK_URL is not configured'}), 503
+    try:
+        # POST はリトライしない（1回の実行で複数のデプロイを作らないように）
+        response = get_http_client().post(SNAPSHOT_DEPLOY_HOOK_URL)
+        response.raise_for_status()
+    except Exception as e:
+        logger.error(f"Error triggering snapshot rebuild: {e}")
+        return jsonify({'error': 'Failed to trigger snapshot rebuild'}), 502
+
+    logger.info("Triggered snapshot rebuild", extra={'age': age})
+    status['refreshed'] = True
+    return jsonify(status)
 
 # VercelはFlaskアプリケーションを直接エクスポート
 app = app
\ No newline at end of file
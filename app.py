@@ -1,179 +1,251 @@
-from flask import Flask, jsonify, send_from_directory
+from flask import Flask, Response, jsonify, request, send_from_directory
 from flask_cors import CORS
-import requests
 import os
 import json
+import hashlib
+import logging
+import codecs
 from datetime import datetime, timedelta
 import threading
 import time
+import copy
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from structured_logging import configure_logging
+from metrics import Counter, Gauge, Histogram, instrument_flask
+from profiling import Profiler, install_profiler, phase
+from response_cache import TTLCache
+from shared_cache import create_shared_cache
+from worker_lock import FileLock, LeaderElection
+from upstream import get_http_client
+from token_manager import TokenManager
+from payload_cache import PayloadCache
+from badge_index import BadgeIndexCache
+from search_index import (DEFAULT_LIMIT, MAX_LIMIT, MAX_OFFSET, SearchIndexSync, badge_documents,
+                          emote_documents, search_response)
+from catalog_query import (BADGE_SPEC, EMOTE_SPEC, CatalogViewCache, QueryError, is_catalog_query,
+                           parse_catalog_query)
+from availability import load_availability_periods
+from badge_metadata import (load_badge_metadata, normalize_language, estimate_created_date,
+                            build_meta_bundle, build_availability_map)
+from dashboard import build_dashboard, filter_dashboard
+from compact_format import COMPACT_FORMAT, encode_dashboard
+from timestamp_store import TimestampStore
+from events import EventBroker, parse_last_event_id, stream_events
+from badge_store import BadgeStore, write_json_atomic
+from stream_database import iter_badges
+from research_queue import HostRateLimiter, ResearchQueue
+from admin_jobs import JobManager, job_response
+from urllib.parse import urlparse
 
 # .envファイルを読み込む
 load_dotenv()
 
+# 構造化ログ（LOG_LEVEL・LOG_FORMAT で設定）
+configure_logging()
+logger = logging.getLogger('app')
+
 app = Flask(__name__, static_folder='.', static_url_path='')
 CORS(app)
 
+# ルートごとの処理時間・件数の記録と /metrics（Prometheus形式）
+instrument_flask(app)
+
+# 区間ごとの計測（最も遅いリクエストの記録）と管理者によるオンデマンドのプロファイル
+profiler = Profiler()
+install_profiler(app, profiler)
+
 # Twitch API認証情報（環境変数から取得）
 CLIENT_ID = os.getenv('TWITCH_CLIENT_ID')
 CLIENT_SECRET = os.getenv('TWITCH_CLIENT_SECRET')
 
 # 環境変数が設定されていない場合のエラーチェック
 if not CLIENT_ID or not CLIENT_SECRET:
-    print("ERROR: Twitch API credentials not found!")
-    print("Please set TWITCH_CLIENT_ID and TWITCH_CLIENT_SECRET in your .env file")
-    print("Copy .env.example to .env and add your credentials")
+    logger.error("Twitch API credentials not found! Please set TWITCH_CLIENT_ID and TWITCH_CLIENT_SECRET "
+                 "in your .env file (copy .env.example to .env and add your credentials)")
     exit(1)
 
-# アクセストークンのキャッシュ
-access_token_cache = {
-    'token': None,
-    'expires_at': 0
-}
+# Twitch APIの接続先（負荷試験などでスタブサーバーに差し替え可能）
+HELIX_API_URL = os.getenv('HELIX_API_URL', 'https://api.twitch.tv/helix')
+TWITCH_TOKEN_URL = os.getenv('TWITCH_TOKEN_URL', 'https://id.twitch.tv/oauth2/token')
+
+# Helixレスポンスのキャッシュ（グローバルバッジ・エモートは週に数回しか変わらない）
+HELIX_CACHE_TTL = int(os.getenv('HELIX_CACHE_TTL', '600'))
+HELIX_CACHE_MAX_STALE = int(os.getenv('HELIX_CACHE_MAX_STALE', '86400'))
+
+# 複数ワーカーで起動した場合にHelixレスポンスを共有するキャッシュ（SHARED_CACHE_URL 未設定なら共有しない）
+shared_cache = create_shared_cache()
+helix_cache = TTLCache(ttl=HELIX_CACHE_TTL, max_stale=HELIX_CACHE_MAX_STALE, shared=shared_cache,
+                       name='helix')
+
+# 拡張済みレスポンスのシリアライズ・圧縮結果のキャッシュ
+payload_cache = PayloadCache()
+
+# バッジ単体（/api/badges/<set_id>）の索引
+badge_index_cache = BadgeIndexCache()
+
+# 一覧のフィールド選択・絞り込み・並び替え用（並び順はデータバージョンごとに計算済み）
+catalog_views = CatalogViewCache()
+
+# /api/search の転置インデックス（データが変わったときは変わった文書だけ索引し直す）
+search_sync = SearchIndexSync()
+
+# アクセストークンの管理（期限前に自動更新し、同時更新は1回にまとめる）
+token_manager = TokenManager(CLIENT_ID, CLIENT_SECRET, get_http_client, background=True,
+                             token_url=TWITCH_TOKEN_URL)
 
 def get_app_access_token():
     """Twitchアプリケーションアクセストークンを取得"""
-    import time
-    
-    # キャッシュされたトークンが有効な場合はそれを返す
-    if access_token_cache['token'] and time.time() < access_token_cache['expires_at']:
-        return access_token_cache['token']
-    
-    # 新しいトークンを取得
-    url = 'https://id.twitch.tv/oauth2/token'
-    params = {
-        'client_id': CLIENT_ID,
-        'client_secret': CLIENT_SECRET,
-        'grant_type': 'client_credentials'
-    }
-    
-    try:
-        response = requests.post(url, params=params)
-        response.raise_for_status()
-        
-        data = response.json()
-        access_token = data['access_token']
-        expires_in = data.get('expires_in', 3600)
-        
-        # トークンをキャッシュ
-        access_token_cache['token'] = access_token
-        access_token_cache['expires_at'] = time.time() + expires_in - 60  # 1分前に期限切れとする
-        
-        return access_token
-    except requests.exceptions.HTTPError as e:
-        print(f"HTTP Error getting access token: {e}")
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text}")
-        return None
-    except Exception as e:
-        print(f"Error getting access token: {e}")
-        return None
+    with phase('token'):
+        return token_manager.get_token()
 
-@app.route('/api/badges')
-def get_global_badges():
-    """Twitchグローバルバッジを取得するAPIエンドポイント"""
-    # アクセストークンを取得
+class AccessTokenError(Exception):
+    """アクセストークンを取得できなかった場合の例外"""
+
+
+def fetch_helix(path):
+    """Twitch Helix APIからデータを取得（キャッシュのローダーとして使用）"""
     access_token = get_app_access_token()
     
     if not access_token:
-        return jsonify({'error': 'Failed to get access token'}), 500
+        raise AccessTokenError('Failed to get access token')
     
-    # Twitch APIからグローバルバッジを取得
-    url = 'https://api.twitch.tv/helix/chat/badges/global'
+    url = f'{HELIX_API_URL}/{path}'
     headers = {
         'Authorization': f'Bearer {access_token}',
         'Client-Id': CLIENT_ID
     }
     
+    response = get_http_client().get(url, headers=headers)
+    
+    # トークンが失効していた場合は無効化して1回だけ再試行
+    if response.status_code == 401:
+        token_manager.invalidate(access_token)
+        access_token = get_app_access_token()
+        if not access_token:
+            raise AccessTokenError('Failed to get access token')
+        headers['Authorization'] = f'Bearer {access_token}'
+        response = get_http_client().get(url, headers=headers)
+    
+    response.raise_for_status()
+    
+    return response.json()
+
+@app.route('/api/badges')
+def get_global_badges():
+    """Twitchグローバルバッジを取得するAPIエンドポイント"""
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
+        # Twitch APIからグローバルバッジを取得（キャッシュ経由）
+        twitch_data, helix_version = helix_cache.get_versioned(
+            'badges', lambda: fetch_helix('chat/badges/global'))
         
-        twitch_data = response.json()
+        # Stream Database APIから追加日情報を取得して統合（データ更新時のみ）
+        payload = get_badges_payload(twitch_data, helix_version)
         
-        # Stream Database APIから追加日情報を取得して統合
-        enhanced_data = enhance_badges_with_timestamps(twitch_data)
+        # 一覧のクエリパラメータがある場合は絞り込み・ページング済みの一覧を返す
+        if is_catalog_query(request.args):
+            return catalog_response(BADGE_SPEC, payload)
         
-        return jsonify(enhanced_data)
+        return payload.to_response()
+    except AccessTokenError:
+        return jsonify({'error': 'Failed to get access token'}), 500
     except Exception as e:
-        print(f"Error fetching badges: {e}")
+        logger.exception(f"Error fetching badges: {e}")
         return jsonify({'error': 'Failed to fetch badges'}), 500
 
+def catalog_response(spec, payload):
+    """fields・sort・limit・cursor と絞り込み条件を適用した一覧を返す"""
+    view = catalog_views.get(spec, payload.version, lambda: payload.data.get('data', []))
+    try:
+        query = parse_catalog_query(request.args, spec)
+        return view.query(query, availability_periods).to_response()
+    except QueryError as e:
+        return jsonify({'error': str(e)}), 400
+
+def get_badges_payload(twitch_data, helix_version):
+    """拡張済みバッジ一覧のペイロード（Helix・タイムスタンプのバージョンごとに1回だけ構築）"""
+    version = (helix_version, timestamp_store.version)
+    return payload_cache.get(
+        'badges', version, lambda: enhance_badges_with_timestamps(copy.deepcopy(twitch_data)))
+
+@app.route('/api/badges/<set_id>')
+def get_badge(set_id):
+    """バッジ単体（versions・タイムスタンプ・badge_details）を返す"""
+    try:
+        twitch_data, helix_version = helix_cache.get_versioned(
+            'badges', lambda: fetch_helix('chat/badges/global'))
+        badges_payload = get_badges_payload(twitch_data, helix_version)
+        
+        # badge_details は変更ログのバージョンが変わったときだけ読み直す
+        version = (badges_payload.version, badge_store.change_log_version())
+        index = badge_index_cache.get(version, lambda: (
+            badges_payload.data.get('data', []), badge_store.get_badge_details()))
+        
+        payload = index.get(set_id)
+        if payload is None:
+            return jsonify({'error': 'Badge not found'}), 404
+        return payload.to_response()
+    except AccessTokenError:
+        return jsonify({'error': 'Failed to get access token'}), 500
+    except Exception as e:
+        logger.exception(f"Error fetching badge {set_id}: {e}")
+        return jsonify({'error': 'Failed to fetch badge'}), 500
+
+@app.route('/api/badges/availability')
+def get_badges_availability():
+    """入手可能期間の情報があるバッジ全件の入手可能状態（一覧ページのカード表示用）"""
+    lang = normalize_language(request.args.get('lang'))
+    
+    # 入手可能判定は時刻に依存するため1分単位で再計算
+    version = int(time.time() // 60)
+    payload = payload_cache.get(f'availability:{lang}', version, lambda: {
+        'lang': lang,
+        'availability': build_availability_map(availability_periods, lang)
+    })
+    return payload.to_response()
+
+@app.route('/api/badges/<set_id>/meta')
+def get_badge_meta(set_id):
+    """バッジ単体・1言語分のメタデータ（入手方法と入手可能状態）を返す"""
+    lang = normalize_language(request.args.get('lang'))
+    key = f'meta:{set_id}:{lang}'
+    version = int(time.time() // 60)
+    
+    payload = payload_cache.get_cached(key, version)
+    if payload is not None:
+        return payload.to_response()
+    
+    obtain_method, has_own = badge_store.get_obtain_method(set_id, lang)
+    bundle = build_meta_bundle(set_id, lang, obtain_method, availability_periods)
+    
+    # 固有の情報が無いバッジ（汎用説明のみ）はキャッシュせず、任意のIDでキャッシュが増えないようにする
+    if not has_own and set_id not in availability_periods:
+        return jsonify(bundle)
+    return payload_cache.get(key, version, lambda: bundle).to_response()
+
+# Stream Database公式サイトから取得した正確な追加日（バッジ・エモート）
+# Vercel版（api/index.py）と同じ api/timestamps.json を読み込む
+BASE_TIMESTAMPS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'api', 'timestamps.json')
+with open(BASE_TIMESTAMPS_FILE, 'r', encoding='utf-8') as f:
+    _base_timestamps = json.load(f)
+BASE_BADGE_TIMESTAMPS = _base_timestamps['badges']
+BASE_EMOTE_TIMESTAMPS = _base_timestamps['emotes']
+
+# 最新タイムスタンプ（latest_badge_timestamps.json）とのマージ結果を保持するストア
+timestamp_store = TimestampStore('latest_badge_timestamps.json', BASE_BADGE_TIMESTAMPS)
+
 def enhance_badges_with_timestamps(twitch_data):
     """Stream Databaseのデータでバッジにタイムスタンプを追加（正確な追加日のみ）"""
-    # 基本的なタイムスタンプデータベース（Stream Database公式サイトから取得した正確な追加日）
-    base_badge_timestamps = {
-        # 2025年の最新バッジ（Stream Databaseから取得した正確な追加日）
-        'zevent25': '2025-09-04T00:00:00.000Z',  # ZEVENT 2025
-        'hornet': '2025-09-03T00:00:00.000Z',  # Hollow Knight: Silksong
-        'subtember-2025': '2025-09-03T00:00:00.000Z',  # SUBtember 2025
-        'gears-of-war-superfan-badge': '2025-08-29T00:00:00.000Z',  # Gears of War Superfan
-        'path-of-exile-2-badge': '2025-08-27T00:00:00.000Z',  # Chaos Orb (Path of Exile 2)
-        
-        # 2025年の既存バッジ（Stream Databaseから取得した正確な追加日）
-        'evo-2025': '2025-07-31T00:00:00.000Z',
-        'la-velada-v-badge': '2025-07-23T00:00:00.000Z',
-        'legendus': '2025-06-28T06:15:55.000Z',
-        'league-of-legends-mid-season-invitational-2025---grey': '2025-06-24T01:11:19.640Z',
-        'league-of-legends-mid-season-invitational-2025---purple': '2025-06-24T01:11:19.640Z',
-        'league-of-legends-mid-season-invitational-2025---blue': '2025-06-24T01:11:19.640Z',
-        'borderlands-4-badge---ripper': '2025-06-20T22:01:18.225Z',
-        'borderlands-4-badge---vault-symbol': '2025-06-20T22:01:18.225Z',
-        'bot-badge': '2025-06-09T23:43:23.947Z',
-        'elden-ring-recluse': '2025-05-30T22:26:02.951Z',
-        'elden-ring-wylder': '2025-05-30T22:26:02.951Z',
-        'twitchcon-referral-program-2025-bleedpurple': '2025-05-29T00:00:00.000Z',
-        'twitchcon-referral-program-2025-chrome-star': '2025-05-29T00:00:00.000Z',
-        'minecraft-15th-anniversary-celebration': '2025-05-28T00:00:00.000Z',
-        'clips-leader': '2025-04-11T20:37:56.758Z',
-        'marathon-reveal-runner': '2025-04-10T21:04:04.000Z',
-        'gone-bananas': '2025-04-01T17:07:13.529Z',
-        'speedons-5-badge': '2025-02-24T00:00:00.000Z',
-        'share-the-love': '2025-02-14T00:00:00.000Z',  # バレンタインデー関連
-        'twitchcon-2025---rotterdam': '2025-02-10T00:00:00.000Z',
-        
-        # 2024年のバッジ（Stream Databaseから取得した正確な追加日）
-        'twitch-recap-2024': '2024-12-09T00:00:00.000Z',
-        'clip-the-halls': '2024-12-03T18:59:14.164Z',
-        'ruby-pixel-heart---together-for-good-24': '2024-12-02T00:00:00.000Z',  # 寄付50ドル以上
-        'purple-pixel-heart---together-for-good-24': '2024-12-02T00:00:00.000Z',  # Together for Good 2024
-        'gold-pixel-heart---together-for-good-24': '2024-12-02T21:05:01.561Z',
-        'arcane-season-2-premiere': '2024-11-07T21:36:20.704Z',
-        'subtember-2024': '2024-09-26T00:00:00.000Z',
-        'zevent-2024': '2024-09-07T00:00:00.000Z',
-        'streamer-awards-2024': '2024-08-23T00:00:00.000Z',
-        'dreamcon-2024': '2024-08-28T21:00:06.004Z',
-        'la-velada-del-ano-iv': '2024-07-13T16:19:09.441Z',
-        'la-velada-iv': '2024-07-13T16:19:09.441Z',  # La Velada del Año IV (別名)
-        'raging-wolf-helm': '2024-06-20T00:00:00.000Z',  # Elden Ring関連
-        'destiny-2-final-shape-raid-race': '2024-06-06T22:09:47.189Z',
-        'destiny-2-the-final-shape-streamer': '2024-06-06T22:09:48.208Z',
-        'twitchcon-2024---san-diego': '2024-05-28T00:00:00.000Z',
-        'twitch-intern-2024': '2024-08-23T00:00:00.000Z',
-        
-        # 2023年のバッジ（Stream Databaseから取得した情報）
-        'twitch-recap-2023': '2023-12-11T00:00:00.000Z',  # 推定日
-        'rplace-2023': '2023-07-20T00:00:00.000Z',  # 推定日
-        'the-game-awards-2023': '2023-12-07T00:00:00.000Z',  # 推定日
-        'the-golden-predictor-of-the-game-awards-2023': '2023-12-07T00:00:00.000Z',  # 推定日
-        'superultracombo-2023': '2023-08-04T00:00:00.000Z',  # 推定日
-        'twitchconEU2023': '2023-07-15T00:00:00.000Z',  # 推定日
-        'twitchconNA2023': '2023-10-20T00:00:00.000Z',  # 推定日
-        'twitch-intern-2023': '2023-08-15T00:00:00.000Z',  # 推定日
-    }
-    
-    # 最新のタイムスタンプデータを取得してマージ
-    try:
-        latest_timestamps = badge_updater.get_latest_badge_timestamps()
-        badge_timestamps = {**base_badge_timestamps, **latest_timestamps}
-        print(f"Using {len(badge_timestamps)} badge timestamps ({len(latest_timestamps)} from latest data)")
-    except:
-        badge_timestamps = base_badge_timestamps
-        print(f"Using {len(badge_timestamps)} base badge timestamps")
+    # マージ済みのタイムスタンプと部分一致インデックスをストアから取得
+    snapshot = timestamp_store.snapshot()
+    badge_timestamps = snapshot.merged
+    matcher = snapshot.matcher
+    logger.debug("Enhancing badges with timestamps", extra={
+        'timestamps': len(badge_timestamps), 'latest_timestamps': len(snapshot.latest)})
     
     # バッジデータにタイムスタンプを追加（正確な追加日のみ）
     if 'data' in twitch_data:
-        for badge in twitch_data['data']:
+        for index, badge in enumerate(twitch_data['data']):
             set_id = badge.get('set_id', '')
             
             # 完全一致チェック（正確な追加日のみ）
@@ -182,21 +254,65 @@ def enhance_badges_with_timestamps(twitch_data):
                 badge['has_real_timestamp'] = True
             else:
                 # 部分一致チェック（正確な追加日のみ）
-                found_timestamp = None
-                for key, timestamp in badge_timestamps.items():
-                    if key in set_id or set_id in key:
-                        found_timestamp = timestamp
-                        break
+                found_timestamp = matcher.partial_match(set_id)
                 
                 if found_timestamp:
                     badge['created_at'] = found_timestamp
                     badge['has_real_timestamp'] = True
                 else:
-                    # 追加日が不明な場合は何も設定しない
+                    # 追加日が不明な場合は並び替え用の推定作成日のみ設定
                     badge['has_real_timestamp'] = False
+                    badge['estimated_created_at'] = estimate_created_date(
+                        set_id, index, badge_creation_dates)
     
     return twitch_data
 
+# バッジデータのSQLiteストア（初回起動時は既存のJSONファイルを取り込む）
+badge_store = BadgeStore()
+
+# 複数ワーカーが同時に起動しても取り込みは1つのワーカーだけで行う
+with FileLock(badge_store.path + '.init.lock'):
+    if badge_store.is_empty():
+        badge_store.import_json()
+
+    # 入手方法・推定作成日のメタデータ（badge_metadata.json が変わっていればストアに取り込み直す）
+    badge_store.sync_metadata(*load_badge_metadata())
+badge_creation_dates = badge_store.get_creation_dates()
+
+# /api/events で配信するイベント（新しいバッジの検出・タイムスタンプの変更）
+# イベントはストアを通して全ワーカーに配信し、連番もストアで振る
+event_broker = EventBroker(store=badge_store)
+
+
+def publish_timestamps_changed(version, set_ids):
+    """タイムスタンプの変更を通知する（同じファイルの変更を検出した各ワーカーからは1回だけ）"""
+    signature = timestamp_store.file_signature
+    dedupe_key = f"timestamps-changed:{':'.join(map(str, signature))}" if signature else None
+    event_broker.publish('timestamps-changed', {'version': version, 'set_ids': set_ids}, dedupe_key)
+
+
+timestamp_store.add_listener(publish_timestamps_changed)
+
+# バッジチェックは複数ワーカーで同時に実行しない（定期チェックと管理画面からのチェックを直列化）
+badge_check_lock = FileLock(badge_store.path + '.check.lock')
+
+STREAM_DATABASE_BADGES_URL = 'https://www.streamdatabase.com/twitch/global-badges'
+
+class StreamDatabaseError(Exception):
+    pass
+
+# 新しいバッジの情報調査ワーカー（検出処理をブロックしないようバックグラウンドで実行）
+RESEARCH_WORKERS = int(os.getenv('RESEARCH_WORKERS', '2'))
+RESEARCH_QUEUE_SIZE = int(os.getenv('RESEARCH_QUEUE_SIZE', '200'))
+RESEARCH_MIN_INTERVAL = float(os.getenv('RESEARCH_MIN_INTERVAL', '1.0'))
+research_rate_limiter = HostRateLimiter(min_interval=RESEARCH_MIN_INTERVAL)
+
+# バッジチェック（定期監視・管理画面からのチェック）の所要時間。result: unchanged・updated・error
+BADGE_CHECK_LATENCY = Histogram('badge_check_duration_seconds', 'バッジチェックの所要時間（秒、ロック待ちを除く）',
+                                ['result'], buckets=(0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300))
+NEW_BADGES_DETECTED = Counter('badge_new_detected_total', '検出した新しいバッジの数')
+MONITOR_ERRORS = Counter('badge_monitor_errors_total', 'バッジ監視ループのエラー数')
+
 # 新しいバッジの自動検出と情報収集システム
 class BadgeAutoUpdater:
     def __init__(self):
@@ -204,16 +320,20 @@ class BadgeAutoUpdater:
         self.known_badges = set()
         self.new_badges_queue = []
         self.auto_update_enabled = True
+        self._queue_lock = threading.Lock()
+        self.research_queue = ResearchQueue(self._research_pending_badge, workers=RESEARCH_WORKERS,
+                                            maxsize=RESEARCH_QUEUE_SIZE)
         self.load_known_badges()
         
     def load_known_badges(self):
-        """既知のバッジリストを読み込む"""
-        try:
-            with open('known_badges.json', 'r') as f:
-                data = json.load(f)
-                self.known_badges = set(data.get('badges', []))
-                self.last_checked = datetime.fromisoformat(data.get('last_checked', datetime.now().isoformat()))
-        except FileNotFoundError:
+        """既知のバッジリストと承認待ちキューをストアから読み込む"""
+        self.known_badges = badge_store.get_known_badges()
+        self.new_badges_queue = badge_store.list_pending()
+        last_checked = badge_store.get_meta('last_checked')
+        if last_checked:
+            self.last_checked = datetime.fromisoformat(last_checked)
+
+        if not self.known_badges:
             # 初回起動時には最新の5つのバッジを既知として設定
             self.known_badges = {
                 'zevent25', 'hornet', 'subtember-2025', 
@@ -221,113 +341,144 @@ class BadgeAutoUpdater:
                 'zevent-2024', 'la-velada-v-badge', 'evo-2025',
                 'share-the-love', 'speedons-5-badge', 'clips-leader'
             }
-            self.save_known_badges()
-    
-    def save_known_badges(self):
-        """既知のバッジリストを保存"""
-        data = {
-            'badges': list(self.known_badges),
-            'last_checked': self.last_checked.isoformat(),
-            'new_badges_queue': self.new_badges_queue
+            badge_store.add_known_badges(self.known_badges, self.last_checked.isoformat())
+    
+    def sync_from_store(self):
+        """他のワーカーが検出・更新したバッジをストアから取り込む"""
+        self.known_badges |= badge_store.get_known_badges()
+        pending = badge_store.list_pending()
+        with self._queue_lock:
+            self.new_badges_queue = pending
+        last_checked = badge_store.get_meta('last_checked')
+        if last_checked:
+            self.last_checked = max(self.last_checked, datetime.fromisoformat(last_checked))
+    
+    def resume_pending_research(self):
+        """前回の起動中に調査が終わらなかったバッジを再度キューに入れる"""
+        for badge in list(self.new_badges_queue):
+            if badge.get('research_needed', True) and 'basic_info' not in badge:
+                self.research_queue.submit(badge['id'])
+    
+    def fetch_stream_database_badges(self, conditional=True):
+        """Stream Databaseのバッジページを取得してバッジ情報を抽出
+
+        conditional=True の場合は前回の ETag / Last-Modified で条件付きリクエストを送り、
+        ページが変わっていなければ（304 または同一内容）None を返す。
+        変化があれば (バッジ情報, 保存するページ状態) を返す。ページ状態は反映が
+        成功してから badge_store に保存する。
+        """
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        }
+        if conditional:
+            etag = badge_store.get_meta('scrape_etag')
+            last_modified = badge_store.get_meta('scrape_last_modified')
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        
+        response = get_http_client().get(STREAM_DATABASE_BADGES_URL, headers=headers,
+                                          timeout=(3.05, 15), stream=True)
+        try:
+            if response.status_code == 304:
+                return None
+            if response.status_code != 200:
+                raise StreamDatabaseError(f'Failed to fetch data: HTTP {response.status_code}')
+            
+            # 受信したチャンクごとにハッシュ計算とバッジ抽出を進める（ページ全体を保持しない）
+            page_digest = hashlib.sha256()
+            decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+            
+            def chunks():
+                for raw in response.iter_content(chunk_size=64 * 1024):
+                    page_digest.update(raw)
+                    yield decoder.decode(raw)
+                yield decoder.decode(b'', final=True)
+            
+            current_badges = {badge['set_id']: badge for badge in iter_badges(chunks())}
+        finally:
+            response.close()
+        
+        page_hash = page_digest.hexdigest()
+        if conditional and page_hash == badge_store.get_meta('scrape_page_hash'):
+            return None
+        
+        page_state = {
+            'scrape_etag': response.headers.get('ETag'),
+            'scrape_last_modified': response.headers.get('Last-Modified'),
+            'scrape_page_hash': page_hash
         }
-        with open('known_badges.json', 'w') as f:
-            json.dump(data, f, indent=2)
+        return current_badges, page_state
     
     def check_for_new_badges(self):
-        """新しいバッジをチェック - Stream Databaseサイトから最新データを取得"""
+        """新しいバッジをチェック（他のワーカーのチェックが終わるまで待ってから実行）"""
         if not self.auto_update_enabled:
             return
         
+        with badge_check_lock:
+            started = time.perf_counter()
+            self.sync_from_store()
+            result = self._check_for_new_badges()
+            duration = time.perf_counter() - started
+        
+        BADGE_CHECK_LATENCY.observe(duration, result=result)
+        logger.info("Badge check finished", extra={
+            'result': result, 'duration_ms': round(duration * 1000, 1)})
+        return result
+    
+    def _check_for_new_badges(self):
+        """新しいバッジをチェック - Stream Databaseサイトから最新データを取得
+
+        結果（unchanged: ページに変化なし、updated: 反映済み、error: 失敗）を返す。
+        """
         try:
-            print("Checking for new badges from Stream Database...")
+            logger.debug("Checking for new badges from Stream Database...")
             
-            # Stream DatabaseのTwitchバッジページから最新データを取得
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
+            # 前回から変化が無ければ小さな304応答のみで終了（ディスクへの書き込みも無し）
+            result = self.fetch_stream_database_badges()
+            if result is None:
+                return 'unchanged'
+            current_badges, page_state = result
+            current_badge_ids = set(current_badges.keys())
             
-            response = requests.get('https://www.streamdatabase.com/twitch/global-badges', 
-                                  headers=headers, timeout=15)
+            # 新しいバッジを検出
+            new_badges = current_badge_ids - self.known_badges
             
-            if response.status_code == 200:
-                # HTMLからバッジ情報を抽出
-                current_badges = self._extract_badges_from_html(response.text)
-                current_badge_ids = set(current_badges.keys())
+            if new_badges:
+                NEW_BADGES_DETECTED.inc(len(new_badges))
+                logger.info(f"New badges detected: {len(new_badges)} badges", extra={
+                    'badge_ids': sorted(new_badges)[:5]})  # 最初の5個を表示
                 
-                # 新しいバッジを検出
-                new_badges = current_badge_ids - self.known_badges
+                # 新しいバッジ情報を保存
+                for badge_id in new_badges:
+                    if badge_id in current_badges:
+                        self.collect_badge_info_from_data(badge_id, current_badges[badge_id])
+                
+                self.known_badges.update(new_badges)
+                self.last_checked = datetime.now()
+                badge_store.add_known_badges(new_badges, self.last_checked.isoformat())
+                event_broker.publish('badges-added', {'set_ids': sorted(new_badges)})
+            
+            # 内容が変わったバッジのみタイムスタンプデータに反映
+            if self._update_badge_timestamps(current_badges) is None:
+                return 'error'
+            badge_store.set_meta_many(page_state)
+            return 'updated'
                 
-                if new_badges:
-                    print(f"New badges detected: {len(new_badges)} badges")
-                    print(f"New badge IDs: {list(new_badges)[:5]}...")  # 最初の5個を表示
-                    
-                    # 新しいバッジ情報を保存
-                    for badge_id in new_badges:
-                        if badge_id in current_badges:
-                            self.collect_badge_info_from_data(badge_id, current_badges[badge_id])
-                    
-                    self.known_badges.update(new_badges)
-                    self.last_checked = datetime.now()
-                    self.save_known_badges()
-                    
-                    # バッジタイムスタンプデータを更新
-                    self._update_badge_timestamps(current_badges)
-                    
-                else:
-                    print("No new badges found.")
-                    
         except Exception as e:
-            print(f"Error checking for new badges: {e}")
+            logger.exception(f"Error checking for new badges: {e}")
+            return 'error'
     
     def _extract_badges_from_html(self, html_content):
         """HTMLからバッジ情報を抽出"""
-        import re
-        import json
-        
         badge_data = {}
         
         try:
-            # Next.jsのページデータを抽出
-            script_pattern = r'<script id="__NEXT_DATA__" type="application/json">(.*?)</script>'
-            script_match = re.search(script_pattern, html_content, re.DOTALL)
-            
-            if script_match:
-                next_data = json.loads(script_match.group(1))
-                page_props = next_data.get('props', {}).get('pageProps', {})
-                
-                # バッジデータを抽出
-                if 'badges' in page_props:
-                    for badge in page_props['badges']:
-                        badge_id = badge.get('set_id')
-                        if badge_id:
-                            badge_data[badge_id] = {
-                                'set_id': badge_id,
-                                'name': badge.get('name', ''),
-                                'description': badge.get('description', ''),
-                                'created_at': badge.get('created_at', ''),
-                                'user_count': badge.get('user_count', 0),
-                                'image_urls': badge.get('image_urls', {}),
-                                'source': 'stream_database'
-                            }
-            
-            # フォールバック: HTMLから直接バッジIDを抽出
-            if not badge_data:
-                # バッジIDのパターンを検索
-                badge_id_pattern = r'\/twitch\/global-badges\/([^\/\s"]+)'
-                badge_ids = re.findall(badge_id_pattern, html_content)
-                
-                for badge_id in set(badge_ids):  # 重複を除去
-                    if badge_id and not badge_id.endswith('.json'):
-                        badge_data[badge_id] = {
-                            'set_id': badge_id,
-                            'name': badge_id.replace('-', ' ').title(),
-                            'description': f'Badge discovered: {badge_id}',
-                            'created_at': '',
-                            'source': 'html_extraction'
-                        }
-            
+            for badge in iter_badges([html_content]):
+                badge_data[badge['set_id']] = badge
         except Exception as e:
-            print(f"Error extracting badge data from HTML: {e}")
+            logger.error(f"Error extracting badge data from HTML: {e}")
         
         return badge_data
     
@@ -348,16 +499,19 @@ class BadgeAutoUpdater:
                 'source': badge_data.get('source', 'stream_database')
             }
             
-            # 自動的に情報を収集して推測
-            self.auto_research_badge(badge_info)
+            # 新しいバッジを待機キューに追加（調査結果が揃う前から承認待ち一覧に表示される）
+            with self._queue_lock:
+                self.new_badges_queue.append(badge_info)
+            badge_store.save_pending(badge_info)
             
-            # 新しいバッジを待機キューに追加
-            self.new_badges_queue.append(badge_info)
+            # 情報の収集と推測はワーカーで実行
+            if not self.research_queue.submit(badge_id):
+                logger.warning(f"Research queue is full; {badge_id} will be researched on next start")
             
-            print(f"Collected info for new badge: {badge_id} - {badge_info['name']}")
+            logger.info(f"Collected info for new badge: {badge_id} - {badge_info['name']}")
             
         except Exception as e:
-            print(f"Error collecting info for badge {badge_id}: {e}")
+            logger.exception(f"Error collecting info for badge {badge_id}: {e}")
     
     def collect_badge_info(self, badge_id):
         """レガシーメソッド - 互換性のため保持"""
@@ -371,84 +525,68 @@ class BadgeAutoUpdater:
         self.collect_badge_info_from_data(badge_id, badge_data)
     
     def _update_badge_timestamps(self, current_badges):
-        """現在のバッジタイムスタンプデータを更新（改良版）"""
+        """内容が変わったバッジのみタイムスタンプデータに反映（変化したバッジIDのリストを返す）"""
         try:
-            # 新しいタイムスタンプデータを収集
-            new_timestamps = {}
-            badge_details = {}
-            
-            for badge_id, badge_data in current_badges.items():
-                created_at = badge_data.get('created_at')
-                if created_at and created_at.strip():
-                    new_timestamps[badge_id] = created_at
-                
-                # 詳細情報も保存
-                badge_details[badge_id] = {
-                    'name': badge_data.get('name', ''),
-                    'description': badge_data.get('description', ''),
-                    'created_at': created_at,
-                    'user_count': badge_data.get('user_count', 0),
-                    'last_updated': datetime.now().isoformat(),
-                    'source': badge_data.get('source', 'stream_database')
-                }
+            # 変化したバッジの詳細・タイムスタンプと更新履歴を1トランザクションで反映
+            changed, old_count, new_count = badge_store.record_scrape(current_badges)
+            if not changed:
+                logger.debug("No badge changes; database not modified")
+                return changed
             
-            # データベースファイルを読み込み・更新
-            database_file = 'badge_database.json'
-            try:
-                with open(database_file, 'r') as f:
-                    database = json.load(f)
-            except FileNotFoundError:
-                database = {
-                    'metadata': {'last_updated': '', 'version': '1.0', 'total_badges': 0},
-                    'timestamps': {},
-                    'badge_details': {},
-                    'update_history': []
-                }
-            
-            # データを更新
-            old_count = len(database['timestamps'])
-            database['timestamps'].update(new_timestamps)
-            database['badge_details'].update(badge_details)
-            database['metadata']['last_updated'] = datetime.now().isoformat()
-            database['metadata']['total_badges'] = len(database['timestamps'])
-            
-            # 更新履歴を追加
-            database['update_history'].append({
-                'timestamp': datetime.now().isoformat(),
-                'badges_added': len(new_timestamps),
-                'total_badges': len(database['timestamps']),
-                'new_badges': list(new_timestamps.keys())[:10]  # 最初の10個のみ
-            })
-            
-            # 履歴を最新の10件のみ保持
-            database['update_history'] = database['update_history'][-10:]
-            
-            # データベースファイルに保存
-            with open(database_file, 'w') as f:
-                json.dump(database, f, indent=2)
-            
-            # レガシーファイルも更新
-            with open('latest_badge_timestamps.json', 'w') as f:
-                json.dump(new_timestamps, f, indent=2)
+            # レガシーファイルには取得できたタイムスタンプのみ既存の表へ追加・上書きする
+            # （フォールバックのID抽出など不完全な取得では表を消さないよう書き換えない）
+            scraped_timestamps = {
+                badge_id: badge_data['created_at']
+                for badge_id, badge_data in current_badges.items()
+                if badge_data.get('created_at') and badge_data['created_at'].strip()
+            }
+            complete = scraped_timestamps and all(
+                badge.get('source', 'stream_database') == 'stream_database'
+                for badge in current_badges.values())
+            if complete:
+                latest = timestamp_store.get_latest()
+                new_timestamps = dict(latest, **scraped_timestamps)
+                if new_timestamps != latest:
+                    write_json_atomic('latest_badge_timestamps.json', new_timestamps)
+                    timestamp_store.replace_latest(new_timestamps)
+            else:
+                logger.warning("Scrape has no complete timestamps; latest_badge_timestamps.json not modified")
             
-            new_count = len(database['timestamps'])
             added_count = new_count - old_count
             
-            print(f"Database updated: {new_count} total badges (+{added_count} new)")
+            logger.info("Database updated", extra={
+                'changed': len(changed), 'total': new_count, 'added': added_count})
+            return changed
             
         except Exception as e:
-            print(f"Error updating badge database: {e}")
+            logger.exception(f"Error updating badge database: {e}")
+            return None
+    
+    def _research_pending_badge(self, badge_id):
+        """ワーカーで実行: バッジを調査し、結果を承認待ちキューに反映する"""
+        with self._queue_lock:
+            badge = next((b for b in self.new_badges_queue if b['id'] == badge_id), None)
+        if badge is None:
+            return
+        
+        # 調査中も一覧を返せるよう、コピーに対して調査する
+        researched = dict(badge)
+        self.auto_research_badge(researched)
+        
+        with self._queue_lock:
+            for index, current in enumerate(self.new_badges_queue):
+                if current['id'] == badge_id:
+                    # 調査中に承認された場合も承認情報を失わないよう調査結果のみ反映
+                    updated = dict(current)
+                    updated['research_results'] = researched['research_results']
+                    updated['basic_info'] = researched['basic_info']
+                    self.new_badges_queue[index] = updated
+                    badge_store.save_pending(updated)
+                    break
     
     def get_latest_badge_timestamps(self):
         """最新のバッジタイムスタンプを取得"""
-        try:
-            with open('latest_badge_timestamps.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
-        except Exception as e:
-            print(f"Error loading latest timestamps: {e}")
-            return {}
+        return timestamp_store.get_latest()
     
     def auto_research_badge(self, badge_info):
         """バッジ情報を自動的に調査"""
@@ -465,8 +603,13 @@ class BadgeAutoUpdater:
         
         research_results = []
         
+        host = urlparse(badge_info['url']).netloc
+        
         for query in search_queries[:2]:  # 最初の2つのクエリのみ実行
             try:
+                # ホストごとのレート制限（ワーカー間で共有）
+                research_rate_limiter.wait(host)
+                
                 # Web検索を実行（実際の実装では適切なAPIを使用）
                 search_result = {
                     'query': query,
@@ -475,11 +618,8 @@ class BadgeAutoUpdater:
                 }
                 research_results.append(search_result)
                 
-                # レート制限を考慮した待機
-                time.sleep(1)
-                
             except Exception as e:
-                print(f"Error researching {badge_id}: {e}")
+                logger.error(f"Error researching {badge_id}: {e}")
         
         badge_info['research_results'] = research_results
         
@@ -521,30 +661,35 @@ class BadgeAutoUpdater:
     
     def get_pending_badges(self):
         """承認待ちの新しいバッジを取得"""
-        return [badge for badge in self.new_badges_queue if badge.get('research_needed', True)]
+        with self._queue_lock:
+            return [badge for badge in self.new_badges_queue if badge.get('research_needed', True)]
     
     def approve_badge(self, badge_id, updated_info):
         """バッジ情報を承認して本番データベースに追加"""
         # badge_detail.jsの更新（実際の実装では適切なファイル操作を行う）
-        print(f"Badge {badge_id} approved and added to main database")
+        logger.info(f"Badge {badge_id} approved and added to main database")
         
         # 承認済みとしてマーク
-        for badge in self.new_badges_queue:
-            if badge['id'] == badge_id:
-                badge['research_needed'] = False
-                badge['approved_at'] = datetime.now().isoformat()
-                badge['approved_info'] = updated_info
-                break
-        
-        self.save_known_badges()
+        with self._queue_lock:
+            for badge in self.new_badges_queue:
+                if badge['id'] == badge_id:
+                    badge['research_needed'] = False
+                    badge['approved_at'] = datetime.now().isoformat()
+                    badge['approved_info'] = updated_info
+                    badge_store.save_pending(badge)
+                    break
 
 # グローバルインスタンス
 badge_updater = BadgeAutoUpdater()
 
+# 管理用ジョブ（チェック・更新は1本のワーカーで順番に実行。状態はストアに保存し、
+# 複数ワーカーでもどのワーカーからでも状態を取得でき、重複した実行要求も1つにまとまる）
+admin_jobs = JobManager(store=badge_store)
+
 def start_badge_monitoring():
     """バッジ監視を開始（改良版）"""
     def monitor_loop():
-        print("Badge monitoring started...")
+        logger.info("Badge monitoring started")
         check_interval = 1800  # 30分ごとにチェック（より頻繁に）
         error_count = 0
         max_errors = 5
@@ -552,9 +697,9 @@ def start_badge_monitoring():
         # 初回チェック
         try:
             badge_updater.check_for_new_badges()
-            print("Initial badge check completed")
         except Exception as e:
-            print(f"Error in initial badge check: {e}")
+            MONITOR_ERRORS.inc()
+            logger.exception(f"Error in initial badge check: {e}")
         
         while True:
             try:
@@ -571,26 +716,63 @@ def start_badge_monitoring():
                     
             except Exception as e:
                 error_count += 1
-                print(f"Error in badge monitoring (#{error_count}): {e}")
+                MONITOR_ERRORS.inc()
+                logger.exception(f"Error in badge monitoring (#{error_count}): {e}")
                 
                 if error_count >= max_errors:
-                    print(f"Too many errors ({max_errors}), extending retry interval")
+                    logger.warning(f"Too many errors ({max_errors}), extending retry interval")
                     time.sleep(3600)  # 1時間待機
                     error_count = 0
                 else:
                     time.sleep(600)  # 10分後に再試行
     
+    badge_updater.resume_pending_research()
+    
     monitor_thread = threading.Thread(target=monitor_loop, daemon=True)
     monitor_thread.start()
     return monitor_thread
 
+# 複数ワーカーで起動した場合もバッジ監視はロックを取得した1つのワーカーだけで実行する
+# （リーダーのワーカーが終了したら他のワーカーが引き継ぐ）
+MONITOR_LOCK_PATH = os.getenv('MONITOR_LOCK_PATH', badge_store.path + '.monitor.lock')
+monitor_election = LeaderElection(MONITOR_LOCK_PATH, start_badge_monitoring)
+
+# 新しいバッジのパイプライン（承認待ち・調査キュー）とワーカーの状態（/metrics の描画時に取得）
+Gauge('badge_pending_queue_depth', '承認待ちの新しいバッジの数',
+      callback=lambda: len(badge_updater.get_pending_badges()))
+Gauge('badge_research_queue_depth', '調査待ちの新しいバッジの数',
+      callback=lambda: badge_updater.research_queue.stats()['queued'])
+Counter('badge_research_jobs_total', '調査ワーカーの処理数', ['result'], callback=lambda: {
+    (result,): badge_updater.research_queue.stats()[result] for result in ('completed', 'failed', 'dropped')})
+Gauge('badge_monitor_leader', 'このワーカーがバッジ監視を実行していれば1',
+      callback=lambda: int(monitor_election.is_leader))
+Gauge('event_subscribers', '/api/events の接続数', callback=event_broker.subscriber_count)
+
 # 新しいバッジ管理用のAPI
+@app.route('/api/badges/changes')
+def get_badge_changes():
+    """since（変更ログの連番 または ISO形式の日時）以降のバッジの追加・変更・削除を返す
+
+    レスポンスの version を次回の since に使う。カーソルが圧縮済みの範囲を指す場合は
+    resync_required: true を返すので、/api/badges を取得し直してから version を使う。
+    """
+    since = request.args.get('since', '0')
+    try:
+        limit = min(max(int(request.args.get('limit', '500')), 1), 5000)
+        return jsonify(badge_store.get_changes(since, limit))
+    except ValueError:
+        return jsonify({'error': 'Invalid since or limit'}), 400
+
 @app.route('/api/admin/pending-badges')
 def get_pending_badges():
     """承認待ちの新しいバッジを取得"""
+    if not monitor_election.is_leader:
+        # バッジ監視を行っていないワーカーではストアの最新の状態を返す
+        badge_updater.sync_from_store()
     return jsonify({
         'pending_badges': badge_updater.get_pending_badges(),
-        'last_checked': badge_updater.last_checked.isoformat()
+        'last_checked': badge_updater.last_checked.isoformat(),
+        'research_queue': badge_updater.research_queue.stats()
     })
 
 @app.route('/api/admin/approve-badge', methods=['POST'])
@@ -607,31 +789,42 @@ def approve_badge():
     
     return jsonify({'success': False, 'error': 'Invalid data'}), 400
 
+def run_badge_check():
+    """バッジチェックを実行して結果をまとめる（force-check と update-badges のジョブで共通）"""
+    logger.info("Manual badge check initiated")
+    result = badge_updater.check_for_new_badges()
+    if result == 'error':
+        # ジョブを失敗として記録する（原因はチェック側でログに出力済み）
+        raise RuntimeError('Badge check failed while fetching or updating Stream Database data')
+    
+    # 最新のバッジ情報を取得
+    pending_count = len(badge_updater.get_pending_badges())
+    known_count = len(badge_updater.known_badges)
+    
+    return {
+        'message': 'バッジ情報の更新チェックが完了しました',
+        'check_result': result,
+        'known_badges_count': known_count,
+        'pending_badges_count': pending_count,
+        'total_badges_found': known_count,
+        'new_badges_count': len(badge_updater.new_badges_queue),
+        'new_badges': [badge['id'] for badge in badge_updater.new_badges_queue[-10:]],  # 最新10個
+        'last_checked': badge_updater.last_checked.isoformat()
+    }
+
 @app.route('/api/admin/force-check')
 def force_check():
-    """手動でバッジチェックを実行（改良版）"""
-    try:
-        print("Manual badge check initiated...")
-        badge_updater.check_for_new_badges()
-        
-        # 最新のバッジ情報を取得
-        pending_count = len(badge_updater.get_pending_badges())
-        known_count = len(badge_updater.known_badges)
-        
-        return jsonify({
-            'success': True, 
-            'message': 'Badge check completed successfully',
-            'known_badges_count': known_count,
-            'pending_badges_count': pending_count,
-            'last_checked': badge_updater.last_checked.isoformat()
-        })
-    except Exception as e:
-        print(f"Error in manual badge check: {e}")
-        return jsonify({
-            'success': False, 
-            'error': str(e),
-            'message': 'Badge check failed'
-        }), 500
+    """手動でバッジチェックを実行（ジョブとして登録し、すぐにジョブIDを返す）"""
+    job, coalesced = admin_jobs.submit('badge-check', run_badge_check)
+    return jsonify(job_response(job, coalesced)), 202
+
+@app.route('/api/admin/jobs/<job_id>')
+def get_job(job_id):
+    """ジョブの状態を取得"""
+    job = admin_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
 
 @app.route('/api/admin/status')
 def get_status():
@@ -645,8 +838,14 @@ def get_status():
                 'pending_badges_count': len(badge_updater.get_pending_badges()),
                 'last_checked': badge_updater.last_checked.isoformat(),
                 'auto_update_enabled': badge_updater.auto_update_enabled,
-                'latest_timestamps_count': len(latest_timestamps)
+                'latest_timestamps_count': len(latest_timestamps),
+                'research_queue': badge_updater.research_queue.stats()
             },
+            'access_token': token_manager.stats(),
+            'events': {
+                'subscribers': event_broker.subscriber_count()
+            },
+            'worker': monitor_election.stats(),
             'system': {
                 'timestamp': datetime.now().isoformat(),
                 'status': 'running'
@@ -658,137 +857,64 @@ def get_status():
             'status': 'error'
         }), 500
 
+def run_update_timestamps():
+    """Stream Databaseから最新データを取得してタイムスタンプを更新（条件付きリクエストは使わない）"""
+    with badge_check_lock:
+        current_badges, page_state = badge_updater.fetch_stream_database_badges(conditional=False)
+        changed = badge_updater._update_badge_timestamps(current_badges)
+        if changed is None:
+            raise RuntimeError('Failed to update badge database')
+        badge_store.set_meta_many(page_state)
+    
+    return {
+        'message': f'Updated timestamps for {len(current_badges)} badges',
+        'updated_count': len(current_badges),
+        'changed_count': len(changed)
+    }
+
 @app.route('/api/admin/update-timestamps')
 def update_timestamps():
-    """タイムスタンプデータを強制更新"""
-    try:
-        # Stream Databaseから最新データを取得
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        response = requests.get('https://www.streamdatabase.com/twitch/global-badges', 
-                              headers=headers, timeout=15)
-        
-        if response.status_code == 200:
-            current_badges = badge_updater._extract_badges_from_html(response.text)
-            badge_updater._update_badge_timestamps(current_badges)
-            
-            return jsonify({
-                'success': True,
-                'message': f'Updated timestamps for {len(current_badges)} badges',
-                'updated_count': len(current_badges)
-            })
-        else:
-            return jsonify({
-                'success': False,
-                'error': f'Failed to fetch data: HTTP {response.status_code}'
-            }), 500
-            
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    """タイムスタンプデータを強制更新（ジョブとして登録し、すぐにジョブIDを返す）"""
+    job, coalesced = admin_jobs.submit('update-timestamps', run_update_timestamps)
+    return jsonify(job_response(job, coalesced)), 202
 
 @app.route('/api/emotes')
 def get_global_emotes():
     """Twitchグローバルエモートを取得するAPIエンドポイント"""
-    # アクセストークンを取得
-    access_token = get_app_access_token()
-    
-    if not access_token:
-        return jsonify({'error': 'Failed to get access token'}), 500
-    
-    # Twitch APIからグローバルエモートを取得
-    url = 'https://api.twitch.tv/helix/chat/emotes/global'
-    headers = {
-        'Authorization': f'Bearer {access_token}',
-        'Client-Id': CLIENT_ID
-    }
-    
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
+        # Twitch APIからグローバルエモートを取得（キャッシュ経由）
+        twitch_data, helix_version = helix_cache.get_versioned(
+            'emotes', lambda: fetch_helix('chat/emotes/global'))
         
-        twitch_data = response.json()
+        # Stream Database APIから追加日情報を取得して統合（データ更新時のみ）
+        payload = get_emotes_payload(twitch_data, helix_version)
         
-        # Stream Database APIから追加日情報を取得して統合
-        enhanced_data = enhance_emotes_with_timestamps(twitch_data)
+        # 一覧のクエリパラメータがある場合は絞り込み・ページング済みの一覧を返す
+        if is_catalog_query(request.args):
+            return catalog_response(EMOTE_SPEC, payload)
         
-        return jsonify(enhanced_data)
+        return payload.to_response()
+    except AccessTokenError:
+        return jsonify({'error': 'Failed to get access token'}), 500
     except Exception as e:
-        print(f"Error fetching emotes: {e}")
+        logger.exception(f"Error fetching emotes: {e}")
         return jsonify({'error': 'Failed to fetch emotes'}), 500
 
+def get_emotes_payload(twitch_data, helix_version):
+    """拡張済みエモート一覧のペイロード（Helixのバージョンごとに1回だけ構築）"""
+    return payload_cache.get(
+        'emotes', helix_version, lambda: enhance_emotes_with_timestamps(copy.deepcopy(twitch_data)))
+
 def enhance_emotes_with_timestamps(twitch_data):
     """Stream Databaseのデータでエモートにタイムスタンプとアニメーション情報を追加"""
-    # Stream Database（2025年7月更新）からの正確な追加日データベース
-    emote_timestamps = {
-        # 2025年に追加されたエモート（Stream Databaseから取得）
-        'bosscleared': '2025-08-01T00:00:00.000Z',
-        'veladapeereira': '2025-07-24T00:00:00.000Z',
-        'veladaperxitaa': '2025-07-24T00:00:00.000Z',
-        'veladaroro': '2025-07-24T00:00:00.000Z',
-        'veladatomas': '2025-07-24T00:00:00.000Z',
-        'veladaviruzz': '2025-07-24T00:00:00.000Z',
-        'veladawestcol': '2025-07-24T00:00:00.000Z',
-        'veladarivaldios': '2025-07-24T00:00:00.000Z',
-        'veladagrefg': '2025-07-24T00:00:00.000Z',
-        'veladagaspi': '2025-07-24T00:00:00.000Z',
-        'veladacarlos': '2025-07-24T00:00:00.000Z',
-        'veladaandoni': '2025-07-24T00:00:00.000Z',
-        'veladaarigeli': '2025-07-24T00:00:00.000Z',
-        'veladaabby': '2025-07-24T00:00:00.000Z',
-        'veladaalana': '2025-07-24T00:00:00.000Z',
-        'velocityrun': '2025-07-07T00:00:00.000Z',
-        'mechacharge': '2025-07-02T00:00:00.000Z',
-        'ewccrush': '2025-06-16T00:00:00.000Z',
-        'elegiggle': '2025-06-09T00:00:00.000Z',
-        'nrwylder': '2025-05-30T00:00:00.000Z',
-        'pbmmixtape': '2025-05-29T00:00:00.000Z',
-        'darthjarjar': '2025-05-28T00:00:00.000Z',
-        'streameru': '2025-05-23T00:00:00.000Z',
-        'faze': '2025-05-23T00:00:00.000Z',
-        'oops25': '2025-05-16T00:00:00.000Z',
-        'zlansup': '2025-04-18T00:00:00.000Z',
-        'feverfighter': '2025-04-17T00:00:00.000Z',
-        'baftagames': '2025-04-08T00:00:00.000Z',
-        'mcdzombiehamburglar': '2025-04-01T00:00:00.000Z',
-        'inzoipsycat': '2025-03-27T00:00:00.000Z',
-        'acshadows': '2025-03-20T00:00:00.000Z',
-        'clixhuh': '2025-03-17T00:00:00.000Z',
-        'wedidthat': '2025-03-07T00:00:00.000Z',
-        'splitfictionjosef': '2025-03-05T00:00:00.000Z',
-        'mizfight': '2025-02-28T00:00:00.000Z',
-        'andtime': '2025-02-27T00:00:00.000Z',
-        'lovesmash': '2025-02-14T00:00:00.000Z',
-        'sharetheve': '2025-02-14T00:00:00.000Z',
-        'sharethehug': '2025-02-14T00:00:00.000Z',
-        'sharethelo': '2025-02-14T00:00:00.000Z',
-        'simsplumbob': '2025-02-04T00:00:00.000Z',
-        
-        # 2024年に追加されたエモート（Stream Databaseから取得）
-        'pewpewpew': '2024-12-20T00:00:00.000Z',
-        'cinheimer': '2024-11-08T00:00:00.000Z',
-        'caitthinking': '2024-11-08T00:00:00.000Z',
-        'ekkochest': '2024-11-08T00:00:00.000Z',
-        'ambessalove': '2024-11-08T00:00:00.000Z',
-        'feelsvi': '2024-11-08T00:00:00.000Z',
-        'jinxlul': '2024-11-08T00:00:00.000Z',
-        'bratchat': '2024-10-10T00:00:00.000Z',
-        'bigsad': '2024-09-30T00:00:00.000Z',
-        'andalusiancrush': '2024-09-23T00:00:00.000Z',
-    }
-    
     # エモートデータにタイムスタンプとアニメーション情報を追加
     if 'data' in twitch_data:
         for emote in twitch_data['data']:
             emote_name = emote.get('name', '').lower()
             
             # 完全一致チェック
-            if emote_name in emote_timestamps:
-                emote['created_at'] = emote_timestamps[emote_name]
+            if emote_name in BASE_EMOTE_TIMESTAMPS:
+                emote['created_at'] = BASE_EMOTE_TIMESTAMPS[emote_name]
             
             # アニメーション対応のURL構築
             enhance_emote_with_animation_urls(emote)
@@ -832,6 +958,121 @@ def enhance_emote_with_animation_urls(emote):
     # アニメーション優先フラグを追加
     emote['prefer_animated'] = True
 
+def get_search_index(kind=None):
+    """検索対象のデータが変わっていれば索引に反映してから返す"""
+    if kind in (None, 'badge'):
+        twitch_data, helix_version = helix_cache.get_versioned(
+            'badges', lambda: fetch_helix('chat/badges/global'))
+        badges_payload = get_badges_payload(twitch_data, helix_version)
+        # badge_details・入手方法の説明は変更ログ・メタデータのバージョンが変わったときだけ読み直す
+        version = (badges_payload.version, badge_store.change_log_version(),
+                   badge_store.get_meta('badge_metadata_hash'))
+        search_sync.sync('badge', version, lambda: badge_documents(
+            badges_payload.data.get('data', []), badge_store.get_badge_details(),
+            badge_store.get_obtain_methods()))
+    if kind in (None, 'emote'):
+        twitch_data, helix_version = helix_cache.get_versioned(
+            'emotes', lambda: fetch_helix('chat/emotes/global'))
+        emotes_payload = get_emotes_payload(twitch_data, helix_version)
+        search_sync.sync('emote', emotes_payload.version, lambda: emote_documents(
+            emotes_payload.data.get('data', [])))
+    return search_sync.index
+
+@app.route('/api/search')
+def search():
+    """バッジ（ID・タイトル・説明）とエモート名をスコア順に検索する"""
+    query = request.args.get('q', '')[:100]
+    kind = request.args.get('type') or None
+    if kind not in (None, 'badge', 'emote'):
+        return jsonify({'error': 'type must be badge or emote'}), 400
+    try:
+        limit = min(max(int(request.args.get('limit', DEFAULT_LIMIT)), 1), MAX_LIMIT)
+        offset = min(max(int(request.args.get('offset', 0)), 0), MAX_OFFSET)
+    except ValueError:
+        return jsonify({'error': 'limit and offset must be integers'}), 400
+    
+    try:
+        results, total = get_search_index(kind).search_page(query, kind, limit, offset)
+        return jsonify(search_response(query, results, total, offset))
+    except AccessTokenError:
+        return jsonify({'error': 'Failed to get access token'}), 500
+    except Exception as e:
+        logger.exception(f"Error searching for {query!r}: {e}")
+        return jsonify({'error': 'Failed to search'}), 500
+
+# ダッシュボード用の並列取得スレッドプールと入手可能期間データ
+dashboard_executor = ThreadPoolExecutor(max_workers=4)
+availability_periods = load_availability_periods()
+
+@app.route('/api/dashboard')
+def get_dashboard():
+    """バッジとエモートを並列に取得し、ストリームダッシュボード用にまとめて返す"""
+    try:
+        # 2つの上流呼び出しを並列に実行（コールドキャッシュ時も遅い方の待ち時間で済む）
+        badges_future = dashboard_executor.submit(
+            helix_cache.get_versioned, 'badges', lambda: fetch_helix('chat/badges/global'))
+        emotes_future = dashboard_executor.submit(
+            helix_cache.get_versioned, 'emotes', lambda: fetch_helix('chat/emotes/global'))
+        badges_data, badges_version = badges_future.result()
+        emotes_data, emotes_version = emotes_future.result()
+        
+        # 入手可能判定は時刻に依存するため1分単位で再計算
+        version = (badges_version, timestamp_store.version, emotes_version, int(time.time() // 60))
+        payload = payload_cache.get('dashboard', version, lambda: build_dashboard(
+            enhance_badges_with_timestamps(copy.deepcopy(badges_data)),
+            enhance_emotes_with_timestamps(copy.deepcopy(emotes_data)),
+            availability_periods
+        ))
+        
+        compact = request.args.get('format') == COMPACT_FORMAT
+        
+        # set_ids 指定時は変更のあったバッジのみ返す（/api/events の通知を受けた再取得用）
+        set_ids = request.args.get('set_ids')
+        if set_ids is not None:
+            filtered = filter_dashboard(payload.data, set_ids.split(','))
+            return jsonify(encode_dashboard(filtered) if compact else filtered)
+        
+        if compact:
+            dashboard = payload.data
+            return payload_cache.get(
+                'dashboard:compact', version, lambda: encode_dashboard(dashboard)).to_response()
+        
+        return payload.to_response()
+    except AccessTokenError:
+        return jsonify({'error': 'Failed to get access token'}), 500
+    except Exception as e:
+        logger.exception(f"Error building dashboard: {e}")
+        return jsonify({'error': 'Failed to fetch dashboard data'}), 500
+
+# SSEの接続は1スレッドを占有するため、1ワーカーあたりの同時接続数をスレッド数の半分までに制限する
+# （残りのスレッドで通常のリクエストを処理する。多数の接続を受ける場合は asgi.py を使う）
+SSE_MAX_CONNECTIONS = int(os.getenv('SSE_MAX_CONNECTIONS', max(int(os.getenv('WORKER_THREADS', '8')) // 2, 1)))
+SSE_RETRY_AFTER = 30
+sse_slots = threading.BoundedSemaphore(SSE_MAX_CONNECTIONS)
+
+@app.route('/api/events')
+def events():
+    """新しいバッジの検出・タイムスタンプの変更を Server-Sent Events で配信"""
+    if not sse_slots.acquire(blocking=False):
+        response = jsonify({'error': 'Too many event stream connections'})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(SSE_RETRY_AFTER)
+        # 別オリジンのクライアントも再接続までの時間を読めるようにする
+        response.headers['Access-Control-Expose-Headers'] = 'Retry-After'
+        return response
+
+    # 手動で再接続するクライアントは Last-Event-ID ヘッダーの代わりにクエリで渡す
+    last_event_id = parse_last_event_id(
+        request.headers.get('Last-Event-ID') or request.args.get('last_event_id'))
+    # 待機中もタイムスタンプファイルの外部変更を検出できるよう、ハートビートごとにストアを確認
+    stream = stream_events(event_broker, last_event_id, on_heartbeat=lambda: timestamp_store.version)
+    response = Response(stream, mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    response.call_on_close(sse_slots.release)
+    return response
+
 @app.route('/')
 def index():
     """ルートエンドポイント"""
@@ -844,32 +1085,9 @@ def stream():
 
 @app.route('/api/update-badges', methods=['POST'])
 def update_badges():
-    """Stream Databaseから最新バッジ情報をチェック（開発環境用）"""
-    try:
-        if badge_updater:
-            # 手動でバッジチェックを実行
-            badge_updater.check_for_new_badges()
-            
-            result = {
-                'success': True,
-                'timestamp': datetime.now().isoformat(),
-                'message': 'バッジ情報の更新チェックが完了しました',
-                'new_badges_count': len(badge_updater.new_badges_queue),
-                'new_badges': [badge['id'] for badge in badge_updater.new_badges_queue[-10:]]  # 最新10個
-            }
-            
-            return jsonify(result)
-        else:
-            return jsonify({
-                'success': False,
-                'error': 'Badge updater not initialized'
-            }), 500
-            
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': f'Server error: {str(e)}'
-        }), 500
+    """Stream Databaseから最新バッジ情報をチェック（開発環境用・force-check と同じジョブに合流）"""
+    job, coalesced = admin_jobs.submit('badge-check', run_badge_check)
+    return jsonify(job_response(job, coalesced)), 202
 
 @app.route('/<path:path>')
 def serve_static(path):
@@ -877,6 +1095,7 @@ def serve_static(path):
     return send_from_directory('.', path)
 
 if __name__ == '__main__':
-    # バッジ監視を開始
-    start_badge_monitoring()
+    # バッジ監視を開始（デバッグのリローダーでは実際にアプリを動かす子プロセスでのみ）
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        monitor_election.start()
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,248 @@
+"""ASGIサーバー向けのエントリポイント
+
+    uvicorn asgi:application --host 0.0.0.0 --port 5000
+
+/api/badges・/api/emotes・/api/dashboard は非同期HTTPクライアントで上流を待つため、
+上流の応答が遅くても1プロセスで多数の同時リクエストを処理できる。
+/api/events（SSE）も接続ごとにスレッドを占有せずイベントループ上で配信する。
+それ以外のルート（管理API・静的ファイルなど）は既存のFlaskアプリをWSGIブリッジ経由で配信する。
+従来どおり `python app.py` でのWSGI起動も利用できる。
+
+複数ワーカーで起動する場合（uvicorn --workers N）、バッジ監視はロックを取得した
+1つのワーカーだけで実行され、SHARED_CACHE_URL を設定するとHelixレスポンスを共有する。
+"""
+import asyncio
+import copy
+import json
+import logging
+import os
+import time
+from urllib.parse import parse_qs
+
+from asgiref.wsgi import WsgiToAsgi
+
+import app as wsgi_app
+from dashboard import build_dashboard
+from events import HEARTBEAT_INTERVAL, RETRY_MS, AsyncSubscription, parse_last_event_id
+from metrics import observe_request
+from profiling import PROFILE_HEADER
+from payload_cache import PayloadCache
+from response_cache import AsyncTTLCache
+from upstream import create_async_client
+
+logger = logging.getLogger(__name__)
+
+# HELIX_CACHE_COALESCE=0 は負荷試験用（同時のキャッシュミスをまとめずに上流を呼ぶ）
+async_helix_cache = AsyncTTLCache(ttl=wsgi_app.HELIX_CACHE_TTL, max_stale=wsgi_app.HELIX_CACHE_MAX_STALE,
+                                  shared=wsgi_app.shared_cache, name='helix',
+                                  coalesce=os.getenv('HELIX_CACHE_COALESCE', '1').lower() not in ('0', 'false', 'no'))
+async_payload_cache = PayloadCache()
+upstream_client = create_async_client()
+flask_asgi = WsgiToAsgi(wsgi_app.app)
+
+
+async def get_access_token():
+    """有効なトークンがあれば即座に返し、無ければスレッドで取得する"""
+    token = wsgi_app.token_manager.get_token(blocking=False)
+    if token:
+        return token
+    return await asyncio.to_thread(wsgi_app.get_app_access_token)
+
+
+async def fetch_helix(path):
+    """Twitch Helix APIから非同期でデータを取得"""
+    access_token = await get_access_token()
+    if not access_token:
+        raise wsgi_app.AccessTokenError('Failed to get access token')
+
+    url = f'{wsgi_app.HELIX_API_URL}/{path}'
+    headers = {
+        'Authorization': f'Bearer {access_token}',
+        'Client-Id': wsgi_app.CLIENT_ID
+    }
+    response = await upstream_client.get(url, headers=headers)
+
+    # トークンが失効していた場合は無効化して1回だけ再試行
+    if response.status_code == 401:
+        wsgi_app.token_manager.invalidate(access_token)
+        access_token = await asyncio.to_thread(wsgi_app.get_app_access_token)
+        if not access_token:
+            raise wsgi_app.AccessTokenError('Failed to get access token')
+        headers['Authorization'] = f'Bearer {access_token}'
+        response = await upstream_client.get(url, headers=headers)
+
+    response.raise_for_status()
+    return response.json()
+
+
+async def get_payload(key, version, builder):
+    """構築済みならそのまま返し、再構築が必要な場合はスレッドで実行する"""
+    payload = async_payload_cache.get_cached(key, version)
+    if payload is None:
+        payload = await asyncio.to_thread(async_payload_cache.get, key, version, builder)
+    return payload
+
+
+async def badges_payload():
+    data, helix_version = await async_helix_cache.get_versioned(
+        'badges', lambda: fetch_helix('chat/badges/global'))
+    version = (helix_version, wsgi_app.timestamp_store.version)
+    return await get_payload('badges', version, lambda: wsgi_app.enhance_badges_with_timestamps(
+        copy.deepcopy(data)))
+
+
+async def emotes_payload():
+    data, helix_version = await async_helix_cache.get_versioned(
+        'emotes', lambda: fetch_helix('chat/emotes/global'))
+    return await get_payload('emotes', helix_version, lambda: wsgi_app.enhance_emotes_with_timestamps(
+        copy.deepcopy(data)))
+
+
+async def dashboard_payload():
+    (badges_data, badges_version), (emotes_data, emotes_version) = await asyncio.gather(
+        async_helix_cache.get_versioned('badges', lambda: fetch_helix('chat/badges/global')),
+        async_helix_cache.get_versioned('emotes', lambda: fetch_helix('chat/emotes/global'))
+    )
+    # 入手可能判定は時刻に依存するため1分単位で再計算
+    version = (badges_version, wsgi_app.timestamp_store.version, emotes_version, int(time.time() // 60))
+    return await get_payload('dashboard', version, lambda: build_dashboard(
+        wsgi_app.enhance_badges_with_timestamps(copy.deepcopy(badges_data)),
+        wsgi_app.enhance_emotes_with_timestamps(copy.deepcopy(emotes_data)),
+        wsgi_app.availability_periods
+    ))
+
+
+# 非同期で処理するルート: パス → (ペイロード生成関数, エラーメッセージ)
+ASYNC_ROUTES = {
+    '/api/badges': (badges_payload, 'Failed to fetch badges'),
+    '/api/emotes': (emotes_payload, 'Failed to fetch emotes'),
+    '/api/dashboard': (dashboard_payload, 'Failed to fetch dashboard data'),
+}
+
+
+def has_header(scope, name):
+    name = name.lower().encode('latin-1')
+    return any(key.lower() == name for key, _ in scope['headers'])
+
+
+async def send_response(send, status, body, headers):
+    header_list = [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in headers.items()]
+    header_list.append((b'content-length', str(len(body)).encode()))
+    header_list.append((b'access-control-allow-origin', b'*'))
+    await send({'type': 'http.response.start', 'status': status, 'headers': header_list})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def serve_async_route(scope, send, handler, error_message):
+    started = time.perf_counter()
+    # 区間の計測は Flask 側のルートと同じ記録（/api/admin/profiles）に残す
+    state = wsgi_app.profiler.begin()
+    status = 500
+    try:
+        status = await respond_async_route(scope, send, handler, error_message)
+    finally:
+        wsgi_app.profiler.end(state, scope['method'], scope['path'], scope['path'], status)
+    # Flask側のルートと同じメトリクスに記録する
+    observe_request(scope['path'], scope['method'], status, time.perf_counter() - started)
+
+
+async def respond_async_route(scope, send, handler, error_message):
+    """レスポンスを送信してステータスコードを返す"""
+    request_headers = {k.decode('latin-1').lower(): v.decode('latin-1') for k, v in scope['headers']}
+    try:
+        payload = await handler()
+    except wsgi_app.AccessTokenError:
+        await send_json_error(send, 'Failed to get access token')
+        return 500
+    except Exception as e:
+        logger.exception(f"{error_message}: {e}")
+        await send_json_error(send, error_message)
+        return 500
+
+    status, body, headers = payload.negotiate(
+        request_headers.get('accept-encoding', ''),
+        request_headers.get('if-none-match', '')
+    )
+    if scope['method'] == 'HEAD':
+        body = b''
+    await send_response(send, status, body, headers)
+    return status
+
+
+async def send_json_error(send, message, status=500):
+    body = json.dumps({'error': message}).encode('utf-8')
+    await send_response(send, status, body, {'Content-Type': 'application/json'})
+
+
+async def serve_events(scope, receive, send):
+    """/api/events: Server-Sent Events をイベントループ上で配信"""
+    request_headers = {k.decode('latin-1').lower(): v.decode('latin-1') for k, v in scope['headers']}
+    query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    last_event_id = parse_last_event_id(
+        request_headers.get('last-event-id') or query.get('last_event_id', [None])[0])
+    broker = wsgi_app.event_broker
+    subscription = broker.subscribe(AsyncSubscription(asyncio.get_running_loop()), last_event_id)
+    disconnected = asyncio.Event()
+
+    async def watch_disconnect():
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                disconnected.set()
+                return
+
+    watcher = asyncio.create_task(watch_disconnect())
+    try:
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [
+            (b'content-type', b'text/event-stream; charset=utf-8'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+            (b'access-control-allow-origin', b'*'),
+        ]})
+        await send({'type': 'http.response.body', 'body': f'retry: {RETRY_MS}\n\n'.encode(), 'more_body': True})
+        while not subscription.overflowed and not disconnected.is_set():
+            event = await subscription.get(HEARTBEAT_INTERVAL)
+            if event is None:
+                # タイムスタンプファイルの外部変更を検出するためストアを確認（ファイルI/Oはスレッドで）
+                await asyncio.to_thread(lambda: wsgi_app.timestamp_store.version)
+                chunk = f': keepalive {int(time.time())}\n\n'
+            else:
+                chunk = event.format()
+            await send({'type': 'http.response.body', 'body': chunk.encode('utf-8'), 'more_body': True})
+        if not disconnected.is_set():
+            await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        broker.unsubscribe(subscription)
+        watcher.cancel()
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            if os.getenv('DISABLE_BADGE_MONITOR', '').lower() not in ('1', 'true', 'yes'):
+                wsgi_app.monitor_election.start()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await upstream_client.aclose()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    """ASGIアプリケーション本体"""
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+
+    if scope['type'] == 'http' and scope['method'] in ('GET', 'HEAD'):
+        if scope['path'] == '/api/events' and scope['method'] == 'GET':
+            await serve_events(scope, receive, send)
+            return
+        # クエリ付き（部分取得など）とプロファイルの要求はFlask側で処理する
+        route = ASYNC_ROUTES.get(scope['path'])
+        if route is not None and not scope.get('query_string') and not has_header(scope, PROFILE_HEADER):
+            await serve_async_route(scope, send, *route)
+            return
+
+    await flask_asgi(scope, receive, send)
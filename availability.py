@@ -0,0 +1,111 @@
+"""バッジの入手可能期間の判定（以前フロントエンドにあった getBadgeAvailabilityStatus と同じ規則）"""
+import json
+import math
+import os
+from datetime import datetime, timezone
+
+AVAILABILITY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'badge_availability.json')
+
+# 状態メッセージ（言語ごと）
+MESSAGES = {
+    'ja': {
+        'unknown': '入手可能期間の情報がありません',
+        'available': '現在入手可能',
+        'upcoming': '{days}日後に入手可能',
+        'expired': '入手期間終了',
+        'hours_left': 'あと{hours}時間で終了',
+        'one_day_left': 'あと1日で終了',
+        'days_left': 'あと{days}日で終了',
+        'future': '配布予定'
+    },
+    'en': {
+        'unknown': 'No availability information',
+        'available': 'Currently available',
+        'upcoming': 'Available in {days} days',
+        'expired': 'No longer available',
+        'hours_left': 'Ends in {hours} hours',
+        'one_day_left': 'Ends in 1 day',
+        'days_left': 'Ends in {days} days',
+        'future': 'Coming soon'
+    }
+}
+
+
+def load_availability_periods(path=AVAILABILITY_FILE):
+    """入手可能期間データベースを読み込む"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def parse_iso_datetime(value):
+    """ISO 8601文字列をUTCのdatetimeに変換（末尾のZにも対応）"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def get_badge_availability_status(periods, badge_id, now=None, lang='ja'):
+    """バッジの入手可能状態を判定する"""
+    messages = MESSAGES.get(lang, MESSAGES['ja'])
+    period = periods.get(badge_id)
+    if not period:
+        return {'status': 'unknown', 'message': messages['unknown'], 'isAvailable': False}
+
+    now = now or datetime.now(timezone.utc)
+    period_type = period.get('type')
+
+    if period_type == 'ongoing':
+        return {
+            'status': 'available',
+            'message': messages['available'],
+            'isAvailable': True,
+            'description': period.get('description')
+        }
+
+    if period_type == 'time-limited':
+        start_date = parse_iso_datetime(period.get('start'))
+        end_date = parse_iso_datetime(period.get('end'))
+        if start_date is None or end_date is None:
+            return {'status': 'unknown', 'message': messages['unknown'], 'isAvailable': False}
+
+        result = {
+            'description': period.get('description'),
+            'startDate': period.get('start'),
+            'endDate': period.get('end')
+        }
+
+        if now < start_date:
+            days_until_start = math.ceil((start_date - now).total_seconds() / 86400)
+            result.update(status='upcoming', message=messages['upcoming'].format(days=days_until_start), isAvailable=False)
+        elif now > end_date:
+            result.update(status='expired', message=messages['expired'], isAvailable=False)
+        else:
+            hours_until_end = (end_date - now).total_seconds() / 3600
+            if hours_until_end < 24:
+                # 24時間未満の場合は時間表示
+                message = messages['hours_left'].format(hours=math.ceil(hours_until_end))
+            else:
+                # 24時間以上の場合は日数表示（切り捨て）
+                days_until_end = math.floor(hours_until_end / 24)
+                message = messages['one_day_left'] if days_until_end == 1 else messages['days_left'].format(days=days_until_end)
+            result.update(status='limited', message=message, isAvailable=True)
+        return result
+
+    if period_type == 'future':
+        return {
+            'status': 'future',
+            'message': messages['future'],
+            'isAvailable': False,
+            'description': period.get('description')
+        }
+
+    return {'status': 'unknown', 'message': messages['unknown'], 'isAvailable': False}
@@ -13,310 +13,6 @@ function getBaseUrl() {
 
 const BASE_URL = getBaseUrl();
 
-// バッジの入手可能期間データベース
-const badgeAvailabilityPeriods = {
-    'clips-leader': {
-        type: 'ongoing',
-        description: 'Ongoing feature since April 11, 2025'
-    },
-    'legendus': {
-        type: 'time-limited',
-        start: '2025-06-28T00:00:00Z',
-        end: '2025-06-29T23:59:59Z',
-        description: 'LEGENDUS ITADAKI event June 28-29, 2025'
-    },
-    'marathon-reveal-runner': {
-        type: 'time-limited',
-        start: '2025-04-11T00:00:00Z',
-        end: '2025-04-12T23:59:59Z',
-        description: 'Marathon Reveal stream subscription April 11-12, 2025'
-    },
-    'gone-bananas': {
-        type: 'time-limited',
-        start: '2025-04-01T00:00:00Z',
-        end: '2025-04-04T23:59:59Z',
-        description: 'April Fools 2025 April 1-4, 2025'
-    },
-    'elden-ring-wylder': {
-        type: 'time-limited',
-        start: '2025-05-29T00:00:00Z',
-        end: '2025-06-03T23:59:59Z',
-        description: 'Elden Ring Nightreign clip sharing May 29 - June 3, 2025'
-    },
-    'elden-ring-recluse': {
-        type: 'time-limited',
-        start: '2025-05-29T00:00:00Z',
-        end: '2025-05-30T23:59:59Z',
-        description: 'Elden Ring SuperFan Recluse May 29-30, 2025'
-    },
-    'league-of-legends-mid-season-invitational-2025---grey': {
-        type: 'time-limited',
-        start: '2025-06-24T00:00:00Z',
-        end: '2025-07-12T08:59:00Z',
-        description: 'MSI 2025 June 24 - July 12, 2025'
-    },
-    'league-of-legends-mid-season-invitational-2025---purple': {
-        type: 'time-limited',
-        start: '2025-06-24T00:00:00Z',
-        end: '2025-07-12T08:59:00Z',
-        description: 'MSI 2025 June 24 - July 12, 2025'
-    },
-    'league-of-legends-mid-season-invitational-2025---blue': {
-        type: 'time-limited',
-        start: '2025-06-24T00:00:00Z',
-        end: '2025-07-12T08:59:00Z',
-        description: 'MSI 2025 June 24 - July 12, 2025'
-    },
-    'borderlands-4-badge---ripper': {
-        type: 'time-limited',
-        start: '2025-06-21T00:00:00Z',
-        end: '2025-06-21T23:59:59Z',
-        description: 'Borderlands 4 Fan Fest June 21, 2025'
-    },
-    'borderlands-4-badge---vault-symbol': {
-        type: 'time-limited',
-        start: '2025-06-21T00:00:00Z',
-        end: '2025-06-21T23:59:59Z',
-        description: 'Borderlands 4 Fan Fest June 21, 2025'
-    },
-    'bot-badge': {
-        type: 'future',
-        description: 'Added to system but not yet distributed'
-    },
-    'minecraft-15th-anniversary-celebration': {
-        type: 'time-limited',
-        start: '2024-05-25T00:00:00Z',
-        end: '2024-05-31T23:59:59Z',
-        description: 'Minecraft 15th Anniversary May 25-31, 2024'
-    },
-    'clip-the-halls': {
-        type: 'time-limited',
-        start: '2024-12-02T00:00:00Z',
-        end: '2024-12-13T23:59:59Z',
-        description: 'Holiday Hoopla 2024 December 2-13, 2024'
-    },
-    'gold-pixel-heart---together-for-good-24': {
-        type: 'time-limited',
-        start: '2024-12-03T00:00:00Z',
-        end: '2024-12-15T23:59:59Z',
-        description: 'Together for Good 2024 December 3-15, 2024'
-    },
-    'gold-pixel-heart': {
-        type: 'time-limited',
-        start: '2024-12-03T00:00:00Z',
-        end: '2024-12-15T23:59:59Z',
-        description: 'Together for Good 2024 December 3-15, 2024'
-    },
-    'arcane-season-2-premiere': {
-        type: 'time-limited',
-        start: '2024-11-08T00:00:00Z',
-        end: '2024-11-09T23:59:59Z',
-        description: 'Arcane Season 2 Premiere November 8-9, 2024'
-    },
-    'dreamcon-2024': {
-        type: 'time-limited',
-        start: '2024-07-26T00:00:00Z',
-        end: '2024-07-28T23:59:59Z',
-        description: 'DreamCon 2024 July 26-28, 2024'
-    },
-    'destiny-2-the-final-shape-streamer': {
-        type: 'time-limited',
-        start: '2024-06-07T00:00:00Z',
-        end: '2024-06-09T23:59:59Z',
-        description: 'Destiny 2 raid race June 7-9, 2024'
-    },
-    'destiny-2-final-shape-raid-race': {
-        type: 'time-limited',
-        start: '2024-06-07T00:00:00Z',
-        end: '2024-06-09T23:59:59Z',
-        description: 'Destiny 2 raid race June 7-9, 2024'
-    },
-    'evo-2025': {
-        type: 'time-limited',
-        start: '2025-08-01T00:00:00Z',
-        end: '2025-08-04T23:59:59Z',
-        description: 'Evo 2025 fighting game tournament August 1-4, 2025'
-    },
-    'share-the-love': {
-        type: 'time-limited',
-        start: '2025-02-14T00:00:00Z',
-        end: '2025-02-14T23:59:59Z',
-        description: 'Share the Love Valentine\'s Day 2025'
-    },
-    'raging-wolf-helm': {
-        type: 'time-limited',
-        start: '2024-06-20T00:00:00Z',
-        end: '2024-06-22T23:59:59Z',
-        description: 'Elden Ring collaboration event June 2024'
-    },
-    'speedons-5-badge': {
-        type: 'time-limited',
-        start: '2025-02-24T00:00:00Z',
-        end: '2025-02-24T23:59:59Z',
-        description: 'Speedons 5 event February 24, 2025'
-    },
-    'ruby-pixel-heart---together-for-good-24': {
-        type: 'time-limited',
-        start: '2024-12-02T00:00:00Z',
-        end: '2024-12-15T23:59:59Z',
-        description: 'Together for Good 2024 December 2-15, 2024'
-    },
-    'purple-pixel-heart---together-for-good-24': {
-        type: 'time-limited',
-        start: '2024-12-02T00:00:00Z',
-        end: '2024-12-15T23:59:59Z', 
-        description: 'Together for Good 2024 December 2-15, 2024'
-    },
-    'la-velada-iv': {
-        type: 'time-limited',
-        start: '2024-07-13T00:00:00Z',
-        end: '2024-07-14T23:59:59Z',
-        description: 'La Velada del Año IV July 13, 2024'
-    },
-    'la-velada-v-badge': {
-        type: 'time-limited',
-        start: '2025-07-26T16:45:00Z',
-        end: '2025-07-27T01:30:00Z',
-        description: 'La Velada del Año V July 26, 2025'
-    },
-    'valorant-2025': {
-        type: 'time-limited',
-        start: '2025-09-12T17:00:00Z',
-        end: '2025-10-05T18:59:00Z',
-        description: 'VCT Champions Paris 2025 - SUBtember September 12 - October 5, 2025'
-    },
-    'valorant-paris-2025': {
-        type: 'time-limited',
-        start: '2025-09-12T17:00:00Z',
-        end: '2025-10-05T18:59:00Z',
-        description: 'VCT Champions Paris 2025 - SUBtember September 12 - October 5, 2025'
-    },
-    'zevent-2024': {
-        type: 'time-limited',
-        start: '2024-09-06T18:00:00Z',
-        end: '2024-09-08T23:59:59Z',
-        description: 'ZEVENT 2024 charity marathon September 6-8, 2024'
-    },
-    'zevent25': {
-        type: 'time-limited',
-        start: '2025-09-04T16:00:00Z',
-        end: '2025-09-07T00:00:00Z',
-        description: 'ZEVENT 2025 charity marathon September 4-7, 2025'
-    },
-    'hornet': {
-        type: 'time-limited',
-        start: '2025-09-04T14:00:00Z',
-        end: '2025-09-13T06:59:00Z',
-        description: 'Hollow Knight: Silksong launch event September 4-13, 2025'
-    },
-    'subtember-2025': {
-        type: 'time-limited',
-        start: '2025-08-29T17:00:00Z',
-        end: '2025-10-01T17:00:00Z',
-        description: 'SUBtember 2025 August 29 - October 1, 2025'
-    },
-    'gears-of-war-superfan-badge': {
-        type: 'time-limited',
-        start: '2025-08-25T07:00:00Z',
-        end: '2025-08-26T19:00:00Z',
-        description: 'Gears of War: Reloaded Superfan August 25-26, 2025'
-    },
-    'path-of-exile-2-badge': {
-        type: 'time-limited',
-        start: '2025-08-29T07:00:00Z',
-        end: '2025-09-15T06:59:00Z',
-        description: 'Path of Exile II launch promotion August 29 - September 15, 2025'
-    }
-};
-
-// 動的な入手可能性を判定する関数
-function getBadgeAvailabilityStatus(badgeId) {
-    const period = badgeAvailabilityPeriods[badgeId];
-    if (!period) {
-        return { status: 'unknown', message: '入手可能期間の情報がありません' };
-    }
-    
-    const now = new Date();
-    
-    switch (period.type) {
-        case 'ongoing':
-            return { 
-                status: 'available', 
-                message: '現在入手可能',
-                isAvailable: true,
-                description: period.description
-            };
-        
-        case 'time-limited':
-            const startDate = new Date(period.start);
-            const endDate = new Date(period.end);
-            
-            if (now < startDate) {
-                const daysUntilStart = Math.ceil((startDate - now) / (1000 * 60 * 60 * 24));
-                return {
-                    status: 'upcoming',
-                    message: `${daysUntilStart}日後に入手可能`,
-                    isAvailable: false,
-                    description: period.description,
-                    startDate: startDate,
-                    endDate: endDate
-                };
-            } else if (now > endDate) {
-                return {
-                    status: 'expired',
-                    message: '入手期間終了',
-                    isAvailable: false,
-                    description: period.description,
-                    startDate: startDate,
-                    endDate: endDate
-                };
-            } else {
-                const hoursUntilEnd = (endDate - now) / (1000 * 60 * 60);
-                let message;
-                
-                if (hoursUntilEnd < 24) {
-                    // 24時間未満の場合は時間表示
-                    const hours = Math.ceil(hoursUntilEnd);
-                    message = `あと${hours}時間で終了`;
-                } else {
-                    // 24時間以上の場合は日数表示（切り捨て）
-                    const daysUntilEnd = Math.floor(hoursUntilEnd / 24);
-                    if (daysUntilEnd === 0) {
-                        message = '本日終了';
-                    } else if (daysUntilEnd === 1) {
-                        message = 'あと1日で終了';
-                    } else {
-                        message = `あと${daysUntilEnd}日で終了`;
-                    }
-                }
-                
-                return {
-                    status: 'limited',
-                    message: message,
-                    isAvailable: true,
-                    description: period.description,
-                    startDate: startDate,
-                    endDate: endDate
-                };
-            }
-        
-        case 'future':
-            return {
-                status: 'future',
-                message: '配布予定',
-                isAvailable: false,
-                description: period.description
-            };
-        
-        default:
-            return { 
-                status: 'unknown', 
-                message: '入手可能期間の情報がありません',
-                isAvailable: false
-            };
-    }
-}
-
 // 翻訳データ
 const translations = {
     ja: {
@@ -374,1030 +70,28 @@ let currentLanguage = 'ja';
 let currentBadgeSet = null;
 let currentVersionId = null;
 
-// バッジ入手方法データベース
-const badgeObtainMethods = {
-    // 継続中のバッジ
-    'clips-leader': {
-        ja: {
-            title: 'Clips Leader バッジ',
-            description: 'チャンネルでクリップを作成したり、作成されたクリップが人気になることで入手できます。現在入手可能です。',
-            requirements: [
-                'チャンネルでクリップを作成する',
-                'または他の人があなたのチャンネルでクリップを作成する',
-                'クリップが一定の視聴数を獲得する',
-                'アクティブなTwitchアカウントが必要'
-            ],
-            availability: 'available',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/clips-leader/1'
-        },
-        en: {
-            title: 'Clips Leader Badge',
-            description: 'Obtained by creating clips on channels or having clips created on your channel that become popular. Currently available.',
-            requirements: [
-                'Create clips on channels',
-                'Or have others create clips on your channel',
-                'Clips must achieve certain viewership',
-                'Active Twitch account required'
-            ],
-            availability: 'available',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/clips-leader/1'
-        }
-    },
-    // 2025年のバッジ
-    'legendus': {
-        ja: {
-            title: 'LEGENDUS ITADAKI イベント参加',
-            description: 'LEGENDUS ITADAKI イベント期間中（2025年6月28-29日）にfps_shakaまたはlegendus_shakaの配信を30分間視聴することで入手できました。',
-            requirements: [
-                '2025年6月28-29日のイベント期間中に参加',
-                'fps_shakaまたはlegendus_shakaの配信を視聴',
-                '最低30分間の継続視聴が必要',
-                'Twitchアカウントでログイン済み'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/legendus/1'
-        },
-        en: {
-            title: 'LEGENDUS ITADAKI Event Participation',
-            description: 'Obtained by watching fps_shaka or legendus_shaka streams for 30 minutes during the LEGENDUS ITADAKI event (June 28-29, 2025).',
-            requirements: [
-                'Participate during June 28-29, 2025 event period',
-                'Watch fps_shaka or legendus_shaka channels',
-                'Minimum 30 minutes continuous viewing required',
-                'Must be logged in with Twitch account'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/legendus/1'
-        }
-    },
-    'marathon-reveal-runner': {
-        ja: {
-            title: 'Marathon Reveal ストリーム購読',
-            description: 'Bungie の Marathon Reveal ストリーム期間中（2025年4月11-12日）に Marathonディレクトリ内のクリエイターに購読することで入手できました。',
-            requirements: [
-                '2025年4月11日7:45 AM PT - 4月12日4:00 PM PTの期間内',
-                'Marathonディレクトリ内のチャンネルに新規購読',
-                'ギフト購読でも獲得可能',
-                'Prime購読は対象外'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/marathon-reveal-runner/1'
-        },
-        en: {
-            title: 'Marathon Reveal Stream Subscription',
-            description: 'Obtained by subscribing to creators in the Marathon directory during Bungie\'s Marathon reveal stream (April 11-12, 2025).',
-            requirements: [
-                'Subscribe during April 11 7:45 AM PT - April 12 4:00 PM PT',
-                'Subscribe to channels in Marathon directory',
-                'Gift subscriptions also count',
-                'Prime subscriptions do NOT count'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/marathon-reveal-runner/1'
-        }
-    },
-    'minecraft-15th-anniversary-celebration': {
-        ja: {
-            title: 'Minecraft 15周年記念バッジ',
-            description: 'Minecraft 15周年記念イベント期間中（2024年5月25-31日）にMinecraft配信を視聴し、専用エモートをチャットで使用することで入手できました。',
-            requirements: [
-                '2024年5月25-31日に5分間Minecraft配信を視聴',
-                '専用エモート (:ssssssplode:) を獲得',
-                '2024年5月28-31日にチャットでエモートを使用',
-                'Minecraft 15周年記念タグ付き配信が対象'
-            ],
-            availability: 'unavailable',
-            url: 'https://blog.twitch.tv/en/2024/05/15/celebrating-15-years-of-minecraft-on-twitch/'
-        },
-        en: {
-            title: 'Minecraft 15th Anniversary Badge',
-            description: 'Obtained during Minecraft\'s 15th anniversary celebration (May 25-31, 2024) by watching Minecraft streams and using a special emote in chat.',
-            requirements: [
-                'Watch Minecraft streams for 5 minutes (May 25-31, 2024)',
-                'Unlock the exclusive :ssssssplode: emote',
-                'Use the emote in chat (May 28-31, 2024)',
-                'Only tagged anniversary streams counted'
-            ],
-            availability: 'unavailable',
-            url: 'https://blog.twitch.tv/en/2024/05/15/celebrating-15-years-of-minecraft-on-twitch/'
-        }
-    },
-    'league-of-legends-mid-season-invitational-2025---grey': {
-        ja: {
-            title: 'LoL MSI 2025 ストリーマーサポートバッジ',
-            description: 'MSI 2025期間中（2024年6月24日 - 7月12日）にLeague of Legendsカテゴリのストリーマーに購読することで入手できました。',
-            requirements: [
-                '2024年6月24日 - 7月12日8:59 AM (GMT+2)の期間内',
-                'League of Legendsカテゴリのストリーマーに購読',
-                'ギフト購読でも獲得可能',
-                'Prime購読は対象外',
-                'TwitchとRiotアカウントの連携が必要'
-            ],
-            availability: 'unavailable',
-            url: 'https://esports.gg/news/league-of-legends/msi-2025-twitch-subs-gifted-subs-and-perks-explained/'
-        },
-        en: {
-            title: 'LoL MSI 2025 Support a Streamer Badge',
-            description: 'Obtained by subscribing to streamers in League of Legends category during MSI 2025 (June 24 - July 12, 2025).',
-            requirements: [
-                'Subscribe during June 24 - July 12, 8:59 AM (GMT+2)',
-                'Subscribe to League of Legends category streamers',
-                'Gift subscriptions also count',
-                'Prime subscriptions do NOT count',
-                'Twitch and Riot account linking required'
-            ],
-            availability: 'unavailable',
-            url: 'https://esports.gg/news/league-of-legends/msi-2025-twitch-subs-gifted-subs-and-perks-explained/'
-        }
-    },
-    'league-of-legends-mid-season-invitational-2025---purple': {
-        ja: {
-            title: 'LoL MSI 2025 eスポーツバッジ',
-            description: 'MSI 2025期間中（2024年6月24日 - 7月12日）にLoL eスポーツチャンネルに購読することで入手できました。',
-            requirements: [
-                '2024年6月24日 - 7月12日8:59 AM (GMT+2)の期間内',
-                'Riot Gamesまたは公式LoL eスポーツチャンネルに購読',
-                'LCK、lolesportstw、LeagueofLegendsJPなどが対象',
-                'Prime購読は対象外',
-                'TwitchとRiotアカウントの連携が必要'
-            ],
-            availability: 'unavailable',
-            url: 'https://esports.gg/news/league-of-legends/msi-2025-twitch-subs-gifted-subs-and-perks-explained/'
-        },
-        en: {
-            title: 'LoL MSI 2025 Esports Badge',
-            description: 'Obtained by subscribing to LoL Esports channels during MSI 2025 (June 24 - July 12, 2025).',
-            requirements: [
-                'Subscribe during June 24 - July 12, 8:59 AM (GMT+2)',
-                'Subscribe to Riot Games or official LoL Esports channels',
-                'Eligible channels: LCK, lolesportstw, LeagueofLegendsJP, etc.',
-                'Prime subscriptions do NOT count',
-                'Twitch and Riot account linking required'
-            ],
-            availability: 'unavailable',
-            url: 'https://esports.gg/news/league-of-legends/msi-2025-twitch-subs-gifted-subs-and-perks-explained/'
-        }
-    },
-    'league-of-legends-mid-season-invitational-2025---blue': {
-        ja: {
-            title: 'LoL MSI 2025 ブルーバッジ',
-            description: 'MSI 2025期間中（2024年6月24日 - 7月12日）に特定の条件を満たすことで入手できました。詳細な入手方法についてはイベント固有の要件があります。',
-            requirements: [
-                '2024年6月24日 - 7月12日8:59 AM (GMT+2)の期間内',
-                'MSI 2025イベント特定の条件を満たす',
-                'TwitchとRiotアカウントの連携が必要'
-            ],
-            availability: 'unavailable',
-            url: 'https://esports.gg/news/league-of-legends/msi-2025-twitch-subs-gifted-subs-and-perks-explained/'
-        },
-        en: {
-            title: 'LoL MSI 2025 Blue Badge',
-            description: 'Obtained by meeting specific conditions during MSI 2025 (June 24 - July 12, 2025). Detailed requirements were event-specific.',
-            requirements: [
-                'Meet requirements during June 24 - July 12, 8:59 AM (GMT+2)',
-                'Complete MSI 2025 event-specific conditions',
-                'Twitch and Riot account linking required'
-            ],
-            availability: 'unavailable',
-            url: 'https://esports.gg/news/league-of-legends/msi-2025-twitch-subs-gifted-subs-and-perks-explained/'
-        }
-    },
-    'gone-bananas': {
-        ja: {
-            title: 'Gone Bananas エイプリルフール 2025',
-            description: 'エイプリルフール週間（2025年4月1-4日）に面白いクリップをソーシャルメディアでシェアすることで入手できました。',
-            requirements: [
-                '2025年4月1-4日の期間内',
-                'エイプリルフール特別カテゴリからクリップを作成/シェア',
-                'TikTok、YouTube、Instagramのいずれかでシェア',
-                '通常のクリップは対象外',
-                'Twitchアカウントでログイン済み'
-            ],
-            availability: 'unavailable',
-            url: 'https://blog.twitch.tv/en/2025/04/01/april-fools-day/'
-        },
-        en: {
-            title: 'Gone Bananas April Fools 2025',
-            description: 'Obtained by sharing funny clips on social media during April Fool\'s week (April 1-4, 2025).',
-            requirements: [
-                'Share clips during April 1-4, 2025',
-                'Clips must be from official April Fools categories',
-                'Share on TikTok, YouTube, or Instagram',
-                'Regular clips do not count',
-                'Must be logged in with Twitch account'
-            ],
-            availability: 'unavailable',
-            url: 'https://blog.twitch.tv/en/2025/04/01/april-fools-day/'
-        }
-    },
-    'elden-ring-wylder': {
-        ja: {
-            title: 'Elden Ring Nightreign クリップ共有',
-            description: 'Elden Ring: Nightreign イベント期間中（2025年5月29日 - 6月3日）にElden Ringのクリップをダウンロード・共有することで入手できました。',
-            requirements: [
-                '2025年5月29日 - 6月3日の期間内',
-                'Elden Ring: Nightreignカテゴリのクリップを作成・ダウンロード',
-                'YouTube、TikTok、Instagramのいずれかでクリップを共有',
-                'バッジ付与まで最大72時間要する場合あり'
-            ],
-            availability: 'unavailable',
-            url: 'https://blog.twitch.tv/en/2025/05/29/elden-ring-nightreign-awaits/'
-        },
-        en: {
-            title: 'Elden Ring Nightreign Clip Sharing',
-            description: 'Obtained by downloading and sharing Elden Ring clips during the Nightreign event (May 29 - June 3, 2025).',
-            requirements: [
-                'Download/share clips during May 29 - June 3, 2025',
-                'Create clips from "Elden Ring: Nightreign" category',
-                'Share on YouTube, TikTok, or Instagram',
-                'Badge delivery may take up to 72 hours'
-            ],
-            availability: 'unavailable',
-            url: 'https://blog.twitch.tv/en/2025/05/29/elden-ring-nightreign-awaits/'
-        }
-    },
-    'elden-ring-recluse': {
-        ja: {
-            title: 'Elden Ring SuperFan Recluse',
-            description: 'Elden Ring: Nightreign の協力配信イベント（2025年5月29日午前12時 - 5月30日正午PT）でStream Togetherを使用した配信を15分間視聴/配信することで入手できました。',
-            requirements: [
-                '2025年5月29日午前12時PT - 5月30日正午PTの期間内',
-                'Stream Together機能を使用したElden Ring配信を15分間視聴',
-                'または自分でStream Togetherを使ってElden Ring配信を15分間実施',
-                'Elden Ring: Nightreignカテゴリが対象'
-            ],
-            availability: 'unavailable',
-            url: 'https://blog.twitch.tv/en/2025/05/29/elden-ring-nightreign-awaits/'
-        },
-        en: {
-            title: 'Elden Ring SuperFan Recluse',
-            description: 'Obtained by watching or streaming Elden Ring content using Stream Together for 15 minutes during the Nightreign collaboration event (May 29 12 AM PT - May 30 Noon PT, 2025).',
-            requirements: [
-                'Participate during May 29 12 AM PT - May 30 Noon PT, 2025',
-                'Watch 15 minutes of Elden Ring streams using Stream Together',
-                'Or stream Elden Ring content using Stream Together for 15 minutes',
-                'Must be in "Elden Ring: Nightreign" category'
-            ],
-            availability: 'unavailable',
-            url: 'https://blog.twitch.tv/en/2025/05/29/elden-ring-nightreign-awaits/'
-        }
-    },
-    'clip-the-halls': {
-        ja: {
-            title: 'Clip the Halls ホリデー2024',
-            description: 'Twitch Holiday Hoopla 2024期間中（2024年12月2-13日）にクリップをTikTokまたはYouTubeにシェアすることで入手できました。',
-            requirements: [
-                '2024年12月2-13日のHoliday Hoopla期間内',
-                'クリップマネージャーからクリップをシェア',
-                'TikTokまたはYouTubeにシェア',
-                'バッジは数営業日以内に付与'
-            ],
-            availability: 'unavailable',
-            url: 'https://blog.twitch.tv/en/2024/12/02/twitch-holiday-hoopla/'
-        },
-        en: {
-            title: 'Clip the Halls Holiday 2024',
-            description: 'Obtained by sharing holiday clips to TikTok or YouTube during Twitch Holiday Hoopla 2024 (December 2-13, 2024).',
-            requirements: [
-                'Share clips during December 2-13, 2024 Holiday Hoopla',
-                'Use Clip Manager to share clips',
-                'Share to TikTok or YouTube',
-                'Badge delivered within a few business days'
-            ],
-            availability: 'unavailable',
-            url: 'https://blog.twitch.tv/en/2024/12/02/twitch-holiday-hoopla/'
-        }
-    },
-    'borderlands-4-badge---ripper': {
-        ja: {
-            title: 'Borderlands 4 Ripper',
-            description: 'Borderlands 4 Fan Fest イベント期間中（2025年6月21日）にBorderlands 4カテゴリの配信者に購読することで入手できました。',
-            requirements: [
-                '2025年6月21日11:00 AM ET - 8:00 PM ETの期間内',
-                'Borderlands 4カテゴリで配信中のチャンネルに新規購読',
-                'ギフト購読でも獲得可能',
-                'Prime購読は対象外'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/borderlands-4-badge---ripper/1'
-        },
-        en: {
-            title: 'Borderlands 4 Ripper',
-            description: 'Obtained by purchasing a new subscription or gifting a subscription to participating Borderlands 4 streamers during Fan Fest (June 21, 2025).',
-            requirements: [
-                'Subscribe during June 21, 2025 11:00 AM ET - 8:00 PM ET',
-                'Subscribe to channels streaming in Borderlands 4 category',
-                'Gift subscriptions also count',
-                'Prime subscriptions do NOT count'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/borderlands-4-badge---ripper/1'
-        }
-    },
-    'borderlands-4-badge---vault-symbol': {
-        ja: {
-            title: 'Borderlands 4 Vault Symbol',
-            description: 'Borderlands 4 Fan Fest イベント期間中（2025年6月21日）に公式Borderlandsチャンネルまたはパートナーチャンネルのイベント配信を30分間視聴することで入手できました。',
-            requirements: [
-                '2025年6月21日11:00 AM ET - 8:00 PM ETの期間内',
-                '公式Borderlandsチャンネルまたはパートナーチャンネルを視聴',
-                'イベント配信を30分間以上継続視聴',
-                'Twitchアカウントでログイン済み'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/borderlands-4-badge---vault-symbol/1'
-        },
-        en: {
-            title: 'Borderlands 4 Vault Symbol',
-            description: 'Obtained by watching 30+ minutes of the official Borderlands channel or partnered channels during Fan Fest event (June 21, 2025).',
-            requirements: [
-                'Watch during June 21, 2025 11:00 AM ET - 8:00 PM ET',
-                'Watch official Borderlands channel or partnered channels',
-                'Minimum 30 minutes continuous viewing',
-                'Must be logged in with Twitch account'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/borderlands-4-badge---vault-symbol/1'
-        }
-    },
-    'gold-pixel-heart---together-for-good-24': {
-        ja: {
-            title: 'Gold Pixel Heart - Together For Good 2024',
-            description: 'Twitch Together for Good 2024チャリティイベント期間中（2024年12月3-15日）にTwitchチャリティツールを通じて累計50ドル以上寄付することで入手できました。',
-            requirements: [
-                '2024年12月3-15日のTogether for Good期間内',
-                'Twitchチャリティツールを通じて累計50ドル以上寄付',
-                '複数のチャンネルでの寄付も累計に含まれる',
-                'バッジは寄付後72時間以内に付与（週末除く）'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/gold-pixel-heart---together-for-good-24/1'
-        },
-        en: {
-            title: 'Gold Pixel Heart - Together For Good 2024',
-            description: 'Obtained by donating $50+ cumulatively through the Twitch Charity tool during Together for Good 2024 (December 3-15, 2024).',
-            requirements: [
-                'Donate during December 3-15, 2024 Together for Good event',
-                'Cumulative donations of $50+ through Twitch Charity tool',
-                'Donations across multiple channels count toward total',
-                'Badge delivered within 72 hours (weekends excluded)'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/gold-pixel-heart---together-for-good-24/1'
-        }
-    },
-    'gold-pixel-heart': {
-        ja: {
-            title: 'Gold Pixel Heart - 通常版',
-            description: 'Twitch Together for Good 2024チャリティイベント期間中（2024年12月3-15日）にTwitchチャリティツールを通じて累計50ドル以上寄付することで入手できました。',
-            requirements: [
-                '2024年12月3-15日のTogether for Good期間内',
-                'Twitchチャリティツールを通じて累計50ドル以上寄付',
-                '複数のチャンネルでの寄付も累計に含まれる',
-                'バッジは寄付後72時間以内に付与（週末除く）'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/gold-pixel-heart/1'
-        },
-        en: {
-            title: 'Gold Pixel Heart - Standard',
-            description: 'Obtained by donating $50+ cumulatively through the Twitch Charity tool during Together for Good 2024 (December 3-15, 2024).',
-            requirements: [
-                'Donate during December 3-15, 2024 Together for Good event',
-                'Cumulative donations of $50+ through Twitch Charity tool',
-                'Donations across multiple channels count toward total',
-                'Badge delivered within 72 hours (weekends excluded)'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/gold-pixel-heart/1'
-        }
-    },
-    'arcane-season-2-premiere': {
-        ja: {
-            title: 'Arcane Season 2 Premiere',
-            description: 'Arcane Season 2 プレミア配信（2024年11月8-9日）でエピソード1を15分間視聴することで入手できました。',
-            requirements: [
-                '2024年11月8日11:00 PM PT - 11月9日12:00 AM PTの配信時間',
-                'Arcane Season 2 エピソード1を15分間視聴',
-                'Riot Games公式Twitchチャンネルまたは許可されたコーストリーム',
-                'RiotアカウントとTwitchアカウントの連携が必要'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/arcane-season-2-premiere/1'
-        },
-        en: {
-            title: 'Arcane Season 2 Premiere',
-            description: 'Obtained by watching 15 minutes of Arcane Season 2 Episode 1 during the premiere broadcast (November 8-9, 2024).',
-            requirements: [
-                'Watch during November 8 11:00 PM PT - November 9 12:00 AM PT',
-                'Watch 15 minutes of Arcane Season 2 Episode 1',
-                'Official Riot Games Twitch channel or authorized co-streams',
-                'Riot and Twitch account linking required'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/arcane-season-2-premiere/1'
-        }
-    },
-    'dreamcon-2024': {
-        ja: {
-            title: 'DreamCon 2024',
-            description: 'DreamCon 2024イベント（2024年7月26-28日）のライブ配信を視聴するか、イベント後のフィードバック調査を完了することで入手できました。',
-            requirements: [
-                '2024年7月26-28日のDreamCon 2024ライブ配信を視聴',
-                'または2024年8月30日までにイベントフィードバック調査を完了',
-                'トラブルシューティングは2024年9月6日まで対応',
-                'info@dreamconvention.com への問い合わせが必要な場合あり'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/dreamcon-2024/1'
-        },
-        en: {
-            title: 'DreamCon 2024',
-            description: 'Obtained by watching DreamCon 2024 live (July 26-28, 2024) or completing the post-event feedback survey.',
-            requirements: [
-                'Watch DreamCon 2024 livestream during July 26-28, 2024',
-                'Or complete event feedback survey by August 30, 2024',
-                'Troubleshooting available until September 6, 2024',
-                'Contact info@dreamconvention.com if needed'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/dreamcon-2024/1'
-        }
-    },
-    'destiny-2-the-final-shape-streamer': {
-        ja: {
-            title: 'Destiny 2: The Final Shape Streamer',
-            description: 'Destiny 2 Final Shape レイドレース期間中（2024年6月7-9日）にDestiny 2を30分間配信することで入手できました。',
-            requirements: [
-                '2024年6月7日9:30 AM PT - 6月9日9:30 AM PTの期間内',
-                'Destiny 2を30分間配信',
-                'The Final Shape レイドレースイベント期間中',
-                'Scanning Ghost Chat Badge として付与'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/destiny-2-the-final-shape-streamer/1'
-        },
-        en: {
-            title: 'Destiny 2: The Final Shape Streamer',
-            description: 'Obtained by streaming Destiny 2 for 30 minutes during The Final Shape raid race (June 7-9, 2024).',
-            requirements: [
-                'Stream during June 7 9:30 AM PT - June 9 9:30 AM PT',
-                'Stream Destiny 2 for 30 minutes',
-                'During The Final Shape raid race event',
-                'Awarded as Scanning Ghost Chat Badge'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/destiny-2-the-final-shape-streamer/1'
-        }
-    },
-    'destiny-2-final-shape-raid-race': {
-        ja: {
-            title: 'Destiny 2: The Final Shape Raid Race',
-            description: 'Destiny 2 Final Shape レイドレース期間中（2024年6月7-9日）にSalvation\'s Edge レイドを15分間視聴することで入手できました。',
-            requirements: [
-                '2024年6月7日9:30 AM PT - 6月9日9:30 AM PTの期間内',
-                'The Final Shape レイドを15分間視聴',
-                'Twitch Rivals配信または参加クリエイターの配信',
-                'Ghost Chat Badge として付与'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/destiny-2-final-shape-raid-race/1'
-        },
-        en: {
-            title: 'Destiny 2: The Final Shape Raid Race',
-            description: 'Obtained by watching 15 minutes of The Final Shape raid during the raid race (June 7-9, 2024).',
-            requirements: [
-                'Watch during June 7 9:30 AM PT - June 9 9:30 AM PT',
-                'Watch The Final Shape raid for 15 minutes',
-                'Twitch Rivals stream or participating creators',
-                'Awarded as Ghost Chat Badge'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/destiny-2-final-shape-raid-race/1'
-        }
-    },
-    'bot-badge': {
-        ja: {
-            title: 'Bot Badge',
-            description: 'サードパーティのチャットボットを識別するためのバッジです。2025年6月9日にTwitchのシステムに追加されましたが、現在はまだ使用されていません。',
-            requirements: [
-                'Twitchによる公式な配布方法は未発表',
-                'バッジは追加されているが、まだ使用されていない',
-                'Bot開発者向けのAPI端点やアプリケーションプロセスは未実装',
-                '今後のTwitchからの公式発表を待つ必要がある'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/bot-badge/1'
-        },
-        en: {
-            title: 'Bot Badge',
-            description: 'A badge designed to distinguish third-party chatbots. Added to Twitch\'s system on June 9, 2025, but not yet in use.',
-            requirements: [
-                'Official distribution method not yet announced by Twitch',
-                'Badge exists in system but is not currently distributed',
-                'No API endpoint or application process for developers yet',
-                'Waiting for official announcement from Twitch'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/bot-badge/1'
-        }
-    },
-    'clips-leader': {
-        ja: {
-            title: 'Clips Leader',
-            description: '2025年4月11日にリリースされたクリップリーダーボード機能で、チャンネル内でクリップの視聴数が上位3位以内に入ることで入手できます。',
-            requirements: [
-                'クリップリーダーボード機能が有効なチャンネルで参加',
-                'ストリーマーが設定した期間内にクリップを作成',
-                'クリップの視聴数で上位3位以内に入る',
-                '1位: Clips Leader 1、2位: Clips Leader 2、3位: Clips Leader 3',
-                'チャンネル固有のバッジ（そのチャンネルでのみ表示）'
-            ],
-            availability: 'available',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/clips-leader/1'
-        },
-        en: {
-            title: 'Clips Leader',
-            description: 'Obtained by ranking in the top 3 clippers in a channel through the Clips Leaderboard feature released on April 11, 2025.',
-            requirements: [
-                'Participate in channels with Clips Leaderboard feature enabled',
-                'Create clips during the time frame selected by the streamer',
-                'Rank in top 3 based on clip views',
-                '1st place: Clips Leader 1, 2nd: Clips Leader 2, 3rd: Clips Leader 3',
-                'Channel-specific badge (only displays in that channel)'
-            ],
-            availability: 'available',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/clips-leader/1'
-        }
-    },
-    'evo-2025': {
-        ja: {
-            title: 'Evo 2025',
-            description: 'Evo 2025イベント期間中（2025年8月1-4日）に対象ゲームの配信チャンネルにサブスクライブすることで入手できました。',
-            requirements: [
-                '2025年8月1-4日のEvo 2025期間中に参加',
-                '以下のゲームを配信しているチャンネルにサブスクライブ:',
-                '• Street Fighter 6',
-                '• TEKKEN 8',
-                '• Fatal Fury: City of the Wolves',
-                '• Guilty Gear -Strive-',
-                'Prime Gaming サブスクリプションは対象外',
-                'Street Fighter 6の場合、バッジ取得には2回のサブスクが必要（1回目でGuileコスチューム、2回目でバッジ）'
-            ],
-            availability: 'unavailable',
-            url: 'https://evo.gg'
-        },
-        en: {
-            title: 'Evo 2025',
-            description: 'Obtained by subscribing to channels streaming eligible games during Evo 2025 event (August 1-4, 2025).',
-            requirements: [
-                'Subscribe during Evo 2025 event period (August 1-4, 2025)',
-                'Subscribe to channels streaming:',
-                '• Street Fighter 6',
-                '• TEKKEN 8',
-                '• Fatal Fury: City of the Wolves', 
-                '• Guilty Gear -Strive-',
-                'Prime Gaming subscriptions do NOT count',
-                'For Street Fighter 6: 2 subscriptions required for badge (1st for Guile costume, 2nd for badge)'
-            ],
-            availability: 'unavailable',
-            url: 'https://evo.gg'
-        }
-    },
-    'share-the-love': {
-        ja: {
-            title: 'Share the Love バレンタイン 2025',
-            description: 'バレンタインデー（2025年2月14日）に愛を共有するための特別なイベントバッジです。',
-            requirements: [
-                '2025年2月14日のバレンタインデーに参加',
-                '愛をテーマにした特別なアクティビティに参加',
-                'Share the Love イベント期間中の配信視聴またはアクティビティ参加',
-                'Twitchアカウントでログイン済み'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/share-the-love/1'
-        },
-        en: {
-            title: 'Share the Love Valentine\'s 2025',
-            description: 'Special Valentine\'s Day badge (February 14, 2025) for sharing love in the community.',
-            requirements: [
-                'Participate on Valentine\'s Day (February 14, 2025)',
-                'Join love-themed special activities',
-                'Watch streams or participate in activities during Share the Love event',
-                'Must be logged in with Twitch account'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/share-the-love/1'
-        }
-    },
-    'raging-wolf-helm': {
-        ja: {
-            title: 'Raging Wolf Helm',
-            description: 'Elden Ring関連の特別イベント（2024年6月20日頃）で入手できました。狼の兜をモチーフにしたバッジです。',
-            requirements: [
-                '2024年6月20日頃のElden Ringイベント期間中に参加',
-                'Elden Ringカテゴリの配信を視聴',
-                '特定のElden Ring関連アクティビティに参加',
-                'イベント期間中のアクティブな参加が必要'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/raging-wolf-helm/1'
-        },
-        en: {
-            title: 'Raging Wolf Helm',
-            description: 'Obtained during a special Elden Ring event (around June 20, 2024). Features a wolf helmet design.',
-            requirements: [
-                'Participate during Elden Ring event period (around June 20, 2024)',
-                'Watch streams in Elden Ring category',
-                'Participate in specific Elden Ring-related activities',
-                'Active participation during event period required'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/raging-wolf-helm/1'
-        }
-    },
-    'speedons-5-badge': {
-        ja: {
-            title: 'Speedons 5 バッジ',
-            description: 'Speedons 5イベント（2025年2月24日）で入手できました。スピードラン関連の特別イベントバッジです。',
-            requirements: [
-                '2025年2月24日のSpeedons 5イベント期間中に参加',
-                'スピードラン関連の配信を視聴',
-                'Speedons 5イベントの特定アクティビティに参加',
-                'イベント配信を一定時間視聴'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/speedons-5-badge/1'
-        },
-        en: {
-            title: 'Speedons 5 Badge',
-            description: 'Obtained during Speedons 5 event (February 24, 2025). Special speedrunning event badge.',
-            requirements: [
-                'Participate during Speedons 5 event (February 24, 2025)',
-                'Watch speedrunning-related streams',
-                'Participate in specific Speedons 5 event activities',
-                'Watch event streams for required duration'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/speedons-5-badge/1'
-        }
-    },
-    'ruby-pixel-heart---together-for-good-24': {
-        ja: {
-            title: 'Ruby Pixel Heart - Together for Good 2024',
-            description: 'Twitch Together for Good 2024チャリティイベント期間中（2024年12月2-15日）にTwitchチャリティツールを通じて累計25ドル以上寄付することで入手できました。',
-            requirements: [
-                '2024年12月2-15日のTogether for Good期間内',
-                'Twitchチャリティツールを通じて累計25ドル以上寄付',
-                '複数のチャンネルでの寄付も累計に含まれる',
-                'バッジは寄付後72時間以内に付与（週末除く）'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/ruby-pixel-heart---together-for-good-24/1'
-        },
-        en: {
-            title: 'Ruby Pixel Heart - Together for Good 2024',
-            description: 'Obtained by donating $25+ cumulatively through the Twitch Charity tool during Together for Good 2024 (December 2-15, 2024).',
-            requirements: [
-                'Donate during December 2-15, 2024 Together for Good event',
-                'Cumulative donations of $25+ through Twitch Charity tool',
-                'Donations across multiple channels count toward total',
-                'Badge delivered within 72 hours (weekends excluded)'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/ruby-pixel-heart---together-for-good-24/1'
-        }
-    },
-    'purple-pixel-heart---together-for-good-24': {
-        ja: {
-            title: 'Purple Pixel Heart - Together for Good 2024',
-            description: 'Twitch Together for Good 2024チャリティイベント期間中（2024年12月2-15日）にTwitchチャリティツールを通じて累計10ドル以上寄付することで入手できました。',
-            requirements: [
-                '2024年12月2-15日のTogether for Good期間内',
-                'Twitchチャリティツールを通じて累計10ドル以上寄付',
-                '複数のチャンネルでの寄付も累計に含まれる',
-                'バッジは寄付後72時間以内に付与（週末除く）'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/purple-pixel-heart---together-for-good-24/1'
-        },
-        en: {
-            title: 'Purple Pixel Heart - Together for Good 2024',
-            description: 'Obtained by donating $10+ cumulatively through the Twitch Charity tool during Together for Good 2024 (December 2-15, 2024).',
-            requirements: [
-                'Donate during December 2-15, 2024 Together for Good event',
-                'Cumulative donations of $10+ through Twitch Charity tool',
-                'Donations across multiple channels count toward total',
-                'Badge delivered within 72 hours (weekends excluded)'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/purple-pixel-heart---together-for-good-24/1'
-        }
-    },
-    'la-velada-iv': {
-        ja: {
-            title: 'La Velada del Año IV',
-            description: 'La Velada del Año IV（第4回ベラーダ）イベント（2024年7月13日）で入手できました。スペインの人気YouTuber TheGrefgが主催するボクシングイベントです。',
-            requirements: [
-                '2024年7月13日のLa Velada del Año IVイベント期間中に参加',
-                'TheGrefgまたは関連チャンネルのライブ配信を視聴',
-                'イベント配信を一定時間視聴',
-                'La Velada IVイベント特別配信が対象'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/la-velada-iv/1'
-        },
-        en: {
-            title: 'La Velada del Año IV',
-            description: 'Obtained during La Velada del Año IV (The Evening of the Year IV) event (July 13, 2024). A boxing event hosted by popular Spanish YouTuber TheGrefg.',
-            requirements: [
-                'Participate during La Velada del Año IV event (July 13, 2024)',
-                'Watch TheGrefg or related channels\' live streams',
-                'Watch event streams for required duration',
-                'Only La Velada IV special event streams counted'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/la-velada-iv/1'
-        }
-    },
-    'la-velada-v-badge': {
-        ja: {
-            title: 'La Velada del Año V',
-            description: 'La Velada del Año V（第5回ベラーダ）イベント（2025年7月26日）で入手できました。セビリアのLa Cartuja Stadiumで開催された史上最大規模のストリーマーボクシングイベントです。',
-            requirements: [
-                '2025年7月26日16:45 - 7月27日01:30（UTC）の期間中に参加',
-                'ibaiのTwitchチャンネルでライブ配信を視聴',
-                '最低5分間の継続視聴が必要',
-                'TheGrefg vs WestCOL のメインイベントを含む7試合を配信',
-                'Twitchアカウントでログイン済み'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/la-velada-v-badge/1'
-        },
-        en: {
-            title: 'La Velada del Año V',
-            description: 'Obtained during La Velada del Año V (The Evening of the Year V) event (July 26, 2025). The biggest streamer boxing event ever held at La Cartuja Stadium in Seville.',
-            requirements: [
-                'Watch during July 26, 16:45 - July 27, 01:30 (UTC), 2025',
-                'Watch the live stream on ibai\'s Twitch channel',
-                'Minimum 5 minutes continuous viewing required',
-                'Event featured 7 boxing matches including TheGrefg vs WestCOL main event',
-                'Must be logged in with Twitch account'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/la-velada-v-badge/1'
-        }
-    },
-    'valorant-2025': {
-        ja: {
-            title: 'VCT Champions Paris 2025',
-            description: 'VCT Champions Paris 2025（VALORANTチャンピオンズツアー）とSUBtemberのコラボレーションバッジ（2025年9月12日〜10月5日）。VALORANTカテゴリーで有料サブスクリプションまたはギフトサブが必要です。',
-            requirements: [
-                '2025年9月12日17:00 - 10月5日18:59（UTC）の期間中に参加',
-                'VALORANTカテゴリーのストリーマーに有料サブスクリプションまたはギフトサブ',
-                'Prime Gamingサブスクリプションは対象外',
-                'SUBtemberキャンペーンで30%割引適用（10月1日まで）',
-                '大会配信でも通常配信でも、VALORANTカテゴリーであれば対象',
-                'サブスクリプション完了後、自動的にバッジが付与される'
-            ],
-            availability: 'available',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/valorant-2025/1'
-        },
-        en: {
-            title: 'VCT Champions Paris 2025',
-            description: 'VCT Champions Paris 2025 collaboration badge with SUBtember (September 12 - October 5, 2025). Requires paid subscription or gift sub in the VALORANT category.',
-            requirements: [
-                'Participate during September 12, 17:00 - October 5, 18:59 (UTC), 2025',
-                'Purchase or gift a subscription to any streamer in the VALORANT category',
-                'Prime Gaming subscriptions do NOT count',
-                '30% discount available during SUBtember (until October 1)',
-                'Valid for any VALORANT category stream, tournament or regular',
-                'Badge granted automatically after subscription completion'
-            ],
-            availability: 'available',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/valorant-2025/1'
-        }
-    },
-    'valorant-paris-2025': {
-        ja: {
-            title: 'VCT Champions Paris 2025',
-            description: 'VALORANT Champions 2025パリ大会の記念バッジ。世界最高峰のVALORANT大会で、16チームが賞金総額225万ドルをかけて競い合いました。Accor ArenaとLes Arènes de Grand Paris Sudで24日間開催された史上最大規模の大会です。',
-            requirements: [
-                '2025年9月12日17:00 - 10月5日18:59（UTC）の期間中に参加',
-                'VALORANTカテゴリーのストリーマーに有料サブスクリプションまたはギフトサブ',
-                'Prime Gamingサブスクリプションは対象外',
-                'SUBtemberキャンペーンで30%割引適用（10月1日まで）',
-                '参加16チーム：G2、Bilibili Gaming、Team Liquid、Paper Rex、NRG、Sentinels等',
-                '優勝賞金100万ドル、総賞金225万ドルの世界大会記念バッジ'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/vct-paris-2025/1'
-        },
-        en: {
-            title: 'VCT Champions Paris 2025',
-            description: 'Commemorative badge for VALORANT Champions 2025 Paris. The pinnacle VALORANT tournament with 16 teams competing for $2.25M prize pool. Held for 24 days at Accor Arena and Les Arènes de Grand Paris Sud.',
-            requirements: [
-                'Participate during September 12, 17:00 - October 5, 18:59 (UTC), 2025',
-                'Purchase or gift a subscription to any streamer in the VALORANT category',
-                'Prime Gaming subscriptions do NOT count',
-                '30% discount available during SUBtember (until October 1)',
-                '16 teams competed: G2, Bilibili Gaming, Team Liquid, Paper Rex, NRG, Sentinels, etc.',
-                '$1M first place prize, $2.25M total prize pool championship badge'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/vct-paris-2025/1'
-        }
-    },
-    'zevent25': {
-        ja: {
-            title: 'ZEVENT25',
-            description: 'ZEVENT 2025（2025年9月4-7日）で入手できました。ZeratoRが主催するフランス最大のチャリティストリーミングマラソンイベントの最新版です。',
-            requirements: [
-                '2025年9月4日16:00 - 9月7日00:00（UTC）の期間中に参加',
-                'ZEVENT25の参加チャンネルで1時間の配信を視聴',
-                '複数のチャリティ団体を支援する寄付が推奨（バッジ取得に必須ではない）',
-                'Twitchアカウントでログイン済み'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/zevent25/1'
-        },
-        en: {
-            title: 'ZEVENT25',
-            description: 'Obtained during ZEVENT 2025 (September 4-7, 2025). The latest edition of France\'s biggest charity streaming marathon organized by ZeratoR.',
-            requirements: [
-                'Watch during September 4, 16:00 - September 7, 00:00 (UTC), 2025',
-                'Watch 1 hour of any participating ZEVENT25 channel',
-                'Donations to supported charities encouraged (not required for badge)',
-                'Must be logged in with Twitch account'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/zevent25/1'
-        }
-    },
-    'hornet': {
-        ja: {
-            title: 'Hornet - Hollow Knight: Silksong',
-            description: 'Hollow Knight: Silksong ローンチ期間中（2025年9月4-13日）にHollow Knight: Silksongカテゴリの配信者に購読することで入手できました。',
-            requirements: [
-                '2025年9月4日14:00 - 9月13日06:59（UTC）の期間中',
-                'Hollow Knight: Silksongカテゴリで配信中のチャンネルに購読',
-                'またはギフト購読を送る',
-                'Prime購読は対象外',
-                'ゲームの発売週記念バッジ'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/hornet/1'
-        },
-        en: {
-            title: 'Hornet - Hollow Knight: Silksong',
-            description: 'Obtained by subscribing to streamers in Hollow Knight: Silksong category during game launch week (September 4-13, 2025).',
-            requirements: [
-                'Subscribe during September 4, 14:00 - September 13, 06:59 (UTC), 2025',
-                'Subscribe to channels streaming in Hollow Knight: Silksong category',
-                'Or gift subscriptions to eligible channels',
-                'Prime subscriptions do NOT count',
-                'Game launch week commemorative badge'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/hornet/1'
-        }
-    },
-    'subtember-2025': {
-        ja: {
-            title: 'SUBtember 2025',
-            description: 'SUBtember 2025期間中（2025年8月29日 - 10月1日）に購読、ギフト購読、またはBitsを使用することで入手できました。',
-            requirements: [
-                '2025年8月29日17:00 - 10月1日17:00（UTC）の期間中',
-                'いずれかのTwitchチャンネルに購読（Prime購読は対象外）',
-                'またはギフト購読を送る',
-                'またはBitsを使用する',
-                '購読とBitsの割引キャンペーン期間'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/subtember-2025/1'
-        },
-        en: {
-            title: 'SUBtember 2025',
-            description: 'Obtained by subscribing, gifting subscriptions, or using bits on any Twitch channel during SUBtember 2025 (August 29 - October 1, 2025).',
-            requirements: [
-                'Participate during August 29, 17:00 - October 1, 17:00 (UTC), 2025',
-                'Subscribe to any channel (Prime subscriptions do NOT count)',
-                'Or gift subscriptions to any channel',
-                'Or use bits on any channel',
-                'Special discount period for subscriptions and bits'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/subtember-2025/1'
-        }
-    },
-    'gears-of-war-superfan-badge': {
-        ja: {
-            title: 'Gears of War Superfan Badge',
-            description: 'Gears of War: Reloaded発表イベント期間中（2025年8月25-26日）にGears of War: Reloaded Waiting Roomカテゴリで配信を視聴または配信することで入手できました。',
-            requirements: [
-                '2025年8月25日07:00 - 8月26日19:00（UTC）の期間中',
-                'Gears of War: Reloaded Waiting Roomカテゴリで配信を視聴または配信',
-                'Stream Together機能を有効にしている必要あり',
-                'ゲーム発表イベント記念バッジ'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/gears-of-war-superfan-badge/1'
-        },
-        en: {
-            title: 'Gears of War Superfan Badge',
-            description: 'Obtained by watching or streaming in the "Gears of War: Reloaded Waiting Room" category during the announcement event (August 25-26, 2025).',
-            requirements: [
-                'Participate during August 25, 07:00 - August 26, 19:00 (UTC), 2025',
-                'Watch or stream in "Gears of War: Reloaded Waiting Room" category',
-                'Required to have "Streaming Together" feature enabled',
-                'Game announcement event commemorative badge'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/gears-of-war-superfan-badge/1'
-        }
-    },
-    'path-of-exile-2-badge': {
-        ja: {
-            title: 'Chaos Orb - Path of Exile 2',
-            description: 'Path of Exile 2: The Third Edict発売促進期間中（2025年8月29日 - 9月15日）にPath of Exile IIカテゴリの配信者に購読することで入手できました。',
-            requirements: [
-                '2025年8月29日07:00 - 9月15日06:59（UTC）の期間中',
-                'Path of Exile IIカテゴリで配信中のチャンネルに購読',
-                'またはギフト購読を送る',
-                'Prime購読は対象外',
-                'SUBtember 2025期間と重複するため、一度の購読で2つのバッジ獲得可能'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/path-of-exile-2-badge/1'
-        },
-        en: {
-            title: 'Chaos Orb - Path of Exile 2',
-            description: 'Obtained by subscribing to streamers in Path of Exile II category during "The Third Edict" launch promotion (August 29 - September 15, 2025).',
-            requirements: [
-                'Subscribe during August 29, 07:00 - September 15, 06:59 (UTC), 2025',
-                'Subscribe to channels streaming Path of Exile II',
-                'Or gift subscriptions to eligible channels',
-                'Prime subscriptions do NOT count',
-                'Overlaps with SUBtember 2025 - one subscription can earn both badges'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/path-of-exile-2-badge/1'
-        }
-    },
-    'zevent-2024': {
-        ja: {
-            title: 'ZEVENT 2024',
-            description: 'ZEVENT 2024（2024年9月6-8日）で入手できました。ZeratoRが主催するフランス最大のチャリティストリーミングマラソンイベントです。',
-            requirements: [
-                '2024年9月6日18:00 - 9月8日23:59（UTC）の期間中に参加',
-                'ZEVENT 2024の公式チャンネルまたは参加ストリーマーの配信を視聴',
-                '最低15分間の継続視聴が必要',
-                'Secours Populaire Français等の5つの慈善団体を支援',
-                '現地36名、リモート100名の計136名のストリーマーが参加',
-                'Twitchアカウントでログイン済み'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/zevent-2024/1'
-        },
-        en: {
-            title: 'ZEVENT 2024',
-            description: 'Obtained during ZEVENT 2024 (September 6-8, 2024). France\'s biggest charity streaming marathon organized by ZeratoR.',
-            requirements: [
-                'Watch during September 6, 18:00 - September 8, 23:59 (UTC), 2024',
-                'Watch ZEVENT 2024 official channels or participating streamers',
-                'Minimum 15 minutes continuous viewing required',
-                'Supporting 5 charities including Secours Populaire Français',
-                '136 streamers participated: 36 on-site, 100 remote',
-                'Must be logged in with Twitch account'
-            ],
-            availability: 'unavailable',
-            url: 'https://www.streamdatabase.com/twitch/global-badges/zevent-2024/1'
-        }
-    },
-    // デフォルトの入手方法（不明なバッジ用）
-    'default': {
-        ja: {
-            title: '特別イベント参加',
-            description: 'このバッジは特定のイベントやキャンペーン期間中に入手可能でした。詳細な入手方法については公式情報をご確認ください。',
-            requirements: [
-                '特定のイベント期間中に参加',
-                '対象配信の視聴または特定アクティビティへの参加',
-                'Twitchアカウントでのログインが必要'
-            ],
-            availability: 'unavailable'
-        },
-        en: {
-            title: 'Special Event Participation',
-            description: 'This badge was obtainable during specific events or campaign periods. Please check official information for detailed obtaining methods.',
-            requirements: [
-                'Participate during specific event periods',
-                'Watch eligible streams or participate in specific activities',
-                'Must be logged in with Twitch account'
-            ],
-            availability: 'unavailable'
-        }
+// 取得済みのバッジメタデータ（入手方法と入手可能状態、言語ごと）
+const badgeMetaCache = {};
+
+// バッジ単体のメタデータを取得（言語ごとに1回だけ）
+async function loadBadgeMeta(badgeId, lang) {
+    const cacheKey = `${badgeId}:${lang}`;
+    if (!badgeMetaCache[cacheKey]) {
+        badgeMetaCache[cacheKey] = fetch(`${BASE_URL}/api/badges/${encodeURIComponent(badgeId)}/meta?lang=${encodeURIComponent(lang)}`)
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`HTTP error! status: ${response.status}`);
+                }
+                return response.json();
+            })
+            .catch(error => {
+                // 失敗した場合は次回に再取得する
+                delete badgeMetaCache[cacheKey];
+                throw error;
+            });
     }
-};
+    return badgeMetaCache[cacheKey];
+}
 
 // URLパラメータを取得
 function getUrlParameters() {
@@ -1422,24 +116,20 @@ async function loadBadgeDetail() {
     }
     
     try {
-        // バックエンドAPIからバッジデータを取得
-        const response = await fetch(`${BASE_URL}/api/badges`);
+        // バックエンドAPIから指定されたバッジのみを取得
+        const response = await fetch(`${BASE_URL}/api/badges/${encodeURIComponent(params.badge)}`);
         
+        if (response.status === 404) {
+            throw new Error('指定されたバッジが見つかりません');
+        }
         if (!response.ok) {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
         
-        const data = await response.json();
+        const badgeSet = await response.json();
         
-        if (data.error) {
-            throw new Error(data.error);
-        }
-        
-        // 指定されたバッジを検索
-        const badgeSet = data.data.find(badge => badge.set_id === params.badge);
-        
-        if (!badgeSet) {
-            throw new Error('指定されたバッジが見つかりません');
+        if (badgeSet.error) {
+            throw new Error(badgeSet.error);
         }
         
         currentBadgeSet = badgeSet;
@@ -1549,10 +239,24 @@ function setupResolutionButtons(version) {
 }
 
 // 入手方法を表示
-function displayObtainMethod(badgeSet) {
+async function displayObtainMethod(badgeSet) {
     const obtainSection = document.getElementById('badge-obtain-section');
-    const obtainMethod = badgeObtainMethods[badgeSet.set_id] || badgeObtainMethods['default'];
-    const langData = obtainMethod[currentLanguage];
+    const lang = currentLanguage;
+    
+    let meta;
+    try {
+        meta = await loadBadgeMeta(badgeSet.set_id, lang);
+    } catch (error) {
+        console.error('Error loading badge meta:', error);
+        return;
+    }
+    
+    // 取得中に言語やバッジが切り替わった場合は表示しない
+    if (lang !== currentLanguage || currentBadgeSet !== badgeSet || !meta.obtain_method) {
+        return;
+    }
+    
+    const langData = meta.obtain_method;
     
     // タイトル
     document.getElementById('obtain-title').textContent = langData.title;
@@ -1570,8 +274,8 @@ function displayObtainMethod(badgeSet) {
     });
     document.getElementById('obtain-requirements').style.display = 'block';
     
-    // 利用可能性（動的判定）
-    const availabilityInfo = getBadgeAvailabilityStatus(badgeSet.set_id);
+    // 利用可能性（サーバーで判定済み）
+    const availabilityInfo = meta.availability;
     const availabilityStatus = document.getElementById('availability-status');
     
     // 状態に応じたスタイルクラスを設定
@@ -1604,8 +308,8 @@ function displayObtainMethod(badgeSet) {
     if (availabilityInfo.startDate && availabilityInfo.endDate) {
         const periodInfo = document.createElement('div');
         periodInfo.className = 'availability-period';
-        const startDateStr = availabilityInfo.startDate.toLocaleDateString('ja-JP');
-        const endDateStr = availabilityInfo.endDate.toLocaleDateString('ja-JP');
+        const startDateStr = new Date(availabilityInfo.startDate).toLocaleDateString('ja-JP');
+        const endDateStr = new Date(availabilityInfo.endDate).toLocaleDateString('ja-JP');
         periodInfo.textContent = `期間: ${startDateStr} - ${endDateStr}`;
         
         const availabilityContainer = document.getElementById('obtain-availability');
@@ -0,0 +1,72 @@
+"""set_id をキーにしたバッジ単体の索引（データバージョンごとに1回だけ構築）"""
+import threading
+
+from payload_cache import PreparedPayload
+
+
+class BadgeIndex:
+    """拡張済みバッジ一覧と badge_details から、バッジ単体のレスポンスを引けるようにする
+
+    バッジごとの PreparedPayload は最初に要求されたときに作る。ETag はそのバッジの
+    内容だけから計算されるため、他のバッジが変わっても変化しない。
+    """
+
+    def __init__(self, version, badges, badge_details):
+        self.version = version
+        self._badges = {badge['set_id']: badge for badge in badges if badge.get('set_id')}
+        self._details = badge_details
+        self._payloads = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, set_id):
+        return set_id in self._badges
+
+    def __len__(self):
+        return len(self._badges)
+
+    def entry(self, set_id):
+        """バッジ単体のデータ（versions・タイムスタンプ・badge_details をまとめたもの）"""
+        badge = self._badges.get(set_id)
+        if badge is None:
+            return None
+        return {
+            **badge,
+            'timestamp': badge.get('created_at'),
+            'details': self._details.get(set_id)
+        }
+
+    def get(self, set_id):
+        """バッジ単体の PreparedPayload（存在しなければNone）"""
+        payload = self._payloads.get(set_id)
+        if payload is not None:
+            return payload
+        entry = self.entry(set_id)
+        if entry is None:
+            return None
+        with self._lock:
+            payload = self._payloads.get(set_id)
+            if payload is None:
+                payload = PreparedPayload(self.version, entry)
+                self._payloads[set_id] = payload
+            return payload
+
+
+class BadgeIndexCache:
+    """最新バージョンの BadgeIndex を1つだけ保持する"""
+
+    def __init__(self):
+        self._index = None
+        self._lock = threading.Lock()
+
+    def get(self, version, builder):
+        """バージョンが変わった場合のみ builder() で (バッジ一覧, badge_details) を作り直す"""
+        index = self._index
+        if index is not None and index.version == version:
+            return index
+        with self._lock:
+            index = self._index
+            if index is None or index.version != version:
+                badges, badge_details = builder()
+                index = BadgeIndex(version, badges, badge_details)
+                self._index = index
+            return index
@@ -0,0 +1,109 @@
+"""バッジset_idとタイムスタンプキーの照合インデックス"""
+from bisect import bisect_right
+
+_SEPARATOR = '\x00'
+
+
+class TimestampMatcher:
+    """タイムスタンプ表から一度だけ構築する照合インデックス
+
+    従来の部分一致ループ（辞書順に ``key in set_id or set_id in key`` を
+    最初に満たすキーを採用）と同じ結果を、set_id の長さにほぼ比例する時間で返す。
+
+    - ``key in set_id``: 全キーから構築したAho-Corasickオートマトンで走査
+    - ``set_id in key``: 全キーを辞書順に連結した文字列を1回 find する
+    両者のうち辞書順で先に来るキーを採用する。
+    """
+
+    def __init__(self, timestamps):
+        self.timestamps = timestamps
+        self._keys = list(timestamps)
+        self._build_automaton()
+        self._build_haystack()
+
+    def _build_automaton(self):
+        # ノードごとの遷移・失敗リンク・到達可能な最小キー番号
+        goto = [{}]
+        own = [None]
+        for index, key in enumerate(self._keys):
+            node = 0
+            for ch in key:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    own.append(None)
+                node = nxt
+            if own[node] is None:
+                own[node] = index
+
+        fail = [0] * len(goto)
+        best = list(own)
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for ch, child in goto[node].items():
+                if node == 0:
+                    fail[child] = 0
+                else:
+                    state = fail[node]
+                    while state and ch not in goto[state]:
+                        state = fail[state]
+                    fail[child] = goto[state].get(ch, 0)
+                queue.append(child)
+            # 失敗リンク先（より浅いノード）で一致するキーも含めた最小番号
+            inherited = best[fail[node]]
+            if inherited is not None and (best[node] is None or inherited < best[node]):
+                best[node] = inherited
+
+        self._goto = goto
+        self._fail = fail
+        self._best = best
+
+    def _build_haystack(self):
+        self._haystack = _SEPARATOR.join(self._keys)
+        self._starts = []
+        offset = 0
+        for key in self._keys:
+            self._starts.append(offset)
+            offset += len(key) + 1
+
+    def _first_key_inside(self, set_id):
+        """set_id に含まれるキーのうち最小の番号"""
+        goto, fail, best = self._goto, self._fail, self._best
+        found = best[0]
+        node = 0
+        for ch in set_id:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            candidate = best[node]
+            if candidate is not None and (found is None or candidate < found):
+                found = candidate
+                if found == 0:
+                    break
+        return found
+
+    def _first_key_containing(self, set_id):
+        """set_id を含むキーのうち最小の番号"""
+        if _SEPARATOR in set_id:
+            return next((i for i, key in enumerate(self._keys) if set_id in key), None)
+        position = self._haystack.find(set_id)
+        if position < 0:
+            return None
+        return bisect_right(self._starts, position) - 1
+
+    def partial_match(self, set_id):
+        """部分一致で最初に見つかるキーのタイムスタンプを返す（無ければNone）"""
+        if not self._keys:
+            return None
+
+        inside = self._first_key_inside(set_id)
+        containing = self._first_key_containing(set_id)
+        candidates = [i for i in (inside, containing) if i is not None]
+        if not candidates:
+            return None
+        return self.timestamps[self._keys[min(candidates)]]
@@ -0,0 +1,82 @@
+"""バッジの入手方法（日英）・推定作成日のメタデータ
+
+以前は badge-detail.js / script.js に埋め込まれていた表を badge_metadata.json に移し、
+サーバー側でバッジ単体・言語ごとのバンドルとして返す。
+"""
+import hashlib
+import json
+import os
+import re
+from datetime import date, timedelta
+
+from availability import get_badge_availability_status
+
+METADATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'badge_metadata.json')
+
+SUPPORTED_LANGUAGES = ('ja', 'en')
+DEFAULT_LANGUAGE = 'ja'
+DEFAULT_OBTAIN_METHOD = 'default'
+
+_YEAR = re.compile(r'(\d{4})')
+
+
+def load_badge_metadata(path=METADATA_FILE):
+    """メタデータを読み込み (データ, ファイル内容のハッシュ) を返す"""
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return {'obtain_methods': {}, 'creation_dates': {}}, ''
+    return json.loads(raw.decode('utf-8')), hashlib.sha1(raw).hexdigest()
+
+
+def normalize_language(lang):
+    """未対応の言語は既定の日本語にする"""
+    return lang if lang in SUPPORTED_LANGUAGES else DEFAULT_LANGUAGE
+
+
+def find_obtain_method(metadata, set_id, lang):
+    """バッジの入手方法（無ければ汎用説明）と、そのバッジ固有のものかを返す（ストアを使わない環境用）"""
+    obtain_methods = metadata.get('obtain_methods', {})
+    if set_id in obtain_methods:
+        return obtain_methods[set_id].get(lang), True
+    return obtain_methods.get(DEFAULT_OBTAIN_METHOD, {}).get(lang), False
+
+
+def estimate_created_date(set_id, index, creation_dates):
+    """正確な追加日が無いバッジの推定作成日（YYYY-MM-DD）"""
+    # 完全一致
+    if set_id in creation_dates:
+        return creation_dates[set_id]
+
+    # 部分一致
+    prefix = set_id.split('_')[0]
+    for key, created_date in creation_dates.items():
+        if key in set_id or prefix in key:
+            return created_date
+
+    # バッジIDに含まれる年
+    match = _YEAR.search(set_id)
+    if match and 2011 <= int(match.group(1)) <= 2025:
+        return f'{match.group(1)}-01-01'
+
+    # APIの順序に基づいて2011年から推定（10個ごとに1週間進める）
+    return (date(2011, 6, 1) + timedelta(weeks=index // 10)).isoformat()
+
+
+def build_meta_bundle(set_id, lang, obtain_method, periods, now=None):
+    """バッジ単体・1言語分のメタデータ（入手方法と入手可能状態）"""
+    return {
+        'set_id': set_id,
+        'lang': lang,
+        'obtain_method': obtain_method,
+        'availability': get_badge_availability_status(periods, set_id, now, lang)
+    }
+
+
+def build_availability_map(periods, lang, now=None):
+    """入手可能期間の情報があるバッジ全件の入手可能状態（一覧ページ用）"""
+    return {
+        set_id: get_badge_availability_status(periods, set_id, now, lang)
+        for set_id in periods
+    }
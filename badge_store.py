@@ -0,0 +1,651 @@
+"""SQLite（WALモード）によるバッジデータストア
+
+known_badges.json・badge_database.json・latest_badge_timestamps.json の全体書き換えに代わり、
+既知バッジ・タイムスタンプ・バッジ詳細・承認待ちキュー・更新履歴をテーブルに保持して
+差分のみをトランザクションで書き込む。静的デプロイ用に従来形式のJSONを書き出すこともできる。
+
+    python badge_store.py import   # 既存のJSONファイルを取り込む（初回のみ）
+    python badge_store.py export   # 従来形式のJSONファイルを書き出す
+    python badge_store.py compact [N]  # 変更ログを N 件以内に圧縮する
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime, timezone
+
+DEFAULT_DB_PATH = os.getenv('BADGE_DB_PATH', 'badges.db')
+
+# 変更ログの保持件数（超えたら古い半分を削除し、それより前のカーソルには再同期を求める）
+CHANGE_LOG_MAX_ROWS = int(os.getenv('CHANGE_LOG_MAX_ROWS', '5000'))
+
+# /api/events の再送用に保持するイベントの件数
+EVENT_LOG_MAX_ROWS = int(os.getenv('EVENT_LOG_MAX_ROWS', '1000'))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS known_badges (
+    set_id TEXT PRIMARY KEY,
+    added_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS timestamps (
+    set_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_timestamps_created_at ON timestamps (created_at);
+CREATE TABLE IF NOT EXISTS badge_details (
+    set_id TEXT PRIMARY KEY,
+    name TEXT,
+    description TEXT,
+    created_at TEXT,
+    user_count INTEGER,
+    source TEXT,
+    last_updated TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS record_hashes (
+    set_id TEXT PRIMARY KEY,
+    record_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS change_log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    set_id TEXT NOT NULL,
+    op TEXT NOT NULL,
+    changed_at TEXT NOT NULL,
+    record TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_change_log_changed_at ON change_log (changed_at);
+CREATE TABLE IF NOT EXISTS pending_badges (
+    position INTEGER PRIMARY KEY AUTOINCREMENT,
+    badge_id TEXT NOT NULL UNIQUE,
+    research_needed INTEGER NOT NULL DEFAULT 1,
+    discovered_at TEXT,
+    info TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pending_research_needed ON pending_badges (research_needed);
+CREATE TABLE IF NOT EXISTS update_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    badges_added INTEGER NOT NULL,
+    total_badges INTEGER NOT NULL,
+    new_badges TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_update_history_timestamp ON update_history (timestamp);
+CREATE TABLE IF NOT EXISTS obtain_methods (
+    set_id TEXT NOT NULL,
+    lang TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (set_id, lang)
+);
+CREATE TABLE IF NOT EXISTS creation_dates (
+    set_id TEXT PRIMARY KEY,
+    created_date TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS admin_jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_admin_jobs_kind_status ON admin_jobs (kind, status);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    type TEXT NOT NULL,
+    data TEXT NOT NULL,
+    dedupe_key TEXT UNIQUE,
+    created_at TEXT NOT NULL
+);
+"""
+
+
+def record_hash(badge_data):
+    """差分判定用のバッジレコードのハッシュ（取得日時などの揮発的な値は含めない）"""
+    record = [badge_data.get(field) for field in
+              ('name', 'description', 'created_at', 'user_count', 'source')]
+    return hashlib.sha1(json.dumps(record, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def change_record(badge_data):
+    """変更ログに記録するバッジの内容"""
+    return {field: badge_data.get(field) for field in
+            ('name', 'description', 'created_at', 'user_count', 'source')}
+
+
+def utc_isoformat(value=None):
+    """変更ログの日時の形式（UTC・マイクロ秒まで固定の桁数で、文字列の大小が時刻の前後と一致する）"""
+    value = value or datetime.now(timezone.utc)
+    return value.astimezone(timezone.utc).isoformat(timespec='microseconds')
+
+
+def parse_since(value):
+    """ISO形式の日時を utc_isoformat の形式にする（タイムゾーンの無い値はサーバーのローカル時刻とみなす）
+
+    解釈できない値は ValueError。
+    """
+    return utc_isoformat(datetime.fromisoformat(value))
+
+
+def write_json_atomic(path, data, indent=2):
+    """一時ファイルに書き込んでから置き換える（読み手が書きかけのファイルを見ないように）"""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=indent)
+    os.replace(tmp_path, path)
+
+
+class BadgeStore:
+    """バッジデータのSQLiteストア（スレッドごとに接続を持つ）"""
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+        self._migrate_change_log_times()
+
+    def _migrate_change_log_times(self):
+        """以前のバージョンがローカル時刻（タイムゾーン無し）で記録した変更ログの日時をUTCに変換する"""
+        conn = self._connect()
+        rows = conn.execute(
+            "SELECT seq, changed_at FROM change_log WHERE changed_at NOT LIKE '%+00:00'").fetchall()
+        compacted_at = self.get_meta('change_log_compacted_at')
+        if not rows and (not compacted_at or compacted_at.endswith('+00:00')):
+            return
+        with conn:
+            conn.executemany('UPDATE change_log SET changed_at = ? WHERE seq = ?',
+                             [(parse_since(row['changed_at']), row['seq']) for row in rows])
+            if compacted_at and not compacted_at.endswith('+00:00'):
+                conn.execute("UPDATE meta SET value = ? WHERE key = 'change_log_compacted_at'",
+                             (parse_since(compacted_at),))
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def is_empty(self):
+        conn = self._connect()
+        for table in ('known_badges', 'badge_details', 'pending_badges'):
+            if conn.execute(f'SELECT 1 FROM {table} LIMIT 1').fetchone():
+                return False
+        return True
+
+    # --- メタ情報 ---
+
+    def get_meta(self, key, default=None):
+        row = self._connect().execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row['value'] if row else default
+
+    def set_meta(self, key, value):
+        with self._connect() as conn:
+            conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    def set_meta_many(self, values):
+        """複数のメタ情報を1トランザクションで保存（値がNoneのキーは削除）"""
+        with self._connect() as conn:
+            for key, value in values.items():
+                if value is None:
+                    conn.execute('DELETE FROM meta WHERE key = ?', (key,))
+                else:
+                    conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    # --- 既知のバッジ ---
+
+    def get_known_badges(self):
+        return {row['set_id'] for row in self._connect().execute('SELECT set_id FROM known_badges')}
+
+    def add_known_badges(self, badge_ids, last_checked=None):
+        """既知のバッジを追加（last_checked も同じトランザクションで更新）"""
+        now = datetime.now().isoformat()
+        with self._connect() as conn:
+            conn.executemany(
+                'INSERT OR IGNORE INTO known_badges (set_id, added_at) VALUES (?, ?)',
+                [(badge_id, now) for badge_id in badge_ids]
+            )
+            if last_checked is not None:
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_checked', ?)",
+                             (last_checked,))
+
+    # --- 承認待ちキュー ---
+
+    def list_pending(self):
+        """キューの全バッジ（追加順）"""
+        rows = self._connect().execute('SELECT info FROM pending_badges ORDER BY position')
+        return [json.loads(row['info']) for row in rows]
+
+    def save_pending(self, badge_info):
+        """承認待ちバッジを追加・更新する"""
+        with self._connect() as conn:
+            self._save_pending(conn, badge_info)
+
+    def _save_pending(self, conn, badge_info):
+        conn.execute(
+            """INSERT INTO pending_badges (badge_id, research_needed, discovered_at, info)
+               VALUES (?, ?, ?, ?)
+               ON CONFLICT (badge_id) DO UPDATE SET
+                   research_needed = excluded.research_needed,
+                   info = excluded.info""",
+            (badge_info['id'], int(bool(badge_info.get('research_needed', True))),
+             badge_info.get('discovered_at'), json.dumps(badge_info, ensure_ascii=False))
+        )
+
+    # --- タイムスタンプ・バッジ詳細 ---
+
+    def get_timestamps(self):
+        rows = self._connect().execute('SELECT set_id, created_at FROM timestamps ORDER BY rowid')
+        return {row['set_id']: row['created_at'] for row in rows}
+
+    def get_badge_details(self):
+        rows = self._connect().execute('SELECT * FROM badge_details ORDER BY rowid')
+        return {
+            row['set_id']: {
+                'name': row['name'],
+                'description': row['description'],
+                'created_at': row['created_at'],
+                'user_count': row['user_count'],
+                'last_updated': row['last_updated'],
+                'source': row['source']
+            }
+            for row in rows
+        }
+
+    def record_scrape(self, current_badges):
+        """Stream Databaseから取得したバッジ一覧のうち、変化したものだけを1トランザクションで反映する
+
+        追加・変更・削除は変更ログにも記録する。削除は全バッジの詳細が取れた場合
+        （__NEXT_DATA__ から抽出できた場合）のみ判定する。
+        戻り値は (変化・削除されたバッジIDのリスト, 追加前の件数, 追加後の件数)。
+        変化が無ければ何も書き込まない。更新履歴には新しく追加されたバッジだけを記録する。
+        """
+        conn = self._connect()
+        known_hashes = {row['set_id']: row['record_hash']
+                        for row in conn.execute('SELECT set_id, record_hash FROM record_hashes')}
+        changed = {}
+        for badge_id, badge_data in current_badges.items():
+            digest = record_hash(badge_data)
+            if known_hashes.get(badge_id) != digest:
+                changed[badge_id] = (badge_data, digest)
+
+        removed = []
+        complete = current_badges and all(
+            badge.get('source', 'stream_database') == 'stream_database' for badge in current_badges.values())
+        if complete:
+            removed = sorted(set(known_hashes) - set(current_badges))
+
+        old_count = conn.execute('SELECT COUNT(*) FROM timestamps').fetchone()[0]
+        if not changed and not removed:
+            return [], old_count, old_count
+
+        now = datetime.now().isoformat()
+        changed_at = utc_isoformat()
+        added = [badge_id for badge_id in changed if badge_id not in known_hashes]
+        timestamp_rows = []
+        detail_rows = []
+        change_rows = []
+        for badge_id, (badge_data, _) in changed.items():
+            op = 'modified' if badge_id in known_hashes else 'added'
+            change_rows.append((badge_id, op, changed_at,
+                                json.dumps(change_record(badge_data), ensure_ascii=False)))
+            created_at = badge_data.get('created_at')
+            if created_at and created_at.strip():
+                timestamp_rows.append((badge_id, created_at, now))
+            detail_rows.append((
+                badge_id, badge_data.get('name', ''), badge_data.get('description', ''), created_at,
+                badge_data.get('user_count', 0), badge_data.get('source', 'stream_database'), now
+            ))
+
+        with conn:
+            conn.executemany(
+                """INSERT INTO timestamps (set_id, created_at, updated_at) VALUES (?, ?, ?)
+                   ON CONFLICT (set_id) DO UPDATE SET
+                       created_at = excluded.created_at, updated_at = excluded.updated_at
+                   WHERE timestamps.created_at != excluded.created_at""",
+                timestamp_rows
+            )
+            conn.executemany(
+                'INSERT OR REPLACE INTO badge_details '
+                '(set_id, name, description, created_at, user_count, source, last_updated) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                detail_rows
+            )
+            conn.executemany(
+                'INSERT OR REPLACE INTO record_hashes (set_id, record_hash) VALUES (?, ?)',
+                [(badge_id, digest) for badge_id, (_, digest) in changed.items()]
+            )
+            if removed:
+                conn.executemany('DELETE FROM record_hashes WHERE set_id = ?', [(b,) for b in removed])
+                conn.executemany('DELETE FROM badge_details WHERE set_id = ?', [(b,) for b in removed])
+                change_rows.extend((badge_id, 'removed', changed_at, None) for badge_id in removed)
+            conn.executemany(
+                'INSERT INTO change_log (set_id, op, changed_at, record) VALUES (?, ?, ?, ?)',
+                change_rows
+            )
+            new_count = conn.execute('SELECT COUNT(*) FROM timestamps').fetchone()[0]
+            conn.execute(
+                'INSERT INTO update_history (timestamp, badges_added, total_badges, new_badges) '
+                'VALUES (?, ?, ?, ?)',
+                (now, len(added), new_count, json.dumps(added[:10]))
+            )
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_updated', ?)", (now,))
+        self.compact_change_log()
+        return list(changed) + removed, old_count, new_count
+
+    # --- 変更ログ ---
+
+    def change_log_version(self):
+        """変更ログの最新の連番（変更が無ければ0。圧縮でログが空になっても戻らない）"""
+        row = self._connect().execute('SELECT MAX(seq) FROM change_log').fetchone()
+        return max(row[0] or 0, self.compacted_through())
+
+    def compacted_through(self):
+        """圧縮で削除済みの最大の連番（このより前のカーソルには再同期が必要）"""
+        return int(self.get_meta('change_log_compacted_through', '0'))
+
+    def compact_change_log(self, max_rows=CHANGE_LOG_MAX_ROWS, keep=None):
+        """保持件数を超えたら新しい keep 件（既定は max_rows の半分）だけを残す"""
+        conn = self._connect()
+        count = conn.execute('SELECT COUNT(*) FROM change_log').fetchone()[0]
+        if count <= max_rows:
+            return 0
+        keep = max_rows // 2 if keep is None else keep
+        with conn:
+            cutoff = conn.execute('SELECT seq, changed_at FROM change_log ORDER BY seq DESC LIMIT 1 OFFSET ?',
+                                  (keep,)).fetchone()
+            deleted = conn.execute('DELETE FROM change_log WHERE seq <= ?', (cutoff['seq'],)).rowcount
+            conn.executemany('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', [
+                ('change_log_compacted_through', str(cutoff['seq'])),
+                ('change_log_compacted_at', cutoff['changed_at'])
+            ])
+        return deleted
+
+    def get_changes(self, since, limit=500):
+        """since（連番 または ISO形式の日時）より後の変更をバッジごとにまとめて返す
+
+        日時はタイムゾーン付き（Z・+09:00など）で指定でき、UTCに揃えて比較する。
+        カーソルが圧縮済みの範囲を指す場合は resync_required を返す。解釈できない since は ValueError。
+        """
+        conn = self._connect()
+        version = self.change_log_version()
+        compacted_through = self.compacted_through()
+
+        if isinstance(since, str) and not since.isdigit():
+            # 日時指定は、その日時までに記録された最後の連番をカーソルとする
+            since = parse_since(since)
+            row = conn.execute('SELECT MAX(seq) FROM change_log WHERE changed_at <= ?', (since,)).fetchone()
+            if row[0] is not None:
+                since = row[0]
+            elif compacted_through == 0 or since >= self.get_meta('change_log_compacted_at', ''):
+                since = compacted_through
+            else:
+                since = -1
+        since = int(since)
+
+        if since < compacted_through or since > version:
+            return {'version': version, 'resync_required': True, 'changes': [], 'has_more': False}
+
+        rows = conn.execute(
+            'SELECT seq, set_id, op, changed_at, record FROM change_log WHERE seq > ? ORDER BY seq LIMIT ?',
+            (since, limit + 1)
+        ).fetchall()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        changes = {}
+        for row in rows:
+            previous = changes.pop(row['set_id'], None)
+            op = row['op']
+            if previous is not None and previous['op'] == 'added':
+                if op == 'removed':
+                    # 期間内に追加されて削除されたバッジは差分に含めない
+                    continue
+                op = 'added'
+            changes[row['set_id']] = {
+                'set_id': row['set_id'],
+                'op': op,
+                'seq': row['seq'],
+                'changed_at': row['changed_at'],
+                'badge': json.loads(row['record']) if row['record'] else None
+            }
+
+        return {
+            'version': rows[-1]['seq'] if rows else since,
+            'resync_required': False,
+            'changes': list(changes.values()),
+            'has_more': has_more
+        }
+
+    def get_update_history(self, limit=10):
+        rows = self._connect().execute(
+            'SELECT * FROM update_history ORDER BY id DESC LIMIT ?', (limit,)).fetchall()
+        return [
+            {
+                'timestamp': row['timestamp'],
+                'badges_added': row['badges_added'],
+                'total_badges': row['total_badges'],
+                'new_badges': json.loads(row['new_badges'])
+            }
+            for row in reversed(rows)
+        ]
+
+    # --- 入手方法・推定作成日（badge_metadata.json） ---
+
+    def sync_metadata(self, metadata, metadata_hash):
+        """メタデータファイルが前回の取り込みから変わっていれば入れ替える（変わったらTrue）"""
+        if metadata_hash and self.get_meta('badge_metadata_hash') == metadata_hash:
+            return False
+        with self._connect() as conn:
+            conn.execute('DELETE FROM obtain_methods')
+            conn.execute('DELETE FROM creation_dates')
+            conn.executemany(
+                'INSERT INTO obtain_methods (set_id, lang, data) VALUES (?, ?, ?)',
+                [(set_id, lang, json.dumps(data, ensure_ascii=False))
+                 for set_id, languages in metadata.get('obtain_methods', {}).items()
+                 for lang, data in languages.items()]
+            )
+            conn.executemany('INSERT INTO creation_dates (set_id, created_date) VALUES (?, ?)',
+                             list(metadata.get('creation_dates', {}).items()))
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('badge_metadata_hash', ?)",
+                         (metadata_hash,))
+        return True
+
+    def get_obtain_method(self, set_id, lang, default_id='default'):
+        """バッジの入手方法（無ければ default_id の汎用説明）と、そのバッジ固有のものか"""
+        row = self._connect().execute(
+            'SELECT set_id, data FROM obtain_methods WHERE set_id IN (?, ?) AND lang = ? '
+            'ORDER BY set_id = ? DESC LIMIT 1', (set_id, default_id, lang, set_id)).fetchone()
+        if row is None:
+            return None, False
+        return json.loads(row['data']), row['set_id'] == set_id
+
+    def get_obtain_methods(self):
+        """全バッジの入手方法（badge_metadata.json と同じ {set_id: {言語: データ}} の形）"""
+        obtain_methods = {}
+        for row in self._connect().execute('SELECT set_id, lang, data FROM obtain_methods ORDER BY rowid'):
+            obtain_methods.setdefault(row['set_id'], {})[row['lang']] = json.loads(row['data'])
+        return obtain_methods
+
+    def get_creation_dates(self):
+        rows = self._connect().execute('SELECT set_id, created_date FROM creation_dates ORDER BY rowid')
+        return {row['set_id']: row['created_date'] for row in rows}
+
+    # --- 管理ジョブ（admin_jobs.JobManager から使う。どのワーカーからも状態を取得できる） ---
+
+    def claim_job(self, job, history=50, is_abandoned=None):
+        """同じ種類の未完了ジョブが無ければ job を登録する
+
+        戻り値は (ジョブ, 既存ジョブに合流したか)。確認と登録は1トランザクションで行うため、
+        複数のワーカーが同時に登録しても未完了のジョブは種類ごとに1つになる。
+        is_abandoned(ジョブ) が True を返す未完了ジョブ（実行していたワーカーが終了したもの）は失敗にする。
+        """
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            rows = conn.execute(
+                "SELECT data FROM admin_jobs WHERE kind = ? AND status IN ('queued', 'running') "
+                'ORDER BY created_at', (job['kind'],)).fetchall()
+            for row in rows:
+                active = json.loads(row['data'])
+                if is_abandoned is None or not is_abandoned(active):
+                    conn.commit()
+                    return active, True
+                active.update(status='failed', error='Worker exited before the job finished',
+                              finished_at=datetime.now().isoformat())
+                self._write_job(conn, active)
+
+            conn.execute('INSERT INTO admin_jobs (id, kind, status, created_at, data) VALUES (?, ?, ?, ?, ?)',
+                         (job['id'], job['kind'], job['status'], job['created_at'],
+                          json.dumps(job, ensure_ascii=False)))
+            # 完了したジョブは新しい history 件だけ残す
+            conn.execute(
+                "DELETE FROM admin_jobs WHERE status IN ('succeeded', 'failed') AND id NOT IN "
+                '(SELECT id FROM admin_jobs ORDER BY created_at DESC LIMIT ?)', (history,))
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        return job, False
+
+    @staticmethod
+    def _write_job(conn, job):
+        conn.execute('UPDATE admin_jobs SET status = ?, data = ? WHERE id = ?',
+                     (job['status'], json.dumps(job, ensure_ascii=False), job['id']))
+
+    def update_job(self, job):
+        with self._connect() as conn:
+            self._write_job(conn, job)
+
+    def get_job(self, job_id):
+        row = self._connect().execute('SELECT data FROM admin_jobs WHERE id = ?', (job_id,)).fetchone()
+        return json.loads(row['data']) if row else None
+
+    # --- SSEイベント（events.EventBroker から使う。どのワーカーからも配信・再送できる） ---
+
+    def append_event(self, event_type, data, dedupe_key=None, keep=EVENT_LOG_MAX_ROWS):
+        """イベントを追記して連番を返す
+
+        同じ dedupe_key のイベントが既にあれば追記せず None を返す（複数のワーカーが
+        同じ変更を検出しても1回だけ配信する）。新しい keep 件より古いイベントは削除する。
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'INSERT OR IGNORE INTO events (type, data, dedupe_key, created_at) VALUES (?, ?, ?, ?)',
+                (event_type, json.dumps(data, ensure_ascii=False), dedupe_key, datetime.now().isoformat()))
+            if cursor.rowcount == 0:
+                return None
+            event_id = cursor.lastrowid
+            conn.execute('DELETE FROM events WHERE id <= ?', (event_id - keep,))
+        return event_id
+
+    def events_after(self, event_id, limit=500):
+        """event_id より後のイベントを (連番, 種類, データ) のリストで古い順に返す"""
+        rows = self._connect().execute(
+            'SELECT id, type, data FROM events WHERE id > ? ORDER BY id LIMIT ?', (event_id, limit)).fetchall()
+        return [(row['id'], row['type'], json.loads(row['data'])) for row in rows]
+
+    def last_event_id(self):
+        """最新のイベントの連番（イベントが無ければ0）"""
+        row = self._connect().execute('SELECT MAX(id) FROM events').fetchone()
+        return row[0] or 0
+
+    # --- JSONとの相互変換 ---
+
+    def import_json(self, known_path='known_badges.json', database_path='badge_database.json',
+                    latest_path='latest_badge_timestamps.json'):
+        """既存のJSONファイルを1回で取り込む"""
+        def load(path):
+            try:
+                with open(path, 'r') as f:
+                    return json.load(f)
+            except FileNotFoundError:
+                return {}
+
+        known = load(known_path)
+        database = load(database_path)
+        latest = load(latest_path)
+        now = datetime.now().isoformat()
+
+        with self._connect() as conn:
+            conn.executemany('INSERT OR IGNORE INTO known_badges (set_id, added_at) VALUES (?, ?)',
+                             [(badge_id, now) for badge_id in known.get('badges', [])])
+            if known.get('last_checked'):
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_checked', ?)",
+                             (known['last_checked'],))
+            for badge_info in known.get('new_badges_queue', []):
+                self._save_pending(conn, badge_info)
+
+            timestamps = {**database.get('timestamps', {}), **latest}
+            conn.executemany('INSERT OR REPLACE INTO timestamps (set_id, created_at, updated_at) VALUES (?, ?, ?)',
+                             [(badge_id, created_at, now) for badge_id, created_at in timestamps.items()])
+            conn.executemany(
+                'INSERT OR REPLACE INTO badge_details '
+                '(set_id, name, description, created_at, user_count, source, last_updated) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(badge_id, d.get('name', ''), d.get('description', ''), d.get('created_at'),
+                  d.get('user_count', 0), d.get('source'), d.get('last_updated') or now)
+                 for badge_id, d in database.get('badge_details', {}).items()]
+            )
+            conn.executemany(
+                'INSERT OR REPLACE INTO record_hashes (set_id, record_hash) VALUES (?, ?)',
+                [(badge_id, record_hash(d)) for badge_id, d in database.get('badge_details', {}).items()]
+            )
+            conn.executemany(
+                'INSERT INTO update_history (timestamp, badges_added, total_badges, new_badges) '
+                'VALUES (?, ?, ?, ?)',
+                [(h.get('timestamp', now), h.get('badges_added', 0), h.get('total_badges', 0),
+                  json.dumps(h.get('new_badges', []))) for h in database.get('update_history', [])]
+            )
+            last_updated = database.get('metadata', {}).get('last_updated')
+            if last_updated:
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_updated', ?)",
+                             (last_updated,))
+
+    def export_json(self, known_path='known_badges.json', database_path='badge_database.json',
+                    latest_path='latest_badge_timestamps.json'):
+        """静的デプロイ用に従来形式のJSONファイルを書き出す"""
+        timestamps = self.get_timestamps()
+        write_json_atomic(known_path, {
+            'badges': sorted(self.get_known_badges()),
+            'last_checked': self.get_meta('last_checked', datetime.now().isoformat()),
+            'new_badges_queue': self.list_pending()
+        })
+        write_json_atomic(database_path, {
+            'metadata': {
+                'last_updated': self.get_meta('last_updated', ''),
+                'version': '1.0',
+                'source': 'stream_database_integration',
+                'total_badges': len(timestamps)
+            },
+            'timestamps': timestamps,
+            'badge_details': self.get_badge_details(),
+            'update_history': self.get_update_history(10)
+        })
+        write_json_atomic(latest_path, timestamps)
+
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else ''
+    store = BadgeStore()
+    if command == 'import':
+        store.import_json()
+        print(f"Imported JSON files into {store.path}")
+    elif command == 'export':
+        store.export_json()
+        print(f"Exported {store.path} to JSON files")
+    elif command == 'compact':
+        keep = int(sys.argv[2]) if len(sys.argv) > 2 else CHANGE_LOG_MAX_ROWS
+        deleted = store.compact_change_log(max_rows=keep, keep=keep)
+        print(f"Compacted change log: {deleted} entries removed")
+    else:
+        print(__doc__)
+        sys.exit(1)
@@ -0,0 +1,325 @@
+"""/api/badges・/api/emotes のフィールド選択・絞り込み・並び替え・カーソルページング・コンパクト形式
+
+並び替えの順序（API順・新しい順・古い順・名前順）はデータバージョンごとに1回だけ
+計算しておき、リクエストごとには並び替えない。同じクエリの結果は
+シリアライズ・圧縮済みのまま少数だけ保持する。
+"""
+import base64
+import binascii
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from availability import get_badge_availability_status, parse_iso_datetime
+from compact_format import COMPACT_FORMAT, encode_badges, encode_emotes
+from payload_cache import PreparedPayload
+
+SORT_ORDERS = ('api', 'newest', 'oldest', 'name')
+FORMATS = ('json', COMPACT_FORMAT)
+AVAILABILITY_STATUSES = ('available', 'limited', 'upcoming', 'expired', 'future', 'unknown')
+MAX_PAGE_SIZE = 500
+
+# 一覧の形式を切り替えるクエリパラメータ（キャッシュ回避用の _ や lang などは対象外）
+CATALOG_PARAMS = ('fields', 'sort', 'limit', 'cursor', 'has_real_timestamp',
+                  'created_after', 'created_before', 'availability', 'format')
+
+# バージョンごとに保持するクエリ結果の数
+QUERY_CACHE_SIZE = 64
+
+
+class QueryError(ValueError):
+    """クエリパラメータが不正な場合の例外（400で返す）"""
+
+
+class CatalogSpec:
+    """一覧の種類ごとの設定（IDのキー・名前・日付の取り出し方）"""
+
+    def __init__(self, kind, id_field, name_of, sort_date_of, created_at_of, encode_compact,
+                 availability=False):
+        self.kind = kind
+        self.id_field = id_field
+        self.name_of = name_of
+        # 並び替えに使う日付（バッジは推定作成日も含む）
+        self.sort_date_of = sort_date_of
+        # 絞り込みに使う正確な追加日（無ければNone）
+        self.created_at_of = created_at_of
+        # format=compact の要素の配列を列形式にする関数
+        self.encode_compact = encode_compact
+        self.availability = availability
+
+
+BADGE_SPEC = CatalogSpec(
+    'badges', 'set_id',
+    name_of=lambda badge: badge.get('set_id', ''),
+    sort_date_of=lambda badge: (badge.get('created_at') if badge.get('has_real_timestamp')
+                                else badge.get('estimated_created_at')),
+    created_at_of=lambda badge: badge.get('created_at') if badge.get('has_real_timestamp') else None,
+    encode_compact=encode_badges,
+    availability=True
+)
+
+EMOTE_SPEC = CatalogSpec(
+    'emotes', 'id',
+    name_of=lambda emote: emote.get('name', ''),
+    sort_date_of=lambda emote: emote.get('created_at'),
+    created_at_of=lambda emote: emote.get('created_at'),
+    encode_compact=encode_emotes
+)
+
+
+class CatalogQuery:
+    """正規化済みのクエリ"""
+    __slots__ = ('fields', 'sort', 'limit', 'cursor', 'has_real_timestamp',
+                 'created_after', 'created_before', 'availability', 'format')
+
+    def __init__(self, fields=None, sort='api', limit=None, cursor=None, has_real_timestamp=None,
+                 created_after=None, created_before=None, availability=None, format='json'):
+        self.fields = fields
+        self.sort = sort
+        self.limit = limit
+        self.cursor = cursor
+        self.has_real_timestamp = has_real_timestamp
+        self.created_after = created_after
+        self.created_before = created_before
+        self.availability = availability
+        self.format = format
+
+    def cache_key(self):
+        return (self.fields, self.sort, self.limit, self.cursor, self.has_real_timestamp,
+                self.created_after, self.created_before, self.availability, self.format)
+
+    @property
+    def has_filters(self):
+        return (self.has_real_timestamp is not None or self.created_after is not None
+                or self.created_before is not None or self.availability is not None)
+
+
+def _parse_bool(name, value):
+    if value in ('true', '1'):
+        return True
+    if value in ('false', '0'):
+        return False
+    raise QueryError(f'{name} must be true or false')
+
+
+def _parse_date(name, value):
+    parsed = parse_iso_datetime(value)
+    if parsed is None:
+        raise QueryError(f'{name} must be an ISO 8601 date')
+    return parsed
+
+
+def encode_cursor(sort, last_id):
+    raw = json.dumps({'s': sort, 'k': last_id}, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return data['s'], data['k']
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise QueryError('invalid cursor')
+
+
+def is_catalog_query(args):
+    """フィールド選択・並び替え・ページング・絞り込み・形式の指定があるか"""
+    return any(name in args for name in CATALOG_PARAMS)
+
+
+def parse_catalog_query(args, spec):
+    """リクエストのクエリパラメータ（MultiDict など）を CatalogQuery に変換する"""
+    fields = args.get('fields')
+    if fields is not None:
+        fields = tuple(sorted({field.strip() for field in fields.split(',') if field.strip()}))
+        if not fields:
+            raise QueryError('fields must not be empty')
+
+    sort = args.get('sort', 'api')
+    if sort not in SORT_ORDERS:
+        raise QueryError(f'sort must be one of: {", ".join(SORT_ORDERS)}')
+
+    limit = args.get('limit')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise QueryError('limit must be an integer')
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise QueryError(f'limit must be between 1 and {MAX_PAGE_SIZE}')
+
+    cursor = args.get('cursor') or None
+    if cursor is not None:
+        cursor_sort, _ = decode_cursor(cursor)
+        if cursor_sort != sort:
+            raise QueryError('cursor does not match sort')
+
+    has_real_timestamp = args.get('has_real_timestamp')
+    if has_real_timestamp is not None:
+        has_real_timestamp = _parse_bool('has_real_timestamp', has_real_timestamp)
+
+    created_after = args.get('created_after')
+    if created_after is not None:
+        created_after = _parse_date('created_after', created_after)
+    created_before = args.get('created_before')
+    if created_before is not None:
+        created_before = _parse_date('created_before', created_before)
+
+    availability = args.get('availability')
+    if availability is not None:
+        if not spec.availability:
+            raise QueryError(f'availability filter is not supported for {spec.kind}')
+        availability = tuple(sorted({status.strip() for status in availability.split(',') if status.strip()}))
+        unknown = [status for status in availability if status not in AVAILABILITY_STATUSES]
+        if not availability or unknown:
+            raise QueryError(f'availability must be one of: {", ".join(AVAILABILITY_STATUSES)}')
+
+    response_format = args.get('format', 'json')
+    if response_format not in FORMATS:
+        raise QueryError(f'format must be one of: {", ".join(FORMATS)}')
+    if response_format == COMPACT_FORMAT and fields is not None:
+        raise QueryError('fields cannot be combined with format=compact')
+
+    return CatalogQuery(fields, sort, limit, cursor, has_real_timestamp,
+                        created_after, created_before, availability, response_format)
+
+
+def project(item, fields):
+    """ドット区切りのフィールド（例: versions.image_url_1x）だけを残す（リストは要素ごとに適用）"""
+    tree = {}
+    for field in fields:
+        node = tree
+        for part in field.split('.'):
+            node = node.setdefault(part, {})
+    return _project(item, tree)
+
+
+def _project(value, tree):
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [_project(element, tree) for element in value]
+    if not isinstance(value, dict):
+        return value
+    return {key: _project(value[key], subtree) for key, subtree in tree.items() if key in value}
+
+
+class CatalogView:
+    """1つのデータバージョンの一覧と、あらかじめ計算した並び順"""
+
+    def __init__(self, version, items, spec):
+        self.version = version
+        self.spec = spec
+        self._items = items
+        self._ids = [item.get(spec.id_field) for item in items]
+        self._created_at = [parse_iso_datetime(spec.created_at_of(item)) for item in items]
+
+        sort_dates = [parse_iso_datetime(spec.sort_date_of(item)) for item in items]
+        dated = [index for index, date in enumerate(sort_dates) if date is not None]
+        undated = [index for index, date in enumerate(sort_dates) if date is None]
+        # 日付不明のものは元のAPI順のまま末尾に置く（sorted は安定なので同日も元の順）
+        self._orders = {
+            'api': list(range(len(items))),
+            'newest': sorted(dated, key=lambda index: sort_dates[index], reverse=True) + undated,
+            'oldest': sorted(dated, key=lambda index: sort_dates[index]) + undated,
+            'name': sorted(range(len(items)), key=lambda index: spec.name_of(items[index]).lower())
+        }
+        # カーソルのIDから並び順の位置を引くための表
+        self._positions = {
+            sort: {self._ids[index]: position for position, index in enumerate(order)}
+            for sort, order in self._orders.items()
+        }
+        self._payloads = OrderedDict()
+        self._lock = threading.Lock()
+
+    def query(self, query, availability_periods=None, now=None):
+        """クエリ結果の PreparedPayload を返す"""
+        key = query.cache_key()
+        if query.availability is not None:
+            # 入手可能判定は時刻に依存するため1分単位でキャッシュを分ける
+            key += (int(time.time() // 60),)
+
+        with self._lock:
+            payload = self._payloads.get(key)
+            if payload is not None:
+                self._payloads.move_to_end(key)
+                return payload
+
+        payload = PreparedPayload(self.version, self._build(query, availability_periods or {}, now))
+        with self._lock:
+            self._payloads[key] = payload
+            while len(self._payloads) > QUERY_CACHE_SIZE:
+                self._payloads.popitem(last=False)
+        return payload
+
+    def _build(self, query, availability_periods, now):
+        order = self._orders[query.sort]
+        start = 0
+        if query.cursor is not None:
+            _, last_id = decode_cursor(query.cursor)
+            position = self._positions[query.sort].get(last_id)
+            if position is None:
+                raise QueryError('cursor refers to an item that no longer exists')
+            start = position + 1
+
+        matches = (index for index in order[start:] if self._matches(index, query, availability_periods, now))
+        selected = []
+        next_cursor = None
+        for index in matches:
+            if query.limit is not None and len(selected) == query.limit:
+                next_cursor = encode_cursor(query.sort, self._ids[selected[-1]])
+                break
+            selected.append(index)
+
+        data = [self._items[index] for index in selected]
+        if query.fields is not None:
+            data = [project(item, query.fields) for item in data]
+
+        if query.has_filters:
+            total = sum(1 for index in order if self._matches(index, query, availability_periods, now))
+        else:
+            total = len(order)
+
+        if query.format == COMPACT_FORMAT:
+            return {**self.spec.encode_compact(data), 'total': total, 'next_cursor': next_cursor}
+        return {'data': data, 'total': total, 'next_cursor': next_cursor}
+
+    def _matches(self, index, query, availability_periods, now):
+        if query.has_real_timestamp is not None:
+            if (self._created_at[index] is not None) != query.has_real_timestamp:
+                return False
+        if query.created_after is not None or query.created_before is not None:
+            created_at = self._created_at[index]
+            if created_at is None:
+                return False
+            if query.created_after is not None and created_at < query.created_after:
+                return False
+            if query.created_before is not None and created_at > query.created_before:
+                return False
+        if query.availability is not None:
+            status = get_badge_availability_status(availability_periods, self._ids[index], now)['status']
+            if status not in query.availability:
+                return False
+        return True
+
+
+class CatalogViewCache:
+    """種類ごとに最新バージョンの CatalogView を1つだけ保持する"""
+
+    def __init__(self):
+        self._views = {}
+        self._lock = threading.Lock()
+
+    def get(self, spec, version, builder):
+        """バージョンが変わった場合のみ builder() の一覧から並び順を計算し直す"""
+        view = self._views.get(spec.kind)
+        if view is not None and view.version == version:
+            return view
+        with self._lock:
+            view = self._views.get(spec.kind)
+            if view is None or view.version != version:
+                view = CatalogView(version, builder(), spec)
+                self._views[spec.kind] = view
+            return view
@@ -0,0 +1,81 @@
+// コンパクト形式（?format=compact）のレスポンスを通常形式に戻す
+// script.js・emotes-script.js・stream.js で共通に使用する
+
+// テンプレートの {name} を値で置き換える
+function expandCompactTemplate(template, values) {
+    return template.replace(/\{(\w+)\}/g, (match, name) => (name in values ? values[name] : match));
+}
+
+// 画像の種類ごとのURLをテンプレートから組み立てる
+function buildCompactImages(payload, values) {
+    const images = {};
+    Object.entries(payload.images).forEach(([key, params]) => {
+        images[key] = expandCompactTemplate(payload.templates.image, { ...values, ...params });
+    });
+    return images;
+}
+
+// バッジのバージョン1件を復元
+function decodeCompactVersion(payload, row) {
+    const version = {};
+    payload.version_columns.forEach((name, index) => {
+        const value = row[index];
+        if (name === 'image_id') {
+            // テンプレートに当てはまらない画像はURLがそのまま入っている
+            Object.assign(version, typeof value === 'string'
+                ? buildCompactImages(payload, { image_id: value })
+                : value);
+        } else if (value !== null && value !== undefined) {
+            version[name] = value;
+        }
+    });
+    return version;
+}
+
+// バッジ一覧を復元
+function decodeCompactBadges(payload) {
+    const columns = payload.columns;
+    return columns.set_id.map((setId, index) => {
+        const badge = {
+            set_id: setId,
+            has_real_timestamp: !!columns.has_real_timestamp[index],
+            versions: columns.versions[index].map(row => decodeCompactVersion(payload, row))
+        };
+        if (columns.created_at[index]) {
+            badge.created_at = columns.created_at[index];
+        }
+        if (columns.estimated_created_at[index]) {
+            badge.estimated_created_at = columns.estimated_created_at[index];
+        }
+        return badge;
+    });
+}
+
+// エモート一覧を復元
+function decodeCompactEmotes(payload) {
+    const columns = payload.columns;
+    const overrides = payload.image_overrides || {};
+    return columns.id.map((id, index) => {
+        const emote = {
+            id: id,
+            name: columns.name[index],
+            format: columns.animated[index] ? ['static', 'animated'] : ['static'],
+            images: overrides[index] || buildCompactImages(payload, { id: id })
+        };
+        if (columns.created_at[index]) {
+            emote.created_at = columns.created_at[index];
+        }
+        return emote;
+    });
+}
+
+// コンパクト形式のバッジ・エモート一覧を要素の配列に戻す（通常形式ならそのまま返す）
+function decodeCompactList(payload) {
+    if (!payload) {
+        return [];
+    }
+    if (payload.format !== 'compact') {
+        return Array.isArray(payload) ? payload : (payload.data || []);
+    }
+    return payload.kind === 'emotes' ? decodeCompactEmotes(payload) : decodeCompactBadges(payload);
+}
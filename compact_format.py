@@ -0,0 +1,110 @@
+"""コンパクト形式（?format=compact）のレスポンス
+
+画像URLはレスポンスごとにテンプレートを1回だけ送り、各要素にはIDとフラグだけを
+持たせる。一覧の項目は列（フィールドごとの配列）で送る。テンプレートに当てはまらない
+URLだけはそのまま送る。ブラウザ側の復元は compact.js の decodeCompactList で行う。
+"""
+import re
+
+COMPACT_FORMAT = 'compact'
+
+BADGE_IMAGE_TEMPLATE = 'https://static-cdn.jtvnw.net/badges/v1/{image_id}/{scale}'
+BADGE_IMAGES = {
+    'image_url_1x': {'scale': '1'},
+    'image_url_2x': {'scale': '2'},
+    'image_url_4x': {'scale': '3'}
+}
+BADGE_VERSION_COLUMNS = ('id', 'image_id', 'title', 'description')
+
+EMOTE_IMAGE_TEMPLATE = 'https://static-cdn.jtvnw.net/emoticons/v2/{id}/{format}/{theme_mode}/{scale}'
+EMOTE_IMAGES = {
+    'url_1x': {'format': 'static', 'theme_mode': 'light', 'scale': '1.0'},
+    'url_2x': {'format': 'static', 'theme_mode': 'light', 'scale': '2.0'},
+    'url_4x': {'format': 'static', 'theme_mode': 'light', 'scale': '3.0'},
+    'animated_url_1x': {'format': 'animated', 'theme_mode': 'dark', 'scale': '1.0'},
+    'animated_url_2x': {'format': 'animated', 'theme_mode': 'dark', 'scale': '2.0'},
+    'animated_url_4x': {'format': 'animated', 'theme_mode': 'dark', 'scale': '3.0'},
+    'static_url_1x': {'format': 'static', 'theme_mode': 'dark', 'scale': '1.0'},
+    'static_url_2x': {'format': 'static', 'theme_mode': 'dark', 'scale': '2.0'},
+    'static_url_4x': {'format': 'static', 'theme_mode': 'dark', 'scale': '3.0'}
+}
+
+_BADGE_IMAGE_ID = re.compile(r'^https://static-cdn\.jtvnw\.net/badges/v1/([^/]+)/1$')
+
+
+def _matches_template(images, template, specs, **values):
+    """images の全URLがテンプレートから復元できるか"""
+    if set(images) != set(specs):
+        return False
+    return all(images[key] == template.format(**values, **params) for key, params in specs.items())
+
+
+def _badge_version_row(version):
+    images = {key: version[key] for key in BADGE_IMAGES if key in version}
+    match = _BADGE_IMAGE_ID.match(images.get('image_url_1x') or '')
+    image = match.group(1) if match else None
+    if image is None or not _matches_template(images, BADGE_IMAGE_TEMPLATE, BADGE_IMAGES, image_id=image):
+        # テンプレートに当てはまらない場合はURLをそのまま送る
+        image = images
+    return [version.get('id'), image, version.get('title'), version.get('description')]
+
+
+def encode_badges(badges):
+    """拡張済みバッジの配列をコンパクト形式にする"""
+    return {
+        'format': COMPACT_FORMAT,
+        'kind': 'badges',
+        'count': len(badges),
+        'templates': {'image': BADGE_IMAGE_TEMPLATE},
+        'images': BADGE_IMAGES,
+        'version_columns': list(BADGE_VERSION_COLUMNS),
+        'columns': {
+            'set_id': [badge.get('set_id') for badge in badges],
+            'created_at': [badge.get('created_at') if badge.get('has_real_timestamp') else None
+                           for badge in badges],
+            'has_real_timestamp': [int(bool(badge.get('has_real_timestamp'))) for badge in badges],
+            'estimated_created_at': [badge.get('estimated_created_at') for badge in badges],
+            'versions': [[_badge_version_row(version) for version in badge.get('versions') or []]
+                         for badge in badges]
+        }
+    }
+
+
+def encode_emotes(emotes):
+    """拡張済みエモートの配列をコンパクト形式にする"""
+    # 全エモートに共通する画像の種類だけをテンプレートで送る
+    keys = set(EMOTE_IMAGES)
+    for emote in emotes:
+        keys &= set(emote.get('images') or {})
+    specs = {key: params for key, params in EMOTE_IMAGES.items() if key in keys}
+
+    overrides = {}
+    for index, emote in enumerate(emotes):
+        images = emote.get('images') or {}
+        if not _matches_template(images, EMOTE_IMAGE_TEMPLATE, specs, id=emote.get('id')):
+            # テンプレートに当てはまらないエモートだけ画像URLをそのまま送る
+            overrides[str(index)] = images
+    return {
+        'format': COMPACT_FORMAT,
+        'kind': 'emotes',
+        'count': len(emotes),
+        'templates': {'image': EMOTE_IMAGE_TEMPLATE},
+        'images': specs,
+        'columns': {
+            'id': [emote.get('id') for emote in emotes],
+            'name': [emote.get('name') for emote in emotes],
+            'created_at': [emote.get('created_at') for emote in emotes],
+            'animated': [int('animated' in (emote.get('format') or [])) for emote in emotes]
+        },
+        'image_overrides': overrides
+    }
+
+
+def encode_dashboard(dashboard):
+    """ダッシュボード（部分更新を含む）のバッジ・エモートをコンパクト形式にする"""
+    compact = {**dashboard, 'format': COMPACT_FORMAT}
+    if 'badges' in dashboard:
+        compact['badges'] = encode_badges(dashboard['badges'])
+    if 'emotes' in dashboard:
+        compact['emotes'] = encode_emotes(dashboard['emotes'])
+    return compact
@@ -0,0 +1,48 @@
+"""ストリームダッシュボード用の集約ペイロード生成"""
+from datetime import datetime, timezone
+
+from availability import get_badge_availability_status, parse_iso_datetime
+
+_FALLBACK_DATE = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+def created_at_sort_key(item):
+    """作成日（無ければ更新日、それも無ければ2020-01-01）をソートキーにする"""
+    return parse_iso_datetime(item.get('created_at') or item.get('updated_at')) or _FALLBACK_DATE
+
+
+def sort_newest_first(items):
+    """作成日の新しい順に並べる（同日の場合は元の順序を保持）"""
+    return sorted(items, key=created_at_sort_key, reverse=True)
+
+
+def build_dashboard(badges_data, emotes_data, availability_periods, now=None):
+    """並び替え済みのバッジ・エモートと「現在入手可能」なバッジの一覧を作成"""
+    now = now or datetime.now(timezone.utc)
+    badges = sort_newest_first(badges_data.get('data', []))
+    emotes = sort_newest_first(emotes_data.get('data', []))
+
+    # 入手可能なバッジは元のバッジ順のまま set_id と判定結果のみを返す
+    available_badges = []
+    for badge in badges_data.get('data', []):
+        availability = get_badge_availability_status(availability_periods, badge.get('set_id'), now)
+        if availability['isAvailable']:
+            available_badges.append({'set_id': badge.get('set_id'), 'availability': availability})
+
+    return {
+        'badges': badges,
+        'available_badges': available_badges,
+        'emotes': emotes,
+        'generated_at': now.isoformat()
+    }
+
+
+def filter_dashboard(dashboard, set_ids):
+    """指定した set_id のバッジと入手可能判定だけを取り出す（部分更新用）"""
+    wanted = {set_id for set_id in set_ids if set_id}
+    return {
+        'badges': [badge for badge in dashboard['badges'] if badge.get('set_id') in wanted],
+        'available_badges': [entry for entry in dashboard['available_badges'] if entry['set_id'] in wanted],
+        'set_ids': sorted(wanted),
+        'generated_at': dashboard['generated_at']
+    }
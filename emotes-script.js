@@ -18,53 +18,84 @@ let allEmotes = [];
 let currentSortOrder = 'newest';
 let filteredEmotes = [];
 
+// 最初の画面に表示する件数（残りは表示後に続けて取得）
+const EMOTE_PAGE_SIZE = 100;
+
+// エモート一覧を新しい順で1ページ取得（画像URLはテンプレートで送られるコンパクト形式）
+async function fetchEmotePage(cursor) {
+    const params = new URLSearchParams({
+        sort: 'newest',
+        format: 'compact',
+        limit: EMOTE_PAGE_SIZE
+    });
+    if (cursor) {
+        params.set('cursor', cursor);
+    }
+    
+    const response = await fetch(`${BASE_URL}/api/emotes?${params}`);
+    
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    
+    const data = await response.json();
+    
+    // エラーチェック
+    if (data.error) {
+        throw new Error(data.error);
+    }
+    
+    return { data: decodeCompactList(data), next_cursor: data.next_cursor };
+}
+
+// 取得したエモートに追加時刻と実際の作成日を記録して追加
+function appendEmotes(emotes) {
+    const timestamp = Date.now();
+    const offset = allEmotes.length;
+    
+    emotes.forEach((emote, i) => {
+        const index = offset + i;
+        
+        // APIから取得した実際の作成日を使用
+        let createdDate = null;
+        if (emote.created_at) {
+            createdDate = new Date(emote.created_at);
+        }
+        
+        allEmotes.push({
+            ...emote,
+            addedAt: timestamp + index,
+            originalIndex: index,
+            createdDate: createdDate,
+            hasRealTimestamp: !!emote.created_at
+        });
+    });
+}
+
+// 検索条件を適用して現在の並び順で表示し直す
+function refreshEmotes() {
+    const searchInput = document.getElementById('search-input');
+    searchEmotes(searchInput ? searchInput.value : '');
+}
+
 // グローバルエモートを取得して表示する
 async function loadGlobalEmotes() {
     const loadingElement = document.getElementById('loading');
     const errorElement = document.getElementById('error-message');
-    const emoteContainer = document.getElementById('emote-container');
     
+    let cursor = null;
     try {
-        // バックエンドAPIにリクエスト
-        const response = await fetch(`${BASE_URL}/api/emotes`);
-        
-        if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
-        }
-        
-        const data = await response.json();
-        
-        // エラーチェック
-        if (data.error) {
-            throw new Error(data.error);
-        }
+        // 最初のページだけ取得してすぐに表示
+        const firstPage = await fetchEmotePage(null);
+        allEmotes = [];
+        appendEmotes(firstPage.data);
+        cursor = firstPage.next_cursor;
         
         // ローディング表示を非表示
         loadingElement.style.display = 'none';
         
-        // エモートデータに追加時刻と実際の作成日を記録
-        const timestamp = Date.now();
-        allEmotes = data.data.map((emote, index) => {
-            // APIから取得した実際の作成日を使用
-            let createdDate = null;
-            if (emote.created_at) {
-                createdDate = new Date(emote.created_at);
-            }
-            
-            return {
-                ...emote,
-                addedAt: timestamp + index,
-                originalIndex: index,
-                createdDate: createdDate,
-                hasRealTimestamp: !!emote.created_at
-            };
-        });
-        
         // 初期表示（デフォルトで最新順ソート）
         filteredEmotes = [...allEmotes];
-        displayEmotes(filteredEmotes);
-        
-        // 最新順でソートを適用
         sortEmotes('newest');
         
         // 検索・ソートコントロールを表示
@@ -80,7 +111,20 @@ async function loadGlobalEmotes() {
         // エラーメッセージを表示
         errorElement.textContent = `エモートの読み込みに失敗しました: ${error.message}`;
         errorElement.style.display = 'block';
+        return;
+    }
+    
+    // 残りのページを続けて取得し、揃ったら検索条件と並び順を適用し直す
+    try {
+        while (cursor) {
+            const page = await fetchEmotePage(cursor);
+            appendEmotes(page.data);
+            cursor = page.next_cursor;
+        }
+    } catch (error) {
+        console.error('Error loading remaining emotes:', error);
     }
+    refreshEmotes();
 }
 
 // エモートデータをHTMLとして表示
@@ -215,17 +259,69 @@ function sortEmotes(order) {
     displayEmotes(sortedEmotes);
 }
 
+// 検索の待ち時間（入力が止まってから送信する）
+const SEARCH_DEBOUNCE_MS = 150;
+let searchTimer = null;
+let searchSequence = 0;
+
+// 検索結果を1回に取得する件数（サーバーの上限）
+const SEARCH_PAGE_SIZE = 100;
+
+// サーバーの /api/search でエモート名を検索し、一致したIDの集合を返す（next_offset を辿って全件取得）
+async function fetchEmoteSearch(query) {
+    const matchedIds = new Set();
+    let offset = 0;
+    
+    while (offset !== null) {
+        const params = new URLSearchParams({ q: query, type: 'emote', limit: SEARCH_PAGE_SIZE, offset });
+        const response = await fetch(`${BASE_URL}/api/search?${params}`);
+        
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        
+        const data = await response.json();
+        data.results.forEach(result => matchedIds.add(result.id));
+        offset = data.next_offset ?? null;
+    }
+    
+    return matchedIds;
+}
+
 // 検索機能
 function searchEmotes(query) {
+    clearTimeout(searchTimer);
+    const sequence = ++searchSequence;
+    
     if (!query.trim()) {
         filteredEmotes = [...allEmotes];
-    } else {
-        filteredEmotes = allEmotes.filter(emote => 
-            emote.name.toLowerCase().includes(query.toLowerCase())
-        );
+        sortEmotes(currentSortOrder);
+        return;
     }
     
-    sortEmotes(currentSortOrder);
+    searchTimer = setTimeout(async () => {
+        let matchedIds = null;
+        try {
+            matchedIds = await fetchEmoteSearch(query);
+        } catch (error) {
+            // 検索APIが使えない場合は読み込み済みのエモートから絞り込む
+            console.error('Error searching emotes:', error);
+        }
+        
+        // より新しい入力の検索が始まっていれば結果を捨てる
+        if (sequence !== searchSequence) {
+            return;
+        }
+        
+        if (matchedIds) {
+            filteredEmotes = allEmotes.filter(emote => matchedIds.has(emote.id));
+        } else {
+            filteredEmotes = allEmotes.filter(emote => 
+                emote.name.toLowerCase().includes(query.toLowerCase())
+            );
+        }
+        sortEmotes(currentSortOrder);
+    }, SEARCH_DEBOUNCE_MS);
 }
 
 // イベントリスナーを設定
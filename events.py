@@ -0,0 +1,185 @@
+"""Server-Sent Events の配信（新しいバッジの検出・タイムスタンプの変更を通知）"""
+import asyncio
+import json
+import logging
+import queue
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_INTERVAL = 15
+RETRY_MS = 5000
+# 他のワーカーが発行したイベントを確認する間隔（秒）
+POLL_INTERVAL = 1.0
+
+
+class Event:
+    __slots__ = ('id', 'type', 'data')
+
+    def __init__(self, event_id, event_type, data):
+        self.id = event_id
+        self.type = event_type
+        self.data = data
+
+    def format(self):
+        """SSEのワイヤ形式"""
+        payload = json.dumps(self.data, ensure_ascii=False, separators=(',', ':'))
+        return f'id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n'
+
+
+class Subscription:
+    """スレッド（WSGI）で待ち受ける購読者"""
+
+    def __init__(self, maxsize=100):
+        self._queue = queue.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def deliver(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            # 読み出しが追いつかない購読者は切断し、再接続時に Last-Event-ID から再送する
+            self.overflowed = True
+
+    def get(self, timeout):
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class AsyncSubscription:
+    """asyncio のイベントループで待ち受ける購読者（ASGI用）"""
+
+    def __init__(self, loop, maxsize=100):
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def deliver(self, event):
+        self._loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event):
+        if self._queue.full():
+            self.overflowed = True
+        else:
+            self._queue.put_nowait(event)
+
+    async def get(self, timeout):
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBroker:
+    """イベントを全購読者に配信し、再接続用に直近のイベントを保持する
+
+    store（BadgeStore）を渡すとイベントをストアに書き込み、ポーリング用のスレッドが
+    ストアに追記されたイベントを購読者に配信する。どのワーカーで発行したイベントも
+    全ワーカーの購読者に届き、連番はストアで振るためワーカーをまたいだ再接続や
+    再起動後も Last-Event-ID から再送できる。
+    """
+
+    def __init__(self, history=200, store=None, poll_interval=POLL_INTERVAL):
+        self._history = deque(maxlen=history)
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self._store = store
+        self._poll_interval = poll_interval
+        self._last_id = 0
+        self._poller = None
+        self._wake = threading.Event()
+
+    def publish(self, event_type, data, dedupe_key=None):
+        """イベントを発行する（store がある場合、dedupe_key が発行済みなら None を返す）"""
+        if self._store is not None:
+            event_id = self._store.append_event(event_type, data, dedupe_key)
+            if event_id is None:
+                return None
+            # 自ワーカーの購読者にはポーリング間隔を待たずに配信する
+            self._wake.set()
+            return Event(event_id, event_type, data)
+
+        with self._lock:
+            event = Event(self._next_id, event_type, data)
+            self._next_id += 1
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.deliver(event)
+        return event
+
+    def subscribe(self, subscription, last_event_id=None):
+        """購読を開始し、last_event_id より後の保持済みイベントを先に渡す"""
+        with self._lock:
+            if self._store is not None and self._poller is None:
+                # 以降に追記されたイベントだけをポーリングで配信する
+                self._last_id = self._store.last_event_id()
+                self._poller = threading.Thread(target=self._poll, name='event-poller', daemon=True)
+                self._poller.start()
+            self._subscribers.add(subscription)
+            if last_event_id is not None:
+                for event in self._replay(last_event_id):
+                    subscription.deliver(event)
+        return subscription
+
+    def _replay(self, last_event_id):
+        if self._store is None:
+            return [event for event in self._history if event.id > last_event_id]
+        # 配信済み（_last_id まで）のイベントを再送し、それより後はポーリングに任せる
+        return [Event(*row) for row in self._store.events_after(last_event_id, self._history.maxlen)
+                if row[0] <= self._last_id]
+
+    def _poll(self):
+        while True:
+            self._wake.wait(self._poll_interval)
+            self._wake.clear()
+            try:
+                self.deliver_pending()
+            except Exception as e:
+                logger.warning(f"Error polling events: {e}")
+
+    def deliver_pending(self):
+        """ストアに追記されたイベントを購読者に配信する"""
+        with self._lock:
+            for row in self._store.events_after(self._last_id):
+                event = Event(*row)
+                self._last_id = event.id
+                for subscriber in self._subscribers:
+                    subscriber.deliver(event)
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+
+def parse_last_event_id(value):
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+def stream_events(broker, last_event_id=None, on_heartbeat=None, heartbeat=HEARTBEAT_INTERVAL):
+    """WSGI用のSSEストリーム（ジェネレーター）"""
+    subscription = broker.subscribe(Subscription(), last_event_id)
+    try:
+        yield f'retry: {RETRY_MS}\n\n'
+        while not subscription.overflowed:
+            event = subscription.get(timeout=heartbeat)
+            if event is None:
+                if on_heartbeat:
+                    on_heartbeat()
+                yield f': keepalive {int(time.time())}\n\n'
+            else:
+                yield event.format()
+    finally:
+        broker.unsubscribe(subscription)
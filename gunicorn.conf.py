@@ -0,0 +1,23 @@
+"""gunicorn の設定（wsgi.py 参照）
+
+ワーカー数は WEB_CONCURRENCY、1ワーカーあたりのスレッド数は WORKER_THREADS で変更できる。
+"""
+import multiprocessing
+import os
+
+bind = os.getenv('BIND', '0.0.0.0:5000')
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+
+# /api/events（SSE）の接続は1スレッドを占有するため、スレッド付きのワーカーを使う。
+# 1ワーカーあたりのSSE接続はスレッド数の半分（SSE_MAX_CONNECTIONS で変更可能）までで、
+# 超えた接続には 503 と Retry-After を返す。多数のオーバーレイが常時接続する場合は
+# SSEをイベントループで配信する ASGI（uvicorn asgi:application）で起動する。
+worker_class = 'gthread'
+threads = int(os.getenv('WORKER_THREADS', '8'))
+
+# アプリは fork 後に各ワーカーで読み込む（SQLite接続やバックグラウンドスレッドを共有しない）
+preload_app = False
+
+timeout = 60
+graceful_timeout = 30
+accesslog = '-'
@@ -0,0 +1,209 @@
+"""Prometheusのテキスト形式（0.0.4）で公開するメトリクス
+
+外部ライブラリを使わない最小限の実装（Counter・Gauge・Histogram とラベル）。
+各モジュールはモジュールレベルでメトリクスを定義し、/metrics は REGISTRY.render() を返す。
+値はプロセスごとに保持する（複数ワーカーではワーカーごとの値になる）。
+
+    UPSTREAM_LATENCY = Histogram('upstream_request_duration_seconds', '上流HTTPの応答時間', ['host'])
+    UPSTREAM_LATENCY.observe(0.12, host='api.twitch.tv')
+
+callback を渡すと描画時に値を取得する（キューの深さなど、他で管理している値の公開用）。
+callback はラベルが無ければ数値、あれば {ラベル値のタプル: 数値} を返す。
+"""
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# 秒単位のバケット（上流API・ページ生成の応答時間を想定）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Registry:
+    """メトリクスの一覧（登録順に描画する）"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f'duplicate metric: {metric.name}')
+            self._metrics[metric.name] = metric
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + '}'
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value))
+
+
+class _Metric:
+    type = None
+
+    def __init__(self, name, documentation, labelnames=(), callback=None, registry=REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+        self._values = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name} expects labels {self.labelnames}, got {tuple(labels)}')
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self):
+        """(サフィックス, ラベル名, ラベル値, 値) の一覧"""
+        if self.callback is not None:
+            values = self.callback()
+            if not self.labelnames:
+                values = {(): values}
+            return [('', self.labelnames, key, value) for key, value in values.items()]
+        with self._lock:
+            values = dict(self._values)
+        if not values and not self.labelnames:
+            values = {(): 0}
+        return [('', self.labelnames, key, value) for key, value in values.items()]
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type}']
+        for suffix, names, values, value in self._samples():
+            lines.append(f'{self.name}{suffix}{_format_labels(names, values)} {_format_value(value)}')
+        return lines
+
+
+class Counter(_Metric):
+    """単調増加する値（名前は _total で終える）"""
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """増減する値"""
+    type = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """観測値の分布（バケットごとの累積件数・合計・件数）"""
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, registry=REGISTRY):
+        super().__init__(name, documentation, labelnames, registry=registry)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # バケットごとの件数（最後が +Inf）、合計
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][bisect.bisect_left(self.buckets, value)] += 1
+            state[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """with ブロックの経過秒数を記録する"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self):
+        with self._lock:
+            values = {key: (list(counts), total) for key, (counts, total) in self._values.items()}
+        if not values and not self.labelnames:
+            values = {(): ([0] * (len(self.buckets) + 1), 0.0)}
+        samples = []
+        bucket_names = self.labelnames + ('le',)
+        for key, (counts, total) in values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                samples.append(('_bucket', bucket_names, key + (_format_value(bound),), cumulative))
+            samples.append(('_sum', self.labelnames, key, total))
+            samples.append(('_count', self.labelnames, key, cumulative))
+        return samples
+
+
+# ルートごとのHTTPリクエスト（Flask・ASGIの両方で記録する）
+HTTP_REQUESTS = Counter('http_requests_total', 'HTTPリクエスト数', ['route', 'method', 'status'])
+HTTP_LATENCY = Histogram('http_request_duration_seconds', 'HTTPリクエストの処理時間（秒）', ['route', 'method'])
+
+
+def observe_request(route, method, status, seconds):
+    HTTP_LATENCY.observe(seconds, route=route, method=method)
+    HTTP_REQUESTS.inc(route=route, method=method, status=status)
+
+
+def instrument_flask(app):
+    """Flaskアプリのルートごとの処理時間・件数を記録し、/metrics を追加する"""
+    from flask import Response, g, request
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        started = g.pop('metrics_started', None)
+        if started is not None:
+            # ラベルはパスではなくルールにする（/api/badges/<set_id> などで系列が増えないように）
+            route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            observe_request(route, request.method, response.status_code, time.perf_counter() - started)
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        """Prometheus形式のメトリクス"""
+        return Response(REGISTRY.render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,129 @@
+"""シリアライズ・圧縮済みJSONペイロードのキャッシュ（データバージョン単位）"""
+import gzip
+import hashlib
+import json
+import threading
+
+from flask import Response, request
+
+from metrics import Counter, Histogram
+from profiling import phase
+
+try:
+    import brotli
+except ImportError:  # brotliが無い環境ではgzipのみ
+    brotli = None
+
+# kind はキーの ':' より前（meta:<set_id>:<lang> などで系列が増えないように）
+PAYLOAD_REQUESTS = Counter('payload_cache_requests_total', '構築済みペイロードの参照数（result: hit・build）',
+                           ['kind', 'result'])
+# stage: enrich（builder() によるタイムスタンプの付与・集計）・serialize（JSON化と圧縮）
+PAYLOAD_BUILD_LATENCY = Histogram('payload_build_duration_seconds', 'ペイロードの構築時間（秒）', ['kind', 'stage'])
+
+
+def _kind(key):
+    return key.split(':', 1)[0]
+
+
+class PreparedPayload:
+    """1つのデータバージョンに対するJSON本体と圧縮済みバイト列（元のデータも参照用に保持）"""
+    __slots__ = ('version', 'data', 'identity', 'gzip', 'br', 'etag')
+
+    def __init__(self, version, data):
+        self.version = version
+        self.data = data
+        with phase('serialize'):
+            self.identity = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            self.gzip = gzip.compress(self.identity, compresslevel=6)
+            self.br = brotli.compress(self.identity, quality=5) if brotli else None
+            self.etag = hashlib.sha1(self.identity).hexdigest()[:20]
+
+    def negotiate(self, accept_encoding, if_none_match):
+        """(ステータス, 本体, ヘッダー) を返す（フレームワーク非依存）"""
+        headers = {'ETag': f'"{self.etag}"', 'Vary': 'Accept-Encoding'}
+        if if_none_match and _etag_matches(if_none_match, self.etag):
+            return 304, b'', headers
+
+        accepted = _parse_accept_encoding(accept_encoding)
+        if self.br is not None and _accepts(accepted, 'br'):
+            body, headers['Content-Encoding'] = self.br, 'br'
+        elif _accepts(accepted, 'gzip'):
+            body, headers['Content-Encoding'] = self.gzip, 'gzip'
+        else:
+            body = self.identity
+        headers['Content-Type'] = 'application/json'
+        return 200, body, headers
+
+    def to_response(self):
+        """Accept-Encoding / If-None-Match に応じたFlaskレスポンスを返す"""
+        status, body, headers = self.negotiate(
+            request.headers.get('Accept-Encoding', ''),
+            request.headers.get('If-None-Match', '')
+        )
+        return Response(body, status=status, headers=headers)
+
+
+def _parse_accept_encoding(header):
+    accepted = {}
+    for part in header.split(','):
+        name, _, params = part.strip().partition(';')
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    return accepted
+
+
+def _accepts(accepted, encoding):
+    quality = accepted.get(encoding, accepted.get('*', 0))
+    return quality > 0
+
+
+def _etag_matches(if_none_match, etag):
+    if if_none_match.strip() == '*':
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return any(tag.removeprefix('W/').strip('"') == etag for tag in candidates)
+
+
+class PayloadCache:
+    """キーごとに最新バージョンのPreparedPayloadを1つだけ保持する"""
+
+    def __init__(self):
+        self._payloads = {}
+        self._lock = threading.Lock()
+
+    def get_cached(self, key, version):
+        """指定バージョンのペイロードが構築済みなら返す（無ければNone）"""
+        payload = self._payloads.get(key)
+        if payload is not None and payload.version == version:
+            PAYLOAD_REQUESTS.inc(kind=_kind(key), result='hit')
+            return payload
+        return None
+
+    def get(self, key, version, builder):
+        """バージョンが変わった場合のみ builder() を呼んで再シリアライズする"""
+        kind = _kind(key)
+        payload = self._payloads.get(key)
+        if payload is not None and payload.version == version:
+            PAYLOAD_REQUESTS.inc(kind=kind, result='hit')
+            return payload
+
+        with self._lock:
+            payload = self._payloads.get(key)
+            if payload is None or payload.version != version:
+                PAYLOAD_REQUESTS.inc(kind=kind, result='build')
+                with PAYLOAD_BUILD_LATENCY.time(kind=kind, stage='enrich'), phase('enrich'):
+                    data = builder()
+                with PAYLOAD_BUILD_LATENCY.time(kind=kind, stage='serialize'):
+                    payload = PreparedPayload(version, data)
+                self._payloads[key] = payload
+            else:
+                PAYLOAD_REQUESTS.inc(kind=kind, result='hit')
+            return payload
@@ -0,0 +1,358 @@
+"""リクエストの区間計測とオンデマンドのプロファイル
+
+- 各リクエストの処理時間を区間（token・upstream・enrich・serialize と、それ以外の other）に
+  分けて計測し、最も遅い SLOW_REQUEST_LOG_SIZE 件（既定20件）を記録する
+- 管理者がヘッダー X-Profile（またはクエリ _profile）を付けたリクエストは1件だけプロファイルする
+    sample   スタックのサンプリング（既定。ブロッキング待ちも含めた実時間）
+    cprofile cProfile による関数ごとの呼び出し回数・CPU時間
+- 結果は /api/admin/profiles から取得する。?format=folded（フレームグラフ用の折り畳みスタック形式）は
+  flamegraph.pl・speedscope などでそのまま読み込める
+
+管理者の判定は環境変数 ADMIN_TOKEN とヘッダー X-Admin-Token（または Authorization: Bearer）の一致。
+ADMIN_TOKEN が未設定の場合、プロファイルの要求と /api/admin/profiles は拒否する。
+
+区間は phase() で囲む。リクエスト外（バックグラウンドの再取得など）では何もしない。
+
+    with phase('upstream'):
+        response = session.request(...)
+"""
+import heapq
+import hmac
+import io
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+
+PROFILE_MODES = ('sample', 'cprofile')
+PROFILE_HEADER = 'X-Profile'
+PROFILE_QUERY = '_profile'
+ADMIN_HEADER = 'X-Admin-Token'
+
+_current = ContextVar('request_profile', default=None)
+
+
+class RequestProfile:
+    """1リクエストの区間ごとの所要時間"""
+    __slots__ = ('started', 'phases', 'active')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.active = None
+
+    def phases_ms(self, total):
+        phases = {name: round(seconds * 1000, 2) for name, seconds in self.phases.items()}
+        phases['other'] = round(max(total - sum(self.phases.values()), 0) * 1000, 2)
+        return phases
+
+
+@contextmanager
+def phase(name):
+    """処理中のリクエストの区間 name として計測する
+
+    他の区間の中では外側の区間に含める（トークン取得のための上流呼び出しは token に計上）。
+    """
+    profile = _current.get()
+    if profile is None or profile.active is not None:
+        yield
+        return
+    profile.active = name
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.phases[name] = profile.phases.get(name, 0) + time.perf_counter() - started
+        profile.active = None
+
+
+def admin_token_matches(headers, admin_token=None):
+    """ヘッダーのトークンが ADMIN_TOKEN と一致するか（未設定なら常に False）"""
+    admin_token = admin_token if admin_token is not None else os.getenv('ADMIN_TOKEN', '')
+    if not admin_token:
+        return False
+    token = headers.get(ADMIN_HEADER) or ''
+    authorization = headers.get('Authorization') or ''
+    if not token and authorization.startswith('Bearer '):
+        token = authorization[len('Bearer '):]
+    return hmac.compare_digest(token.encode('utf-8'), admin_token.encode('utf-8'))
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    return _function_name(code.co_filename, code.co_firstlineno, code.co_name)
+
+
+def _function_name(filename, lineno, name):
+    # 折り畳み形式ではスタックの区切りに ; を使うため置き換える（件数は行末の空白の後）
+    return f'{name} ({os.path.basename(filename)}:{lineno})'.replace(';', ':')
+
+
+class StackSampler:
+    """指定スレッドのスタックを interval 秒ごとに記録する（折り畳みスタック → 件数）"""
+
+    def __init__(self, thread_id, interval=0.001):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                names.append(_frame_name(frame))
+                frame = frame.f_back
+            if names:
+                self.stacks[';'.join(reversed(names))] += 1
+
+    def folded(self):
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+
+class Capture:
+    """オンデマンドのプロファイル1件"""
+
+    def __init__(self, mode, sample_interval):
+        self.mode = mode
+        if mode == 'cprofile':
+            # 計測時のみ使うため関数の起動を遅くしないよう必要になってから読み込む
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            self._profiler = StackSampler(threading.get_ident(), sample_interval)
+            self._profiler.start()
+
+    def stop(self):
+        """(折り畳みスタック形式, テキストの要約) を返す"""
+        if self.mode == 'cprofile':
+            import pstats
+            self._profiler.disable()
+            stats = pstats.Stats(self._profiler)
+            summary = io.StringIO()
+            stats.stream = summary
+            stats.sort_stats('cumulative').print_stats(40)
+            return _folded_from_stats(stats), summary.getvalue()
+        self._profiler.stop()
+        folded = self._profiler.folded()
+        return folded, f'{sum(self._profiler.stacks.values())} samples\n'
+
+
+def _folded_from_stats(stats):
+    """cProfile の結果を「呼び出し元;関数 CPU時間(μs)」の折り畳み形式にする
+
+    cProfile は呼び出し元1段分しか保持しないため、スタックは2段（呼び出し元;関数）になる。
+    """
+    lines = []
+    for func, (_, _, tottime, _, callers) in stats.stats.items():
+        name = _function_name(*func)
+        if not callers:
+            lines.append((name, tottime))
+            continue
+        for caller, caller_stats in callers.items():
+            # callers の値は (呼び出し回数, 再帰を除く回数, tottime, cumtime)
+            lines.append((f'{_function_name(*caller)};{name}', caller_stats[2]))
+    return ''.join(f'{stack} {round(seconds * 1e6)}\n'
+                   for stack, seconds in sorted(lines, key=lambda line: -line[1]) if seconds > 0)
+
+
+class Profiler:
+    """区間計測・最も遅いリクエストの記録・オンデマンドのプロファイルの保持"""
+
+    def __init__(self, slow_size=None, keep=10, sample_interval=0.001):
+        self.slow_size = slow_size if slow_size is not None else int(os.getenv('SLOW_REQUEST_LOG_SIZE', '20'))
+        self.sample_interval = sample_interval
+        self._slowest = []  # (所要時間, 連番, 記録) の最小ヒープ
+        self._profiles = OrderedDict()
+        self._keep = keep
+        self._sequence = itertools.count(1)
+        self._lock = threading.Lock()
+        # cProfile は同時に1つしか有効にできないため、オンデマンドのプロファイルは1件ずつ
+        self._capture_lock = threading.Lock()
+
+    def begin(self):
+        """リクエストの計測を開始する（end() に渡す値を返す）"""
+        profile = RequestProfile()
+        return profile, _current.set(profile)
+
+    def end(self, state, method, path, route, status, capture=None):
+        """計測を終了して記録する（最も遅い slow_size 件に入らなければ捨てる）"""
+        profile, token = state
+        total = time.perf_counter() - profile.started
+        _current.reset(token)
+        sequence = next(self._sequence)
+        record = {
+            'id': f'{os.getpid()}-{sequence}',
+            'at': datetime.now().isoformat(),
+            'method': method,
+            'path': path,
+            'route': route,
+            'status': status,
+            'duration_ms': round(total * 1000, 2),
+            'phases_ms': profile.phases_ms(total)
+        }
+        if capture is not None:
+            try:
+                folded, summary = capture.stop()
+            finally:
+                self._capture_lock.release()
+            record['profile'] = capture.mode
+            with self._lock:
+                self._profiles[record['id']] = dict(record, folded=folded, summary=summary)
+                while len(self._profiles) > self._keep:
+                    self._profiles.popitem(last=False)
+
+        with self._lock:
+            item = (total, sequence, record)
+            if len(self._slowest) < self.slow_size:
+                heapq.heappush(self._slowest, item)
+            elif self.slow_size and total > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, item)
+        return record
+
+    def start_capture(self, mode):
+        """オンデマンドのプロファイルを開始する（他のプロファイル中なら None）"""
+        if mode not in PROFILE_MODES:
+            mode = 'sample'
+        if not self._capture_lock.acquire(blocking=False):
+            return None
+        try:
+            return Capture(mode, self.sample_interval)
+        except Exception:
+            self._capture_lock.release()
+            raise
+
+    def slowest(self):
+        with self._lock:
+            return [record for _, _, record in sorted(self._slowest, key=lambda item: -item[0])]
+
+    def profiles(self):
+        with self._lock:
+            return [{key: value for key, value in profile.items() if key not in ('folded', 'summary')}
+                    for profile in reversed(self._profiles.values())]
+
+    def get_profile(self, profile_id):
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def slowest_folded(self):
+        """最も遅いリクエストの区間を「メソッド ルート;区間 μs」の折り畳み形式で返す"""
+        totals = Counter()
+        for record in self.slowest():
+            prefix = f'{record["method"]} {record["route"]}'.replace(';', ':')
+            for name, ms in record['phases_ms'].items():
+                totals[f'{prefix};{name}'] += round(ms * 1000)
+        return ''.join(f'{stack} {value}\n' for stack, value in totals.most_common() if value > 0)
+
+    def clear(self):
+        with self._lock:
+            self._slowest.clear()
+            self._profiles.clear()
+
+
+def requested_mode(headers, args):
+    """ヘッダー X-Profile またはクエリ _profile で要求されたモード（無ければ None）"""
+    value = headers.get(PROFILE_HEADER) or args.get(PROFILE_QUERY)
+    if not value:
+        return None
+    return value if value in PROFILE_MODES else 'sample'
+
+
+def server_timing(record):
+    """Server-Timing ヘッダーの値（ブラウザの開発者ツールで区間を確認できる）"""
+    return ', '.join(f'{name};dur={ms}' for name, ms in record['phases_ms'].items())
+
+
+def install_profiler(app, profiler):
+    """Flaskアプリの全リクエストを計測し、/api/admin/profiles を追加する"""
+    from flask import Response, g, jsonify, request
+    from werkzeug.datastructures import ImmutableMultiDict
+
+    @app.before_request
+    def _begin_profile():
+        mode = requested_mode(request.headers, request.args)
+        if PROFILE_QUERY in request.args:
+            # ルートがクエリの有無で処理を変えるため（/api/badges など）、_profile は取り除く
+            request.args = ImmutableMultiDict(
+                [(key, value) for key, value in request.args.items(multi=True) if key != PROFILE_QUERY])
+        if mode is not None and not admin_token_matches(request.headers):
+            return jsonify({'error': 'Profiling requires admin token'}), 403
+        g.profile_state = profiler.begin()
+        g.profile_capture = profiler.start_capture(mode) if mode is not None else None
+
+    @app.after_request
+    def _end_profile(response):
+        state = g.pop('profile_state', None)
+        if state is not None:
+            capture = g.pop('profile_capture', None)
+            route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            record = profiler.end(state, request.method, request.full_path.rstrip('?'), route,
+                                  response.status_code, capture)
+            if capture is not None:
+                response.headers['X-Profile-Id'] = record['id']
+                response.headers['Server-Timing'] = server_timing(record)
+        return response
+
+    @app.teardown_request
+    def _abort_profile(error):
+        # 例外で after_request が呼ばれなかった場合もプロファイルを終了する
+        state = g.pop('profile_state', None)
+        if state is not None:
+            route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            profiler.end(state, request.method, request.full_path.rstrip('?'), route, 500,
+                         g.pop('profile_capture', None))
+
+    def admin_only():
+        if not admin_token_matches(request.headers):
+            return jsonify({'error': 'Admin token required (set ADMIN_TOKEN)'}), 403
+        return None
+
+    @app.route('/api/admin/profiles', methods=['GET', 'DELETE'])
+    def get_profiles():
+        """最も遅いリクエストとオンデマンドのプロファイルの一覧（?format=folded でフレームグラフ用）"""
+        denied = admin_only()
+        if denied:
+            return denied
+        if request.method == 'DELETE':
+            profiler.clear()
+            return jsonify({'success': True})
+        if request.args.get('format') == 'folded':
+            return _download(Response, profiler.slowest_folded(), 'slowest-requests.folded')
+        return jsonify({
+            'slowest': profiler.slowest(),
+            'profiles': profiler.profiles(),
+            'slow_size': profiler.slow_size
+        })
+
+    @app.route('/api/admin/profiles/<profile_id>')
+    def get_profile(profile_id):
+        """オンデマンドのプロファイル（既定は折り畳みスタック形式、?format=text で要約）"""
+        denied = admin_only()
+        if denied:
+            return denied
+        profile = profiler.get_profile(profile_id)
+        if profile is None:
+            return jsonify({'error': 'Profile not found'}), 404
+        if request.args.get('format') == 'text':
+            return Response(profile['summary'], content_type='text/plain; charset=utf-8')
+        return _download(Response, profile['folded'], f'profile-{profile_id}.folded')
+
+
+def _download(response_class, body, filename):
+    return response_class(body, content_type='text/plain; charset=utf-8',
+                          headers={'Content-Disposition': f'attachment; filename="{filename}"'})
@@ -0,0 +1,92 @@
+"""新しく検出したバッジの情報調査をバックグラウンドで行うワーカープール"""
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class HostRateLimiter:
+    """ホストごとにリクエスト間隔を min_interval 秒以上空ける"""
+
+    def __init__(self, min_interval=1.0):
+        self.min_interval = min_interval
+        self._next_allowed = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host):
+        """このホストへの次のリクエストが許可されるまで待つ"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_allowed.get(host, 0))
+            self._next_allowed[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class ResearchQueue:
+    """上限付きのキューを複数のワーカースレッドで処理する
+
+    submit はブロックせず、キューが満杯の場合は False を返す。
+    """
+
+    def __init__(self, handler, workers=2, maxsize=200):
+        self.handler = handler
+        self.workers = workers
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._threads = []
+        self._lock = threading.Lock()
+
+        self.completed = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def submit(self, item):
+        self._ensure_workers()
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+
+    def _ensure_workers(self):
+        if len(self._threads) >= self.workers:
+            return
+        with self._lock:
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._worker, daemon=True,
+                                          name=f'badge-research-{len(self._threads)}')
+                thread.start()
+                self._threads.append(thread)
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            try:
+                self.handler(item)
+                with self._lock:
+                    self.completed += 1
+            except Exception as e:
+                with self._lock:
+                    self.failed += 1
+                logger.exception(f"Error in badge research worker: {e}")
+            finally:
+                self._queue.task_done()
+
+    def join(self):
+        """キューが空になるまで待つ"""
+        self._queue.join()
+
+    def stats(self):
+        """監視用の統計情報"""
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'queued': self._queue.qsize(),
+                'completed': self.completed,
+                'failed': self.failed,
+                'dropped': self.dropped
+            }
@@ -0,0 +1,271 @@
+"""上流APIレスポンスのインプロセスキャッシュ（TTL + stale-while-revalidate）
+
+shared（shared_cache.SharedCache）を渡すと、取得した値をワーカー間で共有する。
+手元に新しい値が無いときは上流を呼ぶ前に共有キャッシュを確認し、他のワーカーが
+取得済みの値をそのまま使う。
+
+name はメトリクス（cache_requests_total など）のラベルに使う。
+"""
+import logging
+import threading
+import time
+
+from metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+# result: hit（TTL内）・stale（古い値を返して裏で再取得）・miss（上流から取得）・coalesced（他のロードを待った）
+CACHE_REQUESTS = Counter('cache_requests_total', 'レスポンスキャッシュの参照数', ['cache', 'key', 'result'])
+CACHE_REFRESH_ERRORS = Counter('cache_refresh_errors_total', 'バックグラウンド再取得の失敗数', ['cache', 'key'])
+CACHE_SHARED_ADOPTIONS = Counter('cache_shared_adoptions_total', '共有キャッシュから取り込んだ値の数', ['cache', 'key'])
+
+
+class _Entry:
+    __slots__ = ('value', 'fetched_at', 'version')
+
+    def __init__(self, value, fetched_at, version):
+        self.value = value
+        self.fetched_at = fetched_at
+        self.version = version
+
+
+class _Flight:
+    """同一キーへの同時ロードを1回にまとめるための待ち合わせ"""
+    __slots__ = ('event', 'value', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+# 共有キャッシュを確認する最短間隔（秒）。古い値を返している間に毎回問い合わせないため
+SHARED_CHECK_INTERVAL = 1.0
+
+
+class _SharedCacheMixin:
+    """TTLCache / AsyncTTLCache 共通の共有キャッシュの読み書き（ブロッキング）"""
+
+    def _init_shared(self, shared):
+        self.shared = shared if shared is not None and self.ttl + self.max_stale > 0 else None
+        self._shared_checked = {}
+
+    def _read_shared(self, key, now):
+        """共有キャッシュに手元より新しい値があれば (値, 取得時刻) を返す"""
+        if now - self._shared_checked.get(key, 0) < SHARED_CHECK_INTERVAL:
+            return None
+        self._shared_checked[key] = now
+        record = self.shared.get(key)
+        if not record or now - record.get('fetched_at', 0) >= self.ttl + self.max_stale:
+            return None
+        return record['value'], record['fetched_at']
+
+    def _write_shared(self, key, entry):
+        self.shared.set(key, {'fetched_at': entry.fetched_at, 'value': entry.value},
+                        self.ttl + self.max_stale)
+
+    def _adopt(self, key, value, fetched_at):
+        """共有キャッシュの値が手元の値より新しい場合だけ取り込む"""
+        entry = self._entries.get(key)
+        if entry is None or entry.fetched_at < fetched_at:
+            self._store(key, value, fetched_at)
+            CACHE_SHARED_ADOPTIONS.inc(cache=self.name, key=key)
+
+
+class TTLCache(_SharedCacheMixin):
+    """エンドポイントごとにレスポンスを保持するキャッシュ
+
+    - TTL内はキャッシュをそのまま返す
+    - TTL切れ後も max_stale 秒までは古い値を返しつつ、裏で1回だけ再取得する
+    - キャッシュが無い状態での同時アクセスは1回の上流呼び出しにまとめる
+    - shared があれば、上流を呼ぶ前に他のワーカーが取得済みの値を確認する
+    """
+
+    def __init__(self, ttl, max_stale=86400, shared=None, name='default'):
+        self.name = name
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self._entries = {}
+        self._flights = {}
+        self._refreshing = set()
+        self._version = 0
+        self._lock = threading.Lock()
+        self._init_shared(shared)
+
+    def get(self, key, loader):
+        """キャッシュから値を取得し、必要に応じて loader() で取得する"""
+        return self.get_versioned(key, loader)[0]
+
+    def get_versioned(self, key, loader):
+        """(値, バージョン) を返す。バージョンは値が再取得されるたびに増える"""
+        now = time.time()
+        if self.shared is not None:
+            with self._lock:
+                entry = self._entries.get(key)
+                fresh = entry is not None and now - entry.fetched_at < self.ttl
+            if not fresh:
+                shared = self._read_shared(key, now)
+                if shared is not None:
+                    with self._lock:
+                        self._adopt(key, *shared)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry.fetched_at
+                if age < self.ttl:
+                    CACHE_REQUESTS.inc(cache=self.name, key=key, result='hit')
+                    return entry.value, entry.version
+                if age < self.ttl + self.max_stale:
+                    CACHE_REQUESTS.inc(cache=self.name, key=key, result='stale')
+                    # 古い値を返しつつバックグラウンドで再取得
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        threading.Thread(
+                            target=self._refresh, args=(key, loader), daemon=True
+                        ).start()
+                    return entry.value, entry.version
+
+            flight = self._flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = _Flight()
+                self._flights[key] = flight
+
+        CACHE_REQUESTS.inc(cache=self.name, key=key, result='miss' if is_leader else 'coalesced')
+        if not is_leader:
+            # 先行するロードの完了を待つ
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            value = loader()
+            with self._lock:
+                entry = self._store(key, value)
+            if self.shared is not None:
+                self._write_shared(key, entry)
+            flight.value = (entry.value, entry.version)
+            return flight.value
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.event.set()
+
+    def _refresh(self, key, loader):
+        """バックグラウンドでの再取得（失敗時は古い値を保持）"""
+        try:
+            value = loader()
+            with self._lock:
+                entry = self._store(key, value)
+            if self.shared is not None:
+                self._write_shared(key, entry)
+        except Exception as e:
+            CACHE_REFRESH_ERRORS.inc(cache=self.name, key=key)
+            logger.error(f"Error refreshing cache for {key}: {e}", extra={'cache': self.name})
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _store(self, key, value, fetched_at=None):
+        self._version += 1
+        entry = _Entry(value, fetched_at or time.time(), self._version)
+        self._entries[key] = entry
+        return entry
+
+    def invalidate(self, key=None):
+        """キャッシュを破棄する（key省略時は全件）"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+class AsyncTTLCache(_SharedCacheMixin):
+    """TTLCache と同じ規則の asyncio 版（ASGIモード用）
+
+    asyncio はこのクラスでのみ使うため、TTLCache だけを使う環境（Vercelの関数など）の
+    起動を遅くしないようメソッド内で読み込む。
+    coalesce=False の場合は同一キーへの同時ロードをまとめない（負荷試験で上流の同時待ちを再現する用）。
+    """
+
+    def __init__(self, ttl, max_stale=86400, shared=None, name='default', coalesce=True):
+        self.name = name
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.coalesce = coalesce
+        self._entries = {}
+        self._flights = {}
+        self._refresh_tasks = {}
+        self._version = 0
+        self._init_shared(shared)
+
+    async def get_versioned(self, key, loader):
+        """(値, バージョン) を返す。loader は await 可能な値を返す関数"""
+        import asyncio
+        now = time.time()
+        entry = self._entries.get(key)
+        if self.shared is not None and (entry is None or now - entry.fetched_at >= self.ttl):
+            # 共有キャッシュの読み込みはブロッキングI/Oのためスレッドで
+            shared = await asyncio.to_thread(self._read_shared, key, now)
+            if shared is not None:
+                self._adopt(key, *shared)
+                entry = self._entries.get(key)
+        if entry is not None:
+            age = now - entry.fetched_at
+            if age < self.ttl:
+                CACHE_REQUESTS.inc(cache=self.name, key=key, result='hit')
+                return entry.value, entry.version
+            if age < self.ttl + self.max_stale:
+                CACHE_REQUESTS.inc(cache=self.name, key=key, result='stale')
+                # 古い値を返しつつバックグラウンドで再取得
+                if key not in self._refresh_tasks:
+                    self._refresh_tasks[key] = asyncio.ensure_future(self._refresh(key, loader))
+                return entry.value, entry.version
+
+        if not self.coalesce:
+            CACHE_REQUESTS.inc(cache=self.name, key=key, result='miss')
+            return await self._load(key, loader)
+
+        flight = self._flights.get(key)
+        CACHE_REQUESTS.inc(cache=self.name, key=key, result='miss' if flight is None else 'coalesced')
+        if flight is None:
+            flight = asyncio.ensure_future(self._load(key, loader))
+            self._flights[key] = flight
+        # shield: 待機中のリクエストが切断されても他の待機者のロードは継続する
+        return await asyncio.shield(flight)
+
+    async def _load(self, key, loader):
+        import asyncio
+        try:
+            value = await loader()
+            entry = self._store(key, value)
+            if self.shared is not None:
+                await asyncio.to_thread(self._write_shared, key, entry)
+            return entry.value, entry.version
+        finally:
+            if self.coalesce:
+                self._flights.pop(key, None)
+
+    async def _refresh(self, key, loader):
+        import asyncio
+        try:
+            entry = self._store(key, await loader())
+            if self.shared is not None:
+                await asyncio.to_thread(self._write_shared, key, entry)
+        except Exception as e:
+            CACHE_REFRESH_ERRORS.inc(cache=self.name, key=key)
+            logger.error(f"Error refreshing cache for {key}: {e}", extra={'cache': self.name})
+        finally:
+            self._refresh_tasks.pop(key, None)
+
+    def _store(self, key, value, fetched_at=None):
+        self._version += 1
+        entry = _Entry(value, fetched_at or time.time(), self._version)
+        self._entries[key] = entry
+        return entry
@@ -13,310 +13,6 @@ function getBaseUrl() {
 
 const BASE_URL = getBaseUrl();
 
-// バッジの入手可能期間データベース（badge-detail.jsと同じ）
-const badgeAvailabilityPeriods = {
-    'clips-leader': {
-        type: 'ongoing',
-        description: 'Ongoing feature since April 11, 2025'
-    },
-    'legendus': {
-        type: 'time-limited',
-        start: '2025-06-28T00:00:00Z',
-        end: '2025-06-29T23:59:59Z',
-        description: 'LEGENDUS ITADAKI event June 28-29, 2025'
-    },
-    'marathon-reveal-runner': {
-        type: 'time-limited',
-        start: '2025-04-11T00:00:00Z',
-        end: '2025-04-12T23:59:59Z',
-        description: 'Marathon Reveal stream subscription April 11-12, 2025'
-    },
-    'gone-bananas': {
-        type: 'time-limited',
-        start: '2025-04-01T00:00:00Z',
-        end: '2025-04-04T23:59:59Z',
-        description: 'April Fools 2025 April 1-4, 2025'
-    },
-    'elden-ring-wylder': {
-        type: 'time-limited',
-        start: '2025-05-29T00:00:00Z',
-        end: '2025-06-03T23:59:59Z',
-        description: 'Elden Ring Nightreign clip sharing May 29 - June 3, 2025'
-    },
-    'elden-ring-recluse': {
-        type: 'time-limited',
-        start: '2025-05-29T00:00:00Z',
-        end: '2025-05-30T23:59:59Z',
-        description: 'Elden Ring SuperFan Recluse May 29-30, 2025'
-    },
-    'league-of-legends-mid-season-invitational-2025---grey': {
-        type: 'time-limited',
-        start: '2025-06-24T00:00:00Z',
-        end: '2025-07-12T08:59:00Z',
-        description: 'MSI 2025 June 24 - July 12, 2025'
-    },
-    'league-of-legends-mid-season-invitational-2025---purple': {
-        type: 'time-limited',
-        start: '2025-06-24T00:00:00Z',
-        end: '2025-07-12T08:59:00Z',
-        description: 'MSI 2025 June 24 - July 12, 2025'
-    },
-    'league-of-legends-mid-season-invitational-2025---blue': {
-        type: 'time-limited',
-        start: '2025-06-24T00:00:00Z',
-        end: '2025-07-12T08:59:00Z',
-        description: 'MSI 2025 June 24 - July 12, 2025'
-    },
-    'borderlands-4-badge---ripper': {
-        type: 'time-limited',
-        start: '2025-06-21T00:00:00Z',
-        end: '2025-06-21T23:59:59Z',
-        description: 'Borderlands 4 Fan Fest June 21, 2025'
-    },
-    'borderlands-4-badge---vault-symbol': {
-        type: 'time-limited',
-        start: '2025-06-21T00:00:00Z',
-        end: '2025-06-21T23:59:59Z',
-        description: 'Borderlands 4 Fan Fest June 21, 2025'
-    },
-    'bot-badge': {
-        type: 'future',
-        description: 'Added to system but not yet distributed'
-    },
-    'minecraft-15th-anniversary-celebration': {
-        type: 'time-limited',
-        start: '2024-05-25T00:00:00Z',
-        end: '2024-05-31T23:59:59Z',
-        description: 'Minecraft 15th Anniversary May 25-31, 2024'
-    },
-    'clip-the-halls': {
-        type: 'time-limited',
-        start: '2024-12-02T00:00:00Z',
-        end: '2024-12-13T23:59:59Z',
-        description: 'Holiday Hoopla 2024 December 2-13, 2024'
-    },
-    'gold-pixel-heart---together-for-good-24': {
-        type: 'time-limited',
-        start: '2024-12-03T00:00:00Z',
-        end: '2024-12-15T23:59:59Z',
-        description: 'Together for Good 2024 December 3-15, 2024'
-    },
-    'gold-pixel-heart': {
-        type: 'time-limited',
-        start: '2024-12-03T00:00:00Z',
-        end: '2024-12-15T23:59:59Z',
-        description: 'Together for Good 2024 December 3-15, 2024'
-    },
-    'arcane-season-2-premiere': {
-        type: 'time-limited',
-        start: '2024-11-08T00:00:00Z',
-        end: '2024-11-09T23:59:59Z',
-        description: 'Arcane Season 2 Premiere November 8-9, 2024'
-    },
-    'dreamcon-2024': {
-        type: 'time-limited',
-        start: '2024-07-26T00:00:00Z',
-        end: '2024-07-28T23:59:59Z',
-        description: 'DreamCon 2024 July 26-28, 2024'
-    },
-    'destiny-2-the-final-shape-streamer': {
-        type: 'time-limited',
-        start: '2024-06-07T00:00:00Z',
-        end: '2024-06-09T23:59:59Z',
-        description: 'Destiny 2 raid race June 7-9, 2024'
-    },
-    'destiny-2-final-shape-raid-race': {
-        type: 'time-limited',
-        start: '2024-06-07T00:00:00Z',
-        end: '2024-06-09T23:59:59Z',
-        description: 'Destiny 2 raid race June 7-9, 2024'
-    },
-    'evo-2025': {
-        type: 'time-limited',
-        start: '2025-08-01T00:00:00Z',
-        end: '2025-08-04T23:59:59Z',
-        description: 'Evo 2025 fighting game tournament August 1-4, 2025'
-    },
-    'share-the-love': {
-        type: 'time-limited',
-        start: '2025-02-14T00:00:00Z',
-        end: '2025-02-14T23:59:59Z',
-        description: 'Share the Love Valentine\'s Day 2025'
-    },
-    'raging-wolf-helm': {
-        type: 'time-limited',
-        start: '2024-06-20T00:00:00Z',
-        end: '2024-06-22T23:59:59Z',
-        description: 'Elden Ring collaboration event June 2024'
-    },
-    'speedons-5-badge': {
-        type: 'time-limited',
-        start: '2025-02-24T00:00:00Z',
-        end: '2025-02-24T23:59:59Z',
-        description: 'Speedons 5 event February 24, 2025'
-    },
-    'ruby-pixel-heart---together-for-good-24': {
-        type: 'time-limited',
-        start: '2024-12-02T00:00:00Z',
-        end: '2024-12-15T23:59:59Z',
-        description: 'Together for Good 2024 December 2-15, 2024'
-    },
-    'purple-pixel-heart---together-for-good-24': {
-        type: 'time-limited',
-        start: '2024-12-02T00:00:00Z',
-        end: '2024-12-15T23:59:59Z', 
-        description: 'Together for Good 2024 December 2-15, 2024'
-    },
-    'la-velada-iv': {
-        type: 'time-limited',
-        start: '2024-07-13T00:00:00Z',
-        end: '2024-07-14T23:59:59Z',
-        description: 'La Velada del Año IV July 13, 2024'
-    },
-    'la-velada-v-badge': {
-        type: 'time-limited',
-        start: '2025-07-26T16:45:00Z',
-        end: '2025-07-27T01:30:00Z',
-        description: 'La Velada del Año V July 26, 2025'
-    },
-    'valorant-2025': {
-        type: 'time-limited',
-        start: '2025-09-12T17:00:00Z',
-        end: '2025-10-05T18:59:00Z',
-        description: 'VCT Champions Paris 2025 - SUBtember September 12 - October 5, 2025'
-    },
-    'valorant-paris-2025': {
-        type: 'time-limited',
-        start: '2025-09-12T17:00:00Z',
-        end: '2025-10-05T18:59:00Z',
-        description: 'VCT Champions Paris 2025 - SUBtember September 12 - October 5, 2025'
-    },
-    'zevent-2024': {
-        type: 'time-limited',
-        start: '2024-09-06T18:00:00Z',
-        end: '2024-09-08T23:59:59Z',
-        description: 'ZEVENT 2024 charity marathon September 6-8, 2024'
-    },
-    'zevent25': {
-        type: 'time-limited',
-        start: '2025-09-04T16:00:00Z',
-        end: '2025-09-07T00:00:00Z',
-        description: 'ZEVENT 2025 charity marathon September 4-7, 2025'
-    },
-    'hornet': {
-        type: 'time-limited',
-        start: '2025-09-04T14:00:00Z',
-        end: '2025-09-13T06:59:00Z',
-        description: 'Hollow Knight: Silksong launch event September 4-13, 2025'
-    },
-    'subtember-2025': {
-        type: 'time-limited',
-        start: '2025-08-29T17:00:00Z',
-        end: '2025-10-01T17:00:00Z',
-        description: 'SUBtember 2025 August 29 - October 1, 2025'
-    },
-    'gears-of-war-superfan-badge': {
-        type: 'time-limited',
-        start: '2025-08-25T07:00:00Z',
-        end: '2025-08-26T19:00:00Z',
-        description: 'Gears of War: Reloaded Superfan August 25-26, 2025'
-    },
-    'path-of-exile-2-badge': {
-        type: 'time-limited',
-        start: '2025-08-29T07:00:00Z',
-        end: '2025-09-15T06:59:00Z',
-        description: 'Path of Exile II launch promotion August 29 - September 15, 2025'
-    }
-};
-
-// 動的な入手可能性を判定する関数
-function getBadgeAvailabilityStatus(badgeId) {
-    const period = badgeAvailabilityPeriods[badgeId];
-    if (!period) {
-        return { status: 'unknown', message: '入手可能期間の情報がありません' };
-    }
-    
-    const now = new Date();
-    
-    switch (period.type) {
-        case 'ongoing':
-            return { 
-                status: 'available', 
-                message: '現在入手可能',
-                isAvailable: true,
-                description: period.description
-            };
-        
-        case 'time-limited':
-            const startDate = new Date(period.start);
-            const endDate = new Date(period.end);
-            
-            if (now < startDate) {
-                const daysUntilStart = Math.ceil((startDate - now) / (1000 * 60 * 60 * 24));
-                return {
-                    status: 'upcoming',
-                    message: `${daysUntilStart}日後に入手可能`,
-                    isAvailable: false,
-                    description: period.description,
-                    startDate: startDate,
-                    endDate: endDate
-                };
-            } else if (now > endDate) {
-                return {
-                    status: 'expired',
-                    message: '入手期間終了',
-                    isAvailable: false,
-                    description: period.description,
-                    startDate: startDate,
-                    endDate: endDate
-                };
-            } else {
-                const hoursUntilEnd = (endDate - now) / (1000 * 60 * 60);
-                let message;
-                
-                if (hoursUntilEnd < 24) {
-                    // 24時間未満の場合は時間表示
-                    const hours = Math.ceil(hoursUntilEnd);
-                    message = `あと${hours}時間で終了`;
-                } else {
-                    // 24時間以上の場合は日数表示（切り捨て）
-                    const daysUntilEnd = Math.floor(hoursUntilEnd / 24);
-                    if (daysUntilEnd === 0) {
-                        message = '本日終了';
-                    } else if (daysUntilEnd === 1) {
-                        message = 'あと1日で終了';
-                    } else {
-                        message = `あと${daysUntilEnd}日で終了`;
-                    }
-                }
-                
-                return {
-                    status: 'limited',
-                    message: message,
-                    isAvailable: true,
-                    description: period.description,
-                    startDate: startDate,
-                    endDate: endDate
-                };
-            }
-        
-        case 'future':
-            return {
-                status: 'future',
-                message: '配布予定',
-                isAvailable: false,
-                description: period.description
-            };
-        
-        default:
-            return { 
-                status: 'unknown', 
-                message: '入手可能期間の情報がありません',
-                isAvailable: false
-            };
-    }
-}
-
 // 翻訳データ
 const translations = {
     ja: {
@@ -331,6 +27,7 @@ const translations = {
         'sort.label': '並び替え:',
         'sort.newest': '新しい順',
         'sort.oldest': '古い順',
+        'search.placeholder': 'バッジを検索（名前・入手方法）...',
         'nav.emotes': 'エモートページ'
     },
     en: {
@@ -345,6 +42,7 @@ const translations = {
         'sort.label': 'Sort by:',
         'sort.newest': 'Newest first',
         'sort.oldest': 'Oldest first',
+        'search.placeholder': 'Search badges (name, how to obtain)...',
         'nav.emotes': 'Emotes Page'
     }
 };
@@ -356,63 +54,118 @@ let currentLanguage = 'ja';
 let allBadges = [];
 let currentSortOrder = 'newest';
 
-// グローバルバッジを取得して表示する
-async function loadGlobalBadges() {
-    const loadingElement = document.getElementById('loading');
-    const errorElement = document.getElementById('error-message');
-    const badgeContainer = document.getElementById('badge-container');
-    
+// 検索で絞り込んだバッジのset_id（null なら絞り込みなし）
+let badgeSearchIds = null;
+
+// バッジの入手可能状態（サーバーで判定した結果を言語ごとに取得）
+let badgeAvailability = {};
+
+// 入手可能期間の情報があるバッジの入手可能状態を取得
+async function loadBadgeAvailability() {
     try {
-        // バックエンドAPIにリクエスト
-        const response = await fetch(`${BASE_URL}/api/badges`);
+        const response = await fetch(`${BASE_URL}/api/badges/availability?lang=${encodeURIComponent(currentLanguage)}`);
         
         if (!response.ok) {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
         
         const data = await response.json();
-        
-        // エラーチェック
-        if (data.error) {
-            throw new Error(data.error);
+        badgeAvailability = data.availability || {};
+    } catch (error) {
+        // 取得できなくてもバッジ一覧は表示する
+        console.error('Error loading badge availability:', error);
+        badgeAvailability = {};
+    }
+}
+
+// 最初の画面に表示する件数（残りは表示後に続けて取得）
+const BADGE_PAGE_SIZE = 60;
+
+// バッジ一覧を新しい順で1ページ取得（画像URLはテンプレートで送られるコンパクト形式）
+async function fetchBadgePage(cursor) {
+    const params = new URLSearchParams({
+        sort: 'newest',
+        format: 'compact',
+        limit: BADGE_PAGE_SIZE
+    });
+    if (cursor) {
+        params.set('cursor', cursor);
+    }
+    
+    const response = await fetch(`${BASE_URL}/api/badges?${params}`);
+    
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    
+    const data = await response.json();
+    
+    // エラーチェック
+    if (data.error) {
+        throw new Error(data.error);
+    }
+    
+    return { data: decodeCompactList(data), next_cursor: data.next_cursor };
+}
+
+// 取得したバッジに作成日と番号を記録して追加
+function appendBadges(badges) {
+    const timestamp = Date.now();
+    const offset = allBadges.length;
+    
+    badges.forEach((badge, i) => {
+        const index = offset + i;
+        
+        // バッジIDから番号を抽出（例：60-seconds_1 → 1）
+        const badgeNumber = extractBadgeNumber(badge.set_id);
+        
+        // 作成日の設定：APIからの正確な日付を優先し、なければ推定日を使用
+        let createdDate = null;
+        let hasRealTimestamp = false;
+        
+        if (badge.created_at && badge.has_real_timestamp) {
+            // APIからの正確な作成日
+            createdDate = new Date(badge.created_at);
+            hasRealTimestamp = true;
+        } else if (badge.estimated_created_at) {
+            // サーバーで推定した作成日（並び替え用）
+            createdDate = new Date(badge.estimated_created_at);
         }
         
-        // ローディング表示を非表示
-        loadingElement.style.display = 'none';
-        
-        // バッジデータに追加時刻と番号を記録
-        const timestamp = Date.now();
-        allBadges = data.data.map((badge, index) => {
-            // バッジIDから番号を抽出（例：60-seconds_1 → 1）
-            const badgeNumber = extractBadgeNumber(badge.set_id);
-            
-            // 作成日の設定：APIからの正確な日付を優先し、なければ推定日を使用
-            let createdDate = null;
-            let hasRealTimestamp = false;
-            
-            if (badge.created_at && badge.has_real_timestamp) {
-                // APIからの正確な作成日
-                createdDate = new Date(badge.created_at);
-                hasRealTimestamp = true;
-            } else {
-                // 推定作成日を生成
-                createdDate = generateCreatedDate(badge.set_id, index);
-            }
-            
-            return {
-                ...badge,
-                addedAt: timestamp + index,
-                originalIndex: index,
-                badgeNumber: badgeNumber,
-                createdDate: createdDate,
-                hasRealTimestamp: hasRealTimestamp
-            };
+        allBadges.push({
+            ...badge,
+            addedAt: timestamp + index,
+            originalIndex: index,
+            badgeNumber: badgeNumber,
+            createdDate: createdDate,
+            hasRealTimestamp: hasRealTimestamp
         });
+    });
+}
+
+// グローバルバッジを取得して表示する
+async function loadGlobalBadges() {
+    const loadingElement = document.getElementById('loading');
+    const errorElement = document.getElementById('error-message');
+    
+    let cursor = null;
+    try {
+        // 入手可能状態はバッジ一覧と並行して取得
+        const availabilityRequest = loadBadgeAvailability();
+        
+        // 最初のページだけ取得してすぐに表示
+        const firstPage = await fetchBadgePage(null);
+        allBadges = [];
+        appendBadges(firstPage.data);
+        cursor = firstPage.next_cursor;
         
-        // バッジデータを表示（デフォルトで最新順ソート）
-        displayBadges(allBadges);
+        await availabilityRequest;
         
-        // 最新順でソートを適用
+        // ローディング表示を非表示
+        loadingElement.style.display = 'none';
+        document.getElementById('search-container').style.display = 'block';
+        
+        // 最新順でソートを適用して表示
         sortBadges('newest');
         
     } catch (error) {
@@ -424,7 +177,24 @@ async function loadGlobalBadges() {
         // エラーメッセージを表示
         errorElement.textContent = `${t('error.loading')}: ${error.message}`;
         errorElement.style.display = 'block';
+        return;
+    }
+    
+    if (!cursor) {
+        return;
+    }
+    
+    // 残りのページを続けて取得し、揃ったら現在の並び順で表示し直す
+    try {
+        while (cursor) {
+            const page = await fetchBadgePage(cursor);
+            appendBadges(page.data);
+            cursor = page.next_cursor;
+        }
+    } catch (error) {
+        console.error('Error loading remaining badges:', error);
     }
+    sortBadges(currentSortOrder);
 }
 
 // バッジデータをHTMLとして表示
@@ -488,8 +258,8 @@ function createBadgeCard(badgeSet) {
     }
     
     // 入手可能性の情報を表示
-    const availabilityInfo = getBadgeAvailabilityStatus(badgeSet.set_id);
-    if (availabilityInfo.status !== 'unknown') {
+    const availabilityInfo = badgeAvailability[badgeSet.set_id];
+    if (availabilityInfo && availabilityInfo.status !== 'unknown') {
         const availabilityElement = document.createElement('div');
         availabilityElement.className = 'badge-availability';
         
@@ -571,110 +341,6 @@ function extractBadgeNumber(setId) {
     return match ? parseInt(match[1]) : 0;
 }
 
-// バッジの作成日を生成（推定・より正確なデータベース）
-function generateCreatedDate(setId, index) {
-    // 実際のバッジの推定作成日データベース
-    const badgeCreationDates = {
-        // 基本的なTwitchバッジ（初期からある）
-        'broadcaster': '2011-06-01',
-        'moderator': '2011-06-01',
-        'staff': '2011-06-01',
-        'admin': '2011-06-01',
-        'global-mod': '2011-06-01',
-        'partner': '2011-06-01',
-        'turbo': '2013-08-01',
-        'subscriber': '2011-06-01',
-        'premium': '2019-05-01',
-        'bits': '2016-06-01',
-        'bits-leader': '2017-03-01',
-        'sub-gifter': '2017-07-01',
-        'sub-gift-leader': '2018-02-01',
-        'founder': '2018-08-01',
-        'vip': '2018-07-01',
-        'artist-badge': '2019-04-01',
-        'hype-train': '2019-11-01',
-        'predictions': '2021-03-01',
-        'moments': '2017-12-01',
-        'clip': '2016-05-01',
-        'prime': '2016-09-01',
-        'glhf-pledge': '2020-10-01',
-        'glitchcon2020': '2020-11-01',
-        'twitchcon': '2015-09-01',
-        'drops-enabled': '2017-11-01',
-        'game-awards': '2019-12-01',
-        'charity': '2019-06-01',
-        'no_audio': '2014-08-01',
-        'no_video': '2014-08-01',
-        'anonymous-cheerer': '2018-06-01',
-        'verified': '2021-07-01',
-        'twitchbot': '2019-10-01',
-        'game-developer': '2020-05-01',
-        
-        // ゲーム固有のバッジ（推定）
-        '1979-revolution': '2016-04-01',
-        '60-seconds': '2015-05-01',
-        'a-hat-in-time': '2017-10-01',
-        'among-us': '2018-11-01',
-        'apex-legends': '2019-02-01',
-        'battlefield': '2016-10-01',
-        'call-of-duty': '2019-10-01',
-        'cyberpunk-2077': '2020-12-01',
-        'dota': '2013-07-01',
-        'fallout-76': '2018-11-01',
-        'fortnite': '2017-07-01',
-        'gta-v': '2013-09-01',
-        'league-of-legends': '2012-10-01',
-        'minecraft': '2011-11-01',
-        'overwatch': '2016-05-01',
-        'pubg': '2017-03-01',
-        'rocket-league': '2015-07-01',
-        'subnautica': '2018-01-01',
-        'the-witcher': '2019-12-01',
-        'valorant': '2020-06-01',
-        'warcraft': '2004-11-01',
-        'world-of-warcraft': '2004-11-01'
-    };
-    
-    // 完全一致または部分一致で日付を検索
-    let createdDate = null;
-    
-    // 完全一致チェック
-    if (badgeCreationDates[setId]) {
-        createdDate = new Date(badgeCreationDates[setId]);
-    } else {
-        // 部分一致チェック
-        for (const [key, date] of Object.entries(badgeCreationDates)) {
-            if (setId.includes(key) || key.includes(setId.split('_')[0])) {
-                createdDate = new Date(date);
-                break;
-            }
-        }
-    }
-    
-    // 見つからない場合は推定日付を生成
-    if (!createdDate) {
-        // バッジIDから年を推定
-        const yearMatch = setId.match(/(\d{4})/);
-        if (yearMatch) {
-            const year = parseInt(yearMatch[1]);
-            if (year >= 2011 && year <= 2025) {
-                createdDate = new Date(year, 0, 1);
-            }
-        }
-    }
-    
-    // それでも見つからない場合は、APIの順序に基づいて推定
-    if (!createdDate) {
-        // 2011年からの推定（1週間ごと）
-        const baseDate = new Date('2011-06-01');
-        const weeksToAdd = Math.floor(index / 10); // 10個ごとに1週間進める
-        createdDate = new Date(baseDate.getTime() + (weeksToAdd * 7 * 24 * 60 * 60 * 1000));
-    }
-    
-    return createdDate;
-}
-
-// バッジセットIDをフォーマット（Stream database風の包括的翻訳）
 function formatBadgeSetId(setId) {
     if (currentLanguage === 'en') {
         // 英語の場合は標準的なフォーマット
@@ -911,7 +577,9 @@ function formatBadgeSetId(setId) {
 // 並び替え機能
 function sortBadges(sortOrder) {
     currentSortOrder = sortOrder;
-    let sortedBadges = [...allBadges];
+    let sortedBadges = badgeSearchIds
+        ? allBadges.filter(badge => badgeSearchIds.has(badge.set_id))
+        : [...allBadges];
     
     switch (sortOrder) {
         case 'newest':
@@ -957,6 +625,81 @@ function initializeSortControls() {
     });
 }
 
+// 検索の待ち時間（入力が止まってから送信する）
+const SEARCH_DEBOUNCE_MS = 150;
+// 検索結果を1回に取得する件数（サーバーの上限）
+const SEARCH_PAGE_SIZE = 100;
+let searchTimer = null;
+let searchSequence = 0;
+
+// サーバーの /api/search でバッジ（ID・タイトル・日英の入手方法）を検索し、一致したset_idの集合を返す
+async function fetchBadgeSearch(query) {
+    const matchedIds = new Set();
+    let offset = 0;
+    
+    while (offset !== null) {
+        const params = new URLSearchParams({ q: query, type: 'badge', limit: SEARCH_PAGE_SIZE, offset });
+        const response = await fetch(`${BASE_URL}/api/search?${params}`);
+        
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        
+        const data = await response.json();
+        data.results.forEach(result => matchedIds.add(result.id));
+        offset = data.next_offset ?? null;
+    }
+    
+    return matchedIds;
+}
+
+// 検索機能
+function searchBadges(query) {
+    clearTimeout(searchTimer);
+    const sequence = ++searchSequence;
+    
+    if (!query.trim()) {
+        badgeSearchIds = null;
+        sortBadges(currentSortOrder);
+        return;
+    }
+    
+    searchTimer = setTimeout(async () => {
+        let matchedIds = null;
+        try {
+            matchedIds = await fetchBadgeSearch(query);
+        } catch (error) {
+            // 検索APIが使えない場合は読み込み済みのバッジのIDとタイトルから絞り込む
+            console.error('Error searching badges:', error);
+        }
+        
+        // より新しい入力の検索が始まっていれば結果を捨てる
+        if (sequence !== searchSequence) {
+            return;
+        }
+        
+        if (!matchedIds) {
+            const lowerQuery = query.toLowerCase();
+            matchedIds = new Set(allBadges
+                .filter(badge => badge.set_id.toLowerCase().includes(lowerQuery)
+                    || formatBadgeSetId(badge.set_id).toLowerCase().includes(lowerQuery)
+                    || (badge.versions || []).some(version =>
+                        (version.title || '').toLowerCase().includes(lowerQuery)))
+                .map(badge => badge.set_id));
+        }
+        badgeSearchIds = matchedIds;
+        sortBadges(currentSortOrder);
+    }, SEARCH_DEBOUNCE_MS);
+}
+
+// 検索イベントリスナー
+function initializeSearch() {
+    const searchInput = document.getElementById('search-input');
+    searchInput.addEventListener('input', (e) => {
+        searchBadges(e.target.value);
+    });
+}
+
 // 言語を設定
 function setLanguage(lang) {
     currentLanguage = lang;
@@ -965,12 +708,14 @@ function setLanguage(lang) {
     updateLanguageButtons();
     updateSortOptions();
     
-    // バッジを再読み込み（言語に応じた表示のため）
+    // 入手可能状態を言語に合わせて取得し直してからバッジを再表示
     const badgeContainer = document.getElementById('badge-container');
     if (badgeContainer.children.length > 0) {
-        badgeContainer.innerHTML = '';
-        // 最新順でソートを適用
-        sortBadges('newest');
+        loadBadgeAvailability().then(() => {
+            badgeContainer.innerHTML = '';
+            // 最新順でソートを適用
+            sortBadges('newest');
+        });
     }
 }
 
@@ -982,6 +727,12 @@ function updatePageTranslations() {
             element.textContent = translations[currentLanguage][key];
         }
     });
+    document.querySelectorAll('[data-i18n-placeholder]').forEach(element => {
+        const key = element.getAttribute('data-i18n-placeholder');
+        if (translations[currentLanguage] && translations[currentLanguage][key]) {
+            element.placeholder = translations[currentLanguage][key];
+        }
+    });
 }
 
 // 言語ボタンの状態を更新
@@ -1038,6 +789,7 @@ document.addEventListener('DOMContentLoaded', () => {
     // バッジを読み込む
     loadGlobalBadges();
     initializeSortControls();
+    initializeSearch();
     initializeAdminControls();
 });
 
@@ -1068,6 +820,30 @@ function initializeAdminControls() {
     }
 }
 
+// 管理ジョブの完了を待って結果を返す（登録時点で完了済みならそのまま返す）
+async function waitForAdminJob(data, interval = 1000, timeout = 300000) {
+    let job = data.job;
+    const deadline = Date.now() + timeout;
+    
+    while (job.status !== 'succeeded' && job.status !== 'failed') {
+        if (Date.now() > deadline) {
+            throw new Error('ジョブの完了待ちがタイムアウトしました');
+        }
+        await new Promise(resolve => setTimeout(resolve, interval));
+        
+        const response = await fetch(`${BASE_URL}/api/admin/jobs/${job.id}`);
+        if (!response.ok) {
+            throw new Error(`Job status error: ${response.status}`);
+        }
+        job = await response.json();
+    }
+    
+    if (job.status === 'failed') {
+        throw new Error(job.error || 'Job failed');
+    }
+    return job.result;
+}
+
 // Stream Databaseから最新バッジ情報を取得して更新
 async function updateBadgeData() {
     const updateBtn = document.getElementById('update-badges-btn');
@@ -1090,12 +866,16 @@ async function updateBadgeData() {
             throw new Error(`API error: ${response.status}`);
         }
         
-        const data = await response.json();
+        const job = await response.json();
         
-        if (!data.success) {
-            throw new Error(data.error || 'Unknown error');
+        if (!job.success) {
+            throw new Error(job.error || 'Unknown error');
         }
         
+        // サーバー側ではジョブとして実行されるので完了を待つ
+        updateBtn.innerHTML = '🔄 チェック中...';
+        const data = await waitForAdminJob(job);
+        
         console.log('バッジ更新結果:', data);
         
         // 結果を表示
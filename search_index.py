@@ -0,0 +1,285 @@
+"""バッジ・エモートの名前と説明の検索（文字 n-gram の転置インデックス）
+
+日本語の説明文は単語で区切れないため、正規化したテキストの1文字・2文字の
+n-gram を索引にする。クエリの n-gram の転置リストの積集合で候補を絞り、
+候補だけを部分一致で確認してからスコア順に並べる。
+"""
+import heapq
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+
+_WHITESPACE = re.compile(r'\s+')
+
+# フィールドごとの重み（名前・IDでの一致を説明文より優先する）
+FIELD_WEIGHTS = {
+    'id': 3.0,
+    'title': 3.0,
+    'name': 2.0,
+    'description': 1.0
+}
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+# ページングで取得できる位置の上限（バッジ・エモートの総数より十分大きい値）
+MAX_OFFSET = 10000
+
+# 同じクエリの結果を保持する件数（索引が更新されたら破棄）
+RESULT_CACHE_SIZE = 256
+
+
+def normalize_text(text):
+    """全角・半角と大文字・小文字の違いをなくし、空白を1つにまとめる"""
+    if not text:
+        return ''
+    text = unicodedata.normalize('NFKC', str(text)).lower()
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def ngrams(text):
+    """1文字と2文字の n-gram の集合（空白をまたぐものは含めない）"""
+    grams = set()
+    for word in text.split(' '):
+        grams.update(word)
+        grams.update(word[i:i + 2] for i in range(len(word) - 1))
+    return grams
+
+
+def query_grams(term):
+    """クエリ語の照合に使う n-gram（2文字以上なら2-gram、1文字ならその文字）"""
+    if len(term) == 1:
+        return {term}
+    return {term[i:i + 2] for i in range(len(term) - 1)}
+
+
+class _Document:
+    __slots__ = ('fields', 'weighted', 'grams', 'result')
+
+    def __init__(self, fields, result):
+        self.fields = fields
+        # (重み, 正規化済みの値) を重みの大きい順に並べる
+        self.weighted = sorted(
+            ((FIELD_WEIGHTS.get(name, 1.0), normalize_text(value))
+             for name, values in fields.items() for value in values if value),
+            key=lambda entry: -entry[0])
+        self.grams = set()
+        for _, value in self.weighted:
+            self.grams.update(ngrams(value))
+        self.result = result
+
+
+class SearchIndex:
+    """文書（バッジ・エモート）単位で追加・更新・削除できる転置インデックス"""
+
+    def __init__(self):
+        self._documents = {}
+        self._postings = {}
+        self._results = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._documents)
+
+    def upsert(self, doc_id, fields, result):
+        """文書を追加・更新する（フィールドが変わっていなければ何もしない）"""
+        with self._lock:
+            current = self._documents.get(doc_id)
+            if current is not None and current.fields == fields:
+                if current.result != result:
+                    current.result = result
+                    self._results.clear()
+                return False
+            if current is not None:
+                self._unlink(doc_id, current)
+            self._results.clear()
+            document = _Document(fields, result)
+            self._documents[doc_id] = document
+            for gram in document.grams:
+                self._postings.setdefault(gram, set()).add(doc_id)
+            return True
+
+    def remove(self, doc_id):
+        with self._lock:
+            document = self._documents.pop(doc_id, None)
+            if document is not None:
+                self._unlink(doc_id, document)
+                self._results.clear()
+
+    def _unlink(self, doc_id, document):
+        for gram in document.grams:
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(doc_id)
+                if not posting:
+                    del self._postings[gram]
+
+    def sync(self, kind, documents):
+        """kind の文書一式 {doc_id: (fields, result)} に合わせ、変わった文書だけ索引し直す
+
+        戻り値は (更新した件数, 削除した件数)。
+        """
+        with self._lock:
+            stale = [doc_id for doc_id in self._documents
+                     if doc_id[0] == kind and doc_id not in documents]
+            for doc_id in stale:
+                self.remove(doc_id)
+            updated = sum(1 for doc_id, (fields, result) in documents.items()
+                          if self.upsert(doc_id, fields, result))
+            return updated, len(stale)
+
+    def search(self, query, kind=None, limit=DEFAULT_LIMIT, offset=0):
+        """スコア順の検索結果（各語をすべて含む文書のみ）"""
+        return self.search_page(query, kind, limit, offset)[0]
+
+    def search_page(self, query, kind=None, limit=DEFAULT_LIMIT, offset=0):
+        """offset 件目から limit 件の検索結果と、一致した文書の総数を返す"""
+        terms = tuple(term for term in normalize_text(query).split(' ') if term)
+        if not terms:
+            return [], 0
+
+        key = (terms, kind, offset + limit)
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is None:
+                results, total = self._search(terms, kind, offset + limit)
+                cached = ([{**result, 'score': round(score, 3)} for score, _, result in results], total)
+                self._results[key] = cached
+                while len(self._results) > RESULT_CACHE_SIZE:
+                    self._results.popitem(last=False)
+            else:
+                self._results.move_to_end(key)
+            results, total = cached
+            return results[offset:], total
+
+    def _search(self, terms, kind, limit):
+        candidates = None
+        # 転置リストの短い n-gram から積集合を取る
+        grams = sorted(set().union(*(query_grams(term) for term in terms)),
+                       key=lambda gram: len(self._postings.get(gram, ())))
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if not posting:
+                return [], 0
+            candidates = set(posting) if candidates is None else candidates & posting
+            if not candidates:
+                return [], 0
+
+        results = []
+        for doc_id in candidates:
+            if kind is not None and doc_id[0] != kind:
+                continue
+            document = self._documents[doc_id]
+            score = _score(document, terms)
+            if score > 0:
+                results.append((score, doc_id, document.result))
+        # 全件は並べ替えず上位 limit 件だけ取り出す
+        return heapq.nsmallest(limit, results, key=lambda entry: (-entry[0], entry[1])), len(results)
+
+
+def _score(document, terms):
+    """語ごとに最も良く一致したフィールドの得点を合計する（一致しない語があれば0）"""
+    total = 0.0
+    for term in terms:
+        best = 0.0
+        for weight, value in document.weighted:
+            if weight * 3 <= best:
+                # 残りのフィールドは重みが小さく、これ以上の得点にならない
+                break
+            if term not in value:
+                continue
+            if value == term:
+                best = weight * 3
+            elif value.startswith(term):
+                best = max(best, weight * 2)
+            else:
+                best = max(best, weight)
+        if best == 0:
+            return 0.0
+        total += best
+    return total
+
+
+def badge_documents(badges, badge_details, obtain_methods=None):
+    """拡張済みバッジ一覧・badge_details・入手方法（日英）から検索用の文書を作る
+
+    obtain_methods は badge_metadata.json と同じ {set_id: {言語: {title, description, ...}}}。
+    """
+    obtain_methods = obtain_methods or {}
+    documents = {}
+    for badge in badges:
+        set_id = badge.get('set_id')
+        if not set_id:
+            continue
+        versions = badge.get('versions') or []
+        details = badge_details.get(set_id) or {}
+        methods = [method for method in (obtain_methods.get(set_id) or {}).values() if method]
+        titles = tuple(dict.fromkeys(version.get('title') for version in versions if version.get('title')))
+        fields = {
+            'id': (set_id, set_id.replace('-', ' ').replace('_', ' ')),
+            'title': tuple(dict.fromkeys(
+                titles + tuple(method.get('title') for method in methods if method.get('title')))),
+            'name': (details.get('name'),),
+            'description': tuple(dict.fromkeys(
+                value for value in [details.get('description')]
+                + [version.get('description') for version in versions]
+                + [method.get('description') for method in methods] if value))
+        }
+        result = {
+            'type': 'badge',
+            'id': set_id,
+            'title': titles[0] if titles else set_id,
+            'image_url_1x': versions[0].get('image_url_1x') if versions else None
+        }
+        documents[('badge', set_id)] = (fields, result)
+    return documents
+
+
+def emote_documents(emotes):
+    """拡張済みエモート一覧から検索用の文書を作る"""
+    documents = {}
+    for emote in emotes:
+        emote_id = emote.get('id')
+        if not emote_id:
+            continue
+        fields = {'title': (emote.get('name'),)}
+        result = {
+            'type': 'emote',
+            'id': emote_id,
+            'title': emote.get('name'),
+            'image_url_1x': (emote.get('images') or {}).get('url_1x')
+        }
+        documents[('emote', emote_id)] = (fields, result)
+    return documents
+
+
+def search_response(query, results, total, offset):
+    """/api/search のレスポンス本体（next_offset が null になるまで続きを取得できる）"""
+    next_offset = offset + len(results)
+    return {
+        'query': query,
+        'count': len(results),
+        'total': total,
+        'offset': offset,
+        'next_offset': next_offset if results and next_offset < total else None,
+        'results': results
+    }
+
+
+class SearchIndexSync:
+    """データのバージョンが変わったときだけ文書を作り直し、差分を索引に反映する"""
+
+    def __init__(self, index=None):
+        self.index = index or SearchIndex()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def sync(self, kind, version, builder):
+        """kind のバージョンが変わっていれば builder() の文書一式で索引を更新する"""
+        if self._versions.get(kind) == version:
+            return self.index
+        with self._lock:
+            if self._versions.get(kind) != version:
+                self.index.sync(kind, builder())
+                self._versions[kind] = version
+        return self.index
@@ -0,0 +1,244 @@
+"""ワーカー間で共有するキャッシュのバックエンド
+
+SHARED_CACHE_URL で選択する。
+
+- 未設定: 共有しない（各ワーカーのインプロセスキャッシュのみ）
+- memory://: インプロセスの辞書（単一プロセスでの動作確認用）
+- file:///var/cache/streamjp: ディレクトリ内のファイル（読み込みは mmap）。同じマシンのワーカー間で共有
+- redis://[:password@]host:6379/0: Redisプロトコル（RESP）のサーバー。ローカルでは
+  tools/resp_server.py で代用できる
+
+値はバイト列で、TTL（秒）を過ぎたものは返さない。共有キャッシュはあくまで上流APIへの
+問い合わせを減らすためのもので、バックエンドの障害時は例外を投げずにキャッシュミスとして扱う。
+"""
+import hashlib
+import json
+import logging
+import mmap
+import os
+import socket
+import struct
+import tempfile
+import threading
+import time
+from urllib.parse import unquote, urlparse
+
+logger = logging.getLogger(__name__)
+
+_EXPIRES = struct.Struct('>d')
+
+
+class MemoryBackend:
+    """インプロセスの辞書"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class FileBackend:
+    """キーごとに1ファイル（先頭8バイトが有効期限）。書き込みは置き換えで行う"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.cache')
+
+    def get(self, key):
+        try:
+            with open(self._path(key), 'rb') as f:
+                if os.fstat(f.fileno()).st_size <= _EXPIRES.size:
+                    return None
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                    if _EXPIRES.unpack_from(view, 0)[0] <= time.time():
+                        return None
+                    return view[_EXPIRES.size:]
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key, value, ttl):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_EXPIRES.pack(time.time() + ttl))
+                f.write(value)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.error(f"Error writing shared cache file: {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def delete(self, key):
+        try:
+            os.unlink(self._path(key))
+        except OSError:
+            pass
+
+
+class RedisError(Exception):
+    """RESPサーバーがエラー応答を返した場合の例外"""
+
+
+class RedisBackend:
+    """GET / SET PX / DEL だけを使う最小限のRESPクライアント（1接続を使い回す）"""
+
+    def __init__(self, host='127.0.0.1', port=6379, db=0, password=None, timeout=1.0):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._sock = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._reader = self._sock.makefile('rb')
+        if self.password:
+            self._command('AUTH', self.password)
+        if self.db:
+            self._command('SELECT', str(self.db))
+
+    def _close(self):
+        for resource in (self._reader, self._sock):
+            if resource is not None:
+                try:
+                    resource.close()
+                except OSError:
+                    pass
+        self._sock = self._reader = None
+
+    def _command(self, *args):
+        parts = [b'*%d\r\n' % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode('utf-8')
+            parts.append(b'$%d\r\n%s\r\n' % (len(data), data))
+        self._sock.sendall(b''.join(parts))
+        return self._read_reply()
+
+    def _read_reply(self):
+        line = self._reader.readline()
+        if not line.endswith(b'\r\n'):
+            raise ConnectionError('connection closed by shared cache server')
+        kind, rest = line[:1], line[1:-2]
+        if kind == b'+':
+            return rest
+        if kind == b'-':
+            raise RedisError(rest.decode('utf-8', 'replace'))
+        if kind == b':':
+            return int(rest)
+        if kind == b'$':
+            length = int(rest)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            if len(data) != length + 2:
+                raise ConnectionError('connection closed by shared cache server')
+            return data[:-2]
+        if kind == b'*':
+            count = int(rest)
+            return None if count < 0 else [self._read_reply() for _ in range(count)]
+        raise RedisError(f'unexpected reply: {line!r}')
+
+    def execute(self, *args):
+        """コマンドを実行する（接続が切れていれば1回だけ再接続して再送）"""
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    return self._command(*args)
+                except (OSError, ConnectionError):
+                    self._close()
+                    if attempt:
+                        raise
+
+    def _execute_quietly(self, *args):
+        try:
+            return self.execute(*args)
+        except (OSError, ConnectionError, RedisError) as e:
+            logger.warning(f"Shared cache error ({args[0]}): {e}")
+            return None
+
+    def get(self, key):
+        return self._execute_quietly('GET', key)
+
+    def set(self, key, value, ttl):
+        self._execute_quietly('SET', key, value, 'PX', str(max(int(ttl * 1000), 1)))
+
+    def delete(self, key):
+        self._execute_quietly('DEL', key)
+
+
+def create_backend(url):
+    """SHARED_CACHE_URL からバックエンドを作る（未設定なら None）"""
+    if not url:
+        return None
+    parsed = urlparse(url)
+    if parsed.scheme == 'memory':
+        return MemoryBackend()
+    if parsed.scheme == 'file':
+        return FileBackend(unquote(parsed.netloc + parsed.path))
+    if parsed.scheme == 'redis':
+        db = parsed.path.lstrip('/')
+        return RedisBackend(parsed.hostname or '127.0.0.1', parsed.port or 6379,
+                            db=int(db) if db else 0,
+                            password=unquote(parsed.password) if parsed.password else None)
+    raise ValueError(f'Unsupported SHARED_CACHE_URL scheme: {parsed.scheme}')
+
+
+class SharedCache:
+    """JSONで保存する共有キャッシュ（キーに名前空間を付ける）"""
+
+    def __init__(self, backend, namespace='streamjp'):
+        self.backend = backend
+        self.namespace = namespace
+
+    def _key(self, key):
+        return f'{self.namespace}:{key}'
+
+    def get(self, key):
+        raw = self.backend.get(self._key(key))
+        if raw is None:
+            return None
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return None
+
+    def set(self, key, value, ttl):
+        raw = json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self.backend.set(self._key(key), raw, ttl)
+
+    def delete(self, key):
+        self.backend.delete(self._key(key))
+
+
+def create_shared_cache(url=None, namespace='streamjp'):
+    """環境変数 SHARED_CACHE_URL（または url）の共有キャッシュ。未設定なら None"""
+    backend = create_backend(os.getenv('SHARED_CACHE_URL', '') if url is None else url)
+    return SharedCache(backend, namespace) if backend is not None else None
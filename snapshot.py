@@ -0,0 +1,163 @@
+"""Vercelデプロイ用のビルド時スナップショット
+
+ビルド時（tools/build_snapshot.py）にHelixのバッジ・エモートを取得して拡張し、
+静的なJSONファイルとして snapshots/ に書き出す。vercel.json の書き換え規則で
+/api/badges・/api/emotes の一覧（クエリ無し・format=compact）と、一覧ページが順に取得する
+ページ（PAGE_QUERIES）はCDNから直接配信され、関数は起動しない。
+
+    snapshots/
+      manifest.json              生成日時とファイル一覧
+      source.json                元のHelixレスポンス（関数のコールドスタート時に使用）
+      badges.json など            書き換え先
+      pages/badges/first.json    1ページ目、以降は pages/badges/<cursor>.json
+
+書き換え先のURLはデプロイ間で変わらないため、ファイルはデプロイごとに置き換わる
+（Vercelは静的ファイルのCDNキャッシュをデプロイ時に破棄する）。manifest.json には
+各ファイルの内容のハッシュを記録する。
+"""
+import copy
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+
+from catalog_query import BADGE_SPEC, EMOTE_SPEC, CatalogView, parse_catalog_query
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshots'))
+MANIFEST_FILE = 'manifest.json'
+SOURCE_FILE = 'source.json'
+FIRST_PAGE = 'first'
+
+SPECS = {'badges': BADGE_SPEC, 'emotes': EMOTE_SPEC}
+
+# script.js の fetchBadgePage・emotes-script.js の fetchEmotePage と同じクエリ
+# （変更する場合は vercel.json の書き換え規則も合わせる）
+PAGE_QUERIES = {
+    'badges': {'sort': 'newest', 'format': 'compact', 'limit': '60'},
+    'emotes': {'sort': 'newest', 'format': 'compact', 'limit': '100'}
+}
+
+
+def _dump(data):
+    """APIのレスポンス（PreparedPayload）と同じ形式でシリアライズする"""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def content_hash(body):
+    return hashlib.sha1(body).hexdigest()[:12]
+
+
+def source_hash(sources):
+    """Helixレスポンス一式の内容のハッシュ（データが変わったときだけ再ビルドするための比較用）"""
+    return content_hash(json.dumps({kind: sources[kind] for kind in SPECS}, ensure_ascii=False,
+                                   sort_keys=True, separators=(',', ':')).encode('utf-8'))
+
+
+def build_snapshot(sources, enhancers, now=None):
+    """Helixレスポンスからスナップショットのファイル一式 {相対パス: バイト列} を作る
+
+    sources は {'badges': ..., 'emotes': ...} のHelixレスポンス、enhancers は同じキーの
+    拡張関数（api/index.py の enhance_*_with_timestamps）。
+    """
+    now = now or time.time()
+    files = {}
+    digest = source_hash(sources)
+    manifest = {
+        'generated_at': datetime.fromtimestamp(now, timezone.utc).isoformat(),
+        'source_hash': digest,
+        'files': {},
+        'pages': {}
+    }
+
+    for kind, spec in SPECS.items():
+        enhanced = enhancers[kind](copy.deepcopy(sources[kind]))
+        view = CatalogView(0, enhanced.get('data', []), spec)
+        bodies = {
+            kind: _dump(enhanced),
+            f'{kind}.compact': view.query(parse_catalog_query({'format': 'compact'}, spec)).identity
+        }
+        for name, body in bodies.items():
+            files[f'{name}.json'] = body
+            manifest['files'][name] = content_hash(body)
+
+        # 一覧ページが順に取得するページをカーソルごとに書き出す
+        cursor = None
+        pages = 0
+        while True:
+            args = dict(PAGE_QUERIES[kind], **({'cursor': cursor} if cursor else {}))
+            payload = view.query(parse_catalog_query(args, spec))
+            files[f'pages/{kind}/{cursor or FIRST_PAGE}.json'] = payload.identity
+            pages += 1
+            cursor = payload.data['next_cursor']
+            if cursor is None:
+                break
+        manifest['pages'][kind] = pages
+
+    files[SOURCE_FILE] = _dump({'generated_at': now, 'source_hash': digest,
+                                **{kind: sources[kind] for kind in SPECS}})
+    files[MANIFEST_FILE] = _dump(manifest)
+    return files
+
+
+def write_snapshot(files, directory=SNAPSHOT_DIR):
+    """一時ディレクトリに書き出してから置き換える（前回のスナップショットは削除）"""
+    if os.path.exists(directory) and os.listdir(directory) \
+            and not os.path.exists(os.path.join(directory, MANIFEST_FILE)):
+        raise RuntimeError(f'{directory} is not a snapshot directory')
+
+    staging = directory.rstrip(os.sep) + '.tmp'
+    shutil.rmtree(staging, ignore_errors=True)
+    for path, body in files.items():
+        target = os.path.join(staging, path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            f.write(body)
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(staging, directory)
+
+
+class SnapshotReader:
+    """関数内で source.json を初回アクセス時に1回だけ読み込む"""
+
+    def __init__(self, directory=SNAPSHOT_DIR):
+        self.path = os.path.join(directory, SOURCE_FILE)
+        self._source = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._source is None:
+            with self._lock:
+                if self._source is None:
+                    try:
+                        with open(self.path, 'rb') as f:
+                            self._source = json.loads(f.read().decode('utf-8'))
+                    except FileNotFoundError:
+                        self._source = {}
+                    except (OSError, ValueError) as e:
+                        logger.error(f"Error loading snapshot: {e}")
+                        self._source = {}
+        return self._source
+
+    def age(self, now=None):
+        """スナップショットの経過秒数（無ければ None）"""
+        generated_at = self._load().get('generated_at')
+        if generated_at is None:
+            return None
+        return (now or time.time()) - generated_at
+
+    def source_hash(self):
+        """生成に使ったHelixレスポンスのハッシュ（無ければ None）"""
+        return self._load().get('source_hash')
+
+    def get(self, kind, max_age, now=None):
+        """max_age 秒以内に生成されたスナップショットの kind のHelixレスポンス（古ければ None）"""
+        age = self.age(now)
+        if age is None or age > max_age:
+            return None
+        return self._load().get(kind)
@@ -18,311 +18,16 @@ class StreamDashboard {
     constructor() {
         this.badges = [];
         this.emotes = [];
+        this.availableBadges = [];
         this.updateInterval = 30000; // 30秒
-        this.initBadgeAvailabilityData();
         this.init();
     }
 
-    // バッジの入手可能期間データベース（メインページと同期）
-    initBadgeAvailabilityData() {
-        this.badgeAvailabilityPeriods = {
-            'clips-leader': {
-                type: 'time-limited',
-                start: '2025-04-11T00:00:00Z',
-                end: '2025-04-11T23:59:59Z',
-                description: 'Clips Leader feature April 11, 2025'
-            },
-            'legendus': {
-                type: 'time-limited',
-                start: '2025-06-28T00:00:00Z',
-                end: '2025-06-29T23:59:59Z',
-                description: 'LEGENDUS ITADAKI event June 28-29, 2025'
-            },
-            'marathon-reveal-runner': {
-                type: 'time-limited',
-                start: '2025-04-11T00:00:00Z',
-                end: '2025-04-12T23:59:59Z',
-                description: 'Marathon Reveal stream subscription April 11-12, 2025'
-            },
-            'gone-bananas': {
-                type: 'time-limited',
-                start: '2025-04-01T00:00:00Z',
-                end: '2025-04-04T23:59:59Z',
-                description: 'April Fools 2025 April 1-4, 2025'
-            },
-            'elden-ring-wylder': {
-                type: 'time-limited',
-                start: '2025-05-29T00:00:00Z',
-                end: '2025-06-03T23:59:59Z',
-                description: 'Elden Ring Nightreign clip sharing May 29 - June 3, 2025'
-            },
-            'elden-ring-recluse': {
-                type: 'time-limited',
-                start: '2025-05-29T00:00:00Z',
-                end: '2025-05-30T23:59:59Z',
-                description: 'Elden Ring SuperFan Recluse May 29-30, 2025'
-            },
-            'league-of-legends-mid-season-invitational-2025---grey': {
-                type: 'time-limited',
-                start: '2025-06-24T00:00:00Z',
-                end: '2025-07-12T08:59:00Z',
-                description: 'MSI 2025 June 24 - July 12, 2025'
-            },
-            'league-of-legends-mid-season-invitational-2025---purple': {
-                type: 'time-limited',
-                start: '2025-06-24T00:00:00Z',
-                end: '2025-07-12T08:59:00Z',
-                description: 'MSI 2025 June 24 - July 12, 2025'
-            },
-            'league-of-legends-mid-season-invitational-2025---blue': {
-                type: 'time-limited',
-                start: '2025-06-24T00:00:00Z',
-                end: '2025-07-12T08:59:00Z',
-                description: 'MSI 2025 June 24 - July 12, 2025'
-            },
-            'borderlands-4-badge---ripper': {
-                type: 'time-limited',
-                start: '2025-06-21T00:00:00Z',
-                end: '2025-06-21T23:59:59Z',
-                description: 'Borderlands 4 Fan Fest June 21, 2025'
-            },
-            'borderlands-4-badge---vault-symbol': {
-                type: 'time-limited',
-                start: '2025-06-21T00:00:00Z',
-                end: '2025-06-21T23:59:59Z',
-                description: 'Borderlands 4 Fan Fest June 21, 2025'
-            },
-            'bot-badge': {
-                type: 'future',
-                description: 'Added to system but not yet distributed'
-            },
-            'minecraft-15th-anniversary-celebration': {
-                type: 'time-limited',
-                start: '2024-05-25T00:00:00Z',
-                end: '2024-05-31T23:59:59Z',
-                description: 'Minecraft 15th Anniversary May 25-31, 2024'
-            },
-            'clip-the-halls': {
-                type: 'time-limited',
-                start: '2024-12-02T00:00:00Z',
-                end: '2024-12-13T23:59:59Z',
-                description: 'Holiday Hoopla 2024 December 2-13, 2024'
-            },
-            'gold-pixel-heart---together-for-good-24': {
-                type: 'time-limited',
-                start: '2024-12-03T00:00:00Z',
-                end: '2024-12-15T23:59:59Z',
-                description: 'Together for Good 2024 December 3-15, 2024'
-            },
-            'gold-pixel-heart': {
-                type: 'time-limited',
-                start: '2024-12-03T00:00:00Z',
-                end: '2024-12-15T23:59:59Z',
-                description: 'Together for Good 2024 December 3-15, 2024'
-            },
-            'arcane-season-2-premiere': {
-                type: 'time-limited',
-                start: '2024-11-08T00:00:00Z',
-                end: '2024-11-09T23:59:59Z',
-                description: 'Arcane Season 2 Premiere November 8-9, 2024'
-            },
-            'dreamcon-2024': {
-                type: 'time-limited',
-                start: '2024-07-26T00:00:00Z',
-                end: '2024-07-28T23:59:59Z',
-                description: 'DreamCon 2024 July 26-28, 2024'
-            },
-            'destiny-2-the-final-shape-streamer': {
-                type: 'time-limited',
-                start: '2024-06-07T00:00:00Z',
-                end: '2024-06-09T23:59:59Z',
-                description: 'Destiny 2 raid race June 7-9, 2024'
-            },
-            'destiny-2-final-shape-raid-race': {
-                type: 'time-limited',
-                start: '2024-06-07T00:00:00Z',
-                end: '2024-06-09T23:59:59Z',
-                description: 'Destiny 2 raid race June 7-9, 2024'
-            },
-            'evo-2025': {
-                type: 'time-limited',
-                start: '2025-08-01T00:00:00Z',
-                end: '2025-08-04T23:59:59Z',
-                description: 'Evo 2025 fighting game tournament August 1-4, 2025'
-            },
-            'share-the-love': {
-                type: 'time-limited',
-                start: '2025-02-14T00:00:00Z',
-                end: '2025-02-14T23:59:59Z',
-                description: 'Share the Love Valentine\'s Day 2025'
-            },
-            'raging-wolf-helm': {
-                type: 'time-limited',
-                start: '2024-06-20T00:00:00Z',
-                end: '2024-06-22T23:59:59Z',
-                description: 'Elden Ring collaboration event June 2024'
-            },
-            'speedons-5-badge': {
-                type: 'time-limited',
-                start: '2025-02-24T00:00:00Z',
-                end: '2025-02-24T23:59:59Z',
-                description: 'Speedons 5 event February 24, 2025'
-            },
-            'ruby-pixel-heart---together-for-good-24': {
-                type: 'time-limited',
-                start: '2024-12-02T00:00:00Z',
-                end: '2024-12-15T23:59:59Z',
-                description: 'Together for Good 2024 December 2-15, 2024'
-            },
-            'purple-pixel-heart---together-for-good-24': {
-                type: 'time-limited',
-                start: '2024-12-02T00:00:00Z',
-                end: '2024-12-15T23:59:59Z', 
-                description: 'Together for Good 2024 December 2-15, 2024'
-            },
-            'la-velada-iv': {
-                type: 'time-limited',
-                start: '2024-07-13T00:00:00Z',
-                end: '2024-07-14T23:59:59Z',
-                description: 'La Velada del Año IV July 13, 2024'
-            },
-            'la-velada-v-badge': {
-                type: 'time-limited',
-                start: '2025-07-26T16:45:00Z',
-                end: '2025-07-27T01:30:00Z',
-                description: 'La Velada del Año V July 26, 2025'
-            },
-            'zevent-2024': {
-                type: 'time-limited',
-                start: '2024-09-06T18:00:00Z',
-                end: '2024-09-08T23:59:59Z',
-                description: 'ZEVENT 2024 charity marathon September 6-8, 2024'
-            },
-            'zevent25': {
-                type: 'time-limited',
-                start: '2025-09-04T16:00:00Z',
-                end: '2025-09-07T00:00:00Z',
-                description: 'ZEVENT 2025 charity marathon September 4-7, 2025'
-            },
-            'hornet': {
-                type: 'time-limited',
-                start: '2025-09-04T14:00:00Z',
-                end: '2025-09-13T06:59:00Z',
-                description: 'Hollow Knight: Silksong launch event September 4-13, 2025'
-            },
-            'subtember-2025': {
-                type: 'time-limited',
-                start: '2025-08-29T17:00:00Z',
-                end: '2025-10-01T17:00:00Z',
-                description: 'SUBtember 2025 August 29 - October 1, 2025'
-            },
-            'gears-of-war-superfan-badge': {
-                type: 'time-limited',
-                start: '2025-08-25T07:00:00Z',
-                end: '2025-08-26T19:00:00Z',
-                description: 'Gears of War: Reloaded Superfan August 25-26, 2025'
-            },
-            'path-of-exile-2-badge': {
-                type: 'time-limited',
-                start: '2025-08-29T07:00:00Z',
-                end: '2025-09-15T06:59:00Z',
-                description: 'Path of Exile II launch promotion August 29 - September 15, 2025'
-            }
-        };
-    }
-
-    // 動的な入手可能性を判定する関数
-    getBadgeAvailabilityStatus(badgeId) {
-        const period = this.badgeAvailabilityPeriods[badgeId];
-        if (!period) {
-            return { status: 'unknown', message: '入手可能期間の情報がありません', isAvailable: false };
-        }
-        
-        const now = new Date();
-        
-        switch (period.type) {
-            case 'ongoing':
-                return { 
-                    status: 'available', 
-                    message: '現在入手可能',
-                    isAvailable: true,
-                    description: period.description
-                };
-            
-            case 'time-limited':
-                const startDate = new Date(period.start);
-                const endDate = new Date(period.end);
-                
-                if (now < startDate) {
-                    const daysUntilStart = Math.ceil((startDate - now) / (1000 * 60 * 60 * 24));
-                    return {
-                        status: 'upcoming',
-                        message: `${daysUntilStart}日後に入手可能`,
-                        isAvailable: false,
-                        description: period.description,
-                        startDate: startDate,
-                        endDate: endDate
-                    };
-                } else if (now > endDate) {
-                    return {
-                        status: 'expired',
-                        message: '入手期間終了',
-                        isAvailable: false,
-                        description: period.description,
-                        startDate: startDate,
-                        endDate: endDate
-                    };
-                } else {
-                    const hoursUntilEnd = (endDate - now) / (1000 * 60 * 60);
-                    let message;
-                    
-                    if (hoursUntilEnd < 24) {
-                        // 24時間未満の場合は時間表示
-                        const hours = Math.ceil(hoursUntilEnd);
-                        message = `あと${hours}時間で終了`;
-                    } else {
-                        // 24時間以上の場合は日数表示（切り捨て）
-                        const daysUntilEnd = Math.floor(hoursUntilEnd / 24);
-                        if (daysUntilEnd === 0) {
-                            message = '本日終了';
-                        } else if (daysUntilEnd === 1) {
-                            message = 'あと1日で終了';
-                        } else {
-                            message = `あと${daysUntilEnd}日で終了`;
-                        }
-                    }
-                    
-                    return {
-                        status: 'limited',
-                        message: message,
-                        isAvailable: true,
-                        description: period.description,
-                        startDate: startDate,
-                        endDate: endDate
-                    };
-                }
-            
-            case 'future':
-                return {
-                    status: 'future',
-                    message: '配布予定',
-                    isAvailable: false,
-                    description: period.description
-                };
-            
-            default:
-                return { 
-                    status: 'unknown', 
-                    message: '入手可能期間の情報がありません',
-                    isAvailable: false
-                };
-        }
-    }
-
     init() {
         console.log('🎮 ストリーム配信ダッシュボードを初期化中...');
         this.loadData();
         // this.setupAutoRefresh(); // 自動更新を無効化
+        this.setupEventStream();
         this.setupEventListeners();
         
         // データ読み込み完了後に自動スクロール開始
@@ -332,58 +37,109 @@ class StreamDashboard {
     }
 
     async loadData() {
+        // バッジ・エモート・入手可能バッジをまとめて取得（並び替えと入手可能判定はサーバー側で実施済み）
         try {
-            await Promise.all([
-                this.loadBadges(),
-                this.loadEmotes()
-            ]);
-        } catch (error) {
-            console.error('❌ ダッシュボードデータの読み込みに失敗:', error);
-            this.showError('データの読み込みに失敗しました');
-        }
-    }
-
-    async loadBadges() {
-        try {
-            const response = await fetch(`${BASE_URL}/api/badges`);
+            const response = await fetch(`${BASE_URL}/api/dashboard?format=compact`);
             if (!response.ok) throw new Error(`HTTP ${response.status}`);
             
             const data = await response.json();
-            this.badges = data.data || [];
+            this.badges = decodeCompactList(data.badges);
+            this.emotes = decodeCompactList(data.emotes);
+            this.availableBadges = data.available_badges || [];
             
             this.renderBadges();
             this.renderAvailableBadges();
+            this.renderEmotes();
             
-            console.log(`✅ ${this.badges.length}個のバッジを読み込みました`);
+            console.log(`✅ ${this.badges.length}個のバッジと${this.emotes.length}個のエモートを読み込みました`);
         } catch (error) {
-            console.error('❌ バッジの読み込みに失敗:', error);
+            console.error('❌ ダッシュボードデータの読み込みに失敗:', error);
             this.showLoadingError('badges-grid', 'バッジの読み込みに失敗しました');
             this.showLoadingError('available-badges-grid', '入手可能なバッジの読み込みに失敗しました');
+            this.showLoadingError('emotes-grid', 'エモートの読み込みに失敗しました');
+            this.showError('データの読み込みに失敗しました');
+        }
+    }
+
+    setupEventStream() {
+        // サーバーからの変更通知を受けて、変更のあったバッジのみ再取得する（全件のポーリングは行わない）
+        if (typeof EventSource === 'undefined') return;
+        
+        // 手動で再接続するときは受信済みのイベントIDを渡して取りこぼしを再送してもらう
+        const query = this.lastEventId ? `?last_event_id=${encodeURIComponent(this.lastEventId)}` : '';
+        const source = new EventSource(`${BASE_URL}/api/events${query}`);
+        const onChange = (event) => {
+            this.lastEventId = event.lastEventId || this.lastEventId;
+            const setIds = JSON.parse(event.data).set_ids || [];
+            if (setIds.length > 0) {
+                this.refreshBadges(setIds);
+            }
+        };
+        source.addEventListener('badges-added', onChange);
+        source.addEventListener('timestamps-changed', onChange);
+        source.onerror = () => {
+            // 一時的な切断はブラウザが自動で再接続する（Last-Event-IDで取りこぼしも再送される）
+            // エラー応答で閉じられた場合はブラウザが再接続しないため、理由を確認してから接続し直す
+            if (source.readyState === EventSource.CLOSED) {
+                this.retryEventStream(query);
+            }
+        };
+        this.eventSource = source;
+    }
+
+    async retryEventStream(query) {
+        // EventSource からはステータスコードが分からないため、同じURLを fetch して確認する
+        // 接続数の上限（503 + Retry-After）の場合だけ待って再接続し、/api/events の無いサーバー
+        // （Vercelの関数は404を返す）では再接続しない
+        const controller = new AbortController();
+        let response;
+        try {
+            response = await fetch(`${BASE_URL}/api/events${query}`, { signal: controller.signal });
+        } catch (error) {
+            response = null;
+        } finally {
+            // ストリームの本文は読まない（接続が成功した場合も EventSource で接続し直す）
+            controller.abort();
         }
+        
+        if (response && response.ok) {
+            this.setupEventStream();
+            return;
+        }
+        const retryAfter = response ? parseInt(response.headers.get('Retry-After'), 10) : NaN;
+        if (response && response.status === 503 && retryAfter > 0) {
+            console.warn(`⚠️ 変更通知の接続数が上限のため、${retryAfter}秒後に再接続します`);
+            setTimeout(() => this.setupEventStream(), retryAfter * 1000);
+            return;
+        }
+        console.warn('⚠️ 変更通知を受信できません（自動更新は行われません）');
     }
 
-    async loadEmotes() {
+    async refreshBadges(setIds) {
         try {
-            const response = await fetch(`${BASE_URL}/api/emotes`);
+            const params = new URLSearchParams({ set_ids: setIds.join(','), format: 'compact' });
+            const response = await fetch(`${BASE_URL}/api/dashboard?${params}`);
             if (!response.ok) throw new Error(`HTTP ${response.status}`);
             
             const data = await response.json();
-            this.emotes = data.data || [];
-            
-            // デバッグ用：最初の数個のエモートの画像URLを確認
-            if (this.emotes.length > 0) {
-                console.log('エモートサンプル:', this.emotes.slice(0, 3).map(e => ({
-                    name: e.name,
-                    images: e.images
-                })));
-            }
+            data.badges = decodeCompactList(data.badges);
+            const updated = new Map(data.badges.map(badge => [badge.set_id, badge]));
+            const requested = new Set(data.set_ids);
             
-            this.renderEmotes();
+            // 既存のバッジは差し替え、新しいバッジは先頭に追加（新しい順の表示を維持）
+            const existing = new Set(this.badges.map(badge => badge.set_id));
+            const added = data.badges.filter(badge => !existing.has(badge.set_id));
+            this.badges = [...added, ...this.badges.map(badge => updated.get(badge.set_id) || badge)];
+            this.availableBadges = [
+                ...data.available_badges,
+                ...this.availableBadges.filter(entry => !requested.has(entry.set_id))
+            ];
             
-            console.log(`✅ ${this.emotes.length}個のエモートを読み込みました`);
+            this.renderBadges();
+            this.renderAvailableBadges();
+            console.log(`🔄 ${data.badges.length}個のバッジを更新しました`);
         } catch (error) {
-            console.error('❌ エモートの読み込みに失敗:', error);
-            this.showLoadingError('emotes-grid', 'エモートの読み込みに失敗しました');
+            console.error('❌ バッジの部分更新に失敗:', error);
         }
     }
 
@@ -396,20 +152,8 @@ class StreamDashboard {
             return;
         }
 
-        // 作成日でソート（最新順）- 正確な作成日を優先し、推定日も考慮
-        const sortedBadges = [...this.badges].sort((a, b) => {
-            // 正確な作成日がある場合は優先
-            const dateA = (a.created_at && a.has_real_timestamp) 
-                ? new Date(a.created_at) 
-                : new Date(a.created_at || a.updated_at || '2020-01-01');
-            const dateB = (b.created_at && b.has_real_timestamp) 
-                ? new Date(b.created_at) 
-                : new Date(b.created_at || b.updated_at || '2020-01-01');
-            
-            return dateB - dateA;
-        });
-
-        const badgeElements = sortedBadges.map(badge => this.createBadgeElement(badge));
+        // サーバー側で作成日の新しい順に並び替え済み
+        const badgeElements = this.badges.map(badge => this.createBadgeElement(badge));
         container.innerHTML = badgeElements.join('');
         
         this.addAnimationDelay(container);
@@ -419,11 +163,9 @@ class StreamDashboard {
         const container = document.getElementById('available-badges-grid');
         if (!container) return;
 
-        // 動的な入手可能性判定を使用してフィルタリング
-        const availableBadges = this.badges.filter(badge => {
-            const availability = this.getBadgeAvailabilityStatus(badge.set_id);
-            return availability.isAvailable;
-        });
+        // サーバー側で判定済みの入手可能バッジを使用
+        const badgesById = new Map(this.badges.map(badge => [badge.set_id, badge]));
+        const availableBadges = this.availableBadges.filter(item => badgesById.has(item.set_id));
 
         if (availableBadges.length === 0) {
             container.innerHTML = this.createEmptyState('現在入手可能なバッジはありません');
@@ -431,10 +173,9 @@ class StreamDashboard {
         }
 
         // 入手可能バッジの専用レイアウトを作成
-        const badgeElements = availableBadges.map(badge => {
-            const availability = this.getBadgeAvailabilityStatus(badge.set_id);
-            return this.createAvailableBadgeCard(badge, availability);
-        });
+        const badgeElements = availableBadges.map(item => 
+            this.createAvailableBadgeCard(badgesById.get(item.set_id), item.availability)
+        );
         container.innerHTML = badgeElements.join('');
         
         this.addAnimationDelay(container);
@@ -449,20 +190,8 @@ class StreamDashboard {
             return;
         }
 
-        // 作成日でソート（最新順）- 正確な作成日を優先し、推定日も考慮
-        const sortedEmotes = [...this.emotes].sort((a, b) => {
-            // 正確な作成日がある場合は優先
-            const dateA = (a.created_at && a.has_real_timestamp) 
-                ? new Date(a.created_at) 
-                : new Date(a.created_at || a.updated_at || '2020-01-01');
-            const dateB = (b.created_at && b.has_real_timestamp) 
-                ? new Date(b.created_at) 
-                : new Date(b.created_at || b.updated_at || '2020-01-01');
-            
-            return dateB - dateA;
-        });
-
-        const emoteElements = sortedEmotes.map(emote => this.createEmoteElement(emote));
+        // サーバー側で作成日の新しい順に並び替え済み
+        const emoteElements = this.emotes.map(emote => this.createEmoteElement(emote));
         container.innerHTML = emoteElements.join('');
         
         this.addAnimationDelay(container);
@@ -0,0 +1,218 @@
+"""Stream Databaseのバッジページのストリーミング解析
+
+レスポンス本体を受信したチャンクごとに走査し、`__NEXT_DATA__` スクリプト内の
+props.pageProps.badges 配列の要素だけを1件ずつ取り出す。ページ全体や
+next_data のツリー全体をメモリに持たないため、ピークメモリが要素1件分で済み、
+ダウンロード完了前から処理を始められる。
+"""
+import json
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+NEXT_DATA_TAG = '<script id="__NEXT_DATA__" type="application/json">'
+BADGES_PATH = ('props', 'pageProps', 'badges')
+
+_STRUCTURAL = re.compile(r'["{}\[\]:,]')
+_STRING_END = re.compile(r'(?:[^"\\]|\\.)*"', re.DOTALL)
+_BADGE_LINK = re.compile(r'/twitch/global-badges/([^/\s"]+)')
+
+# 途中で切れたリンクを次のチャンクと繋げるために保持する最大文字数
+_LINK_TAIL = 512
+
+
+class NextDataBadgeScanner:
+    """__NEXT_DATA__ のJSONを逐次走査し、badges 配列の要素を取り出す"""
+
+    def __init__(self):
+        self._buffer = ''
+        self._pos = 0
+        self._in_json = False
+        self.done = False
+        # (種類, パス, 次がキーか, 現在のキー)
+        self._stack = []
+        self._element_start = None
+        # 読み飛ばし中の（不要な）文字列の途中にいるか
+        self._skipping_string = False
+
+    def feed(self, text):
+        """テキストを追加し、完成したバッジ要素（dict）のリストを返す"""
+        if self.done:
+            return []
+        self._buffer += text
+        if not self._in_json:
+            index = self._buffer.find(NEXT_DATA_TAG)
+            if index < 0:
+                # タグがチャンク境界で切れている可能性があるので末尾だけ残す
+                self._buffer = self._buffer[-(len(NEXT_DATA_TAG) - 1):]
+                return []
+            self._in_json = True
+            self._buffer = self._buffer[index + len(NEXT_DATA_TAG):]
+            self._pos = 0
+        badges = self._scan()
+        self._compact()
+        return badges
+
+    def _scan(self):
+        badges = []
+        buffer = self._buffer
+        stack = self._stack
+        if self._skipping_string:
+            end = _STRING_END.match(buffer, self._pos)
+            if end is None:
+                self._skip_partial_string(buffer)
+                return badges
+            self._skipping_string = False
+            self._pos = end.end()
+        while not self.done:
+            match = _STRUCTURAL.search(buffer, self._pos)
+            if match is None:
+                self._pos = len(buffer)
+                break
+            char = match.group()
+            index = match.start()
+
+            if char == '"':
+                end = _STRING_END.match(buffer, index + 1)
+                if end is None:
+                    if self._element_start is None and not (stack and stack[-1][0] == '{' and stack[-1][2]):
+                        # 不要な長い文字列は続きを待たずに読み飛ばす
+                        self._pos = index + 1
+                        self._skip_partial_string(buffer)
+                    else:
+                        # 文字列が未完なので続きを待つ
+                        self._pos = index
+                    break
+                self._pos = end.end()
+                if stack and stack[-1][0] == '{' and stack[-1][2]:
+                    stack[-1][3] = json.loads(buffer[index:end.end()])
+                    stack[-1][2] = False
+                continue
+
+            self._pos = index + 1
+            if char in '{[':
+                if stack:
+                    parent = stack[-1]
+                    path = parent[1] + ((parent[3],) if parent[0] == '{' else ('[]',))
+                    if parent[0] == '[' and parent[1] == BADGES_PATH and self._element_start is None:
+                        self._element_start = index
+                else:
+                    path = ()
+                stack.append([char, path, char == '{', None])
+            elif char in '}]':
+                stack.pop()
+                if (self._element_start is not None and stack and stack[-1][0] == '['
+                        and stack[-1][1] == BADGES_PATH):
+                    element = json.loads(buffer[self._element_start:index + 1])
+                    self._element_start = None
+                    if isinstance(element, dict):
+                        badges.append(element)
+                if not stack:
+                    self.done = True
+                    self._buffer = ''
+                    self._pos = 0
+                    return badges
+            elif char == ',':
+                if stack and stack[-1][0] == '{':
+                    stack[-1][2] = True
+        return badges
+
+    def _skip_partial_string(self, buffer):
+        """未完の文字列の受信済み部分を捨てる（末尾のエスケープ途中の \\ だけ残す）"""
+        self._skipping_string = True
+        trailing = len(buffer) - len(buffer.rstrip('\\'))
+        self._pos = len(buffer) - (trailing % 2)
+
+    def _compact(self):
+        """処理済みの部分を捨てる（要素の途中なら要素の先頭から残す）"""
+        keep_from = self._pos if self._element_start is None else self._element_start
+        if keep_from:
+            self._buffer = self._buffer[keep_from:]
+            self._pos -= keep_from
+            if self._element_start is not None:
+                self._element_start -= keep_from
+
+
+class BadgeLinkScanner:
+    """/twitch/global-badges/<id> 形式のリンクからバッジIDを逐次収集する"""
+
+    def __init__(self):
+        self._tail = ''
+        self.badge_ids = []
+        self._seen = set()
+
+    def feed(self, text):
+        buffer = self._tail + text
+        keep_from = max(len(buffer) - _LINK_TAIL, 0)
+        for match in _BADGE_LINK.finditer(buffer):
+            if match.end() == len(buffer):
+                # IDがチャンク末尾で切れている可能性があるので次回に持ち越す
+                keep_from = min(keep_from, match.start())
+                break
+            self._add(match.group(1))
+            keep_from = max(keep_from, match.end())
+        self._tail = buffer[keep_from:]
+
+    def close(self):
+        for match in _BADGE_LINK.finditer(self._tail):
+            self._add(match.group(1))
+        self._tail = ''
+
+    def _add(self, badge_id):
+        if badge_id and badge_id not in self._seen:
+            self._seen.add(badge_id)
+            self.badge_ids.append(badge_id)
+
+
+def iter_badges(chunks):
+    """テキストチャンクの列からバッジ情報を1件ずつ返す
+
+    __NEXT_DATA__ にバッジが無い場合や、JSONが壊れていて解析できない場合は、
+    同じ走査で集めたリンクのバッジIDをフォールバックとして返す。
+    """
+    next_data = NextDataBadgeScanner()
+    links = BadgeLinkScanner()
+    yielded = set()
+    failed = False
+
+    for chunk in chunks:
+        if not failed:
+            try:
+                elements = next_data.feed(chunk)
+            except (ValueError, IndexError) as e:
+                # 壊れた __NEXT_DATA__ はリンクからの抽出に切り替える
+                logger.warning(f"Malformed __NEXT_DATA__; falling back to badge links: {e}")
+                failed = True
+                elements = []
+            for badge in elements:
+                badge_id = badge.get('set_id')
+                if badge_id:
+                    yielded.add(badge_id)
+                    yield {
+                        'set_id': badge_id,
+                        'name': badge.get('name', ''),
+                        'description': badge.get('description', ''),
+                        'created_at': badge.get('created_at', ''),
+                        'user_count': badge.get('user_count', 0),
+                        'image_urls': badge.get('image_urls', {}),
+                        'source': 'stream_database'
+                    }
+        # __NEXT_DATA__ を最後まで解析できるまではフォールバック用にリンクも集める
+        if not (yielded and next_data.done):
+            links.feed(chunk)
+
+    if yielded and next_data.done:
+        return
+
+    # フォールバック: HTMLから直接バッジIDを抽出（既に返したバッジは除く）
+    links.close()
+    for badge_id in links.badge_ids:
+        if not badge_id.endswith('.json') and badge_id not in yielded:
+            yield {
+                'set_id': badge_id,
+                'name': badge_id.replace('-', ' ').title(),
+                'description': f'Badge discovered: {badge_id}',
+                'created_at': '',
+                'source': 'html_extraction'
+            }
@@ -0,0 +1,68 @@
+"""構造化ログの設定（1行に1つのJSON）
+
+    LOG_LEVEL   ログレベル（既定 INFO。リクエストごとの詳細は DEBUG）
+    LOG_FORMAT  json（既定）または text（開発時に読みやすい形式）
+
+各モジュールは logging.getLogger(__name__) を使い、extra に渡したフィールドは
+そのままJSONのキーになる。
+
+    logger.info('Badge check finished', extra={'result': 'unchanged', 'duration_ms': 120.5})
+"""
+import json
+import logging
+import os
+import sys
+from datetime import datetime, timezone
+
+# LogRecord の標準属性（これ以外の属性は extra で渡されたフィールドとして出力する）
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'msg': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+    def format(self, record):
+        line = super().format(record)
+        fields = {key: value for key, value in vars(record).items()
+                  if key not in _RECORD_ATTRIBUTES and not key.startswith('_')}
+        if fields:
+            line += ' ' + ' '.join(f'{key}={value}' for key, value in fields.items())
+        return line
+
+
+_configured = False
+
+
+def configure_logging():
+    """ルートロガーに標準エラー出力のハンドラを設定する（2回目以降は何もしない）"""
+    global _configured
+    if _configured:
+        return
+    _configured = True
+
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(TextFormatter() if os.getenv('LOG_FORMAT', 'json').lower() == 'text'
+                         else JsonFormatter())
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+    if root.level > logging.DEBUG:
+        # httpx は上流呼び出しごとに INFO を出すため（上流の呼び出しはメトリクスで記録している）
+        logging.getLogger('httpx').setLevel(logging.WARNING)
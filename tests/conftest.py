@@ -0,0 +1,5 @@
+import os
+import sys
+
+# ルートのモジュール（app.py と同じ階層）を読み込めるようにする
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,81 @@
+"""管理ジョブの状態をワーカー（プロセス）間で共有する"""
+import subprocess
+import sys
+import threading
+import time
+
+from admin_jobs import JobManager, new_job
+from badge_store import BadgeStore
+
+
+def wait_for(manager, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = manager.get(job_id)
+        if job and job['status'] in ('succeeded', 'failed'):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f'job {job_id} did not finish')
+
+
+def test_status_and_coalescing_across_workers(tmp_path):
+    path = str(tmp_path / 'badges.db')
+    # 同じDBファイルを別々の接続で開く2つのワーカー
+    worker_a = JobManager(store=BadgeStore(path))
+    worker_b = JobManager(store=BadgeStore(path))
+
+    release = threading.Event()
+    job, coalesced = worker_a.submit('badge-check', lambda: release.wait(5) and {'checked': True})
+    assert not coalesced
+
+    # 実行中は他のワーカーへの同じ種類の要求も同じジョブにまとまる
+    duplicate, coalesced = worker_b.submit('badge-check', lambda: {'checked': False})
+    assert coalesced and duplicate['id'] == job['id']
+    assert worker_b.get(job['id'])['status'] in ('queued', 'running')
+
+    release.set()
+    finished = wait_for(worker_b, job['id'])
+    assert finished['status'] == 'succeeded'
+    assert finished['result'] == {'checked': True}
+
+    # 完了後は新しいジョブになる
+    second, coalesced = worker_b.submit('badge-check', lambda: 1)
+    assert not coalesced and second['id'] != job['id']
+    assert wait_for(worker_a, second['id'])['result'] == 1
+
+
+def test_failed_job_is_visible_to_other_workers(tmp_path):
+    path = str(tmp_path / 'badges.db')
+    worker_a = JobManager(store=BadgeStore(path))
+    worker_b = JobManager(store=BadgeStore(path))
+
+    def fail():
+        raise RuntimeError('Badge check failed')
+
+    job, _ = worker_a.submit('badge-check', fail)
+    finished = wait_for(worker_b, job['id'])
+    assert finished['status'] == 'failed'
+    assert finished['error'] == 'Badge check failed'
+
+
+def test_job_of_exited_worker_does_not_block_new_jobs(tmp_path):
+    store = BadgeStore(str(tmp_path / 'badges.db'))
+    exited = subprocess.run([sys.executable, '-c', 'import os; print(os.getpid())'],
+                            capture_output=True, text=True, check=True)
+    orphan = new_job('update-timestamps')
+    orphan['status'] = 'running'
+    orphan['worker']['pid'] = int(exited.stdout)
+    store.claim_job(orphan)
+
+    manager = JobManager(store=store, inline=True)
+    job, coalesced = manager.submit('update-timestamps', lambda: 'done')
+    assert not coalesced and job['status'] == 'succeeded'
+    assert store.get_job(orphan['id'])['status'] == 'failed'
+
+
+def test_inline_memory_store():
+    manager = JobManager(inline=True)
+    job, coalesced = manager.submit('badge-check', lambda: {'ok': True})
+    assert not coalesced
+    assert manager.get(job['id'])['result'] == {'ok': True}
+    assert manager.get('missing') is None
@@ -0,0 +1,45 @@
+"""/api/badges/<set_id> のバッジ単体の索引"""
+import json
+
+from badge_index import BadgeIndex, BadgeIndexCache
+
+BADGES = [
+    {'set_id': 'vip', 'versions': [{'id': '1'}], 'created_at': '2018-07-01T00:00:00.000Z'},
+    {'set_id': 'hornet', 'versions': [{'id': '1'}], 'created_at': None},
+    {'versions': []},
+]
+DETAILS = {'vip': {'name': 'VIP', 'user_count': 10}}
+
+
+def test_entry_combines_badge_timestamp_and_details():
+    index = BadgeIndex(1, BADGES, DETAILS)
+    assert len(index) == 2 and 'vip' in index and 'missing' not in index
+    assert index.entry('vip') == {**BADGES[0], 'timestamp': '2018-07-01T00:00:00.000Z', 'details': DETAILS['vip']}
+    assert index.entry('hornet')['details'] is None
+    assert index.get('missing') is None
+
+
+def test_payload_is_built_once_and_etag_depends_only_on_the_badge():
+    index = BadgeIndex(1, BADGES, DETAILS)
+    payload = index.get('vip')
+    assert index.get('vip') is payload
+    assert json.loads(payload.identity)['set_id'] == 'vip'
+
+    # 他のバッジが変わっても vip の ETag は変わらない
+    changed = BadgeIndex(2, [BADGES[0], {**BADGES[1], 'created_at': '2025-09-03T00:00:00.000Z'}], DETAILS)
+    assert changed.get('vip').etag == payload.etag
+    assert changed.get('hornet').etag != index.get('hornet').etag
+
+
+def test_cache_rebuilds_only_when_the_version_changes():
+    cache = BadgeIndexCache()
+    calls = []
+
+    def builder():
+        calls.append(1)
+        return BADGES, DETAILS
+
+    index = cache.get((1, 1), builder)
+    assert cache.get((1, 1), builder) is index
+    assert cache.get((1, 2), builder) is not index
+    assert len(calls) == 2
@@ -0,0 +1,103 @@
+"""TimestampMatcher と従来の部分一致ループの結果が一致することの確認"""
+import json
+import os
+import random
+
+from badge_matcher import TimestampMatcher
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def legacy_partial_match(timestamps, set_id):
+    """置き換え前の部分一致ループ"""
+    for key, timestamp in timestamps.items():
+        if key in set_id or set_id in key:
+            return timestamp
+    return None
+
+
+def legacy_enhance(timestamps, set_ids):
+    """置き換え前の enhance_badges_with_timestamps の判定（created_at, has_real_timestamp）"""
+    results = []
+    for set_id in set_ids:
+        if set_id in timestamps:
+            results.append((timestamps[set_id], True))
+            continue
+        found = legacy_partial_match(timestamps, set_id)
+        results.append((found, True) if found else (None, False))
+    return results
+
+
+def matcher_enhance(timestamps, set_ids):
+    matcher = TimestampMatcher(timestamps)
+    results = []
+    for set_id in set_ids:
+        if set_id in timestamps:
+            results.append((timestamps[set_id], True))
+            continue
+        found = matcher.partial_match(set_id)
+        results.append((found, True) if found else (None, False))
+    return results
+
+
+def assert_same(timestamps, set_ids):
+    matcher = TimestampMatcher(timestamps)
+    for set_id in set_ids:
+        assert matcher.partial_match(set_id) == legacy_partial_match(timestamps, set_id), set_id
+    assert matcher_enhance(timestamps, set_ids) == legacy_enhance(timestamps, set_ids)
+
+
+def known_set_ids():
+    with open(os.path.join(ROOT, 'badge_database.json'), encoding='utf-8') as f:
+        return sorted(json.load(f)['badge_details'])
+
+
+def test_empty_table():
+    assert_same({}, ['', 'glhf-pledge', 'a'])
+
+
+def test_edge_cases():
+    timestamps = {
+        'twitchcon-2024---san-diego': '2024-05-28T00:00:00.000Z',
+        'twitchcon': '2020-01-01T00:00:00.000Z',
+        'recap': '2023-12-11T00:00:00.000Z',
+        'twitch-recap-2023': '2023-12-12T00:00:00.000Z',
+        'a': '2019-01-01T00:00:00.000Z',
+        'empty-timestamp': '',
+    }
+    set_ids = ['', 'a', 'b', 'twitch', 'twitchcon-2024', 'twitch-recap-2024', 'recap',
+               'empty', 'empty-timestamp-2', 'san-diego', '---', 'x\x00y', 'zzz']
+    assert_same(timestamps, set_ids)
+
+
+def test_empty_key_matches_everything():
+    # 空のキーは任意の set_id に含まれる（従来のループと同じく先頭側の順序で決まる）
+    assert_same({'glhf': '2021-01-01', '': '2020-01-01', 'pledge': '2022-01-01'},
+                ['glhf-pledge', 'pledge', 'other', ''])
+
+
+def test_known_badges():
+    set_ids = known_set_ids()
+    rng = random.Random(3)
+    # 実際の set_id とその一部分（前後を切った文字列）からタイムスタンプ表を作る
+    timestamps = {}
+    for set_id in rng.sample(set_ids, min(len(set_ids), 150)):
+        start = rng.randrange(len(set_id))
+        end = rng.randrange(start, len(set_id)) + 1
+        timestamps[set_id[start:end]] = f'2024-01-{rng.randrange(1, 29):02d}T00:00:00.000Z'
+        timestamps[set_id] = '2025-01-01T00:00:00.000Z'
+    assert_same(timestamps, set_ids + ['vip', 'sub', 'twitch', 'unknown-badge-2099'])
+
+
+def test_randomized_tables():
+    rng = random.Random(20240101)
+    alphabet = 'ab-c'
+    for _ in range(300):
+        keys = {''.join(rng.choice(alphabet) for _ in range(rng.randrange(0, 6)))
+                for _ in range(rng.randrange(0, 12))}
+        keys = list(keys)
+        rng.shuffle(keys)
+        timestamps = {key: f'ts-{index}' for index, key in enumerate(keys)}
+        set_ids = [''.join(rng.choice(alphabet) for _ in range(rng.randrange(0, 9)))
+                   for _ in range(20)]
+        assert_same(timestamps, set_ids)
@@ -0,0 +1,70 @@
+"""バッジの入手方法・推定作成日のメタデータ（badge_metadata.json とストアへの取り込み）"""
+from datetime import datetime, timezone
+
+import pytest
+
+from badge_metadata import (build_availability_map, build_meta_bundle, estimate_created_date, find_obtain_method,
+                            load_badge_metadata, normalize_language)
+from badge_store import BadgeStore
+
+METADATA = {
+    'obtain_methods': {
+        'default': {'ja': {'summary': '汎用'}, 'en': {'summary': 'Generic'}},
+        'vip': {'ja': {'summary': 'VIPに任命される'}, 'en': {'summary': 'Be made a VIP'}},
+    },
+    'creation_dates': {'moderator': '2011-06-01', 'bits': '2016-06-27'},
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BadgeStore(str(tmp_path / 'badges.db'))
+
+
+def test_shipped_metadata_has_a_default_for_every_language():
+    metadata, metadata_hash = load_badge_metadata()
+    assert metadata_hash
+    assert set(metadata['obtain_methods']['default']) == {'ja', 'en'}
+
+
+def test_language_falls_back_to_japanese():
+    assert normalize_language('en') == 'en'
+    assert normalize_language('fr') == 'ja'
+    assert normalize_language(None) == 'ja'
+
+
+@pytest.mark.parametrize('set_id, index, expected', [
+    ('moderator', 0, '2011-06-01'),
+    ('bits-leader', 0, '2016-06-27'),
+    ('twitchcon-2019', 0, '2019-01-01'),
+    ('mystery', 25, '2011-06-15'),
+])
+def test_estimated_created_date(set_id, index, expected):
+    assert estimate_created_date(set_id, index, METADATA['creation_dates']) == expected
+
+
+def test_store_lookup_matches_the_file_lookup(store):
+    assert store.sync_metadata(METADATA, 'hash-1') is True
+    assert store.sync_metadata(METADATA, 'hash-1') is False
+    for set_id in ('vip', 'unknown'):
+        for lang in ('ja', 'en'):
+            assert store.get_obtain_method(set_id, lang) == find_obtain_method(METADATA, set_id, lang)
+    assert store.get_obtain_methods() == METADATA['obtain_methods']
+    assert store.get_creation_dates() == METADATA['creation_dates']
+
+
+def test_changed_file_replaces_the_stored_metadata(store):
+    store.sync_metadata(METADATA, 'hash-1')
+    assert store.sync_metadata({'obtain_methods': {}, 'creation_dates': {}}, 'hash-2') is True
+    assert store.get_obtain_method('vip', 'ja') == (None, False)
+    assert store.get_creation_dates() == {}
+
+
+def test_meta_bundle_and_availability_map():
+    now = datetime(2025, 9, 10, tzinfo=timezone.utc)
+    periods = {'vip': {'type': 'ongoing'}}
+    obtain_method, _ = find_obtain_method(METADATA, 'vip', 'en')
+    bundle = build_meta_bundle('vip', 'en', obtain_method, periods, now)
+    assert bundle['obtain_method'] == {'summary': 'Be made a VIP'}
+    assert bundle['availability']['message'] == 'Currently available'
+    assert build_availability_map(periods, 'ja', now) == {'vip': bundle['availability'] | {'message': '現在入手可能'}}
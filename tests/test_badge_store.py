@@ -0,0 +1,158 @@
+"""BadgeStore の変更ログ（/api/badges/changes）・更新履歴・JSONとの相互変換"""
+import json
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from badge_store import BadgeStore
+
+
+def scraped(*set_ids, name='Badge'):
+    return {set_id: {'name': f'{name} {set_id}', 'description': '', 'created_at': '2025-09-01T00:00:00Z',
+                     'user_count': 0, 'source': 'stream_database'} for set_id in set_ids}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BadgeStore(str(tmp_path / 'badges.db'))
+
+
+def test_update_history_counts_only_added_badges(store):
+    store.record_scrape(scraped('a', 'b'))
+    # a は変更、c は追加
+    store.record_scrape({**scraped('b'), **scraped('a', name='Renamed'), **scraped('c')})
+    history = store.get_update_history()
+    assert [(entry['badges_added'], entry['new_badges']) for entry in history] == [(2, ['a', 'b']), (1, ['c'])]
+
+
+def test_since_accepts_timezone_offsets(store):
+    store.record_scrape(scraped('a'))
+    first = datetime.now(timezone.utc)
+    store.record_scrape(scraped('a', 'b'))
+
+    # 同じ時刻を Z・+09:00 のどちらで指定しても同じカーソルになる
+    utc = store.get_changes(first.isoformat().replace('+00:00', 'Z'))
+    jst = store.get_changes(first.astimezone(timezone(timedelta(hours=9))).isoformat())
+    assert utc == jst
+    assert [change['set_id'] for change in utc['changes']] == ['b']
+    assert utc['changes'][0]['changed_at'].endswith('+00:00')
+
+
+def test_unparsable_since_is_rejected(store):
+    store.record_scrape(scraped('a'))
+    for since in ('yesterday', '-1', '2025-13-01'):
+        with pytest.raises(ValueError):
+            store.get_changes(since)
+
+
+def test_version_survives_empty_log(store):
+    store.record_scrape(scraped('a', 'b'))
+    version = store.change_log_version()
+    store.compact_change_log(max_rows=0, keep=0)
+    assert store.change_log_version() == version
+    assert store.get_changes(str(version))['resync_required'] is False
+    assert store.get_changes('0')['resync_required'] is True
+
+
+def test_legacy_local_times_are_converted_to_utc(tmp_path):
+    path = str(tmp_path / 'badges.db')
+    BadgeStore(path).record_scrape(scraped('a'))
+    local = datetime(2025, 9, 1, 12, 0, 0)
+    with sqlite3.connect(path) as conn:
+        conn.execute('UPDATE change_log SET changed_at = ?', (local.isoformat(),))
+
+    changes = BadgeStore(path).get_changes('0')['changes']
+    assert changes[0]['changed_at'] == local.astimezone(timezone.utc).isoformat(timespec='microseconds')
+
+
+def test_json_round_trip(tmp_path, store):
+    known = tmp_path / 'known_badges.json'
+    database = tmp_path / 'badge_database.json'
+    latest = tmp_path / 'latest_badge_timestamps.json'
+    known.write_text(json.dumps({
+        'badges': ['vip', 'hornet'], 'last_checked': '2025-09-01T00:00:00',
+        'new_badges_queue': [{'id': 'zevent25', 'research_needed': True, 'discovered_at': '2025-09-04T00:00:00'}]
+    }))
+    database.write_text(json.dumps({
+        'metadata': {'last_updated': '2025-09-02T00:00:00'},
+        'timestamps': {'vip': '2018-07-01T00:00:00Z', 'hornet': '2025-09-01T00:00:00Z'},
+        'badge_details': {'hornet': {'name': 'Hornet', 'description': 'Silksong', 'created_at': '2025-09-03T00:00:00Z',
+                                     'user_count': 5, 'source': 'stream_database', 'last_updated': '2025-09-03'}},
+        'update_history': [{'timestamp': '2025-09-02T00:00:00', 'badges_added': 1, 'total_badges': 2,
+                            'new_badges': ['hornet']}]
+    }))
+    # latest_badge_timestamps.json は badge_database.json より優先
+    latest.write_text(json.dumps({'hornet': '2025-09-03T00:00:00Z'}))
+    store.import_json(str(known), str(database), str(latest))
+
+    assert store.get_known_badges() == {'vip', 'hornet'}
+    assert store.get_meta('last_checked') == '2025-09-01T00:00:00'
+    assert [badge['id'] for badge in store.list_pending()] == ['zevent25']
+    assert store.get_timestamps() == {'vip': '2018-07-01T00:00:00Z', 'hornet': '2025-09-03T00:00:00Z'}
+    assert store.get_badge_details()['hornet']['user_count'] == 5
+
+    out = tmp_path / 'out'
+    out.mkdir()
+    store.export_json(str(out / 'known.json'), str(out / 'database.json'), str(out / 'latest.json'))
+    exported_known = json.loads((out / 'known.json').read_text())
+    exported_database = json.loads((out / 'database.json').read_text())
+    assert exported_known['badges'] == ['hornet', 'vip']
+    assert exported_known['new_badges_queue'][0]['id'] == 'zevent25'
+    assert exported_database['timestamps'] == store.get_timestamps()
+    assert exported_database['metadata']['total_badges'] == 2
+    assert exported_database['update_history'][0]['new_badges'] == ['hornet']
+    assert json.loads((out / 'latest.json').read_text()) == store.get_timestamps()
+    assert not list(out.glob('*.tmp'))
+
+
+def test_missing_json_files_import_nothing(tmp_path, store):
+    store.import_json(*(str(tmp_path / name) for name in ('a.json', 'b.json', 'c.json')))
+    assert store.is_empty()
+
+
+def test_pending_badges_are_updated_in_place(store):
+    store.save_pending({'id': 'a', 'research_needed': True, 'discovered_at': '2025-09-01'})
+    store.save_pending({'id': 'b', 'research_needed': True, 'discovered_at': '2025-09-02'})
+    store.save_pending({'id': 'a', 'research_needed': False, 'discovered_at': '2025-09-03', 'name': 'A'})
+    pending = store.list_pending()
+    assert [badge['id'] for badge in pending] == ['a', 'b']
+    assert pending[0]['name'] == 'A'
+    store.add_known_badges(['a', 'b', 'a'], last_checked='2025-09-04')
+    assert store.get_known_badges() == {'a', 'b'}
+    assert store.get_meta('last_checked') == '2025-09-04'
+
+
+def test_unchanged_scrape_writes_nothing(store):
+    assert store.record_scrape(scraped('a', 'b')) == (['a', 'b'], 0, 2)
+    version = store.change_log_version()
+    # 取得日時など差分判定に含めない値だけが変わっても書き込まない
+    again = {set_id: {**badge, 'last_updated': 'now'} for set_id, badge in scraped('a', 'b').items()}
+    assert store.record_scrape(again) == ([], 2, 2)
+    assert store.change_log_version() == version
+    assert len(store.get_update_history()) == 1
+
+
+def test_only_changed_badges_are_rewritten(store):
+    store.record_scrape(scraped('a', 'b'))
+    version = store.change_log_version()
+    badges = scraped('a', 'b')
+    badges['b']['created_at'] = '2025-09-02T00:00:00Z'
+    assert store.record_scrape(badges) == (['b'], 2, 2)
+    assert store.get_timestamps()['b'] == '2025-09-02T00:00:00Z'
+    changes = store.get_changes(str(version))['changes']
+    assert [(change['set_id'], change['op']) for change in changes] == [('b', 'modified')]
+
+
+def test_removals_require_a_complete_scrape(store):
+    store.record_scrape(scraped('a', 'b'))
+    version = store.change_log_version()
+    # HTMLのリンクから抽出した場合（source が stream_database 以外）は一覧が不完全なので削除しない
+    partial = {'a': {**scraped('a')['a'], 'source': 'badge_links'}}
+    assert store.record_scrape(partial) == (['a'], 2, 2)
+    assert set(store.get_badge_details()) == {'a', 'b'}
+
+    assert store.record_scrape(scraped('a')) == (['a', 'b'], 2, 2)
+    assert set(store.get_badge_details()) == {'a'}
+    changes = store.get_changes(str(version))['changes']
+    assert [(change['set_id'], change['op']) for change in changes] == [('a', 'modified'), ('b', 'removed')]
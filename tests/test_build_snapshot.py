@@ -0,0 +1,130 @@
+"""保存済みのHelixレスポンス（tests/fixtures/helix）からオフラインでスナップショットを生成する"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from snapshot import content_hash
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, 'tests', 'fixtures', 'helix')
+sys.path.insert(0, os.path.join(ROOT, 'api'))
+
+
+@pytest.fixture(scope='module')
+def snapshot_dir(tmp_path_factory):
+    output = tmp_path_factory.mktemp('build') / 'snapshots'
+    # 認証情報が無くても（Helixに接続せずに）生成できる
+    env = {key: value for key, value in os.environ.items()
+           if key not in ('TWITCH_CLIENT_ID', 'TWITCH_CLIENT_SECRET')}
+    subprocess.run([sys.executable, os.path.join(ROOT, 'tools', 'build_snapshot.py'),
+                    '--fixtures', FIXTURES, '--output', str(output)],
+                   check=True, capture_output=True, env=env)
+    return output
+
+
+def load(path):
+    with open(path, 'rb') as f:
+        return json.loads(f.read().decode('utf-8'))
+
+
+def test_snapshot_files(snapshot_dir):
+    manifest = load(snapshot_dir / 'manifest.json')
+    assert manifest['pages'] == {'badges': 1, 'emotes': 1}
+    for name, digest in manifest['files'].items():
+        assert content_hash((snapshot_dir / f'{name}.json').read_bytes()) == digest
+    # 書き換え先として参照されないファイルは書き出さない
+    assert not (snapshot_dir / 'files').exists()
+
+    source = load(snapshot_dir / 'source.json')
+    assert source['badges'] == load(os.path.join(FIXTURES, 'badges.json'))
+    assert source['emotes'] == load(os.path.join(FIXTURES, 'emotes.json'))
+
+
+def test_badges_are_enhanced(snapshot_dir):
+    badges = {badge['set_id']: badge for badge in load(snapshot_dir / 'badges.json')['data']}
+    assert badges['zevent25']['has_real_timestamp'] is True
+    assert badges['zevent25']['created_at'].startswith('2025-09-04')
+    assert badges['moderator']['has_real_timestamp'] is False
+    assert badges['moderator']['estimated_created_at']
+
+    first_page = load(snapshot_dir / 'pages' / 'badges' / 'first.json')
+    assert first_page['format'] == 'compact' and first_page['next_cursor'] is None
+    # 追加日の新しい順（正確な追加日の無いバッジは後ろ）
+    assert first_page['columns']['set_id'][:3] == ['zevent25', 'hornet', 'subtember-2025']
+
+
+def test_emotes_are_enhanced(snapshot_dir):
+    emotes = {emote['name']: emote for emote in load(snapshot_dir / 'emotes.json')['data']}
+    assert emotes['bosscleared']['created_at'].startswith('2025-08-01')
+    assert 'created_at' not in emotes['Kappa']
+    assert load(snapshot_dir / 'pages' / 'emotes' / 'first.json')['count'] == 3
+
+
+class StubHttpClient:
+    def __init__(self):
+        self.posted = []
+
+    def post(self, url, **kwargs):
+        self.posted.append(url)
+        return StubResponse()
+
+
+class StubResponse:
+    status_code = 201
+
+    def raise_for_status(self):
+        pass
+
+
+def test_cron_rebuilds_only_when_helix_data_changed(snapshot_dir, monkeypatch):
+    import index
+    from snapshot import SnapshotReader
+
+    client = StubHttpClient()
+    helix = {'badges': load(os.path.join(FIXTURES, 'badges.json')),
+             'emotes': load(os.path.join(FIXTURES, 'emotes.json'))}
+    paths = {path: kind for kind, path in index.HELIX_PATHS.items()}
+    monkeypatch.setattr(index, 'snapshot_reader', SnapshotReader(str(snapshot_dir)))
+    monkeypatch.setattr(index, 'fetch_helix', lambda path: helix[paths[path]])
+    monkeypatch.setattr(index, 'get_http_client', lambda: client)
+    monkeypatch.setattr(index, 'CRON_SECRET', 'secret')
+    monkeypatch.setattr(index, 'SNAPSHOT_DEPLOY_HOOK_URL', 'https://deploy.example/hook')
+    app = index.app.test_client()
+    headers = {'Authorization': 'Bearer secret'}
+
+    assert app.get('/api/cron/refresh-snapshot').status_code == 401
+
+    # 次の実行まで新しいままのスナップショットはHelixを確認しない
+    monkeypatch.setattr(index, 'SNAPSHOT_MAX_AGE', 86400)
+    response = app.get('/api/cron/refresh-snapshot', headers=headers)
+    assert response.json['refreshed'] is False and response.json['changed'] is None
+
+    # 古くてもHelixの内容が同じなら再ビルドしない
+    monkeypatch.setattr(index, 'SNAPSHOT_MAX_AGE', 3600)
+    response = app.get('/api/cron/refresh-snapshot', headers=headers)
+    assert response.status_code == 200
+    assert response.json['refreshed'] is False and response.json['changed'] is False
+    assert client.posted == []
+
+    helix['badges'] = {'data': helix['badges']['data'][:-1]}
+    response = app.get('/api/cron/refresh-snapshot', headers=headers)
+    assert response.status_code == 200
+    assert response.json['refreshed'] is True and response.json['changed'] is True
+    assert client.posted == ['https://deploy.example/hook']
+
+
+def test_dashboard_returns_only_requested_badges(snapshot_dir, monkeypatch):
+    import index
+    from snapshot import SnapshotReader
+
+    monkeypatch.setattr(index, 'snapshot_reader', SnapshotReader(str(snapshot_dir)))
+    monkeypatch.setattr(index, 'CLIENT_ID', 'client')
+    monkeypatch.setattr(index, 'CLIENT_SECRET', 'secret')
+    index.helix_cache.invalidate()
+    response = index.app.test_client().get('/api/dashboard?set_ids=hornet,vip')
+    assert response.status_code == 200
+    assert response.json['set_ids'] == ['hornet', 'vip']
+    assert sorted(badge['set_id'] for badge in response.json['badges']) == ['hornet', 'vip']
@@ -0,0 +1,96 @@
+"""/api/badges・/api/emotes の一覧クエリ（並び替え・カーソルページング・絞り込み）"""
+import pytest
+from werkzeug.datastructures import MultiDict
+
+from catalog_query import (BADGE_SPEC, EMOTE_SPEC, CatalogView, QueryError, decode_cursor, encode_cursor,
+                           is_catalog_query, parse_catalog_query)
+
+
+def badge(set_id, created_at=None, estimated=None):
+    return {'set_id': set_id, 'versions': [{'id': '1', 'title': set_id.title()}],
+            'created_at': created_at, 'has_real_timestamp': created_at is not None,
+            'estimated_created_at': estimated}
+
+
+BADGES = [
+    badge('moderator', estimated='2011-06-01'),
+    badge('zevent25', '2025-09-04T00:00:00.000Z'),
+    badge('hornet', '2025-09-03T00:00:00.000Z'),
+    badge('subtember-2025', '2025-09-03T00:00:00.000Z'),
+    badge('mystery'),
+    badge('vip', estimated='2018-07-01'),
+]
+
+
+def query(view, **args):
+    return view.query(parse_catalog_query(MultiDict(args), view.spec)).data
+
+
+def ids(result):
+    return [item['set_id'] for item in result['data']]
+
+
+def test_only_catalog_parameters_switch_the_response_shape():
+    assert not is_catalog_query(MultiDict())
+    # キャッシュ回避や言語の指定では従来の形式のまま
+    assert not is_catalog_query(MultiDict({'_': '123', 'lang': 'ja'}))
+    for name in ('fields', 'sort', 'limit', 'cursor', 'has_real_timestamp', 'created_after',
+                 'created_before', 'availability', 'format'):
+        assert is_catalog_query(MultiDict({name: 'x', '_': '1'}))
+
+
+def test_sort_orders():
+    view = CatalogView(1, BADGES, BADGE_SPEC)
+    assert ids(query(view)) == [item['set_id'] for item in BADGES]
+    # 推定作成日も並び替えに使い、日付不明は元の順で末尾。同日は元の順
+    assert ids(query(view, sort='newest')) == ['zevent25', 'hornet', 'subtember-2025', 'vip', 'moderator', 'mystery']
+    assert ids(query(view, sort='oldest')) == ['moderator', 'vip', 'hornet', 'subtember-2025', 'zevent25', 'mystery']
+    assert ids(query(view, sort='name')) == sorted(item['set_id'] for item in BADGES)
+
+
+@pytest.mark.parametrize('sort', ['api', 'newest', 'oldest', 'name'])
+def test_cursor_pages_cover_every_item_once(sort):
+    view = CatalogView(1, BADGES, BADGE_SPEC)
+    seen = []
+    cursor = None
+    while True:
+        args = {'sort': sort, 'limit': '4'}
+        if cursor:
+            args['cursor'] = cursor
+        page = query(view, **args)
+        assert page['total'] == len(BADGES)
+        seen += ids(page)
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+    assert seen == ids(query(view, sort=sort))
+
+
+def test_cursor_round_trip_and_validation():
+    cursor = encode_cursor('newest', 'hornet')
+    assert decode_cursor(cursor) == ('newest', 'hornet')
+    with pytest.raises(QueryError):
+        parse_catalog_query(MultiDict({'cursor': cursor, 'sort': 'name'}), BADGE_SPEC)
+    with pytest.raises(QueryError):
+        parse_catalog_query(MultiDict({'cursor': '!!!'}), BADGE_SPEC)
+
+    view = CatalogView(1, BADGES, BADGE_SPEC)
+    stale = CatalogView(2, BADGES[2:], BADGE_SPEC)
+    cursor = query(view, sort='api', limit='1')['next_cursor']
+    with pytest.raises(QueryError):
+        query(stale, sort='api', cursor=cursor)
+
+
+def test_filters_fields_and_invalid_parameters():
+    view = CatalogView(1, BADGES, BADGE_SPEC)
+    result = query(view, has_real_timestamp='true', created_after='2025-09-04')
+    assert ids(result) == ['zevent25'] and result['total'] == 1
+    assert query(view, fields='set_id', limit='1')['data'] == [{'set_id': 'moderator'}]
+    assert query(view, fields='versions.title', limit='1')['data'] == [{'versions': [{'title': 'Moderator'}]}]
+
+    for args in ({'sort': 'random'}, {'limit': '0'}, {'limit': 'x'}, {'fields': ','},
+                 {'format': 'compact', 'fields': 'set_id'}, {'has_real_timestamp': 'maybe'}):
+        with pytest.raises(QueryError):
+            parse_catalog_query(MultiDict(args), BADGE_SPEC)
+    with pytest.raises(QueryError):
+        parse_catalog_query(MultiDict({'availability': 'available'}), EMOTE_SPEC)
@@ -0,0 +1,105 @@
+"""コンパクト形式（?format=compact）をブラウザ側の compact.js で復元したときの往復"""
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from compact_format import encode_badges, encode_dashboard, encode_emotes
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BADGE_CDN = 'https://static-cdn.jtvnw.net/badges/v1'
+EMOTE_CDN = 'https://static-cdn.jtvnw.net/emoticons/v2'
+
+
+def badge_version(version_id, image_id, **extra):
+    return {'id': version_id, 'title': f'Badge {version_id}',
+            'image_url_1x': f'{BADGE_CDN}/{image_id}/1', 'image_url_2x': f'{BADGE_CDN}/{image_id}/2',
+            'image_url_4x': f'{BADGE_CDN}/{image_id}/3', **extra}
+
+
+def emote(emote_id, name, animated=False, **extra):
+    images = {'url_1x': f'{EMOTE_CDN}/{emote_id}/static/light/1.0',
+              'url_2x': f'{EMOTE_CDN}/{emote_id}/static/light/2.0',
+              'url_4x': f'{EMOTE_CDN}/{emote_id}/static/light/3.0'}
+    for size, scale in (('1x', '1.0'), ('2x', '2.0'), ('4x', '3.0')):
+        images[f'static_url_{size}'] = f'{EMOTE_CDN}/{emote_id}/static/dark/{scale}'
+        if animated:
+            images[f'animated_url_{size}'] = f'{EMOTE_CDN}/{emote_id}/animated/dark/{scale}'
+    return {'id': emote_id, 'name': name, 'format': ['static', 'animated'] if animated else ['static'],
+            'images': images, **extra}
+
+
+BADGES = [
+    {'set_id': 'zevent25', 'created_at': '2025-09-04T00:00:00.000Z', 'has_real_timestamp': True,
+     'versions': [badge_version('1', 'abc', description='ZEVENT 2025')]},
+    {'set_id': 'subscriber', 'has_real_timestamp': False, 'estimated_created_at': '2011-06-01',
+     'versions': [badge_version('0', 'def'), badge_version('3', 'ghi')]},
+    # テンプレートに当てはまらない画像URLはそのまま送る
+    {'set_id': 'odd', 'has_real_timestamp': False,
+     'versions': [{'id': '1', 'title': 'Odd', 'image_url_1x': 'https://example.com/odd.png'}]},
+]
+
+EMOTES = [
+    emote('25', 'Kappa', created_at='2024-11-08T00:00:00.000Z'),
+    emote('emotesv2_abc', 'bosscleared', animated=True),
+    {**emote('1', 'odd'), 'images': {'url_1x': 'https://example.com/odd.png'}},
+]
+
+
+def decode_with_compact_js(payloads):
+    """compact.js の decodeCompactList で復元した結果"""
+    script = (
+        "const fs = require('fs');"
+        "eval(fs.readFileSync(process.argv[1], 'utf8'));"
+        "const payloads = JSON.parse(fs.readFileSync(0, 'utf8'));"
+        "process.stdout.write(JSON.stringify(payloads.map(decodeCompactList)));"
+    )
+    result = subprocess.run(['node', '-e', script, os.path.join(ROOT, 'compact.js')],
+                            input=json.dumps(payloads), capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+needs_node = pytest.mark.skipif(shutil.which('node') is None, reason='node が必要')
+
+
+def test_templates_replace_matching_urls():
+    badges = encode_badges(BADGES)
+    rows = badges['columns']['versions']
+    assert rows[0][0][1] == 'abc' and isinstance(rows[2][0][1], dict)
+    # 実際の追加日が無いバッジの created_at は送らない
+    assert badges['columns']['created_at'] == ['2025-09-04T00:00:00.000Z', None, None]
+
+    emotes = encode_emotes(EMOTES)
+    # 全エモートに共通する画像の種類だけがテンプレートの対象
+    assert set(emotes['images']) == {'url_1x'}
+    assert set(emotes['image_overrides']) == {'0', '1', '2'}
+    assert set(encode_emotes(EMOTES[:2])['images']) == {'url_1x', 'url_2x', 'url_4x', 'static_url_1x',
+                                                        'static_url_2x', 'static_url_4x'}
+
+
+@needs_node
+def test_badges_round_trip_through_compact_js():
+    decoded, = decode_with_compact_js([encode_badges(BADGES)])
+    assert decoded == [
+        {key: value for key, value in badge.items() if value is not None} for badge in BADGES
+    ]
+
+
+@needs_node
+def test_emotes_round_trip_through_compact_js():
+    for emotes in (EMOTES, EMOTES[:2]):
+        decoded, = decode_with_compact_js([encode_emotes(emotes)])
+        assert decoded == emotes
+
+
+@needs_node
+def test_dashboard_and_plain_lists():
+    dashboard = encode_dashboard({'badges': BADGES, 'emotes': EMOTES[:2], 'generated_at': 'now'})
+    assert dashboard['format'] == 'compact' and dashboard['generated_at'] == 'now'
+    badges, emotes, plain = decode_with_compact_js([dashboard['badges'], dashboard['emotes'], {'data': BADGES}])
+    assert [badge['set_id'] for badge in badges] == ['zevent25', 'subscriber', 'odd']
+    assert emotes == EMOTES[:2]
+    assert plain == BADGES
@@ -0,0 +1,63 @@
+"""/api/dashboard の集約ペイロード（並び替え・入手可能判定・部分更新）"""
+from datetime import datetime, timezone
+
+import pytest
+
+from availability import get_badge_availability_status
+from dashboard import build_dashboard, filter_dashboard
+
+NOW = datetime(2025, 9, 10, 12, 0, tzinfo=timezone.utc)
+
+PERIODS = {
+    'vip': {'type': 'ongoing', 'description': 'VIP'},
+    'zevent25': {'type': 'time-limited', 'start': '2025-09-04T00:00:00Z', 'end': '2025-09-11T00:00:00Z'},
+    'hornet': {'type': 'time-limited', 'start': '2025-09-03T00:00:00Z', 'end': '2025-09-05T00:00:00Z'},
+    'twitchcon': {'type': 'time-limited', 'start': '2025-09-20T00:00:00Z', 'end': '2025-09-30T00:00:00Z'},
+    'marathon': {'type': 'future'},
+}
+
+
+def test_badges_and_emotes_are_sorted_newest_first():
+    badges = {'data': [
+        {'set_id': 'vip'},
+        {'set_id': 'hornet', 'created_at': '2025-09-03T00:00:00.000Z'},
+        {'set_id': 'zevent25', 'created_at': '2025-09-04T00:00:00.000Z'},
+        {'set_id': 'subtember-2025', 'created_at': '2025-09-03T00:00:00.000Z'},
+    ]}
+    emotes = {'data': [{'name': 'old', 'updated_at': '2021-01-01T00:00:00Z'}, {'name': 'new', 'created_at': '2025-08-01T00:00:00Z'}]}
+    dashboard = build_dashboard(badges, emotes, PERIODS, now=NOW)
+
+    # 日付の無いものは2020-01-01扱い、同日は元の順
+    assert [badge['set_id'] for badge in dashboard['badges']] == ['zevent25', 'hornet', 'subtember-2025', 'vip']
+    assert [emote['name'] for emote in dashboard['emotes']] == ['new', 'old']
+    # 入手可能なバッジは元のバッジ順
+    assert [entry['set_id'] for entry in dashboard['available_badges']] == ['vip', 'zevent25']
+    assert dashboard['generated_at'] == NOW.isoformat()
+
+
+@pytest.mark.parametrize('set_id, status, message', [
+    ('vip', 'available', '現在入手可能'),
+    ('zevent25', 'limited', 'あと12時間で終了'),
+    ('hornet', 'expired', '入手期間終了'),
+    ('twitchcon', 'upcoming', '10日後に入手可能'),
+    ('marathon', 'future', '配布予定'),
+    ('unknown-badge', 'unknown', '入手可能期間の情報がありません'),
+])
+def test_availability_status(set_id, status, message):
+    result = get_badge_availability_status(PERIODS, set_id, NOW)
+    assert (result['status'], result['message']) == (status, message)
+    assert result['isAvailable'] == (status in ('available', 'limited'))
+
+
+def test_availability_messages_in_english():
+    assert get_badge_availability_status(PERIODS, 'hornet', NOW, lang='en')['message'] == 'No longer available'
+
+
+def test_filter_keeps_only_requested_badges():
+    badges = {'data': [{'set_id': 'vip'}, {'set_id': 'zevent25'}, {'set_id': 'hornet'}]}
+    dashboard = build_dashboard(badges, {'data': [{'name': 'Kappa'}]}, PERIODS, now=NOW)
+    partial = filter_dashboard(dashboard, ['zevent25', 'hornet', '', 'missing'])
+    assert [badge['set_id'] for badge in partial['badges']] == ['zevent25', 'hornet']
+    assert [entry['set_id'] for entry in partial['available_badges']] == ['zevent25']
+    assert partial['set_ids'] == ['hornet', 'missing', 'zevent25']
+    assert 'emotes' not in partial
@@ -0,0 +1,68 @@
+"""SSEイベントをストア経由でワーカー（プロセス）間に配信する"""
+from badge_store import BadgeStore
+from events import EventBroker, Subscription
+
+
+def received(subscription, timeout=2):
+    events = []
+    while True:
+        event = subscription.get(timeout=timeout if not events else 0.05)
+        if event is None:
+            return [(event.id, event.type, event.data) for event in events]
+        events.append(event)
+
+
+def test_event_published_in_one_worker_reaches_others(tmp_path):
+    path = str(tmp_path / 'badges.db')
+    # 同じDBファイルを別々の接続で開く2つのワーカー
+    worker_a = EventBroker(store=BadgeStore(path), poll_interval=0.05)
+    worker_b = EventBroker(store=BadgeStore(path), poll_interval=0.05)
+    subscriber_a = worker_a.subscribe(Subscription())
+    subscriber_b = worker_b.subscribe(Subscription())
+
+    event = worker_a.publish('badges-added', {'set_ids': ['new-badge']})
+    expected = [(event.id, 'badges-added', {'set_ids': ['new-badge']})]
+    assert received(subscriber_a) == expected
+    assert received(subscriber_b) == expected
+
+
+def test_replay_across_workers_and_restart(tmp_path):
+    path = str(tmp_path / 'badges.db')
+    worker_a = EventBroker(store=BadgeStore(path), poll_interval=0.05)
+    first = worker_a.publish('badges-added', {'set_ids': ['a']})
+    second = worker_a.publish('timestamps-changed', {'version': 2, 'set_ids': ['a']})
+
+    # 再起動後の別のワーカーでも Last-Event-ID より後のイベントが再送される
+    restarted = EventBroker(store=BadgeStore(path), poll_interval=0.05)
+    subscription = restarted.subscribe(Subscription(), last_event_id=first.id)
+    assert received(subscription) == [(second.id, 'timestamps-changed', {'version': 2, 'set_ids': ['a']})]
+
+    third = restarted.publish('badges-added', {'set_ids': ['b']})
+    assert third.id > second.id
+    assert received(subscription) == [(third.id, 'badges-added', {'set_ids': ['b']})]
+
+
+def test_dedupe_key_publishes_once(tmp_path):
+    path = str(tmp_path / 'badges.db')
+    worker_a = EventBroker(store=BadgeStore(path))
+    worker_b = EventBroker(store=BadgeStore(path))
+
+    assert worker_a.publish('timestamps-changed', {'set_ids': ['a']}, 'timestamps-changed:1') is not None
+    assert worker_b.publish('timestamps-changed', {'set_ids': ['a']}, 'timestamps-changed:1') is None
+    assert len(BadgeStore(path).events_after(0)) == 1
+
+
+def test_event_log_is_pruned(tmp_path):
+    store = BadgeStore(str(tmp_path / 'badges.db'))
+    for index in range(5):
+        store.append_event('badges-added', {'index': index}, keep=3)
+    assert [row[2]['index'] for row in store.events_after(0)] == [2, 3, 4]
+    assert store.last_event_id() == 5
+
+
+def test_memory_broker_replays_history():
+    broker = EventBroker()
+    first = broker.publish('badges-added', {'set_ids': ['a']})
+    broker.publish('badges-added', {'set_ids': ['b']})
+    subscription = broker.subscribe(Subscription(), last_event_id=first.id)
+    assert [data['set_ids'] for _, _, data in received(subscription, timeout=0.05)] == [['b']]
@@ -0,0 +1,73 @@
+"""Prometheusテキスト形式のメトリクス（/metrics）"""
+import pytest
+from flask import Flask
+
+from metrics import CONTENT_TYPE, Counter, Gauge, Histogram, Registry, instrument_flask
+
+
+def test_counter_and_gauge_exposition():
+    registry = Registry()
+    requests = Counter('demo_requests_total', 'リクエスト数', ['route', 'status'], registry=registry)
+    requests.inc(route='/api/badges', status=200)
+    requests.inc(2, route='/api/badges', status=200)
+    requests.inc(route='/a"b\\c', status=500)
+    Gauge('demo_queue_depth', '待ち件数', registry=registry)
+    Gauge('demo_workers', 'ワーカー数', ['state'], callback=lambda: {('busy',): 2}, registry=registry)
+
+    assert registry.render().splitlines() == [
+        '# HELP demo_requests_total リクエスト数',
+        '# TYPE demo_requests_total counter',
+        'demo_requests_total{route="/api/badges",status="200"} 3.0',
+        'demo_requests_total{route="/a\\"b\\\\c",status="500"} 1.0',
+        '# HELP demo_queue_depth 待ち件数',
+        '# TYPE demo_queue_depth gauge',
+        'demo_queue_depth 0.0',
+        '# HELP demo_workers ワーカー数',
+        '# TYPE demo_workers gauge',
+        'demo_workers{state="busy"} 2.0',
+    ]
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    latency = Histogram('demo_seconds', '処理時間', ['route'], buckets=(0.1, 1.0), registry=registry)
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, route='/api')
+    lines = registry.render().splitlines()
+    assert lines[2:] == [
+        'demo_seconds_bucket{route="/api",le="0.1"} 2.0',
+        'demo_seconds_bucket{route="/api",le="1.0"} 3.0',
+        'demo_seconds_bucket{route="/api",le="+Inf"} 4.0',
+        'demo_seconds_sum{route="/api"} 3.65',
+        'demo_seconds_count{route="/api"} 4.0',
+    ]
+
+
+def test_labels_and_names_are_validated():
+    registry = Registry()
+    counter = Counter('demo_total', 'demo', ['route'], registry=registry)
+    with pytest.raises(ValueError):
+        counter.inc(status=200)
+    with pytest.raises(ValueError):
+        Counter('demo_total', 'duplicate', registry=registry)
+
+
+def test_flask_routes_are_recorded_by_rule():
+    app = Flask(__name__)
+
+    @app.route('/api/badges/<set_id>')
+    def badge(set_id):
+        return set_id
+
+    instrument_flask(app)
+    client = app.test_client()
+    client.get('/api/badges/vip')
+    client.get('/api/badges/hornet')
+    response = client.get('/metrics')
+    assert response.content_type == CONTENT_TYPE
+    body = response.get_data(as_text=True)
+    # パスではなくルールで集計する
+    line = next(line for line in body.splitlines()
+                if line.startswith('http_requests_total{route="/api/badges/<set_id>",method="GET",status="200"}'))
+    assert float(line.rsplit(' ', 1)[1]) >= 2
+    assert 'route="/api/badges/vip"' not in body
@@ -0,0 +1,83 @@
+"""構築済みペイロード（ETag・304・gzip/br の選択）とバージョン単位の再構築"""
+import gzip
+import json
+
+import pytest
+from flask import Flask
+
+import payload_cache
+from payload_cache import PayloadCache, PreparedPayload
+
+DATA = {'data': [{'set_id': 'vip', 'title': 'VIP（ブイアイピー）'}] * 50}
+
+
+def test_body_matches_the_data_for_every_encoding():
+    payload = PreparedPayload(1, DATA)
+    assert json.loads(payload.identity) == DATA
+    assert gzip.decompress(payload.gzip) == payload.identity
+    if payload_cache.brotli is not None:
+        assert payload_cache.brotli.decompress(payload.br) == payload.identity
+
+
+@pytest.mark.parametrize('accept_encoding, expected', [
+    ('', None),
+    ('identity', None),
+    ('gzip', 'gzip'),
+    ('gzip, deflate', 'gzip'),
+    ('gzip;q=0', None),
+    ('*', 'br'),
+    ('gzip, br', 'br'),
+    ('br;q=0, gzip', 'gzip'),
+    ('br;q=oops, gzip', 'gzip'),
+])
+def test_encoding_negotiation(accept_encoding, expected):
+    payload = PreparedPayload(1, DATA)
+    if expected == 'br' and payload.br is None:
+        expected = 'gzip'
+    status, body, headers = payload.negotiate(accept_encoding, '')
+    assert status == 200
+    assert headers.get('Content-Encoding') == expected
+    assert headers['Vary'] == 'Accept-Encoding'
+    assert body == {None: payload.identity, 'gzip': payload.gzip, 'br': payload.br}[expected]
+
+
+@pytest.mark.parametrize('if_none_match', ['"{etag}"', 'W/"{etag}"', '"other", "{etag}"', '*'])
+def test_matching_etag_returns_304(if_none_match):
+    payload = PreparedPayload(1, DATA)
+    status, body, headers = payload.negotiate('gzip', if_none_match.format(etag=payload.etag))
+    assert (status, body) == (304, b'')
+    assert headers['ETag'] == f'"{payload.etag}"'
+
+
+def test_changed_data_gets_a_new_etag():
+    payload = PreparedPayload(1, DATA)
+    assert payload.negotiate('', '"other"')[0] == 200
+    assert PreparedPayload(2, {'data': []}).etag != payload.etag
+    # 同じ内容ならバージョンが違ってもETagは同じ（クライアントのキャッシュが無駄にならない）
+    assert PreparedPayload(2, DATA).etag == payload.etag
+
+
+def test_flask_response_uses_request_headers():
+    app = Flask(__name__)
+    payload = PreparedPayload(1, DATA)
+    with app.test_request_context(headers={'Accept-Encoding': 'gzip', 'If-None-Match': '"stale"'}):
+        response = payload.to_response()
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.get_data() == payload.gzip
+
+
+def test_builder_runs_once_per_version():
+    cache = PayloadCache()
+    calls = []
+
+    def builder():
+        calls.append(1)
+        return {'data': len(calls)}
+
+    first = cache.get('badges', 1, builder)
+    assert cache.get('badges', 1, builder) is first
+    assert cache.get_cached('badges', 1) is first
+    assert cache.get_cached('badges', 2) is None
+    assert cache.get('badges', 2, builder).data == {'data': 2}
+    assert len(calls) == 2
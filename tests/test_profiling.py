@@ -0,0 +1,78 @@
+"""区間計測とオンデマンドのプロファイル（管理者トークンでの制限）"""
+import time
+
+import pytest
+from flask import Flask, jsonify, request
+
+from profiling import Profiler, admin_token_matches, install_profiler, phase
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv('ADMIN_TOKEN', 'secret')
+    app = Flask(__name__)
+    profiler = Profiler(slow_size=5)
+
+    @app.route('/api/badges')
+    def badges():
+        with phase('upstream'):
+            time.sleep(0.01)
+        # _profile はルートから見えない
+        return jsonify({'args': sorted(request.args)})
+
+    install_profiler(app, profiler)
+    return app.test_client()
+
+
+def test_admin_token_comparison(monkeypatch):
+    assert admin_token_matches({'X-Admin-Token': 'secret'}, 'secret')
+    assert admin_token_matches({'Authorization': 'Bearer secret'}, 'secret')
+    assert not admin_token_matches({'X-Admin-Token': 'wrong'}, 'secret')
+    # ADMIN_TOKEN が未設定なら常に拒否
+    monkeypatch.delenv('ADMIN_TOKEN', raising=False)
+    assert not admin_token_matches({'X-Admin-Token': ''})
+
+
+@pytest.mark.parametrize('headers', [{}, {'X-Admin-Token': 'wrong'}])
+def test_profiling_and_admin_routes_require_the_token(client, headers):
+    assert client.get('/api/badges', headers={'X-Profile': 'sample', **headers}).status_code == 403
+    assert client.get('/api/badges?_profile=cprofile', headers=headers).status_code == 403
+    assert client.get('/api/admin/profiles', headers=headers).status_code == 403
+    assert client.delete('/api/admin/profiles', headers=headers).status_code == 403
+    assert client.get('/api/admin/profiles/1-1', headers=headers).status_code == 403
+    # プロファイルを要求しないリクエストはそのまま処理する
+    assert client.get('/api/badges', headers=headers).status_code == 200
+
+
+def test_admin_can_profile_a_request(client):
+    admin = {'X-Admin-Token': 'secret'}
+    response = client.get('/api/badges?_profile=cprofile&lang=ja', headers=admin)
+    assert response.status_code == 200
+    assert response.get_json() == {'args': ['lang']}
+    assert 'upstream;dur=' in response.headers['Server-Timing']
+    profile_id = response.headers['X-Profile-Id']
+
+    listing = client.get('/api/admin/profiles', headers=admin).get_json()
+    assert [profile['id'] for profile in listing['profiles']] == [profile_id]
+    assert listing['slowest'][0]['phases_ms']['upstream'] >= 10
+    assert 'function calls' in client.get(f'/api/admin/profiles/{profile_id}?format=text', headers=admin).get_data(
+        as_text=True)
+    assert client.get('/api/admin/profiles/missing', headers=admin).status_code == 404
+
+    folded = client.get('/api/admin/profiles?format=folded', headers=admin).get_data(as_text=True)
+    assert 'GET /api/badges;upstream ' in folded
+    client.delete('/api/admin/profiles', headers=admin)
+    listing = client.get('/api/admin/profiles', headers=admin).get_json()
+    # 削除後に残るのは DELETE 自体の記録だけ
+    assert listing['profiles'] == []
+    assert [record['route'] for record in listing['slowest']] == ['/api/admin/profiles']
+
+
+def test_slow_log_keeps_only_the_slowest_requests():
+    profiler = Profiler(slow_size=2)
+    for delay in (0.03, 0.0, 0.02, 0.01):
+        state = profiler.begin()
+        time.sleep(delay)
+        profiler.end(state, 'GET', '/api/badges', '/api/badges', 200)
+    durations = [record['duration_ms'] for record in profiler.slowest()]
+    assert len(durations) == 2 and durations[0] >= 30 and durations[1] >= 20
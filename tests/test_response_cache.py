@@ -0,0 +1,134 @@
+"""レスポンスキャッシュ（TTL・stale-while-revalidate・同時ロードのまとめ）"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from response_cache import AsyncTTLCache, TTLCache
+
+
+def age(cache, key, seconds):
+    """エントリの取得時刻を過去にずらす"""
+    cache._entries[key].fetched_at -= seconds
+
+
+def wait_for_refresh(cache, key, timeout=2):
+    deadline = time.time() + timeout
+    while key in cache._refreshing and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_ttl_hit_then_stale_while_revalidate():
+    cache = TTLCache(ttl=60, max_stale=600)
+    values = iter(['first', 'second', 'third'])
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return next(values)
+
+    assert cache.get_versioned('badges', loader) == ('first', 1)
+    assert cache.get_versioned('badges', loader) == ('first', 1)
+    assert len(calls) == 1
+
+    # TTL切れ・max_stale内: 古い値をすぐ返し、裏で1回だけ再取得する
+    age(cache, 'badges', 120)
+    assert cache.get('badges', loader) == 'first'
+    assert cache.get('badges', loader) == 'first'
+    wait_for_refresh(cache, 'badges')
+    assert len(calls) == 2
+    assert cache.get_versioned('badges', loader) == ('second', 2)
+
+    # max_stale も過ぎた値は返さず、その場で取得する
+    age(cache, 'badges', 1000)
+    assert cache.get('badges', loader) == 'third'
+    assert len(calls) == 3
+
+
+def test_failed_refresh_keeps_the_stale_value():
+    cache = TTLCache(ttl=60, max_stale=600)
+    cache.get('badges', lambda: 'cached')
+    age(cache, 'badges', 120)
+
+    def failing():
+        raise RuntimeError('upstream down')
+
+    assert cache.get('badges', failing) == 'cached'
+    wait_for_refresh(cache, 'badges')
+    assert cache.get('badges', failing) == 'cached'
+
+
+def run_threads(cache, loader, count=8):
+    results, errors = [], []
+
+    def worker():
+        try:
+            results.append(cache.get_versioned('badges', loader))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_concurrent_misses_share_one_load():
+    cache = TTLCache(ttl=60)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.1)
+        return {'data': []}
+
+    results, errors = run_threads(cache, loader)
+    assert not errors
+    assert len(calls) == 1
+    assert len(set(version for _, version in results)) == 1
+
+
+def test_load_error_reaches_every_waiter_and_is_not_cached():
+    cache = TTLCache(ttl=60)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.1)
+        raise RuntimeError('upstream down')
+
+    results, errors = run_threads(cache, loader)
+    assert not results and len(errors) == 8
+    assert len(calls) == 1
+    with pytest.raises(RuntimeError):
+        cache.get('badges', loader)
+    assert len(calls) == 2
+
+
+def run_concurrent_misses(cache, count=5):
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {'data': len(calls)}
+
+    async def run():
+        return await asyncio.gather(*(cache.get_versioned('badges', loader) for _ in range(count)))
+
+    return asyncio.run(run()), calls
+
+
+def test_async_cache_coalesces_concurrent_misses():
+    results, calls = run_concurrent_misses(AsyncTTLCache(ttl=0, max_stale=0))
+    assert len(calls) == 1
+    assert len({version for _, version in results}) == 1
+
+
+def test_async_cache_without_coalescing_loads_every_miss():
+    results, calls = run_concurrent_misses(AsyncTTLCache(ttl=0, max_stale=0, coalesce=False))
+    assert len(calls) == 5
+    assert len({version for _, version in results}) == 5
@@ -0,0 +1,53 @@
+"""バッジ・エモート検索の索引（入手方法の日本語説明・ページング）"""
+from search_index import SearchIndex, badge_documents, emote_documents, search_response
+
+OBTAIN_METHODS = {
+    'clips-leader': {
+        'ja': {'title': 'Clips Leader', 'description': 'クリップの視聴数で上位3位以内に入ると入手できるバッジです。'},
+        'en': {'title': 'Clips Leader', 'description': 'Rank in the top 3 clippers of a channel.'}
+    },
+    'legendus': {
+        'ja': {'title': 'LEGENDUS ITADAKI イベント参加', 'description': '配信を30分間視聴することで入手できました。'}
+    },
+    'default': {'ja': {'title': '不明', 'description': 'このバッジの入手方法は不明です。'}}
+}
+
+
+def make_index():
+    badges = [{'set_id': set_id, 'versions': [{'title': set_id.title(), 'image_url_1x': 'x'}]}
+              for set_id in ('clips-leader', 'legendus', 'hornet')]
+    details = {'hornet': {'name': 'Hornet', 'description': 'Badge discovered: hornet'}}
+    index = SearchIndex()
+    index.sync('badge', badge_documents(badges, details, OBTAIN_METHODS))
+    index.sync('emote', emote_documents([{'id': str(i), 'name': f'emote{i}'} for i in range(250)]))
+    return index
+
+
+def test_badges_match_japanese_obtain_methods():
+    index = make_index()
+    assert [r['id'] for r in index.search('視聴', 'badge')] == ['clips-leader', 'legendus']
+    assert [r['id'] for r in index.search('バッジ', 'badge')] == ['clips-leader']
+    assert [r['id'] for r in index.search('イベント参加', 'badge')] == ['legendus']
+    assert [r['id'] for r in index.search('top 3 clippers', 'badge')] == ['clips-leader']
+    # 汎用の説明（default）はどのバッジにも索引しない
+    assert index.search('不明', 'badge') == []
+
+
+def test_pages_cover_all_results_in_rank_order():
+    index = make_index()
+    everything, total = index.search_page('emote', 'emote', 250, 0)
+    assert total == 250
+
+    collected = []
+    offset = 0
+    while offset is not None:
+        results, total = index.search_page('emote', 'emote', 100, offset)
+        response = search_response('emote', results, total, offset)
+        collected.extend(response['results'])
+        offset = response['next_offset']
+    assert collected == everything
+
+
+def test_search_response_without_results():
+    assert search_response('x', [], 0, 0)['next_offset'] is None
+    assert search_response('x', [], 5, 10)['next_offset'] is None
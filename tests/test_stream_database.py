@@ -0,0 +1,61 @@
+"""Stream Databaseのバッジページのストリーミング解析"""
+import json
+
+from stream_database import NEXT_DATA_TAG, iter_badges
+
+
+def page(next_data_json, links=('hornet', 'zevent25')):
+    anchors = ''.join(f'<a href="/twitch/global-badges/{badge_id}">{badge_id}</a>' for badge_id in links)
+    return (f'<html><body><div>{anchors}</div>'
+            f'{NEXT_DATA_TAG}{next_data_json}</script></body></html>')
+
+
+def next_data(badges):
+    return json.dumps({'props': {'pageProps': {'badges': badges, 'other': 'x' * 100}}, 'page': '/'})
+
+
+def chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+BADGES = [
+    {'set_id': 'hornet', 'name': 'Hornet', 'created_at': '2025-09-04T00:00:00Z', 'user_count': 5},
+    {'set_id': 'zevent25', 'name': 'ZEVENT 25', 'description': 'a "quoted" \\ text {[,]}',
+     'created_at': '2025-09-01T00:00:00Z'},
+]
+
+
+def test_extracts_badges_from_next_data_in_any_chunk_size():
+    html = page(next_data(BADGES))
+    for size in (1, 7, 64, len(html)):
+        badges = list(iter_badges(chunked(html, size)))
+        assert [b['set_id'] for b in badges] == ['hornet', 'zevent25']
+        assert badges[1]['description'] == 'a "quoted" \\ text {[,]}'
+        assert {b['source'] for b in badges} == {'stream_database'}
+
+
+def test_falls_back_to_links_without_next_data_badges():
+    badges = list(iter_badges([page(next_data([]))]))
+    assert [(b['set_id'], b['source']) for b in badges] == [
+        ('hornet', 'html_extraction'), ('zevent25', 'html_extraction')]
+
+
+def test_malformed_next_data_falls_back_to_links():
+    malformed = '{"props": {"pageProps": {"badges": [{"set_id": "hornet", "name": bad}]}}}'
+    for size in (5, 4096):
+        badges = list(iter_badges(chunked(page(malformed), size)))
+        assert [(b['set_id'], b['source']) for b in badges] == [
+            ('hornet', 'html_extraction'), ('zevent25', 'html_extraction')]
+
+
+def test_malformed_after_some_badges_adds_remaining_links():
+    malformed = ('{"props": {"pageProps": {"badges": [' + json.dumps(BADGES[0])
+                 + ', {"set_id": "broken", "name": nope}]}}}')
+    badges = list(iter_badges(chunked(page(malformed), 16)))
+    assert [(b['set_id'], b['source']) for b in badges] == [
+        ('hornet', 'stream_database'), ('zevent25', 'html_extraction')]
+
+
+def test_unbalanced_brackets_do_not_raise():
+    badges = list(iter_badges([page('}]{"props": 1}')]))
+    assert [b['source'] for b in badges] == ['html_extraction', 'html_extraction']
@@ -0,0 +1,70 @@
+"""TimestampStore（基本表とのマージ・ファイル変更時だけの再読み込み・変更通知）"""
+import json
+import os
+
+from timestamp_store import TimestampStore
+
+BASE = {'vip': '2018-07-01T00:00:00.000Z', 'hornet': '2025-09-03T00:00:00.000Z'}
+
+
+def write(path, data):
+    path.write_text(json.dumps(data))
+    # 同じ秒内の書き換えでも mtime が変わるようにする
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_missing_file_uses_the_base_table(tmp_path):
+    store = TimestampStore(str(tmp_path / 'latest.json'), BASE)
+    assert store.get_merged() == BASE
+    assert store.get_latest() == {}
+    assert store.file_signature is None
+    assert store.version == 1
+
+
+def test_file_overrides_base_and_reloads_only_when_changed(tmp_path):
+    path = tmp_path / 'latest.json'
+    write(path, {'hornet': '2025-09-04T00:00:00.000Z', 'new-badge': '2025-10-01T00:00:00.000Z'})
+    store = TimestampStore(str(path), BASE, check_interval=0)
+    changes = []
+    store.add_listener(lambda version, changed: changes.append((version, changed)))
+
+    snapshot = store.snapshot()
+    assert snapshot.merged['hornet'] == '2025-09-04T00:00:00.000Z'
+    assert snapshot.matcher.partial_match('new-badge-2025') == '2025-10-01T00:00:00.000Z'
+    # ファイルが変わらなければ同じスナップショットのまま
+    assert store.snapshot() is snapshot
+    assert changes == []
+
+    write(path, {'new-badge': '2025-10-02T00:00:00.000Z'})
+    assert store.version == 2
+    assert store.get_merged()['hornet'] == BASE['hornet']
+    assert changes == [(2, ['hornet', 'new-badge'])]
+
+
+def test_check_interval_limits_file_checks(tmp_path):
+    path = tmp_path / 'latest.json'
+    write(path, {})
+    store = TimestampStore(str(path), BASE, check_interval=3600)
+    assert store.version == 1
+    write(path, {'vip': '2019-01-01T00:00:00.000Z'})
+    assert store.version == 1
+
+
+def test_invalid_file_keeps_the_previous_data(tmp_path):
+    path = tmp_path / 'latest.json'
+    write(path, {'vip': '2019-01-01T00:00:00.000Z'})
+    store = TimestampStore(str(path), BASE, check_interval=0)
+    assert store.get_merged()['vip'] == '2019-01-01T00:00:00.000Z'
+    path.write_text('{broken')
+    assert store.get_merged()['vip'] == '2019-01-01T00:00:00.000Z'
+    assert store.version == 1
+
+
+def test_replace_latest_notifies_without_rereading(tmp_path):
+    store = TimestampStore(str(tmp_path / 'latest.json'), BASE, check_interval=3600)
+    changes = []
+    store.add_listener(lambda version, changed: changes.append((version, changed)))
+    store.replace_latest({'vip': '2019-01-01T00:00:00.000Z'})
+    assert store.get_latest() == {'vip': '2019-01-01T00:00:00.000Z'}
+    assert changes == [(2, ['vip'])]
@@ -0,0 +1,95 @@
+"""TokenManager（同時要求の単一フライト・期限前の更新・無効化）"""
+import threading
+import time
+
+from token_manager import TokenManager
+
+
+class FakeResponse:
+    def __init__(self, status_code, data):
+        self.status_code = status_code
+        self._data = data
+        self.text = str(data)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f'HTTP {self.status_code}')
+
+    def json(self):
+        return self._data
+
+
+class FakeTokenEndpoint:
+    """呼ばれるたびに token-1, token-2, ... を返すトークンAPI"""
+
+    def __init__(self, expires_in=3600, delay=0, status_code=200):
+        self.expires_in = expires_in
+        self.delay = delay
+        self.status_code = status_code
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def post(self, url, params=None):
+        assert params['grant_type'] == 'client_credentials'
+        time.sleep(self.delay)
+        with self._lock:
+            self.calls += 1
+            calls = self.calls
+        return FakeResponse(self.status_code, {'access_token': f'token-{calls}', 'expires_in': self.expires_in})
+
+
+def manager(endpoint, **kwargs):
+    return TokenManager('id', 'secret', lambda: endpoint, background=False, **kwargs)
+
+
+def test_concurrent_requests_share_one_refresh():
+    endpoint = FakeTokenEndpoint(delay=0.1)
+    tokens = manager(endpoint)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(tokens.get_token())) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert endpoint.calls == 1
+    assert results == ['token-1'] * 10
+
+
+def test_non_blocking_request_never_fetches():
+    endpoint = FakeTokenEndpoint()
+    tokens = manager(endpoint)
+    assert tokens.get_token(blocking=False) is None
+    assert endpoint.calls == 0
+    assert tokens.get_token() == 'token-1'
+    assert tokens.get_token(blocking=False) == 'token-1'
+
+
+def test_token_near_expiry_is_returned_while_refreshing():
+    # 期限（expires_in - 60秒）まで refresh_margin 以内なので取得直後から更新対象
+    endpoint = FakeTokenEndpoint(expires_in=400)
+    tokens = manager(endpoint, refresh_margin=600)
+    assert tokens.get_token() == 'token-1'
+    assert tokens.get_token() == 'token-1'
+    deadline = time.time() + 2
+    while tokens.get_token(blocking=False) != 'token-2' and time.time() < deadline:
+        time.sleep(0.01)
+    assert tokens.get_token(blocking=False) == 'token-2'
+
+
+def test_invalidate_only_drops_the_given_token():
+    endpoint = FakeTokenEndpoint()
+    tokens = manager(endpoint)
+    assert tokens.get_token() == 'token-1'
+    tokens.invalidate('token-0')
+    assert tokens.get_token() == 'token-1'
+    tokens.invalidate('token-1')
+    assert tokens.get_token() == 'token-2'
+    assert tokens.stats()['invalidations'] == 1
+
+
+def test_failed_refresh_returns_none_and_is_counted():
+    endpoint = FakeTokenEndpoint(status_code=500)
+    tokens = manager(endpoint)
+    assert tokens.get_token() is None
+    assert tokens.stats()['refresh_failures'] == 1
+    assert tokens.stats()['has_token'] is False
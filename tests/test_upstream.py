@@ -0,0 +1,163 @@
+"""UpstreamClient のリトライ・バックオフ・タイムアウト（ローカルのスタブサーバーを使用）"""
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from upstream import AsyncUpstreamClient, UpstreamClient
+
+
+class StubServer:
+    """パスごとに決めた応答を返し、受けたリクエスト数を数えるHTTPサーバー
+
+    /status/<code>  常に <code> を返す
+    /flaky/<n>      最初の n 回は 503、その後 200
+    /slow           応答前に1秒待つ
+    /reset          応答せずに接続を閉じる
+    """
+
+    def __init__(self):
+        self.hits = {}
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.hits[self.path] = count = stub.hits.get(self.path, 0) + 1
+                parts = self.path.strip('/').split('/')
+                if parts[0] == 'reset':
+                    self.close_connection = True
+                    return
+                if parts[0] == 'slow':
+                    time.sleep(1)
+                    status = 200
+                elif parts[0] == 'flaky':
+                    status = 503 if count <= int(parts[1]) else 200
+                else:
+                    status = int(parts[1])
+                body = str(count).encode()
+                self.send_response(status)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_POST = do_GET
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self._server.server_address[1]}'
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def stub():
+    server = StubServer()
+    yield server
+    server.close()
+
+
+def make_client(**kwargs):
+    kwargs.setdefault('backoff', 0)
+    return UpstreamClient(**kwargs)
+
+
+def test_retries_5xx_then_returns_last_response(stub):
+    client = make_client(retries=2)
+    response = client.get(stub.url + '/status/503')
+    # 1回目 + リトライ2回の後、最後の503をそのまま返す（呼び出し側が raise_for_status で判定）
+    assert response.status_code == 503
+    assert stub.hits['/status/503'] == 3
+    with pytest.raises(requests.HTTPError):
+        response.raise_for_status()
+
+
+def test_recovers_after_transient_5xx(stub):
+    client = make_client(retries=2)
+    response = client.get(stub.url + '/flaky/2')
+    assert response.status_code == 200
+    assert stub.hits['/flaky/2'] == 3
+
+
+def test_does_not_retry_429_or_4xx(stub):
+    client = make_client(retries=2)
+    assert client.get(stub.url + '/status/429').status_code == 429
+    assert client.get(stub.url + '/status/404').status_code == 404
+    assert stub.hits['/status/429'] == 1
+    assert stub.hits['/status/404'] == 1
+
+
+def test_retries_connection_reset_then_raises(stub):
+    client = make_client(retries=1)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.get(stub.url + '/reset')
+    assert stub.hits['/reset'] == 2
+
+
+def test_read_timeout_is_not_retried(stub):
+    client = make_client(retries=2, timeout=(1, 0.2))
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        client.get(stub.url + '/slow')
+    assert stub.hits['/slow'] == 1
+
+
+def test_post_is_not_retried_unless_idempotent(stub):
+    client = make_client(retries=2)
+    # トークン発行・デプロイフックなどの POST は再送しない
+    assert client.post(stub.url + '/status/503').status_code == 503
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.post(stub.url + '/reset')
+    assert stub.hits['/status/503'] == 1
+    assert stub.hits['/reset'] == 1
+
+    assert client.post(stub.url + '/flaky/1', idempotent=True).status_code == 200
+    assert stub.hits['/flaky/1'] == 2
+
+
+def test_backoff_grows_with_attempts(stub, monkeypatch):
+    delays = []
+    monkeypatch.setattr('upstream.random.uniform', lambda low, high: high)
+    monkeypatch.setattr('upstream.time.sleep', delays.append)
+    client = UpstreamClient(retries=3, backoff=0.5)
+    assert client.get(stub.url + '/status/500').status_code == 500
+    assert delays == [0.5, 1.0, 2.0]
+
+
+def test_async_client_retries_5xx_and_not_429(stub):
+    async def run():
+        client = AsyncUpstreamClient(retries=2, backoff=0)
+        try:
+            first = await client.get(stub.url + '/status/502')
+            second = await client.get(stub.url + '/status/429')
+        finally:
+            await client.aclose()
+        return first.status_code, second.status_code
+
+    assert asyncio.run(run()) == (502, 429)
+    assert stub.hits['/status/502'] == 3
+    assert stub.hits['/status/429'] == 1
+
+
+def test_async_client_does_not_retry_post(stub):
+    async def run():
+        client = AsyncUpstreamClient(retries=2, backoff=0)
+        try:
+            return (await client.request('POST', stub.url + '/status/503')).status_code
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == 503
+    assert stub.hits['/status/503'] == 1
@@ -0,0 +1,142 @@
+"""バッジタイムスタンプのインメモリストア（ファイル変更時のみ再読み込み）"""
+import json
+import logging
+import os
+import threading
+import time
+
+from badge_matcher import TimestampMatcher
+
+logger = logging.getLogger(__name__)
+
+
+class _Snapshot:
+    __slots__ = ('version', 'latest', 'merged', 'matcher')
+
+    def __init__(self, version, latest, merged):
+        self.version = version
+        self.latest = latest
+        self.merged = merged
+        self.matcher = TimestampMatcher(merged)
+
+
+class TimestampStore:
+    """基本タイムスタンプ表と最新データ（JSONファイル）を一度だけマージして保持する
+
+    ファイルの mtime / inode は check_interval 秒に一度だけ確認するため、
+    リクエストごとのファイルI/Oは発生しない。内容が変わるたびに version が増え、
+    add_listener で登録した関数が (version, 変化したset_idのリスト) で呼ばれる。
+    """
+
+    def __init__(self, path, base_timestamps, check_interval=5):
+        self.path = path
+        self.base_timestamps = base_timestamps
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._signature = None
+        self._checked_at = 0
+        self._snapshot = None
+        self._listeners = []
+
+    def add_listener(self, callback):
+        """内容が変わったときに callback(version, changed_set_ids) を呼ぶ"""
+        self._listeners.append(callback)
+
+    def _notify(self, change):
+        if change is None:
+            return
+        for callback in self._listeners:
+            try:
+                callback(*change)
+            except Exception as e:
+                logger.exception(f"Error in timestamp store listener: {e}")
+
+    def _stat_signature(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_mtime_ns, st.st_ino, st.st_size)
+        except OSError:
+            return None
+
+    def _load_file(self):
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.error(f"Error loading latest timestamps: {e}")
+            return None
+
+    def _install(self, latest):
+        """新しいスナップショットを作り、(version, 変化したset_id) を返す（初回はNone）"""
+        previous = self._snapshot
+        version = previous.version + 1 if previous else 1
+        merged = {**self.base_timestamps, **latest}
+        self._snapshot = _Snapshot(version, latest, merged)
+        if previous is None:
+            return None
+        changed = [key for key in merged.keys() | previous.merged.keys()
+                   if merged.get(key) != previous.merged.get(key)]
+        return version, sorted(changed)
+
+    def _current(self):
+        snapshot = self._snapshot
+        now = time.monotonic()
+        if snapshot is not None and now - self._checked_at < self.check_interval:
+            return snapshot
+
+        change = None
+        with self._lock:
+            if self._snapshot is not None and now - self._checked_at < self.check_interval:
+                return self._snapshot
+            self._checked_at = now
+            signature = self._stat_signature()
+            if self._snapshot is None or signature != self._signature:
+                latest = self._load_file()
+                if latest is not None:
+                    self._signature = signature
+                    change = self._install(latest)
+                elif self._snapshot is None:
+                    # 読み込みに失敗した場合は直前のデータを使い続ける
+                    self._install({})
+            snapshot = self._snapshot
+        self._notify(change)
+        return snapshot
+
+    def snapshot(self):
+        """version / latest / merged / matcher を一貫した組で返す"""
+        return self._current()
+
+    @property
+    def version(self):
+        """データが変わるたびに増えるバージョン番号"""
+        return self._current().version
+
+    @property
+    def file_signature(self):
+        """現在のデータを読み込んだときのファイルの (mtime_ns, inode, size)（ファイルが無ければNone）"""
+        self._current()
+        return self._signature
+
+    def get_latest(self):
+        """ファイルから読み込んだ最新のタイムスタンプ"""
+        return self._current().latest
+
+    def get_merged(self):
+        """基本表と最新データをマージしたタイムスタンプ"""
+        return self._current().merged
+
+    def get_matcher(self):
+        """マージ済みタイムスタンプの部分一致インデックス"""
+        return self._current().matcher
+
+    def replace_latest(self, latest):
+        """書き込み直後に新しいデータを反映する（ファイルの再読み込みは不要）"""
+        # 変化したset_idを通知できるよう、未読み込みなら先に現在のデータを読み込む
+        self._current()
+        with self._lock:
+            self._signature = self._stat_signature()
+            self._checked_at = time.monotonic()
+            change = self._install(dict(latest))
+        self._notify(change)
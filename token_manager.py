@@ -0,0 +1,148 @@
+"""Twitchアプリアクセストークンの管理（単一フライト更新・期限前の自動更新）"""
+import logging
+import threading
+import time
+
+from metrics import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+TOKEN_URL = 'https://id.twitch.tv/oauth2/token'
+
+TOKEN_REFRESHES = Counter('twitch_token_refreshes_total', 'アクセストークンの取得回数', ['result'])
+TOKEN_REFRESH_LATENCY = Histogram('twitch_token_refresh_duration_seconds', 'アクセストークンの取得時間（秒）')
+TOKEN_INVALIDATIONS = Counter('twitch_token_invalidations_total', '401応答などによるアクセストークンの無効化回数')
+
+
+class TokenManager:
+    """アプリアクセストークンを保持し、期限切れ前に1回だけ更新する
+
+    - 有効なトークンがあれば即座に返す（期限が近い場合は裏で更新を開始）
+    - トークンが無い状態での同時要求は1回のトークン取得にまとめる
+    - background=True の場合はタイマーで期限前に更新する
+    """
+
+    def __init__(self, client_id, client_secret, http_client_getter,
+                 refresh_margin=300, background=True, token_url=TOKEN_URL):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self._get_http_client = http_client_getter
+        self.refresh_margin = refresh_margin
+        self.background = background
+        self.token_url = token_url
+
+        self._token = None
+        self._expires_at = 0
+        self._issued_at = 0
+        self._refreshing = False
+        self._condition = threading.Condition()
+        self._timer = None
+
+        self.refresh_count = 0
+        self.refresh_failures = 0
+        self.invalidations = 0
+
+    def get_token(self, blocking=True):
+        """有効なアクセストークンを返す（取得できない場合はNone）
+
+        blocking=False の場合は取得処理を行わず、有効なトークンが無ければNoneを返す。
+        """
+        now = time.time()
+        with self._condition:
+            if self._token and now < self._expires_at:
+                if now >= self._expires_at - self.refresh_margin and not self._refreshing:
+                    # 期限が近いので現在のトークンを返しつつ裏で更新
+                    self._refreshing = True
+                    threading.Thread(target=self._refresh, daemon=True).start()
+                return self._token
+
+            if not blocking:
+                return None
+
+            if self._refreshing:
+                # 他のスレッドの更新完了を待つ
+                self._condition.wait_for(lambda: not self._refreshing, timeout=15)
+                return self._token if self._token and time.time() < self._expires_at else None
+
+            self._refreshing = True
+
+        self._refresh()
+        with self._condition:
+            return self._token
+
+    def invalidate(self, token=None):
+        """トークンを無効化する（401を受けた場合など）"""
+        with self._condition:
+            if token is None or token == self._token:
+                self._token = None
+                self._expires_at = 0
+                self.invalidations += 1
+                TOKEN_INVALIDATIONS.inc()
+
+    def _refresh(self):
+        """トークンを取得して保存する（呼び出し元で _refreshing を立てておく）"""
+        params = {
+            'client_id': self.client_id,
+            'client_secret': self.client_secret,
+            'grant_type': 'client_credentials'
+        }
+        response = None
+        started = time.perf_counter()
+        try:
+            response = self._get_http_client().post(self.token_url, params=params)
+            response.raise_for_status()
+
+            data = response.json()
+            expires_in = data.get('expires_in', 3600)
+
+            with self._condition:
+                self._token = data['access_token']
+                self._issued_at = time.time()
+                # 1分前に期限切れとする
+                self._expires_at = self._issued_at + expires_in - 60
+                self.refresh_count += 1
+            TOKEN_REFRESHES.inc(result='success')
+            self._schedule_refresh(expires_in - 60 - self.refresh_margin)
+        except Exception as e:
+            with self._condition:
+                self.refresh_failures += 1
+            TOKEN_REFRESHES.inc(result='failure')
+            extra = {}
+            if response is not None and response.status_code >= 400:
+                extra = {'status': response.status_code, 'body': response.text[:500]}
+            logger.error(f"Error getting access token: {e}", extra=extra)
+        finally:
+            TOKEN_REFRESH_LATENCY.observe(time.perf_counter() - started)
+            with self._condition:
+                self._refreshing = False
+                self._condition.notify_all()
+
+    def _schedule_refresh(self, delay):
+        if not self.background:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(max(delay, 1), self._timer_refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _timer_refresh(self):
+        with self._condition:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        self._refresh()
+
+    def stats(self):
+        """監視用の統計情報"""
+        with self._condition:
+            now = time.time()
+            has_token = bool(self._token)
+            return {
+                'has_token': has_token,
+                'token_age_seconds': round(now - self._issued_at, 1) if has_token else None,
+                'expires_in_seconds': round(self._expires_at - now, 1) if has_token else None,
+                'refresh_count': self.refresh_count,
+                'refresh_failures': self.refresh_failures,
+                'invalidations': self.invalidations
+            }
@@ -0,0 +1,187 @@
+"""ASGIモードの負荷試験
+
+遅延を入れたスタブのTwitch API（トークン・Helix）を起動し、uvicorn で asgi:application を
+立ち上げて大量の同時リクエストを送る。キャッシュを無効化（TTL=0）し、同時のキャッシュミスも
+まとめない（HELIX_CACHE_COALESCE=0）状態で、上流の応答待ちが同時に数千件あっても
+1プロセスで捌けることを確認する。スタブが観測した上流の同時リクエスト数の最大値を
+ラウンドごとに表示する（peak concurrent upstream）。
+
+    python tools/asgi_loadtest.py --concurrency 2000 --upstream-delay 1.0
+
+--coalesce を指定すると本番と同じく同時のキャッシュミスを1回の上流呼び出しにまとめる
+（--cache-ttl が0より大きい場合は常にまとめる）。
+
+--workers で uvicorn のワーカー数を変えると、複数ワーカーでのスループットを比較できる。
+--cache-ttl と --shared-cache（SHARED_CACHE_URL）を指定すると、Helixレスポンスを
+ワーカー間で共有した場合の上流呼び出し回数を確認できる。
+
+    python tools/asgi_loadtest.py --workers 4 --cache-ttl 600 --shared-cache file:///tmp/streamjp-cache
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+upstream_calls = {'token': 0, 'helix': 0}
+# Helixへの同時リクエスト数（スタブで応答待ちの件数）とその最大値
+upstream_concurrency = {'current': 0, 'peak': 0}
+
+
+def fixture_badges(count=120):
+    return {'data': [
+        {
+            'set_id': f'loadtest-badge-{i}',
+            'versions': [{
+                'id': '1',
+                'title': f'Load Test Badge {i}',
+                'image_url_1x': f'https://static-cdn.jtvnw.net/badges/v1/{i:032x}/1',
+                'image_url_2x': f'https://static-cdn.jtvnw.net/badges/v1/{i:032x}/2',
+                'image_url_4x': f'https://static-cdn.jtvnw.net/badges/v1/{i:032x}/3',
+            }]
+        }
+        for i in range(count)
+    ]}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+async def run_stub(port, delay):
+    """キープアライブ対応の最小限のHTTPスタブ"""
+    badges = json.dumps(fixture_badges()).encode()
+    token = json.dumps({'access_token': 'loadtest', 'expires_in': 3600}).encode()
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                path = request_line.split()[1].decode()
+                if path.startswith('/oauth2/token'):
+                    upstream_calls['token'] += 1
+                    body = token
+                else:
+                    upstream_calls['helix'] += 1
+                    upstream_concurrency['current'] += 1
+                    upstream_concurrency['peak'] = max(upstream_concurrency['peak'], upstream_concurrency['current'])
+                    try:
+                        await asyncio.sleep(delay)
+                    finally:
+                        upstream_concurrency['current'] -= 1
+                    body = badges if 'badges' in path else b'{"data":[]}'
+                writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                             b'Content-Length: %d\r\n\r\n' % len(body) + body)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, '127.0.0.1', port, backlog=4096)
+
+
+async def http_get(port, path):
+    """1接続1リクエストの最小限のHTTPクライアント（クライアント側の処理を軽くするため）"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        writer.write(f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n\r\n'.encode())
+        await writer.drain()
+        response = await reader.read()
+        return int(response.split(b' ', 2)[1])
+    finally:
+        writer.close()
+
+
+async def wait_until_ready(port, timeout=20):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            await http_get(port, '/robots.txt')
+            return
+        except (ConnectionError, IndexError, ValueError):
+            await asyncio.sleep(0.2)
+    raise RuntimeError('ASGI server did not start')
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, default=2000)
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--upstream-delay', type=float, default=1.0)
+    parser.add_argument('--path', default='/api/badges')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--cache-ttl', type=int, default=0)
+    parser.add_argument('--shared-cache', default='')
+    parser.add_argument('--coalesce', action='store_true', help='同時のキャッシュミスを1回の上流呼び出しにまとめる')
+    args = parser.parse_args()
+    coalesce = args.coalesce or args.cache_ttl > 0
+
+    stub_port, app_port = free_port(), free_port()
+    stub = await run_stub(stub_port, args.upstream_delay)
+
+    env = dict(
+        os.environ,
+        TWITCH_CLIENT_ID='loadtest',
+        TWITCH_CLIENT_SECRET='loadtest',
+        HELIX_API_URL=f'http://127.0.0.1:{stub_port}/helix',
+        TWITCH_TOKEN_URL=f'http://127.0.0.1:{stub_port}/oauth2/token',
+        HELIX_CACHE_TTL=str(args.cache_ttl),
+        HELIX_CACHE_MAX_STALE='0',
+        SHARED_CACHE_URL=args.shared_cache,
+        HELIX_CACHE_COALESCE='1' if coalesce else '0',
+        # まとめない場合は全リクエストが同時に上流へ接続できるようにする
+        UPSTREAM_ASYNC_POOL_SIZE=str(args.concurrency if not coalesce else 200),
+        DISABLE_BADGE_MONITOR='1',
+    )
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'asgi:application', '--port', str(app_port),
+         '--log-level', 'warning', '--backlog', '4096', '--workers', str(args.workers)],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL
+    )
+    try:
+        await wait_until_ready(app_port)
+        for round_number in range(1, args.rounds + 1):
+            upstream_calls['helix'] = 0
+            upstream_concurrency['peak'] = 0
+            latencies = []
+            statuses = {}
+
+            async def one():
+                started = time.perf_counter()
+                status = await http_get(app_port, args.path)
+                latencies.append(time.perf_counter() - started)
+                statuses[status] = statuses.get(status, 0) + 1
+
+            started = time.perf_counter()
+            await asyncio.gather(*(one() for _ in range(args.concurrency)))
+            elapsed = time.perf_counter() - started
+            latencies.sort()
+            print(
+                f'round {round_number}: {args.concurrency} requests in {elapsed:.2f}s '
+                f'({args.concurrency / elapsed:.0f} req/s), '
+                f'p50={statistics.median(latencies) * 1000:.0f}ms '
+                f'p99={latencies[int(len(latencies) * 0.99) - 1] * 1000:.0f}ms, '
+                f'statuses={statuses}, upstream helix calls={upstream_calls["helix"]}, '
+                f'peak concurrent upstream={upstream_concurrency["peak"]}'
+            )
+    finally:
+        server.terminate()
+        server.wait()
+        stub.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
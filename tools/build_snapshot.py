@@ -0,0 +1,69 @@
+"""Vercelのビルド時にバッジ・エモートのスナップショットを書き出す（snapshot.py 参照）
+
+    python tools/build_snapshot.py
+
+Helixへの接続には TWITCH_CLIENT_ID / TWITCH_CLIENT_SECRET が必要。取得できない場合は
+失敗で終了する（書き換え先のファイルが無いままデプロイされないように）。
+
+--record DIR で取得したHelixレスポンスを保存し、--fixtures DIR で保存済みのレスポンスから
+オフラインで生成できる（DIR/badges.json・DIR/emotes.json）。
+
+    python tools/build_snapshot.py --record fixtures/
+    python tools/build_snapshot.py --fixtures fixtures/ --output /tmp/snapshots
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'api'))
+
+import index  # noqa: E402  api/index.py（Vercelの関数と同じ拡張処理を使う）
+from snapshot import MANIFEST_FILE, SNAPSHOT_DIR, build_snapshot, write_snapshot  # noqa: E402
+
+
+def load_sources(fixtures):
+    if fixtures:
+        sources = {}
+        for kind in index.HELIX_PATHS:
+            with open(os.path.join(fixtures, f'{kind}.json'), 'r', encoding='utf-8') as f:
+                sources[kind] = json.load(f)
+        return sources
+
+    if not index.CLIENT_ID or not index.CLIENT_SECRET:
+        raise SystemExit('TWITCH_CLIENT_ID and TWITCH_CLIENT_SECRET are required to build the snapshot')
+    return {kind: index.fetch_helix(path) for kind, path in index.HELIX_PATHS.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', default=SNAPSHOT_DIR)
+    parser.add_argument('--fixtures', help='保存済みのHelixレスポンスのディレクトリ')
+    parser.add_argument('--record', help='取得したHelixレスポンスを保存するディレクトリ')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    sources = load_sources(args.fixtures)
+    if args.record:
+        os.makedirs(args.record, exist_ok=True)
+        for kind, data in sources.items():
+            with open(os.path.join(args.record, f'{kind}.json'), 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+
+    files = build_snapshot(sources, {
+        'badges': index.enhance_badges_with_timestamps,
+        'emotes': index.enhance_emotes_with_timestamps
+    })
+    write_snapshot(files, args.output)
+
+    manifest = json.loads(files[MANIFEST_FILE])
+    size = sum(len(body) for body in files.values())
+    print(f'Wrote {len(files)} files ({size / 1024:.0f} KiB) to {args.output} '
+          f'in {time.perf_counter() - started:.2f}s: {manifest["files"]}, pages={manifest["pages"]}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""共有キャッシュ用のRedisプロトコル（RESP）サーバーのローカル代替
+
+Redisを用意できない開発環境や負荷試験で、SHARED_CACHE_URL=redis://127.0.0.1:6379/0 の
+接続先として使う。shared_cache.RedisBackend が使うコマンド（GET / SET EX・PX / DEL）と
+PING・SELECT・AUTH・FLUSHALL だけに対応し、データはメモリ上にのみ保持する。
+
+    python tools/resp_server.py --port 6379
+"""
+import argparse
+import asyncio
+import time
+
+# (db, key) -> (値, 有効期限のUNIX時刻 または None)
+store = {}
+
+
+def encode(value):
+    if value is None:
+        return b'$-1\r\n'
+    if isinstance(value, int):
+        return b':%d\r\n' % value
+    if isinstance(value, str):
+        return f'+{value}\r\n'.encode()
+    return b'$%d\r\n%s\r\n' % (len(value), value)
+
+
+def error(message):
+    return f'-ERR {message}\r\n'.encode()
+
+
+def get_value(db, key):
+    entry = store.get((db, key))
+    if entry is None:
+        return None
+    value, expires_at = entry
+    if expires_at is not None and expires_at <= time.time():
+        del store[(db, key)]
+        return None
+    return value
+
+
+def execute(state, args):
+    command = args[0].upper()
+    if command == b'PING':
+        return encode('PONG')
+    if command == b'AUTH':
+        return encode('OK')
+    if command == b'SELECT':
+        state['db'] = int(args[1])
+        return encode('OK')
+    if command == b'GET':
+        return encode(get_value(state['db'], args[1]))
+    if command == b'SET':
+        expires_at = None
+        options = [arg.upper() for arg in args[3:]]
+        for index, option in enumerate(options):
+            if option in (b'EX', b'PX'):
+                amount = float(args[3 + index + 1])
+                expires_at = time.time() + (amount if option == b'EX' else amount / 1000)
+        store[(state['db'], args[1])] = (args[2], expires_at)
+        return encode('OK')
+    if command == b'DEL':
+        return encode(sum(1 for key in args[1:] if store.pop((state['db'], key), None) is not None))
+    if command == b'FLUSHALL':
+        store.clear()
+        return encode('OK')
+    return error(f"unknown command '{command.decode(errors='replace')}'")
+
+
+async def read_command(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b'*'):
+        # インラインコマンド（redis-cli の PING など）
+        return line.split()
+    args = []
+    for _ in range(int(line[1:])):
+        length = int((await reader.readline())[1:])
+        args.append((await reader.readexactly(length + 2))[:-2])
+    return args
+
+
+async def handle(reader, writer):
+    state = {'db': 0}
+    try:
+        while True:
+            args = await read_command(reader)
+            if args is None:
+                break
+            if not args:
+                continue
+            try:
+                writer.write(execute(state, args))
+            except (IndexError, ValueError):
+                writer.write(error('syntax error'))
+            await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=6379)
+    args = parser.parse_args()
+
+    server = await asyncio.start_server(handle, args.host, args.port)
+    print(f'RESP server listening on {args.host}:{args.port}')
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
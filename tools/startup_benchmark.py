@@ -0,0 +1,189 @@
+"""api/index.py（Vercelの関数）のコールドスタート計測
+
+新しいPythonプロセスで index を読み込み、最初の /api/badges に応答するまでを --runs 回
+計測して p50・p99 を表示する。上流には接続せず、固定のフィクスチャから作った
+スナップショット（snapshot.py）を使うため、同じ環境であれば再現性のある値になる。
+別に python -X importtime で読み込みの内訳（index が直接読み込むモジュールごとの
+累積時間の中央値）を表示する。
+
+    python tools/startup_benchmark.py --runs 30
+    python tools/startup_benchmark.py --fixtures fixtures/     # build_snapshot.py --record で保存したデータ
+
+リリースごとに --record で結果を追記し、前回の記録と比較する。
+
+    python tools/startup_benchmark.py --record benchmarks/cold_start.jsonl
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(ROOT, 'api')
+
+from asgi_loadtest import fixture_badges  # noqa: E402  同じディレクトリのツール
+
+# 子プロセスで実行する計測コード（読み込み → 最初のリクエスト）
+CHILD = r'''
+import json, time
+started = time.perf_counter()
+import index
+imported = time.perf_counter()
+response = index.app.test_client().get('/api/badges', headers={'Accept-Encoding': 'br, gzip'})
+assert response.status_code == 200, response.status_code
+print(json.dumps({'import': imported - started, 'first_request': time.perf_counter() - imported}))
+'''
+
+_IMPORTTIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$')
+
+
+def fixture_emotes(count=300):
+    return {'data': [
+        {
+            'id': str(index),
+            'name': f'LoadTestEmote{index}',
+            'images': {
+                'url_1x': f'https://static-cdn.jtvnw.net/emoticons/v2/{index}/static/light/1.0',
+                'url_2x': f'https://static-cdn.jtvnw.net/emoticons/v2/{index}/static/light/2.0',
+                'url_4x': f'https://static-cdn.jtvnw.net/emoticons/v2/{index}/static/light/3.0',
+            },
+            'format': ['static'],
+            'scale': ['1.0', '2.0', '3.0'],
+            'theme_mode': ['light', 'dark']
+        }
+        for index in range(count)
+    ]}
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[max(min(math.ceil(q * len(ordered)) - 1, len(ordered) - 1), 0)]
+
+
+def summarize(values):
+    return {
+        'p50': round(statistics.median(values) * 1000, 1),
+        'p99': round(percentile(values, 0.99) * 1000, 1)
+    }
+
+
+def build_snapshot(workdir, fixtures, env):
+    """フィクスチャからスナップショットを作る（指定が無ければ固定の合成データ）"""
+    if not fixtures:
+        fixtures = os.path.join(workdir, 'fixtures')
+        os.makedirs(fixtures)
+        for kind, data in (('badges', fixture_badges(600)), ('emotes', fixture_emotes())):
+            with open(os.path.join(fixtures, f'{kind}.json'), 'w') as f:
+                json.dump(data, f)
+    output = os.path.join(workdir, 'snapshots')
+    subprocess.run([sys.executable, os.path.join(ROOT, 'tools', 'build_snapshot.py'),
+                    '--fixtures', fixtures, '--output', output],
+                   env=env, check=True, stdout=subprocess.DEVNULL)
+    return output
+
+
+def measure_cold_start(env, runs):
+    samples = {'total': [], 'import': [], 'first_request': []}
+    # 1回目は .pyc の生成を含むため捨てる
+    for run in range(runs + 1):
+        started = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', CHILD], cwd=API_DIR, env=env,
+                                capture_output=True, text=True)
+        total = time.perf_counter() - started
+        if result.returncode != 0:
+            raise RuntimeError(f'cold start failed:\n{result.stderr}')
+        if run == 0:
+            continue
+        timings = json.loads(result.stdout.strip().splitlines()[-1])
+        samples['total'].append(total)
+        samples['import'].append(timings['import'])
+        samples['first_request'].append(timings['first_request'])
+    return {name: summarize(values) for name, values in samples.items()}
+
+
+def measure_imports(env, runs, top=10):
+    """index が直接読み込むモジュールごとの累積時間（ミリ秒）の中央値"""
+    samples = {}
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import index'],
+                                cwd=API_DIR, env=env, capture_output=True, text=True, check=True)
+        for line in result.stderr.splitlines():
+            match = _IMPORTTIME.match(line)
+            if match and (match.group(4) == 'index' or len(match.group(3)) == 2):
+                samples.setdefault(match.group(4), []).append(int(match.group(2)) / 1000)
+    medians = {name: round(statistics.median(values), 1) for name, values in samples.items()}
+    return dict(sorted(medians.items(), key=lambda item: -item[1])[:top])
+
+
+def git(*args):
+    try:
+        return subprocess.run(['git', *args], cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=30)
+    parser.add_argument('--importtime-runs', type=int, default=5)
+    parser.add_argument('--fixtures', help='保存済みのHelixレスポンスのディレクトリ（badges.json・emotes.json）')
+    parser.add_argument('--record', help='結果を1行のJSONとして追記するファイル')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        env = dict(
+            os.environ,
+            TWITCH_CLIENT_ID='benchmark',
+            TWITCH_CLIENT_SECRET='benchmark',
+            # 上流には接続しない（スナップショットが使われなければ失敗する）
+            HELIX_API_URL='http://127.0.0.1:9/helix',
+            TWITCH_TOKEN_URL='http://127.0.0.1:9/oauth2/token',
+            SNAPSHOT_MAX_AGE=str(10 ** 9),
+        )
+        env['SNAPSHOT_DIR'] = build_snapshot(workdir, args.fixtures, env)
+        cold_start = measure_cold_start(env, args.runs)
+        imports = measure_imports(env, args.importtime_runs)
+
+    result = {
+        'release': git('describe', '--tags', '--always', '--dirty'),
+        'commit': git('rev-parse', 'HEAD'),
+        'recorded_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'runs': args.runs,
+        **cold_start,
+        'imports_ms': imports
+    }
+
+    print(f'cold start ({args.runs} runs, ms):')
+    for name in ('total', 'import', 'first_request'):
+        print(f'  {name:<14} p50={result[name]["p50"]:>7.1f}  p99={result[name]["p99"]:>7.1f}')
+    print('imports (cumulative ms, median):')
+    for name, value in imports.items():
+        print(f'  {name:<20} {value:>7.1f}')
+
+    if args.record:
+        previous = None
+        if os.path.exists(args.record):
+            with open(args.record, 'r') as f:
+                lines = [line for line in f if line.strip()]
+            previous = json.loads(lines[-1]) if lines else None
+        if previous:
+            print(f'previous ({previous["release"]}): total p50={previous["total"]["p50"]} '
+                  f'p99={previous["total"]["p99"]}')
+        os.makedirs(os.path.dirname(os.path.abspath(args.record)), exist_ok=True)
+        with open(args.record, 'a') as f:
+            f.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+
+if __name__ == '__main__':
+    main()
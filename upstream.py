@@ -0,0 +1,263 @@
+"""Twitch / Stream Database への外部HTTP呼び出しを共通化するクライアント
+
+ホストごとのコネクションプール（keep-alive）を共有し、既定のタイムアウトと
+5xx・接続リセット時のジッター付きリトライを提供する。リトライは GET / HEAD のみで、
+それ以外のメソッドは idempotent=True を指定した場合だけ再送する。
+"""
+import logging
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import Counter, Histogram
+from profiling import phase
+
+logger = logging.getLogger(__name__)
+
+# (接続タイムアウト, 読み込みタイムアウト) 秒
+DEFAULT_TIMEOUT = (3.05, 10)
+RETRY_STATUSES = frozenset({500, 502, 503, 504})
+# 再送しても結果が変わらないメソッド（それ以外はトークン発行やデプロイフックなど副作用がある）
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD'})
+RETRY_EXCEPTIONS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+# ホストごとの上流呼び出し（リトライした場合は1回ずつ記録する）
+UPSTREAM_LATENCY = Histogram('upstream_request_duration_seconds',
+                             '上流HTTPの応答時間（秒、ヘッダー受信まで）', ['host'])
+UPSTREAM_REQUESTS = Counter('upstream_requests_total',
+                            '上流HTTPの呼び出し数（status は接続エラー・タイムアウトの場合 error）',
+                            ['host', 'status'])
+UPSTREAM_RETRIES = Counter('upstream_retries_total', '上流HTTPのリトライ数', ['host'])
+
+
+def _max_retries(retries, method, idempotent):
+    if idempotent is None:
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+    return retries if idempotent else 0
+
+
+def _observe(host, status, started):
+    UPSTREAM_LATENCY.observe(time.perf_counter() - started, host=host)
+    UPSTREAM_REQUESTS.inc(host=host, status=status)
+
+
+class UpstreamClient:
+    """プール済みセッションを使った上流HTTPクライアント"""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, retries=2, backoff=0.3,
+                 pool_connections=10, pool_maxsize=32, http2=False):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.http2 = http2
+        self._lock = threading.Lock()
+        self._session = None
+        self._http2_client = None
+
+    @property
+    def session(self):
+        """ホストごとのコネクションプールを持つ共有セッション"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=self.pool_connections,
+                        pool_maxsize=self.pool_maxsize,
+                        max_retries=0
+                    )
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    self._session = session
+        return self._session
+
+    def _get_http2_client(self):
+        """HTTP/2クライアント（httpx[http2] がインストールされている場合のみ）"""
+        if self._http2_client is None:
+            with self._lock:
+                if self._http2_client is None:
+                    try:
+                        import httpx
+                        connect, read = self.timeout
+                        self._http2_client = httpx.Client(
+                            http2=True,
+                            timeout=httpx.Timeout(read, connect=connect),
+                            limits=httpx.Limits(max_connections=self.pool_maxsize)
+                        )
+                    except ImportError:
+                        logger.warning("httpx[http2] is not installed; falling back to HTTP/1.1")
+                        self.http2 = False
+                        return None
+        return self._http2_client
+
+    def _sleep_before_retry(self, attempt):
+        # フルジッター付き指数バックオフ
+        time.sleep(random.uniform(0, self.backoff * (2 ** attempt)))
+
+    def request(self, method, url, idempotent=None, **kwargs):
+        """リトライ付きでリクエストを送信する（idempotent を省略した場合は GET / HEAD のみリトライ）"""
+        with phase('upstream'):
+            return self._request(method, url, idempotent, **kwargs)
+
+    def _request(self, method, url, idempotent=None, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        use_http2 = self.http2 and not kwargs.get('stream') and self._get_http2_client()
+
+        host = urlsplit(url).netloc
+        retries = _max_retries(self.retries, method, idempotent)
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                if use_http2:
+                    response = self._send_http2(method, url, **kwargs)
+                else:
+                    response = self.session.request(method, url, **kwargs)
+            except Exception as e:
+                _observe(host, 'error', started)
+                if not isinstance(e, RETRY_EXCEPTIONS) or attempt >= retries:
+                    raise
+                UPSTREAM_RETRIES.inc(host=host)
+                self._sleep_before_retry(attempt)
+                attempt += 1
+                continue
+
+            _observe(host, response.status_code, started)
+            if response.status_code in RETRY_STATUSES and attempt < retries:
+                response.close()
+                UPSTREAM_RETRIES.inc(host=host)
+                self._sleep_before_retry(attempt)
+                attempt += 1
+                continue
+
+            return response
+
+    def _send_http2(self, method, url, timeout=None, **kwargs):
+        import httpx
+        if isinstance(timeout, tuple):
+            timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+        try:
+            return self._http2_client.request(method, url, timeout=timeout, **kwargs)
+        except httpx.TransportError as e:
+            # リトライ判定をrequestsの例外に揃える
+            raise requests.exceptions.ConnectionError(str(e)) from e
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+
+def _env_flag(name):
+    return os.getenv(name, '').lower() in ('1', 'true', 'yes')
+
+
+class AsyncUpstreamClient:
+    """UpstreamClient と同じタイムアウト・リトライ規則の非同期版（httpxを使用）"""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, retries=2, backoff=0.3,
+                 max_connections=200, http2=False):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_connections = max_connections
+        self.http2 = http2
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            import httpx
+            connect, read = self.timeout
+            options = dict(
+                timeout=httpx.Timeout(read, connect=connect),
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections)
+            )
+            try:
+                self._client = httpx.AsyncClient(http2=self.http2, **options)
+            except ImportError:
+                logger.warning("h2 is not installed; falling back to HTTP/1.1")
+                self.http2 = False
+                self._client = httpx.AsyncClient(**options)
+        return self._client
+
+    async def request(self, method, url, idempotent=None, **kwargs):
+        """リトライ付きでリクエストを送信する（idempotent を省略した場合は GET / HEAD のみリトライ）"""
+        with phase('upstream'):
+            return await self._request(method, url, idempotent, **kwargs)
+
+    async def _request(self, method, url, idempotent=None, **kwargs):
+        import asyncio
+        import httpx
+
+        host = urlsplit(url).netloc
+        retries = _max_retries(self.retries, method, idempotent)
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except Exception as e:
+                _observe(host, 'error', started)
+                if not isinstance(e, httpx.TransportError) or attempt >= retries:
+                    raise
+                UPSTREAM_RETRIES.inc(host=host)
+                await asyncio.sleep(random.uniform(0, self.backoff * (2 ** attempt)))
+                attempt += 1
+                continue
+
+            _observe(host, response.status_code, started)
+            if response.status_code in RETRY_STATUSES and attempt < retries:
+                UPSTREAM_RETRIES.inc(host=host)
+                await asyncio.sleep(random.uniform(0, self.backoff * (2 ** attempt)))
+                attempt += 1
+                continue
+
+            return response
+
+    async def get(self, url, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+
+def get_http_client():
+    """アプリ全体で共有するクライアント（初回呼び出し時に環境変数から設定）"""
+    global _shared_client
+    if _shared_client is None:
+        with _shared_lock:
+            if _shared_client is None:
+                _shared_client = UpstreamClient(
+                    retries=int(os.getenv('UPSTREAM_RETRIES', '2')),
+                    pool_maxsize=int(os.getenv('UPSTREAM_POOL_SIZE', '32')),
+                    http2=_env_flag('UPSTREAM_HTTP2')
+                )
+    return _shared_client
+
+
+def create_async_client():
+    """ASGIモード用の非同期クライアントを環境変数の設定で作成"""
+    return AsyncUpstreamClient(
+        retries=int(os.getenv('UPSTREAM_RETRIES', '2')),
+        max_connections=int(os.getenv('UPSTREAM_ASYNC_POOL_SIZE', '200')),
+        http2=_env_flag('UPSTREAM_HTTP2')
+    )
@@ -0,0 +1,136 @@
+"""複数ワーカー（プロセス）間の排他制御
+
+ファイルロック（POSIX は fcntl.flock、Windows は msvcrt.locking）を使う。ロックは
+プロセスが終了するとOSが解放するため、リーダーのワーカーが落ちても残りのワーカーの
+どれかが次の再試行で引き継ぐ。
+"""
+import logging
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+
+class FileLock:
+    """プロセス間の排他ロック（同じプロセス内のスレッド間でも排他）"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._thread_lock = threading.Lock()
+
+    def acquire(self, blocking=True, poll_interval=0.1):
+        """ロックを取得する。blocking=False で取得できなければ False を返す"""
+        if not self._thread_lock.acquire(blocking):
+            return False
+        try:
+            lock_file = open(self.path, 'a+')
+            while True:
+                if self._try_lock(lock_file):
+                    self._file = lock_file
+                    return True
+                if not blocking:
+                    lock_file.close()
+                    self._thread_lock.release()
+                    return False
+                time.sleep(poll_interval)
+        except BaseException:
+            self._thread_lock.release()
+            raise
+
+    @staticmethod
+    def _try_lock(lock_file):
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def release(self):
+        lock_file, self._file = self._file, None
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            lock_file.close()
+            self._thread_lock.release()
+
+    @property
+    def locked(self):
+        return self._file is not None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class LeaderElection:
+    """ロックファイルを取得できた1つのワーカーだけで on_elected() を実行する
+
+    取得できなかったワーカーは retry_interval 秒ごとに再試行し、リーダーのプロセスが
+    終了してロックが解放されたら引き継ぐ。リーダーはプロセスが終了するまでロックを保持する。
+    """
+
+    def __init__(self, path, on_elected, retry_interval=30):
+        self.lock = FileLock(path)
+        self.on_elected = on_elected
+        self.retry_interval = retry_interval
+        self.elected_at = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def is_leader(self):
+        return self.elected_at is not None
+
+    def start(self):
+        """選出を開始する（複数回呼ばれても1回だけ）"""
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            return self._thread
+
+    def _run(self):
+        while not self.lock.acquire(blocking=False):
+            time.sleep(self.retry_interval)
+        self.elected_at = time.time()
+        self._write_owner()
+        logger.info("Worker elected as badge monitor leader", extra={'pid': os.getpid()})
+        self.on_elected()
+
+    def _write_owner(self):
+        """確認用にリーダーのPIDをロックファイルに書いておく（ロック自体には使わない）"""
+        try:
+            lock_file = self.lock._file
+            lock_file.seek(0)
+            lock_file.truncate()
+            lock_file.write(f'{os.getpid()}\n')
+            lock_file.flush()
+        except OSError:
+            pass
+
+    def stats(self):
+        return {
+            'pid': os.getpid(),
+            'is_leader': self.is_leader,
+            'elected_at': self.elected_at,
+            'lock_path': self.lock.path
+        }
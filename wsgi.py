@@ -0,0 +1,14 @@
+"""本番用のWSGIエントリポイント（複数ワーカー）
+
+    pip install -r requirements-prod.txt
+    gunicorn -c gunicorn.conf.py wsgi:application
+
+各ワーカーがアプリを読み込み、バッジ監視はロックを取得した1つのワーカーだけで実行する。
+SHARED_CACHE_URL（shared_cache.py 参照）を設定するとHelixレスポンスをワーカー間で共有する。
+"""
+import os
+
+from app import app as application, monitor_election
+
+if os.getenv('DISABLE_BADGE_MONITOR', '').lower() not in ('1', 'true', 'yes'):
+    monitor_election.start()